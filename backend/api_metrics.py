@@ -0,0 +1,126 @@
+"""
+Prometheus metrics for the backend API, served on /metrics: latency per route,
+MCP tool calls, Anthropic API calls (latency and token usage), card snapshot
+use and prewarming, SQLAlchemy query time and event-loop lag. Anthropic API
+calls also get a span (see tracing).
+"""
+
+import json
+import time
+from typing import Optional
+
+import httpx
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from sqlalchemy import event
+from starlette.responses import Response
+
+from mcp_shared import import_shared
+from tracing import start_span
+
+import_shared("http_metrics")
+from http_metrics import LATENCY_BUCKETS, QUERY_BUCKETS, HTTPMetrics, MetricsMiddleware, statement_type
+
+# Request latency and event-loop lag; the middleware is added with metrics=HTTP_METRICS
+HTTP_METRICS = HTTPMetrics("mia")
+MCP_TOOL_SECONDS = Histogram(
+    "mia_mcp_tool_duration_seconds", "MCP tool call latency seen by the client; outcome is ok, error or exception",
+    ["tool", "transport", "outcome"], buckets=LATENCY_BUCKETS
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "mia_llm_request_duration_seconds", "Anthropic API call latency by call site",
+    ["call_site", "model", "status"], buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter(
+    "mia_llm_tokens_total", "Tokens reported in Anthropic API usage", ["call_site", "model", "kind"]
+)
+DB_QUERY_SECONDS = Histogram(
+    "mia_db_query_duration_seconds", "SQL statement time by statement type", ["statement"], buckets=QUERY_BUCKETS
+)
+CARD_RESPONSES = Counter(
+    "mia_card_responses_total", "Card endpoint responses by source: snapshot, live, stale (live failed) or error",
+    ["card", "source"]
+)
+CARD_PREWARM_SECONDS = Histogram(
+    "mia_card_prewarm_duration_seconds", "Time to precompute one card snapshot", ["card", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+
+
+def observe_mcp_tool(tool: str, transport: str, seconds: float, result) -> None:
+    if result is None:
+        outcome = "exception"
+    elif isinstance(result, dict) and (result.get("success") is False or "error" in result):
+        outcome = "error"
+    else:
+        outcome = "ok"
+    MCP_TOOL_SECONDS.labels(tool, transport, outcome).observe(seconds)
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement executed through a SQLAlchemy engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is not None:
+            DB_QUERY_SECONDS.labels(statement_type(statement)).observe(time.perf_counter() - started)
+
+
+class LLMMetricsTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx transport recording latency, status and token usage of Anthropic
+    Messages API calls; responses are read here, so callers see no difference.
+    """
+
+    def __init__(self, call_site: str, **kwargs):
+        super().__init__(**kwargs)
+        self.call_site = call_site
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        model = _request_model(request)
+        with start_span(f"llm {self.call_site}", kind=SpanKind.CLIENT,
+                        **{"llm.call_site": self.call_site, "llm.model": model}) as span:
+            started = time.perf_counter()
+            try:
+                response = await super().handle_async_request(request)
+                await response.aread()
+            except Exception as e:
+                LLM_REQUEST_SECONDS.labels(self.call_site, model, type(e).__name__).observe(time.perf_counter() - started)
+                raise
+            LLM_REQUEST_SECONDS.labels(self.call_site, model, str(response.status_code)).observe(time.perf_counter() - started)
+            span.set_attribute("http.status_code", response.status_code)
+
+            if response.status_code == 200:
+                try:
+                    usage = json.loads(response.content).get("usage") or {}
+                except ValueError:
+                    usage = {}
+                for kind in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+                    if usage.get(kind):
+                        LLM_TOKENS.labels(self.call_site, model, kind.replace("_tokens", "")).inc(usage[kind])
+                        span.set_attribute(f"llm.{kind}", usage[kind])
+            else:
+                span.set_status(Status(StatusCode.ERROR, f"HTTP {response.status_code}"))
+            return response
+
+
+def _request_model(request: httpx.Request) -> str:
+    try:
+        return json.loads(request.content).get("model") or "unknown"
+    except (ValueError, AttributeError):
+        return "unknown"
+
+
+def llm_http_client(call_site: str, timeout: Optional[float] = 30.0) -> httpx.AsyncClient:
+    """httpx.AsyncClient for Anthropic API calls, instrumented under call_site"""
+    return httpx.AsyncClient(timeout=timeout, transport=LLMMetricsTransport(call_site))
+
+
+def metrics_response() -> Response:
+    """Prometheus text exposition of every metric in this process (includes mcp-backend's when in-process)"""
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -2,11 +2,13 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from backend.config import settings
+from api_metrics import instrument_engine
 
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
 )
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -23,6 +25,7 @@ def init_db():
     # Import all models to ensure they're registered with Base
     from models.chat import ChatHistory, UserSession
     from models.session import ChatSession
-    from models.creative import AdCreative, CreativeInsight
+    from models.creative import AdCreative, CreativeInsight, CreativeAssetAggregate
     from models.user_profile import UserProfile, AuthSession, UserActivity, AccountMapping
+    from models.card_snapshot import CardSnapshot
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
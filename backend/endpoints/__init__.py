@@ -12,6 +12,7 @@ from .creative_endpoint import router as creative_router
 from .growth_endpoint import router as growth_router
 from .optimize_endpoint import router as optimize_router
 from .protect_endpoint import router as protect_router
+from .snapshot_endpoint import router as snapshot_router
 from .static_endpoints import router as static_router
 
 __all__ = [
@@ -22,5 +23,6 @@ __all__ = [
     "growth_router",
     "optimize_router",
     "protect_router",
+    "snapshot_router",
     "static_router"
 ]
\ No newline at end of file
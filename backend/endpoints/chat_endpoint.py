@@ -16,7 +16,6 @@ from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional
 import asyncio
 import json
-import httpx
 import os
 
 # Import backend dependencies
@@ -26,6 +25,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from services.adk_mcp_integration import get_adk_marketing_agent
 from services.creative_import import get_creative_insights
 from database import SessionLocal, get_db
+from api_metrics import llm_http_client
 from models.user_profile import AccountMapping
 
 router = APIRouter()
@@ -740,7 +740,7 @@ Respond naturally as if speaking to a business owner. Use ONLY the campaign data
             "messages": [{"role": "user", "content": claude_prompt}]
         }
         
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with llm_http_client("chat", timeout=120.0) as client:
             response = await client.post(
                 "https://api.anthropic.com/v1/messages", 
                 headers=headers, 
@@ -14,7 +14,6 @@ from pydantic import BaseModel
 from typing import Dict, Any, Optional
 import asyncio
 import json
-import httpx
 from sqlalchemy.orm import Session
 
 # Import backend dependencies
@@ -23,8 +22,11 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from services.adk_mcp_integration import get_adk_marketing_agent
+from services.creative.asset_aggregation import aggregate_creative_assets
 from database import get_db
+from api_metrics import llm_http_client
 from models.user_profile import AccountMapping
+from services.card_snapshots import creative_variant, serve_card
 
 router = APIRouter()
 
@@ -119,16 +121,12 @@ async def creative_analysis(request: CreativeAnalysisRequest, db: Session = Depe
     - Creative performance metrics (clicks, interaction rates, costs)
     - Asset-specific optimization recommendations
     - NO campaign ROAS, budget, or performance data mixing
+
+    Served from the card snapshot while it is fresh (see services/card_snapshots.py).
     """
-    start_time = asyncio.get_event_loop().time()
-    
     # Get dynamic account context
     account_context = get_account_context(request.session_id, db)
     
-    print(f"[CREATIVE-ANALYSIS] Question: {request.question}")
-    print(f"[CREATIVE-ANALYSIS] Category: {request.category}")
-    print(f"[CREATIVE-ANALYSIS] Using dynamic account: {account_context['account_name']} (Google Ads {account_context['google_ads_id']}, GA4 {account_context['ga4_property_id']})")
-    
     # Validate question is in preset list
     valid_questions = PRESET_QUESTIONS.get(request.category, [])
     if request.question not in valid_questions:
@@ -138,6 +136,22 @@ async def creative_analysis(request: CreativeAnalysisRequest, db: Session = Depe
             "valid_questions": valid_questions
         }
     
+    return await serve_card(
+        "creative", account_context["focus_account"], request.start_date, request.end_date,
+        lambda: run_creative_analysis(request, account_context),
+        variant=creative_variant(request.category, request.question)
+    )
+
+async def run_creative_analysis(request: CreativeAnalysisRequest, account_context: Dict[str, Any]) -> Dict[str, Any]:
+    """Live creative analysis: the asset queries through MCP, then the Claude analysis"""
+    start_time = asyncio.get_event_loop().time()
+    
+    print(f"[CREATIVE-ANALYSIS] Question: {request.question}")
+    print(f"[CREATIVE-ANALYSIS] Category: {request.category}")
+    print(f"[CREATIVE-ANALYSIS] Using dynamic account: {account_context['account_name']} (Google Ads {account_context['google_ads_id']}, GA4 {account_context['ga4_property_id']})")
+    
+    valid_questions = PRESET_QUESTIONS.get(request.category, [])
+    
     try:
         # Get the ADK marketing agent (REUSE pattern from chat_endpoint.py)
         agent = await get_adk_marketing_agent()
@@ -410,238 +424,18 @@ async def creative_analysis(request: CreativeAnalysisRequest, db: Session = Depe
             "raw_asset_data": asset_data if isinstance(asset_data, list) and len(asset_data) < 50 else "Too many assets to display"
         }
         
-        # Extract asset insights for Claude - IMPROVED MULTI-FORMAT PARSING
+        # Extract asset insights for Claude - single columnar pass over all three sources
         if isinstance(asset_data, list) and len(asset_data) > 0:
-            # Categorize assets by ALL 9 types (including separate image categories)
-            asset_formats = {
-                'HEADLINE': [],
-                'DESCRIPTION': [],
-                'LONG_HEADLINE': [],
-                'TEXT': [],
-                'CALLOUT': [],
-                'SITELINK': [], 
-                'PRICE': [],
-                'PROMOTION': [],
-                'IMAGE_RESPONSIVE': [],     # Images from responsive ads
-                'IMAGE_EXTENSION': [],      # Images from extensions  
-                'IMAGE_PERFORMANCE_MAX': [] # Images from Performance Max campaigns
-            }
-            
-            for asset in asset_data:
-                # Time-series data for PROTECT questions
-                date = asset.get('segments_date', '')
-                # Handle both aggregated and non-aggregated field names
-                clicks = asset.get('total_clicks', asset.get('metrics_clicks', 0))
-                impressions = asset.get('total_impressions', asset.get('metrics_impressions', 0))
-                interaction_rate = asset.get('metrics_interaction_rate', 0)  # Not aggregated
-                cost_micros = asset.get('total_cost_micros', asset.get('metrics_cost_micros', 0))
-                conversions = asset.get('total_conversions', asset.get('metrics_conversions', 0))
-                
-                # DYNAMIC ASSET TYPE DETECTION - Detect type from content fields (no hardcoding)
-                asset_type = "UNKNOWN"
-                content = ""
-                
-                # Google Ads Asset Type Mapping (numeric to text)
-                ASSET_TYPE_MAP = {
-                    1: 'TEXT',           # TEXT asset
-                    2: 'IMAGE',          # IMAGE asset
-                    3: 'VIDEO',          # VIDEO asset  
-                    4: 'MEDIA_BUNDLE',   # HTML5 asset
-                    5: 'TEXT',           # TEXT asset (alternative code)
-                    9: 'CALLOUT',        # CALLOUT asset
-                    10: 'LEAD_FORM',     # LEAD_FORM asset
-                    11: 'SITELINK',      # SITELINK asset (corrected from BOOK_ON_GOOGLE)
-                    12: 'PROMOTION',     # PROMOTION asset
-                    13: 'CALLOUT',       # CALLOUT asset (alternative code)
-                    14: 'STRUCTURED_SNIPPET', # STRUCTURED_SNIPPET asset
-                    15: 'SITELINK',      # SITELINK asset (alternative code)
-                    17: 'MOBILE_APP',    # MOBILE_APP asset
-                    18: 'HOTEL_CALLOUT', # HOTEL_CALLOUT asset
-                    19: 'CALL',          # CALL asset
-                    20: 'PRICE'          # PRICE asset
-                }
-                
-                # Google Ads Field Type Mapping (numeric to text) for asset_group_asset_field_type
-                FIELD_TYPE_MAP = {
-                    1: 'HEADLINE',           # HEADLINE field
-                    2: 'DESCRIPTION',        # DESCRIPTION field
-                    3: 'LONG_HEADLINE',      # LONG_HEADLINE field
-                    4: 'MARKETING_IMAGE',    # MARKETING_IMAGE field
-                    5: 'YOUTUBE_VIDEO',      # YOUTUBE_VIDEO field
-                    6: 'VIDEO',              # VIDEO field
-                    7: 'BUSINESS_NAME',      # BUSINESS_NAME field
-                    8: 'LOGO',               # LOGO field
-                    9: 'SQUARE_MARKETING_IMAGE', # SQUARE_MARKETING_IMAGE field
-                    10: 'PORTRAIT_MARKETING_IMAGE', # PORTRAIT_MARKETING_IMAGE field
-                    11: 'CALL_TO_ACTION_SELECTION', # CALL_TO_ACTION_SELECTION field
-                    12: 'AD_IMAGE',          # AD_IMAGE field
-                    13: 'LANDSCAPE_LOGO',    # LANDSCAPE_LOGO field
-                    17: 'HEADLINE',          # HEADLINE field (alternative code)
-                    18: 'DESCRIPTION',       # DESCRIPTION field (alternative code)
-                }
-                
-                # CORRECTED ASSET TYPE DETECTION - Using field_type for responsive assets, asset.type for extensions
-                
-                # Check for responsive assets (from ad_group_ad_asset_view)
-                # Try multiple possible field names for field_type
-                field_type = (asset.get('ad_group_ad_asset_view_field_type', '') or 
-                             asset.get('field_type', '') or 
-                             asset.get('ad_group_ad_asset_view.field_type', ''))
-                if field_type:
-                    # Use field_type to determine asset category
-                    if field_type == 'HEADLINE':
-                        asset_type = 'HEADLINE'
-                    elif field_type == 'DESCRIPTION':
-                        asset_type = 'DESCRIPTION'
-                    elif field_type == 'LONG_HEADLINE':
-                        asset_type = 'LONG_HEADLINE'
-                    elif field_type == 'MARKETING_IMAGE':
-                        asset_type = 'IMAGE_RESPONSIVE'
-                    else:
-                        asset_type = field_type  # Use field_type directly
-                    
-                    # Get content based on type
-                    if field_type in ['HEADLINE', 'DESCRIPTION', 'LONG_HEADLINE']:
-                        content = asset.get('asset_text_asset_text', '')
-                    elif field_type == 'MARKETING_IMAGE':
-                        image_url = asset.get('asset_image_asset_full_size_url', '')
-                        width = asset.get('asset_image_asset_full_size_width_pixels', 0)
-                        height = asset.get('asset_image_asset_full_size_height_pixels', 0)
-                        content = f"{width}×{height}" if width and height else image_url
-                    else:
-                        content = asset.get('asset_text_asset_text', '') or str(asset.get('asset_type', ''))
-                
-                # Check for Performance Max assets (from asset_group_asset)
-                elif asset.get('asset_group_asset_field_type'):
-                    # Performance Max uses numeric field_type from asset_group_asset table
-                    performance_field_type_num = asset.get('asset_group_asset_field_type', 0)
-                    performance_field_type = FIELD_TYPE_MAP.get(performance_field_type_num, f'UNKNOWN_FIELD_{performance_field_type_num}')
-                    
-                    if performance_field_type == 'HEADLINE':
-                        asset_type = 'HEADLINE'
-                        content = asset.get('asset_text_asset_text', '')
-                    elif performance_field_type == 'DESCRIPTION':
-                        asset_type = 'DESCRIPTION'  
-                        content = asset.get('asset_text_asset_text', '')
-                    elif performance_field_type == 'LONG_HEADLINE':
-                        asset_type = 'LONG_HEADLINE'
-                        content = asset.get('asset_text_asset_text', '')
-                    elif performance_field_type == 'MARKETING_IMAGE':
-                        asset_type = 'IMAGE_PERFORMANCE_MAX'
-                        image_url = asset.get('asset_image_asset_full_size_url', '')
-                        width = asset.get('asset_image_asset_full_size_width_pixels', 0)
-                        height = asset.get('asset_image_asset_full_size_height_pixels', 0)
-                        content = f"{width}×{height}" if width and height else image_url
-                    else:
-                        asset_type = performance_field_type
-                        content = asset.get('asset_text_asset_text', '') or str(asset.get('asset_type', ''))
-                
-                # Check for extension assets (from campaign_asset)
-                elif asset.get('asset_callout_asset_callout_text'):
-                    asset_type = 'CALLOUT'
-                    content = asset.get('asset_callout_asset_callout_text', '')
-                elif asset.get('asset_sitelink_asset_link_text'):
-                    asset_type = 'SITELINK'
-                    link_text = asset.get('asset_sitelink_asset_link_text', '')
-                    # Use only the main link text, not concatenated with description
-                    content = link_text
-                elif asset.get('asset_image_asset_full_size_url') and not field_type:
-                    asset_type = 'IMAGE_EXTENSION'
-                    image_url = asset.get('asset_image_asset_full_size_url', '')
-                    width = asset.get('asset_image_asset_full_size_width_pixels', 0)
-                    height = asset.get('asset_image_asset_full_size_height_pixels', 0)
-                    content = f"{width}×{height}" if width and height else image_url
-                
-                # Fallback: Handle numeric asset types (Performance Max without field_type)
-                elif asset.get('asset_type'):
-                    asset_type_num = asset.get('asset_type', 0)
-                    asset_type_text = ASSET_TYPE_MAP.get(asset_type_num, f'UNKNOWN_{asset_type_num}')
-                    
-                    # Map to our categories based on numeric type and content
-                    if asset_type_num == 5:  # TEXT asset - check if it's headline/description
-                        text_content = asset.get('asset_text_asset_text', '')
-                        if text_content:
-                            # For Performance Max TEXT assets, assume they're headlines if we have text
-                            asset_type = 'HEADLINE'  # Default Performance Max text to headline
-                            content = text_content
-                        else:
-                            asset_type = 'TEXT'
-                            content = text_content
-                    elif asset_type_num == 2:  # IMAGE asset
-                        asset_type = 'IMAGE_PERFORMANCE_MAX'
-                        image_url = asset.get('asset_image_asset_full_size_url', '')
-                        width = asset.get('asset_image_asset_full_size_width_pixels', 0)
-                        height = asset.get('asset_image_asset_full_size_height_pixels', 0)
-                        content = f"{width}×{height}" if width and height else image_url
-                    else:
-                        asset_type = asset_type_text
-                        content = asset.get('asset_text_asset_text', '') or str(asset_type_num)
-                
-                # Get the API type number for debugging only (not for logic)
-                asset_type_num = asset.get('asset_type', 0)
-                
-                # Get performance label and source info
-                performance_label = asset.get('ad_group_ad_asset_view_performance_label', '') 
-                if field_type:
-                    source_table = 'responsive'
-                elif asset.get('asset_group_asset_field_type'):
-                    source_table = 'performance_max'
-                else:
-                    source_table = 'extension'
-                
-                print(f"[TRIPLE-MCP-PARSING] {asset_type} ({source_table}): '{content[:30]}...', clicks={clicks}, impressions={impressions}, conversions={conversions}, label={performance_label}")
-                print(f"[DEBUG-FIELDS] Available keys: {list(asset.keys())[:10]}")  # Show first 10 field names
-                
-                # Add to appropriate format category (only if we detected a valid type)
-                if asset_type in asset_formats:
-                    asset_info = {
-                        'date': date,  # Time-series data for PROTECT questions
-                        'type': asset_type,
-                        'content': content,
-                        'clicks': clicks,
-                        'impressions': impressions,
-                        'conversions': conversions,
-                        'interaction_rate': interaction_rate * 100,
-                        'avg_cost': cost_micros / 1000000 if cost_micros > 0 else 0,
-                        'ctr': round((clicks / impressions * 100), 2) if impressions > 0 else 0,
-                        'conversion_rate': round((conversions / clicks), 4) if clicks > 0 else 0,
-                        'performance_label': performance_label,  # Backward compatibility
-                        'source_table': source_table,
-                        'field_type': field_type if field_type else None
-                    }
-                    
-                    # Add image-specific metadata for both image types
-                    if asset_type in ['IMAGE_RESPONSIVE', 'IMAGE_EXTENSION', 'IMAGE_PERFORMANCE_MAX']:
-                        asset_info.update({
-                            'image_url': asset.get('asset_image_asset_full_size_url', ''),
-                            'width': asset.get('asset_image_asset_full_size_width_pixels', 0),
-                            'height': asset.get('asset_image_asset_full_size_height_pixels', 0),
-                            'aspect_ratio': round(asset.get('asset_image_asset_full_size_width_pixels', 0) / asset.get('asset_image_asset_full_size_height_pixels', 1), 2) if asset.get('asset_image_asset_full_size_height_pixels', 0) > 0 else 0,
-                            'format_type': 'Square' if abs(asset.get('asset_image_asset_full_size_width_pixels', 0) - asset.get('asset_image_asset_full_size_height_pixels', 0)) <= 50 else ('Horizontal' if asset.get('asset_image_asset_full_size_width_pixels', 0) > asset.get('asset_image_asset_full_size_height_pixels', 0) else 'Vertical'),
-                            'image_category': 'Responsive Ad Image' if asset_type == 'IMAGE_RESPONSIVE' else ('Performance Max Image' if asset_type == 'IMAGE_PERFORMANCE_MAX' else 'Extension Image')
-                        })
-                    
-                    asset_formats[asset_type].append(asset_info)
-                else:
-                    print(f"[TRIPLE-TABLE-PARSING] UNKNOWN asset type detected: {asset_type}, skipping")
+            asset_formats, format_summary = aggregate_creative_assets(
+                responsive_assets, extension_assets, performance_max_assets
+            )
+            parsed_assets = sum(len(assets) for assets in asset_formats.values())
+            print(f"[TRIPLE-MCP-PARSING] {parsed_assets}/{total_assets} assets categorized: "
+                  f"{ {format_type: len(assets) for format_type, assets in asset_formats.items() if assets} }")
             
             # Store by format type for proper analysis
             creative_data['asset_formats'] = asset_formats
-            creative_data['format_summary'] = {
-                format_type: {
-                    'count': len(assets),
-                    'total_clicks': sum(asset['clicks'] for asset in assets),
-                    'total_impressions': sum(asset['impressions'] for asset in assets),
-                    'total_conversions': sum(asset['conversions'] for asset in assets),
-                    'avg_ctr': sum(asset['ctr'] for asset in assets) / len(assets) if assets else 0,
-                    'avg_conversion_rate': sum(asset['conversions'] for asset in assets) / sum(asset['clicks'] for asset in assets) if sum(asset['clicks'] for asset in assets) > 0 else 0,
-                    'total_cost': sum(asset['avg_cost'] for asset in assets),
-                    'avg_cost_per_click': sum(asset['avg_cost'] for asset in assets) / sum(asset['clicks'] for asset in assets) if sum(asset['clicks'] for asset in assets) > 0 else 0,
-                    'clicks_per_dollar': sum(asset['clicks'] for asset in assets) / sum(asset['avg_cost'] for asset in assets) if sum(asset['avg_cost'] for asset in assets) > 0 else 0,
-                    'cost_efficiency_score': (sum(asset['clicks'] for asset in assets) / sum(asset['avg_cost'] for asset in assets)) * 100 if sum(asset['avg_cost'] for asset in assets) > 0 else 0
-                }
-                for format_type, assets in asset_formats.items() if assets
-            }
+            creative_data['format_summary'] = format_summary
             
             # Legacy format for backwards compatibility - group by broad categories
             creative_data['text_assets'] = []
@@ -1479,7 +1273,7 @@ FORMATTING: Use clear section headers followed by bullet points. Avoid numbering
         }
         
         # REUSE: Same timeout and error handling (120s timeout) with 429 rate limit support
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with llm_http_client("creative", timeout=120.0) as client:
             response = await client.post(
                 "https://api.anthropic.com/v1/messages",
                 headers=headers,
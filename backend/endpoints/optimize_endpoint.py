@@ -10,7 +10,6 @@ from pydantic import BaseModel
 from typing import Dict, Any, Optional
 import asyncio
 import json
-import httpx
 from sqlalchemy.orm import Session
 
 # Import backend dependencies
@@ -21,7 +20,12 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from services.adk_mcp_integration import get_adk_marketing_agent
 from services.creative_import import get_creative_insights
 from database import SessionLocal, get_db
+from api_metrics import llm_http_client
+from json_response import json_default
 from models.user_profile import AccountMapping
+from services.card_snapshots import (
+    DEFAULT_END_DATE, DEFAULT_START_DATE, DEFAULT_USER_ID, resolve_card_account, serve_card
+)
 
 router = APIRouter()
 
@@ -199,31 +203,33 @@ async def get_optimize_data(request: OptimizeDataRequest):
     """
     Optimize page endpoint - Performance efficiency focus using proven Growth pattern
     Focus: ROAS improvement gaps, fixing underperformers, reducing waste
+    Served from the card snapshot while it is fresh (see services/card_snapshots.py).
     """
-    start_time = asyncio.get_event_loop().time()
-    
     print(f"[OPTIMIZE-DATA] Processing Optimize request: {request.question}")
-    print(f"[OPTIMIZE-DATA] Using hardcoded Cherry Time context for reliability")
     
-    # Extract account info but use hardcoded Onvlee values for consistency
-    user_id = request.user_id or "106540664695114193744" 
-    google_ads_id = request.account_id or "7482456286"
-    ga4_property_id = request.property_id or "428236885"
+    # Account from the selected account or session (DFSA if neither), over the standard window
+    user_context = {
+        "user_id": request.user_id or DEFAULT_USER_ID,
+        "focus_account": resolve_card_account(request.selected_account, request.session_id),
+        "start_date": DEFAULT_START_DATE,
+        "end_date": DEFAULT_END_DATE
+    }
     
-    print(f"[OPTIMIZE-DATA] Account IDs: User {user_id}, Google Ads {google_ads_id}, GA4 {ga4_property_id}")
+    print(f"[OPTIMIZE-DATA] Account: {user_context['focus_account']}, User {user_context['user_id']}")
+    
+    return await serve_card(
+        "optimize", user_context["focus_account"], user_context["start_date"], user_context["end_date"],
+        lambda: compute_optimize_data(user_context)
+    )
+
+async def compute_optimize_data(user_context: Dict[str, Any]) -> Dict[str, Any]:
+    """Live Optimize card: comprehensive insights from MCP, then the optimization-focused Claude analysis"""
+    start_time = asyncio.get_event_loop().time()
     
     try:
         # Get the ADK marketing agent (same as Growth/Chat endpoint)
         agent = await get_adk_marketing_agent()
         
-        # Build MCP request with hardcoded DFSA account (identical to Growth)
-        user_context = {
-            "user_id": user_id,
-            "focus_account": "dfsa",  # Use DFSA configuration
-            "start_date": "2025-08-03",
-            "end_date": "2025-09-02"
-        }
-        
         print(f"[OPTIMIZE-DATA] Calling MCP with context: {user_context}")
         
         # Get comprehensive insights from MCP (same as Growth endpoint)
@@ -301,7 +307,7 @@ OPTIMIZATION QUESTION: "{optimize_question}"
 - Identify specific rand amounts that can be saved
 
 CAMPAIGN DATA (YOUR ONLY DATA SOURCE):
-{json.dumps(clean_data, indent=2)}
+{json.dumps(clean_data, indent=2, default=json_default)}
 
 Provide specific optimization recommendations focusing on reducing waste and improving efficiency."""
 
@@ -322,7 +328,7 @@ Provide specific optimization recommendations focusing on reducing waste and imp
             "messages": [{"role": "user", "content": claude_prompt}]
         }
         
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with llm_http_client("optimize", timeout=120.0) as client:
             response = await client.post(
                 "https://api.anthropic.com/v1/messages", 
                 headers=headers, 
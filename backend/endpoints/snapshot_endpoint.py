@@ -0,0 +1,32 @@
+"""
+Card Snapshot Endpoints - Status of the precomputed card payloads and the prewarmer
+
+The snapshots themselves are served by the card endpoints (see services/card_snapshots.py).
+"""
+
+import asyncio
+
+from fastapi import APIRouter
+
+from services.card_snapshots import card_prewarmer, list_snapshots
+
+router = APIRouter()
+
+
+@router.get("/api/card-snapshots")
+async def get_card_snapshots():
+    """Every stored snapshot with its age, plus the prewarm schedule and last run"""
+    try:
+        return {"success": True, "prewarmer": card_prewarmer.status(), "snapshots": list_snapshots()}
+    except Exception as e:
+        print(f"[CARD-SNAPSHOTS] Error: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@router.post("/api/card-snapshots/refresh")
+async def refresh_card_snapshots():
+    """Start a prewarm run now; it continues in the background"""
+    if card_prewarmer.status()["running"]:
+        return {"success": False, "error": "A prewarm run is already in progress"}
+    asyncio.get_running_loop().create_task(card_prewarmer.run())
+    return {"success": True, "message": "Prewarm run started", "prewarmer": card_prewarmer.status()}
@@ -0,0 +1,30 @@
+"""
+orjson-rendered JSON responses for the API (default response class of the app)
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson; NumPy values are written natively and NaN/inf as null"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=jsonable_encoder,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps default for in-process MCP tool results, which may hold NumPy values or pandas Timestamps"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'tolist'):
+        # NumPy scalars and arrays
+        return value.tolist()
+    return jsonable_encoder(value)
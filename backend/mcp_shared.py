@@ -0,0 +1,40 @@
+"""
+Modules shared with mcp-backend (mcp_tracing, http_metrics, and the MCP tools
+loaded by the in-process transport). MCP_BACKEND_PATH is appended to sys.path
+once, after backend's own directories, so spawned worker processes can import
+mcp-backend's modules by name too. The two services keep their top-level
+module names distinct (mcp-backend's are credential_db and request_models
+where backend has database and models); import_shared checks that nothing of
+backend's shadows the requested module.
+"""
+
+import importlib
+import os
+import sys
+import threading
+from types import ModuleType
+
+MCP_BACKEND_PATH = os.path.abspath(
+    os.getenv("MCP_BACKEND_PATH", os.path.join(os.path.dirname(__file__), '..', 'mcp-backend'))
+)
+
+_path_lock = threading.Lock()
+
+
+def add_mcp_backend_path():
+    """Put MCP_BACKEND_PATH at the end of sys.path (once per process)"""
+    if not os.path.isdir(MCP_BACKEND_PATH):
+        raise ImportError(f"mcp-backend not found at {MCP_BACKEND_PATH} (set MCP_BACKEND_PATH)")
+    with _path_lock:
+        if MCP_BACKEND_PATH not in sys.path:
+            sys.path.append(MCP_BACKEND_PATH)
+
+
+def import_shared(name: str) -> ModuleType:
+    """Import mcp-backend's top-level module `name`"""
+    add_mcp_backend_path()
+    module = importlib.import_module(name)
+    origin = os.path.abspath(getattr(module, '__file__', None) or '')
+    if os.path.dirname(origin) != MCP_BACKEND_PATH:
+        raise ImportError(f"{name} resolved to {origin or module!r}, not mcp-backend's copy", name=name)
+    return module
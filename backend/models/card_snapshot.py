@@ -0,0 +1,32 @@
+"""
+Card Snapshot Model - Precomputed card payloads served by the card endpoints
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from database import Base
+
+
+class CardSnapshot(Base):
+    """
+    Latest Growth/Optimize/Protect/Creative payload per account, date range and
+    variant. Written by the prewarmer and by live card requests.
+    """
+    __tablename__ = "card_snapshots"
+    __table_args__ = (
+        UniqueConstraint('card', 'account_id', 'start_date', 'end_date', 'variant', name='uq_card_snapshot'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Snapshot identity
+    card = Column(String, index=True)  # "growth", "optimize", "protect", "creative"
+    account_id = Column(String, index=True)  # AccountMapping.account_id
+    start_date = Column(String)  # YYYY-MM-DD
+    end_date = Column(String)  # YYYY-MM-DD
+    variant = Column(String, default="")  # "<category>:<question>" for creative, else ""
+
+    # The endpoint's JSON response, as returned by a successful live computation
+    payload = Column(JSON)
+    source = Column(String)  # "prewarm" or "live"
+    compute_ms = Column(Integer)  # Time the computation took
+
+    computed_at = Column(DateTime(timezone=True), index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, UniqueConstraint
 from sqlalchemy.sql import func
 from database import Base
 
@@ -64,4 +64,32 @@ class CreativeInsight(Base):
     date_range_end = Column(DateTime)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class CreativeAssetAggregate(Base):
+    """Running per-account totals for each headline, description and ad combination.
+
+    Maintained incrementally by the importer so insights can be refreshed
+    without re-reading every AdCreative row.
+    """
+    __tablename__ = "creative_asset_aggregates"
+    __table_args__ = (
+        UniqueConstraint('account_id', 'asset_type', 'asset_text', name='uq_creative_asset_aggregate'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    account_id = Column(String, index=True)
+
+    # Asset identity
+    asset_type = Column(String, index=True)  # 'HEADLINE', 'DESCRIPTION', 'AD_COMBINATION'
+    asset_text = Column(Text)  # Headline/description text, or JSON {"headlines": [...], "descriptions": [...]}
+
+    # Aggregated performance across every active ad using this asset
+    clicks = Column(Integer, default=0)
+    impressions = Column(Integer, default=0)
+    conversions = Column(Float, default=0.0)
+    cost = Column(Float, default=0.0)
+    ads = Column(Integer, default=0)  # Number of active ads using this asset
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
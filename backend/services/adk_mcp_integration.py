@@ -15,6 +15,8 @@ from .claude_agent import get_claude_intent_agent
 # Database imports for account mapping
 from sqlalchemy.orm import Session
 from database import SessionLocal
+from api_metrics import llm_http_client
+from tracing import traced
 from models.user_profile import AccountMapping
 
 
@@ -511,6 +513,7 @@ class ADKMarketingAgent:
         response += "• **Scaling**: 'Which campaigns should I scale?'\n"
         return response
 
+    @traced("agent.analyze_marketing_query")
     async def analyze_marketing_query(self, query: str, user_context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Phase 2: Smart MIA - Analyze marketing query with contextual intelligence
@@ -548,11 +551,12 @@ class ADKMarketingAgent:
             print(f"Query: {query}")
             print(f"Selected tools: {[tool['name'] for tool in selected_tools]}")
             
-            # Step 2: Execute selected tools
+            # Step 2: Execute selected tools (concurrently, so one slow platform doesn't serialize the rest)
             tool_results = []
             for tool in selected_tools:
                 print(f"[ADK DEBUG] Executing tool: {tool['name']}")
-                result = await self._execute_tool(tool, user_context)
+            results = await asyncio.gather(*(self._execute_tool(tool, user_context) for tool in selected_tools))
+            for tool, result in zip(selected_tools, results):
                 print(f"[ADK DEBUG] Tool {tool['name']} result type: {type(result)}")
                 if result:
                     print(f"[ADK DEBUG] Tool {tool['name']} success: {not result.get('error')}")
@@ -577,6 +581,13 @@ class ADKMarketingAgent:
                 "raw_results": tool_results,
                 "timestamp": datetime.now().isoformat()
             }
+            # Platforms mcp-backend gave up on (timeout or open circuit breaker): the answer is partial
+            degraded_platforms = {}
+            for result in tool_results:
+                if isinstance(result.get('data'), dict):
+                    degraded_platforms.update(result['data'].get('degraded_platforms') or {})
+            response_data["degraded"] = bool(degraded_platforms)
+            response_data["degraded_platforms"] = degraded_platforms
             
             # Let Claude analyze the marketing data from individual tools
             print(f"[CLAUDE] Processing marketing data with Claude intelligence...")
@@ -644,12 +655,11 @@ Respond conversationally and directly. Focus on actionable insights. Include spe
 
                 # Call Claude API directly for comprehensive insights
                 import os
-                import httpx
                 
                 api_key = os.getenv('ANTHROPIC_API_KEY')
                 if api_key:
                     try:
-                        async with httpx.AsyncClient(timeout=30.0) as client:
+                        async with llm_http_client("adk_insights", timeout=30.0) as client:
                             response = await client.post(
                                 "https://api.anthropic.com/v1/messages",
                                 headers={
@@ -1156,6 +1166,7 @@ Respond conversationally and directly. Focus on actionable insights. Include spe
             
         status = {
             "mcp_client_ready": bool(self.mcp_client),
+            "mcp_pool": self.mcp_client.pool_status() if self.mcp_client else None,
             "available_tools": list(self.tools.keys()),
             "tool_details": self.tools,
             "timestamp": datetime.now().isoformat()
@@ -1176,7 +1187,11 @@ async def get_adk_marketing_agent() -> ADKMarketingAgent:
     return _adk_agent
 
 async def reset_adk_marketing_agent() -> None:
-    """Force reset the singleton ADK marketing agent to clear cached MCP session"""
+    """Force reset the singleton ADK marketing agent and its MCP session pool.
+
+    Lost MCP sessions are re-initialized automatically by the pool, so this is
+    only needed to pick up configuration changes.
+    """
     global _adk_agent
     if _adk_agent is not None:
         await _adk_agent.close()
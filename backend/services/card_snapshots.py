@@ -0,0 +1,406 @@
+"""
+Card Snapshot Service
+Precomputed Growth, Optimize, Protect and Creative card payloads per active
+AccountMapping and standard date range, stored in the card_snapshots table.
+
+Card endpoints answer through serve_card():
+- a snapshot younger than CARD_SNAPSHOT_MAX_AGE_MINUTES is returned as-is
+- otherwise the card is computed live and the result written through
+- if that fails, an older snapshot is served and marked stale
+Every response carries a "freshness" block: source (snapshot/live),
+computed_at, age_seconds and stale.
+
+CardPrewarmer refreshes every snapshot off-hours (CARD_PREWARM_HOURS, local
+time) and optionally every CARD_PREWARM_INTERVAL_MINUTES. Cards are computed
+one at a time, so a run is a trickle of MCP and Claude calls rather than a burst.
+
+Environment:
+- CARD_SNAPSHOT_MAX_AGE_MINUTES: how long a snapshot is served without recomputing (default 720)
+- CARD_PREWARM_ENABLED: set to false to never prewarm
+- CARD_PREWARM_HOURS: comma-separated local hours to prewarm at (default 5; empty for none)
+- CARD_PREWARM_INTERVAL_MINUTES: additional refresh interval (default 0, off)
+- CARD_PREWARM_CARDS: cards to prewarm (default growth,optimize,protect,creative)
+- CARD_PREWARM_START_DATES: start dates of the standard windows, YYYY-MM-DD or today-N
+- CARD_PREWARM_SKIP_MINUTES: snapshots younger than this are not recomputed by a run (default 60)
+"""
+
+import asyncio
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from database import SessionLocal
+from api_metrics import CARD_PREWARM_SECONDS, CARD_RESPONSES
+from models.card_snapshot import CardSnapshot
+from models.user_profile import AccountMapping, AuthSession
+
+# The window the Growth/Optimize/Protect endpoints analyse and the Creative page starts from
+DEFAULT_START_DATE = "2025-08-03"
+DEFAULT_END_DATE = "2025-09-02"
+DEFAULT_ACCOUNT_ID = "dfsa"
+DEFAULT_USER_ID = os.getenv("DEV_USER_ID", "106540664695114193744")
+
+# Creative windows follow the Creative page: 7 days for protect, 31 days otherwise
+CREATIVE_WINDOW_DAYS = {"protect": 7}
+DEFAULT_WINDOW_DAYS = 31
+
+SNAPSHOT_MAX_AGE_MINUTES = float(os.getenv("CARD_SNAPSHOT_MAX_AGE_MINUTES", "720"))
+PREWARM_ENABLED = os.getenv("CARD_PREWARM_ENABLED", "true").lower() in ("1", "true", "yes")
+PREWARM_HOURS = [int(hour) for hour in os.getenv("CARD_PREWARM_HOURS", "5").split(",") if hour.strip()]
+PREWARM_INTERVAL_MINUTES = float(os.getenv("CARD_PREWARM_INTERVAL_MINUTES", "0"))
+PREWARM_CARDS = [card.strip() for card in os.getenv("CARD_PREWARM_CARDS", "growth,optimize,protect,creative").split(",")
+                 if card.strip()]
+PREWARM_START_DATES = [start.strip() for start in os.getenv("CARD_PREWARM_START_DATES", DEFAULT_START_DATE).split(",")
+                       if start.strip()]
+PREWARM_SKIP_MINUTES = float(os.getenv("CARD_PREWARM_SKIP_MINUTES", "60"))
+
+CardCompute = Callable[[], Awaitable[Dict[str, Any]]]
+
+# Live computations in progress, so concurrent first opens of the same card share one
+_in_flight: Dict[Tuple[str, str, str, str, str], "asyncio.Future"] = {}
+
+
+def creative_variant(category: str, question: str) -> str:
+    return f"{category}:{question}"
+
+
+def creative_date_range(category: str, start_date: str) -> Tuple[str, str]:
+    start = date.fromisoformat(start_date)
+    end = start + timedelta(days=CREATIVE_WINDOW_DAYS.get(category, DEFAULT_WINDOW_DAYS) - 1)
+    return start_date, end.isoformat()
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive; they are stored in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _freshness(source: str, computed_at: datetime) -> Dict[str, Any]:
+    age = (datetime.now(timezone.utc) - _utc(computed_at)).total_seconds()
+    return {
+        "source": source,
+        "computed_at": _utc(computed_at).isoformat(),
+        "age_seconds": int(age),
+        "stale": age > SNAPSHOT_MAX_AGE_MINUTES * 60
+    }
+
+
+def load_snapshot(card: str, account_id: str, start_date: str, end_date: str,
+                  variant: str = "") -> Optional[CardSnapshot]:
+    db = SessionLocal()
+    try:
+        return db.query(CardSnapshot).filter(
+            CardSnapshot.card == card,
+            CardSnapshot.account_id == account_id,
+            CardSnapshot.start_date == start_date,
+            CardSnapshot.end_date == end_date,
+            CardSnapshot.variant == variant
+        ).first()
+    finally:
+        db.close()
+
+
+def store_snapshot(card: str, account_id: str, start_date: str, end_date: str, payload: Dict[str, Any],
+                   source: str, compute_ms: int, variant: str = ""):
+    """Insert or replace the snapshot for this card, account, range and variant"""
+    db = SessionLocal()
+    try:
+        snapshot = db.query(CardSnapshot).filter(
+            CardSnapshot.card == card,
+            CardSnapshot.account_id == account_id,
+            CardSnapshot.start_date == start_date,
+            CardSnapshot.end_date == end_date,
+            CardSnapshot.variant == variant
+        ).first()
+        if snapshot is None:
+            snapshot = CardSnapshot(card=card, account_id=account_id, start_date=start_date,
+                                    end_date=end_date, variant=variant)
+            db.add(snapshot)
+        snapshot.payload = payload
+        snapshot.source = source
+        snapshot.compute_ms = compute_ms
+        snapshot.computed_at = datetime.now(timezone.utc)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"[CARD-SNAPSHOT] Could not store {card} snapshot for {account_id}: {e}")
+    finally:
+        db.close()
+
+
+async def _compute_shared(key: Tuple[str, str, str, str, str], compute: CardCompute) -> Tuple[Dict[str, Any], int]:
+    task = _in_flight.get(key)
+    if task is None:
+        async def timed():
+            started = time.perf_counter()
+            result = await compute()
+            return result, int((time.perf_counter() - started) * 1000)
+
+        task = asyncio.ensure_future(timed())
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # Shielded: a client that disconnects doesn't cancel the computation others are waiting on
+    return await asyncio.shield(task)
+
+
+async def serve_card(card: str, account_id: str, start_date: str, end_date: str, compute: CardCompute,
+                     variant: str = "") -> Dict[str, Any]:
+    """
+    Card response from a fresh snapshot, else from compute() (written through),
+    else from a stale snapshot; with a "freshness" block either way
+    """
+    snapshot = load_snapshot(card, account_id, start_date, end_date, variant)
+    if snapshot is not None:
+        freshness = _freshness("snapshot", snapshot.computed_at)
+        if not freshness["stale"]:
+            CARD_RESPONSES.labels(card, "snapshot").inc()
+            return {**snapshot.payload, "freshness": freshness}
+
+    result, compute_ms = await _compute_shared((card, account_id, start_date, end_date, variant), compute)
+    if result.get("success"):
+        store_snapshot(card, account_id, start_date, end_date, result, "live", compute_ms, variant)
+        CARD_RESPONSES.labels(card, "live").inc()
+        return {**result, "freshness": _freshness("live", datetime.now(timezone.utc))}
+
+    if snapshot is not None:
+        # An old answer beats an error
+        print(f"[CARD-SNAPSHOT] Live {card} failed for {account_id}, serving snapshot from {snapshot.computed_at}")
+        CARD_RESPONSES.labels(card, "stale").inc()
+        return {**snapshot.payload, "freshness": _freshness("snapshot", snapshot.computed_at),
+                "live_error": result.get("error")}
+    CARD_RESPONSES.labels(card, "error").inc()
+    return result
+
+
+def resolve_card_account(selected_account: Optional[Dict[str, Any]], session_id: Optional[str]) -> str:
+    """AccountMapping id for a card request: the selected account, else the session's account, else DFSA"""
+    db = SessionLocal()
+    try:
+        if selected_account:
+            names = [selected_account.get(key) for key in ("account_id", "id") if selected_account.get(key)]
+            ads_ids = [str(selected_account.get(key)).replace("-", "") for key in ("google_ads_id", "customer_id")
+                       if selected_account.get(key)]
+            account = db.query(AccountMapping).filter(
+                AccountMapping.is_active == True,
+                AccountMapping.account_id.in_(names) | AccountMapping.google_ads_id.in_(ads_ids)
+            ).order_by(AccountMapping.sort_order).first()
+            if account:
+                return account.account_id
+
+        if session_id:
+            session = db.query(AuthSession).filter(AuthSession.session_id == session_id).first()
+            if session and session.selected_account_id:
+                return session.selected_account_id
+    except Exception as e:
+        print(f"[CARD-SNAPSHOT] Account lookup failed: {e}, using {DEFAULT_ACCOUNT_ID}")
+    finally:
+        db.close()
+    return DEFAULT_ACCOUNT_ID
+
+
+def _standard_start_dates() -> List[str]:
+    starts = []
+    for start in PREWARM_START_DATES:
+        if start.startswith("today-"):
+            starts.append((date.today() - timedelta(days=int(start[len("today-"):]))).isoformat())
+        else:
+            starts.append(date.fromisoformat(start).isoformat())
+    return starts
+
+
+def _account_user_id(db, account_id: str) -> str:
+    """Google user whose credentials are used to prewarm an account: its most recent authenticated session"""
+    session = db.query(AuthSession).filter(
+        AuthSession.selected_account_id == account_id,
+        AuthSession.authenticated == True
+    ).order_by(AuthSession.last_activity.desc()).first()
+    return session.google_user_id if session and session.google_user_id else DEFAULT_USER_ID
+
+
+def _card_jobs(card: str, account: AccountMapping, user_id: str) -> List[Tuple[str, str, str, CardCompute]]:
+    """(start_date, end_date, variant, compute) for every standard snapshot of one card and account"""
+    if card in ("growth", "optimize", "protect"):
+        from endpoints.growth_endpoint import compute_growth_data
+        from endpoints.optimize_endpoint import compute_optimize_data
+        from endpoints.protect_endpoint import compute_protect_data
+
+        compute = {"growth": compute_growth_data, "optimize": compute_optimize_data,
+                   "protect": compute_protect_data}[card]
+        user_context = {
+            "user_id": user_id,
+            "focus_account": account.account_id,
+            "start_date": DEFAULT_START_DATE,
+            "end_date": DEFAULT_END_DATE
+        }
+        return [(DEFAULT_START_DATE, DEFAULT_END_DATE, "", lambda: compute(user_context))]
+
+    if card == "creative":
+        from endpoints.creative_endpoint import PRESET_QUESTIONS, CreativeAnalysisRequest, run_creative_analysis
+
+        account_context = {
+            "user_id": user_id,
+            "account_id": account.account_id,
+            "account_name": account.account_name,
+            "google_ads_id": account.google_ads_id,
+            "ga4_property_id": account.ga4_property_id,
+            "business_type": account.business_type,
+            "focus_account": account.account_id
+        }
+        jobs = []
+        for category, questions in PRESET_QUESTIONS.items():
+            for start in _standard_start_dates():
+                start_date, end_date = creative_date_range(category, start)
+                for question in questions:
+                    request = CreativeAnalysisRequest(question=question, category=category,
+                                                      start_date=start_date, end_date=end_date)
+                    jobs.append((start_date, end_date, creative_variant(category, question),
+                                 lambda request=request: run_creative_analysis(request, account_context)))
+        return jobs
+
+    print(f"[CARD-PREWARM] Unknown card: {card}")
+    return []
+
+
+class CardPrewarmer:
+    """Background task recomputing every card snapshot on the configured schedule"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self.last_run: Optional[datetime] = None
+        self.last_summary: Dict[str, Any] = {}
+
+    def start(self):
+        """Schedule prewarm runs on the running loop (called on app startup)"""
+        if not PREWARM_ENABLED or not (PREWARM_HOURS or PREWARM_INTERVAL_MINUTES) or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._schedule())
+        print(f"[CARD-PREWARM] Scheduled: hours {PREWARM_HOURS}, interval {PREWARM_INTERVAL_MINUTES:g} min, "
+              f"next run {self.next_run(datetime.now()).isoformat(timespec='minutes')}")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def next_run(self, now: datetime) -> datetime:
+        """Next prewarm time after `now` (local time)"""
+        candidates = []
+        for hour in PREWARM_HOURS:
+            at = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+            candidates.append(at if at > now else at + timedelta(days=1))
+        if PREWARM_INTERVAL_MINUTES:
+            last = self.last_run.astimezone().replace(tzinfo=None) if self.last_run else now
+            candidates.append(max(last + timedelta(minutes=PREWARM_INTERVAL_MINUTES), now))
+        return min(candidates)
+
+    async def _schedule(self):
+        while True:
+            now = datetime.now()
+            await asyncio.sleep(max((self.next_run(now) - now).total_seconds(), 1.0))
+            try:
+                await self.run()
+            except Exception as e:
+                print(f"[CARD-PREWARM] Run failed: {e}")
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Recompute the snapshots of every active AccountMapping, standard date
+        range and card, skipping those refreshed within CARD_PREWARM_SKIP_MINUTES
+        """
+        if self._running:
+            return {"success": False, "error": "A prewarm run is already in progress"}
+        self._running = True
+        started = datetime.now(timezone.utc)
+        summary = {"refreshed": 0, "skipped": 0, "failed": 0, "errors": []}
+        try:
+            db = SessionLocal()
+            try:
+                accounts = db.query(AccountMapping).filter(
+                    AccountMapping.is_active == True
+                ).order_by(AccountMapping.sort_order).all()
+                users = {account.account_id: _account_user_id(db, account.account_id) for account in accounts}
+            finally:
+                db.close()
+
+            for account in accounts:
+                for card in PREWARM_CARDS:
+                    for start_date, end_date, variant, compute in _card_jobs(card, account, users[account.account_id]):
+                        await self._refresh(card, account.account_id, start_date, end_date, variant, compute, summary)
+        finally:
+            self._running = False
+            self.last_run = started
+            self.last_summary = {**summary, "started_at": started.isoformat(),
+                                 "duration_seconds": round((datetime.now(timezone.utc) - started).total_seconds(), 1)}
+        print(f"[CARD-PREWARM] Done: {summary['refreshed']} refreshed, {summary['skipped']} skipped, "
+              f"{summary['failed']} failed")
+        return {"success": True, **self.last_summary}
+
+    async def _refresh(self, card: str, account_id: str, start_date: str, end_date: str, variant: str,
+                       compute: CardCompute, summary: Dict[str, Any]):
+        snapshot = load_snapshot(card, account_id, start_date, end_date, variant)
+        if snapshot is not None and _freshness("snapshot", snapshot.computed_at)["age_seconds"] < PREWARM_SKIP_MINUTES * 60:
+            summary["skipped"] += 1
+            return
+
+        started = time.perf_counter()
+        try:
+            result = await compute()
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        seconds = time.perf_counter() - started
+
+        if result.get("success"):
+            store_snapshot(card, account_id, start_date, end_date, result, "prewarm", int(seconds * 1000), variant)
+            summary["refreshed"] += 1
+            CARD_PREWARM_SECONDS.labels(card, "ok").observe(seconds)
+        else:
+            summary["failed"] += 1
+            if len(summary["errors"]) < 20:
+                label = " ".join(part for part in (card, account_id, variant) if part)
+                summary["errors"].append(f"{label}: {str(result.get('error'))[:200]}")
+            CARD_PREWARM_SECONDS.labels(card, "error").observe(seconds)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": PREWARM_ENABLED,
+            "scheduled": self._task is not None,
+            "running": self._running,
+            "hours": PREWARM_HOURS,
+            "interval_minutes": PREWARM_INTERVAL_MINUTES,
+            "cards": PREWARM_CARDS,
+            "next_run": self.next_run(datetime.now()).isoformat(timespec="minutes") if self._task else None,
+            "last_run": self.last_summary or None
+        }
+
+
+def list_snapshots() -> List[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        snapshots = db.query(CardSnapshot).order_by(CardSnapshot.account_id, CardSnapshot.card,
+                                                    CardSnapshot.start_date, CardSnapshot.variant).all()
+        return [
+            {
+                "card": snapshot.card,
+                "account_id": snapshot.account_id,
+                "start_date": snapshot.start_date,
+                "end_date": snapshot.end_date,
+                "variant": snapshot.variant,
+                "source": snapshot.source,
+                "compute_ms": snapshot.compute_ms,
+                **{key: value for key, value in _freshness(snapshot.source, snapshot.computed_at).items()
+                   if key != "source"}
+            }
+            for snapshot in snapshots
+        ]
+    finally:
+        db.close()
+
+
+# Shared instance started with the app
+card_prewarmer = CardPrewarmer()
@@ -7,6 +7,7 @@ import json
 import httpx
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from api_metrics import llm_http_client
 
 class ClaudeIntentAgent:
     """
@@ -82,7 +83,7 @@ Return only valid JSON, no other text."""
                 ]
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with llm_http_client("intent_analysis", timeout=30.0) as client:
                 response = await client.post(self.base_url, headers=headers, json=payload)
                 response.raise_for_status()
                 
@@ -328,7 +329,7 @@ Respond conversationally and directly. Focus on actionable insights. Include spe
                 ]
             }
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with llm_http_client("response_formatter", timeout=30.0) as client:
                 response = await client.post(self.base_url, headers=headers, json=payload)
                 response.raise_for_status()
                 
@@ -0,0 +1,294 @@
+"""
+Creative Asset Aggregation
+
+Normalizes the three Google Ads asset result sets used by /api/creative-analysis
+(ad_group_ad_asset_view, campaign_asset, asset_group_asset) into a single
+columnar frame and computes every per-asset and per-format metric in one pass.
+"""
+
+from typing import Dict, Any, List, Tuple
+import numpy as np
+import pandas as pd
+
+# Google Ads Asset Type Mapping (numeric to text)
+ASSET_TYPE_MAP = {
+    1: 'TEXT',           # TEXT asset
+    2: 'IMAGE',          # IMAGE asset
+    3: 'VIDEO',          # VIDEO asset
+    4: 'MEDIA_BUNDLE',   # HTML5 asset
+    5: 'TEXT',           # TEXT asset (alternative code)
+    9: 'CALLOUT',        # CALLOUT asset
+    10: 'LEAD_FORM',     # LEAD_FORM asset
+    11: 'SITELINK',      # SITELINK asset (corrected from BOOK_ON_GOOGLE)
+    12: 'PROMOTION',     # PROMOTION asset
+    13: 'CALLOUT',       # CALLOUT asset (alternative code)
+    14: 'STRUCTURED_SNIPPET', # STRUCTURED_SNIPPET asset
+    15: 'SITELINK',      # SITELINK asset (alternative code)
+    17: 'MOBILE_APP',    # MOBILE_APP asset
+    18: 'HOTEL_CALLOUT', # HOTEL_CALLOUT asset
+    19: 'CALL',          # CALL asset
+    20: 'PRICE'          # PRICE asset
+}
+
+# Google Ads Field Type Mapping (numeric to text) for asset_group_asset_field_type
+FIELD_TYPE_MAP = {
+    1: 'HEADLINE',           # HEADLINE field
+    2: 'DESCRIPTION',        # DESCRIPTION field
+    3: 'LONG_HEADLINE',      # LONG_HEADLINE field
+    4: 'MARKETING_IMAGE',    # MARKETING_IMAGE field
+    5: 'YOUTUBE_VIDEO',      # YOUTUBE_VIDEO field
+    6: 'VIDEO',              # VIDEO field
+    7: 'BUSINESS_NAME',      # BUSINESS_NAME field
+    8: 'LOGO',               # LOGO field
+    9: 'SQUARE_MARKETING_IMAGE', # SQUARE_MARKETING_IMAGE field
+    10: 'PORTRAIT_MARKETING_IMAGE', # PORTRAIT_MARKETING_IMAGE field
+    11: 'CALL_TO_ACTION_SELECTION', # CALL_TO_ACTION_SELECTION field
+    12: 'AD_IMAGE',          # AD_IMAGE field
+    13: 'LANDSCAPE_LOGO',    # LANDSCAPE_LOGO field
+    17: 'HEADLINE',          # HEADLINE field (alternative code)
+    18: 'DESCRIPTION',       # DESCRIPTION field (alternative code)
+}
+
+# Enum fields may arrive as numeric codes or as enum names - accept both
+_ASSET_TYPE_LOOKUP = {**ASSET_TYPE_MAP, **{name: name for name in ASSET_TYPE_MAP.values()}}
+_FIELD_TYPE_LOOKUP = {**FIELD_TYPE_MAP, **{name: name for name in FIELD_TYPE_MAP.values()}}
+
+# Asset format categories in prompt order (all 9 types, images split by source)
+ASSET_FORMATS = [
+    'HEADLINE',
+    'DESCRIPTION',
+    'LONG_HEADLINE',
+    'TEXT',
+    'CALLOUT',
+    'SITELINK',
+    'PRICE',
+    'PROMOTION',
+    'IMAGE_RESPONSIVE',       # Images from responsive ads
+    'IMAGE_EXTENSION',        # Images from extensions
+    'IMAGE_PERFORMANCE_MAX'   # Images from Performance Max campaigns
+]
+
+IMAGE_FORMATS = ['IMAGE_RESPONSIVE', 'IMAGE_EXTENSION', 'IMAGE_PERFORMANCE_MAX']
+TEXT_FIELD_TYPES = ['HEADLINE', 'DESCRIPTION', 'LONG_HEADLINE']
+
+# Only the GAQL output columns the analysis reads are materialized
+_RAW_COLUMNS = [
+    'segments_date',
+    'ad_group_ad_asset_view_field_type',
+    'field_type',
+    'ad_group_ad_asset_view.field_type',
+    'ad_group_ad_asset_view_performance_label',
+    'asset_group_asset_field_type',
+    'asset_type',
+    'asset_text_asset_text',
+    'asset_callout_asset_callout_text',
+    'asset_sitelink_asset_link_text',
+    'asset_image_asset_full_size_url',
+    'asset_image_asset_full_size_width_pixels',
+    'asset_image_asset_full_size_height_pixels',
+    'total_clicks', 'metrics_clicks',
+    'total_impressions', 'metrics_impressions',
+    'total_conversions', 'metrics_conversions',
+    'total_cost_micros', 'metrics_cost_micros',
+    'metrics_interaction_rate'
+]
+
+_ASSET_COLUMNS = [
+    'date', 'type', 'content', 'clicks', 'impressions', 'conversions', 'interaction_rate',
+    'avg_cost', 'ctr', 'conversion_rate', 'performance_label', 'source_table', 'field_type'
+]
+
+_IMAGE_COLUMNS = ['image_url', 'width', 'height', 'aspect_ratio', 'format_type', 'image_category']
+
+
+def _present(values: pd.Series) -> pd.Series:
+    """Vectorized truthiness for mixed GAQL columns (None/NaN/''/0 are falsy)"""
+    return values.notna() & values.ne('') & values.ne(0)
+
+
+def _text(values: pd.Series) -> pd.Series:
+    return values.where(values.notna(), '').astype(str)
+
+
+def _metric(frame: pd.DataFrame, aggregated: str, raw: str) -> pd.Series:
+    """Prefer the aggregated (SUM ... AS total_*) column, fall back to the raw metric"""
+    values = frame[aggregated].where(frame[aggregated].notna(), frame[raw])
+    return pd.to_numeric(values, errors='coerce').fillna(0)
+
+
+def build_asset_frame(
+    responsive_assets: List[Dict[str, Any]],
+    extension_assets: List[Dict[str, Any]],
+    performance_max_assets: List[Dict[str, Any]]
+) -> pd.DataFrame:
+    """
+    Normalize the three asset result sets into one typed frame.
+
+    Returns one row per input asset with the columns of the asset records sent to
+    Claude plus image metadata; rows whose type is not an analysed format are dropped.
+    """
+    records = list(responsive_assets) + list(extension_assets) + list(performance_max_assets)
+    raw = pd.DataFrame(records, columns=_RAW_COLUMNS, dtype=object)
+    if raw.empty:
+        return pd.DataFrame(columns=_ASSET_COLUMNS + _IMAGE_COLUMNS)
+
+    # Field type from ad_group_ad_asset_view (responsive assets)
+    field_type = raw['ad_group_ad_asset_view_field_type']
+    for fallback in ['field_type', 'ad_group_ad_asset_view.field_type']:
+        field_type = field_type.where(_present(field_type), raw[fallback])
+    has_field_type = _present(field_type)
+    field_type = _text(field_type.where(has_field_type))
+
+    # Performance Max field type and asset type via lookups (numeric codes or enum names)
+    pmax_raw = raw['asset_group_asset_field_type']
+    has_pmax = _present(pmax_raw)
+    pmax_type = pmax_raw.map(_FIELD_TYPE_LOOKUP)
+    pmax_type = pmax_type.where(pmax_type.notna(), 'UNKNOWN_FIELD_' + _text(pmax_raw))
+
+    asset_type_raw = raw['asset_type']
+    has_asset_type = _present(asset_type_raw)
+    asset_type_name = asset_type_raw.map(_ASSET_TYPE_LOOKUP)
+    asset_type_name = asset_type_name.where(asset_type_name.notna(), 'UNKNOWN_' + _text(asset_type_raw))
+    is_text_code = asset_type_raw.isin([5, 'TEXT'])
+    is_image_code = asset_type_raw.isin([2, 'IMAGE'])
+
+    text = _text(raw['asset_text_asset_text'])
+    has_text = text.ne('')
+    callout = _text(raw['asset_callout_asset_callout_text'])
+    sitelink = _text(raw['asset_sitelink_asset_link_text'])
+    image_url = _text(raw['asset_image_asset_full_size_url'])
+    width = pd.to_numeric(raw['asset_image_asset_full_size_width_pixels'], errors='coerce').fillna(0).astype('int64')
+    height = pd.to_numeric(raw['asset_image_asset_full_size_height_pixels'], errors='coerce').fillna(0).astype('int64')
+    image_content = (width.astype(str) + '×' + height.astype(str)).where((width != 0) & (height != 0), image_url)
+    text_or_type = text.where(has_text, _text(asset_type_raw))
+
+    # Detection order matters: responsive > Performance Max > callout > sitelink > image > numeric type
+    conditions = [
+        has_field_type,
+        has_pmax,
+        callout.ne(''),
+        sitelink.ne(''),
+        image_url.ne(''),
+        has_asset_type
+    ]
+    asset_type = np.select(conditions, [
+        np.where(field_type == 'MARKETING_IMAGE', 'IMAGE_RESPONSIVE', field_type),
+        np.where(pmax_type == 'MARKETING_IMAGE', 'IMAGE_PERFORMANCE_MAX', pmax_type),
+        'CALLOUT',
+        'SITELINK',
+        'IMAGE_EXTENSION',
+        np.select(
+            [is_text_code & has_text, is_text_code, is_image_code],
+            ['HEADLINE', 'TEXT', 'IMAGE_PERFORMANCE_MAX'],
+            asset_type_name
+        )
+    ], 'UNKNOWN')
+    content = np.select(conditions, [
+        np.select([field_type.isin(TEXT_FIELD_TYPES), field_type == 'MARKETING_IMAGE'],
+                  [text, image_content], text_or_type),
+        np.select([pmax_type.isin(TEXT_FIELD_TYPES), pmax_type == 'MARKETING_IMAGE'],
+                  [text, image_content], text_or_type),
+        callout,
+        sitelink,
+        image_content,
+        np.select([is_text_code, is_image_code], [text, image_content], text_or_type)
+    ], '')
+
+    clicks = _metric(raw, 'total_clicks', 'metrics_clicks')
+    impressions = _metric(raw, 'total_impressions', 'metrics_impressions')
+    conversions = _metric(raw, 'total_conversions', 'metrics_conversions')
+    cost_micros = _metric(raw, 'total_cost_micros', 'metrics_cost_micros')
+    interaction_rate = pd.to_numeric(raw['metrics_interaction_rate'], errors='coerce').fillna(0)
+
+    safe_impressions = impressions.where(impressions > 0)
+    safe_clicks = clicks.where(clicks > 0)
+
+    frame = pd.DataFrame({
+        'date': _text(raw['segments_date']),
+        'type': asset_type,
+        'content': content,
+        'clicks': clicks,
+        'impressions': impressions,
+        'conversions': conversions,
+        'interaction_rate': interaction_rate * 100,
+        'avg_cost': (cost_micros / 1000000).where(cost_micros > 0, 0),
+        'ctr': (clicks / safe_impressions * 100).round(2).fillna(0),
+        'conversion_rate': (conversions / safe_clicks).round(4).fillna(0),
+        'performance_label': _text(raw['ad_group_ad_asset_view_performance_label']),
+        'source_table': np.select([has_field_type, has_pmax], ['responsive', 'performance_max'], 'extension'),
+        'field_type': pd.Series(np.where(has_field_type, field_type, None), index=raw.index, dtype=object),
+        'image_url': image_url,
+        'width': width,
+        'height': height,
+        'aspect_ratio': (width / height.where(height > 0)).round(2).fillna(0),
+        'format_type': np.select(
+            [(width - height).abs() <= 50, width > height], ['Square', 'Horizontal'], 'Vertical'
+        ),
+        'image_category': np.select(
+            [asset_type == 'IMAGE_RESPONSIVE', asset_type == 'IMAGE_PERFORMANCE_MAX'],
+            ['Responsive Ad Image', 'Performance Max Image'],
+            'Extension Image'
+        )
+    })
+
+    # Counts are integral in GAQL; keep them as ints in the JSON sent to Claude
+    for column in ['clicks', 'impressions']:
+        if (frame[column] % 1 == 0).all():
+            frame[column] = frame[column].astype('int64')
+
+    return frame[frame['type'].isin(ASSET_FORMATS)]
+
+
+def summarize_asset_frame(frame: pd.DataFrame) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Dict[str, Any]]]:
+    """
+    Group the asset frame by format in a single pass.
+
+    Returns (asset_formats, format_summary) in the shape the creative prompts expect:
+    per-format lists of asset records and per-format totals/ratios.
+    """
+    asset_formats: Dict[str, List[Dict[str, Any]]] = {format_type: [] for format_type in ASSET_FORMATS}
+    if frame.empty:
+        return asset_formats, {}
+
+    grouped = frame.groupby('type', sort=False)
+    for format_type, assets in grouped:
+        columns = _ASSET_COLUMNS + _IMAGE_COLUMNS if format_type in IMAGE_FORMATS else _ASSET_COLUMNS
+        asset_formats[format_type] = assets[columns].to_dict('records')
+
+    totals = grouped.agg(
+        count=('type', 'size'),
+        total_clicks=('clicks', 'sum'),
+        total_impressions=('impressions', 'sum'),
+        total_conversions=('conversions', 'sum'),
+        avg_ctr=('ctr', 'mean'),
+        total_cost=('avg_cost', 'sum')
+    )
+    clicks = totals['total_clicks'].where(totals['total_clicks'] > 0)
+    cost = totals['total_cost'].where(totals['total_cost'] > 0)
+    totals['avg_conversion_rate'] = (totals['total_conversions'] / clicks).fillna(0)
+    totals['avg_cost_per_click'] = (totals['total_cost'] / clicks).fillna(0)
+    totals['clicks_per_dollar'] = (totals['total_clicks'] / cost).fillna(0)
+    totals['cost_efficiency_score'] = totals['clicks_per_dollar'] * 100
+
+    summary_columns = [
+        'count', 'total_clicks', 'total_impressions', 'total_conversions', 'avg_ctr',
+        'avg_conversion_rate', 'total_cost', 'avg_cost_per_click', 'clicks_per_dollar',
+        'cost_efficiency_score'
+    ]
+    by_format = totals[summary_columns].to_dict('index')
+    format_summary = {
+        format_type: by_format[format_type]
+        for format_type in ASSET_FORMATS if format_type in by_format
+    }
+
+    return asset_formats, format_summary
+
+
+def aggregate_creative_assets(
+    responsive_assets: List[Dict[str, Any]],
+    extension_assets: List[Dict[str, Any]],
+    performance_max_assets: List[Dict[str, Any]]
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Dict[str, Any]]]:
+    """Normalize the three asset sources and return (asset_formats, format_summary)"""
+    frame = build_asset_frame(responsive_assets, extension_assets, performance_max_assets)
+    return summarize_asset_frame(frame)
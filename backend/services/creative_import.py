@@ -5,14 +5,28 @@ Handles manual Google Ads export CSV files for ad creative data
 import csv
 import json
 import pandas as pd
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from models.creative import AdCreative, CreativeInsight
+from models.creative import AdCreative, CreativeInsight, CreativeAssetAggregate
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Number of entries kept in each ranked insight list
+TOP_N_INSIGHTS = 10
+
+# Aggregate asset type -> (insight type, label key used in the insight entries)
+INSIGHT_TYPES = {
+    'HEADLINE': ('BEST_HEADLINES', 'headline'),
+    'DESCRIPTION': ('BEST_DESCRIPTIONS', 'description'),
+    'AD_COMBINATION': ('TOP_PERFORMING_ADS', 'ad'),
+}
+
+# SQLite caps bound parameters per statement, so touched keys are looked up in batches
+_AGGREGATE_LOOKUP_BATCH = 500
+
 class CreativeDataImporter:
     """Handles import of ad creative data from manual Google Ads exports"""
     
@@ -40,6 +54,9 @@ class CreativeDataImporter:
                 'errors': []
             }
             
+            # Per-asset metric changes caused by this import
+            deltas: Dict[Tuple[str, str], Dict[str, float]] = {}
+            
             for index, row in df.iterrows():
                 try:
                     # Extract creative data
@@ -54,6 +71,9 @@ class CreativeDataImporter:
                         ).first()
                         
                         if existing_ad:
+                            # Retract the old contribution before overwriting it
+                            if existing_ad.is_active:
+                                self._accumulate_ad_delta(deltas, self._ad_snapshot(existing_ad), sign=-1)
                             # Update existing ad
                             self._update_ad_creative(existing_ad, creative_data)
                             results['updated_ads'] += 1
@@ -62,12 +82,19 @@ class CreativeDataImporter:
                             new_ad = AdCreative(**creative_data)
                             self.db.add(new_ad)
                             results['imported_ads'] += 1
+                        
+                        if creative_data.get('is_active', True):
+                            self._accumulate_ad_delta(deltas, creative_data, sign=1)
                     
                 except Exception as e:
                     error_msg = f"Error processing row {index}: {str(e)}"
                     logger.error(error_msg)
                     results['errors'].append(error_msg)
             
+            # Fold the deltas into the aggregate table in the same transaction as the ads
+            if self._has_aggregates(account_id):
+                self._apply_aggregate_deltas(account_id, deltas)
+            
             # Commit all changes
             self.db.commit()
             
@@ -174,78 +201,136 @@ class CreativeDataImporter:
                 setattr(existing_ad, key, value)
         existing_ad.updated_at = datetime.utcnow()
     
-    def _generate_creative_insights(self, account_id: str):
-        """Generate creative insights after data import"""
-        try:
-            # Get all ads for the account
-            ads = self.db.query(AdCreative).filter_by(account_id=account_id, is_active=True).all()
-            
-            if not ads:
-                return
-            
-            insights = []
-            
-            # Top performing headlines by CTR
-            headline_performance = {}
-            for ad in ads:
-                if ad.headlines:
-                    headlines = json.loads(ad.headlines)
-                    for headline in headlines:
-                        if headline not in headline_performance:
-                            headline_performance[headline] = {'clicks': 0, 'impressions': 0, 'conversions': 0, 'ads': 0}
-                        headline_performance[headline]['clicks'] += ad.clicks
-                        headline_performance[headline]['impressions'] += ad.impressions
-                        headline_performance[headline]['conversions'] += ad.conversions
-                        headline_performance[headline]['ads'] += 1
-            
-            # Calculate CTR for each headline
-            for headline, data in headline_performance.items():
-                if data['impressions'] > 0:
-                    data['ctr'] = (data['clicks'] / data['impressions']) * 100
-                    data['conversion_rate'] = (data['conversions'] / data['clicks']) * 100 if data['clicks'] > 0 else 0
+    def _ad_snapshot(self, ad: AdCreative) -> Dict[str, Any]:
+        """Capture the fields of a stored ad that feed the asset aggregates"""
+        return {
+            'headlines': ad.headlines,
+            'descriptions': ad.descriptions,
+            'clicks': ad.clicks or 0,
+            'impressions': ad.impressions or 0,
+            'conversions': ad.conversions or 0.0,
+            'cost': ad.cost or 0.0
+        }
+    
+    def _accumulate_ad_delta(self, deltas: Dict[Tuple[str, str], Dict[str, float]],
+                             ad: Dict[str, Any], sign: int):
+        """Add (sign=1) or retract (sign=-1) one ad's metrics for each of its assets"""
+        headlines = json.loads(ad['headlines']) if ad.get('headlines') else []
+        descriptions = json.loads(ad['descriptions']) if ad.get('descriptions') else []
+        
+        # An asset repeated inside one ad only counts once for that ad
+        keys = [('HEADLINE', headline) for headline in dict.fromkeys(headlines)]
+        keys += [('DESCRIPTION', desc) for desc in dict.fromkeys(descriptions)]
+        keys.append(('AD_COMBINATION', json.dumps({'headlines': headlines, 'descriptions': descriptions})))
+        
+        for key in keys:
+            delta = deltas.setdefault(key, {'clicks': 0, 'impressions': 0, 'conversions': 0.0, 'cost': 0.0, 'ads': 0})
+            delta['clicks'] += sign * (ad.get('clicks') or 0)
+            delta['impressions'] += sign * (ad.get('impressions') or 0)
+            delta['conversions'] += sign * (ad.get('conversions') or 0.0)
+            delta['cost'] += sign * (ad.get('cost') or 0.0)
+            delta['ads'] += sign
+    
+    def _has_aggregates(self, account_id: str) -> bool:
+        """Check whether the aggregate table has been built for this account"""
+        return self.db.query(CreativeAssetAggregate.id).filter_by(account_id=account_id).first() is not None
+    
+    def _apply_aggregate_deltas(self, account_id: str, deltas: Dict[Tuple[str, str], Dict[str, float]]):
+        """Apply per-asset deltas, touching only the aggregate rows that changed"""
+        for asset_type in INSIGHT_TYPES:
+            texts = [text for (kind, text) in deltas if kind == asset_type]
             
-            # Sort by CTR and get top performers
-            top_headlines = sorted(
-                headline_performance.items(), 
-                key=lambda x: x[1]['ctr'], 
-                reverse=True
-            )[:10]
+            existing = {}
+            for i in range(0, len(texts), _AGGREGATE_LOOKUP_BATCH):
+                batch = texts[i:i + _AGGREGATE_LOOKUP_BATCH]
+                rows = self.db.query(CreativeAssetAggregate).filter(
+                    CreativeAssetAggregate.account_id == account_id,
+                    CreativeAssetAggregate.asset_type == asset_type,
+                    CreativeAssetAggregate.asset_text.in_(batch)
+                ).all()
+                existing.update({row.asset_text: row for row in rows})
             
-            # Store insights
-            insights_data = {
-                'top_headlines_by_ctr': [
-                    {
-                        'headline': headline,
-                        'ctr': data['ctr'],
-                        'clicks': data['clicks'],
-                        'impressions': data['impressions'],
-                        'conversions': data['conversions'],
-                        'ads_used_in': data['ads']
-                    }
-                    for headline, data in top_headlines
-                ],
-                'generated_at': datetime.utcnow().isoformat(),
-                'total_ads_analyzed': len(ads)
-            }
+            for text in texts:
+                delta = deltas[(asset_type, text)]
+                row = existing.get(text)
+                
+                if row is None:
+                    if delta['ads'] <= 0:
+                        continue
+                    row = CreativeAssetAggregate(
+                        account_id=account_id, asset_type=asset_type, asset_text=text,
+                        clicks=0, impressions=0, conversions=0.0, cost=0.0, ads=0
+                    )
+                    self.db.add(row)
+                
+                row.clicks = (row.clicks or 0) + delta['clicks']
+                row.impressions = (row.impressions or 0) + delta['impressions']
+                row.conversions = (row.conversions or 0.0) + delta['conversions']
+                row.cost = (row.cost or 0.0) + delta['cost']
+                row.ads = (row.ads or 0) + delta['ads']
+                
+                # No active ad uses this asset any more
+                if row.ads <= 0 and row.id is not None:
+                    self.db.delete(row)
+    
+    def rebuild_creative_aggregates(self, account_id: str):
+        """Rebuild the asset aggregates for an account from every active ad.
+        
+        Only needed once per account (backfill for data imported before the
+        aggregate table existed); regular imports update it incrementally.
+        """
+        self.db.query(CreativeAssetAggregate).filter_by(account_id=account_id).delete(synchronize_session=False)
+        
+        deltas: Dict[Tuple[str, str], Dict[str, float]] = {}
+        for ad in self.db.query(AdCreative).filter_by(account_id=account_id, is_active=True).yield_per(1000):
+            self._accumulate_ad_delta(deltas, self._ad_snapshot(ad), sign=1)
+        
+        for (asset_type, text), delta in deltas.items():
+            self.db.add(CreativeAssetAggregate(account_id=account_id, asset_type=asset_type, asset_text=text, **delta))
+        
+        self.db.commit()
+        logger.info(f"Rebuilt {len(deltas)} creative asset aggregates for account {account_id}")
+    
+    def _generate_creative_insights(self, account_id: str):
+        """Generate creative insights from the per-account asset aggregates"""
+        try:
+            if not self._has_aggregates(account_id):
+                if not self.db.query(AdCreative.id).filter_by(account_id=account_id, is_active=True).first():
+                    return
+                self.rebuild_creative_aggregates(account_id)
             
-            # Save or update insights
-            existing_insights = self.db.query(CreativeInsight).filter_by(
-                account_id=account_id,
-                insight_type='BEST_HEADLINES'
-            ).first()
+            # Every active ad contributes exactly one ad combination row
+            total_ads, total_clicks, total_conversions = self.db.query(
+                func.sum(CreativeAssetAggregate.ads),
+                func.sum(CreativeAssetAggregate.clicks),
+                func.sum(CreativeAssetAggregate.conversions)
+            ).filter_by(account_id=account_id, asset_type='AD_COMBINATION').one()
             
-            if existing_insights:
-                existing_insights.insight_data = json.dumps(insights_data)
-                existing_insights.updated_at = datetime.utcnow()
-            else:
-                new_insights = CreativeInsight(
+            for asset_type, (insight_type, label) in INSIGHT_TYPES.items():
+                insights_data = _rank_assets(self.db, account_id, asset_type, label)
+                insights_data['generated_at'] = datetime.utcnow().isoformat()
+                insights_data['total_ads_analyzed'] = int(total_ads or 0)
+                
+                # Save or update insights
+                existing_insights = self.db.query(CreativeInsight).filter_by(
                     account_id=account_id,
-                    insight_type='BEST_HEADLINES',
-                    insight_data=json.dumps(insights_data),
-                    total_clicks=sum(ad.clicks for ad in ads),
-                    total_conversions=sum(ad.conversions for ad in ads)
-                )
-                self.db.add(new_insights)
+                    insight_type=insight_type
+                ).first()
+                
+                if existing_insights:
+                    existing_insights.insight_data = json.dumps(insights_data)
+                    existing_insights.total_clicks = int(total_clicks or 0)
+                    existing_insights.total_conversions = float(total_conversions or 0.0)
+                    existing_insights.updated_at = datetime.utcnow()
+                else:
+                    new_insights = CreativeInsight(
+                        account_id=account_id,
+                        insight_type=insight_type,
+                        insight_data=json.dumps(insights_data),
+                        total_clicks=int(total_clicks or 0),
+                        total_conversions=float(total_conversions or 0.0)
+                    )
+                    self.db.add(new_insights)
             
             self.db.commit()
             
@@ -253,6 +338,59 @@ class CreativeDataImporter:
             logger.error(f"Error generating insights: {str(e)}")
 
 
+def _rank_assets(db: Session, account_id: str, asset_type: str, label: str,
+                 top_n: int = TOP_N_INSIGHTS) -> Dict[str, Any]:
+    """Select the top-N assets by CTR, conversions, conversion rate and cost efficiency.
+    
+    Each ranking is an ORDER BY ... LIMIT query, so only the ranked rows are
+    loaded rather than every aggregate (one AD_COMBINATION row per ad).
+    """
+    
+    def entry(row: CreativeAssetAggregate) -> Dict[str, Any]:
+        clicks = row.clicks or 0
+        impressions = row.impressions or 0
+        conversions = row.conversions or 0.0
+        cost = row.cost or 0.0
+        return {
+            label: json.loads(row.asset_text) if row.asset_type == 'AD_COMBINATION' else row.asset_text,
+            'ctr': (clicks / impressions) * 100 if impressions > 0 else 0,
+            'conversion_rate': (conversions / clicks) * 100 if clicks > 0 else 0,
+            'cost_per_conversion': cost / conversions if conversions > 0 else None,
+            'clicks': clicks,
+            'impressions': impressions,
+            'conversions': conversions,
+            'cost': cost,
+            'ads_used_in': row.ads or 0
+        }
+    
+    def top(condition, order) -> List[Dict[str, Any]]:
+        rows = db.query(CreativeAssetAggregate).filter(
+            CreativeAssetAggregate.account_id == account_id,
+            CreativeAssetAggregate.asset_type == asset_type,
+            condition
+        ).order_by(order, CreativeAssetAggregate.id).limit(top_n).all()
+        return [entry(row) for row in rows]
+    
+    clicks = CreativeAssetAggregate.clicks
+    impressions = CreativeAssetAggregate.impressions
+    conversions = CreativeAssetAggregate.conversions
+    unique = db.query(func.count(CreativeAssetAggregate.id)).filter_by(
+        account_id=account_id, asset_type=asset_type
+    ).scalar()
+    
+    plural = f"{label}s" if label != 'ad' else 'ads'
+    return {
+        # * 1.0 keeps SQLite from doing integer division
+        f'top_{plural}_by_ctr': top(impressions > 0, (clicks * 1.0 / impressions).desc()),
+        f'top_{plural}_by_conversions': top(conversions > 0, conversions.desc()),
+        f'top_{plural}_by_conversion_rate': top(clicks > 0, (conversions / clicks).desc()),
+        f'top_{plural}_by_cost_efficiency': top(
+            conversions > 0, (func.coalesce(CreativeAssetAggregate.cost, 0.0) / conversions).asc()
+        ),
+        f'unique_{plural}': int(unique or 0)
+    }
+
+
 def get_creative_insights(db: Session, account_id: str, insight_type: str = None) -> Dict[str, Any]:
     """Get creative insights for an account"""
     query = db.query(CreativeInsight).filter_by(account_id=account_id)
@@ -1,31 +1,76 @@
 """
 MCP Client Fixed - Uses exact format from working Postman requests
-Direct tools/call without session initialization
+Tool calls are spread over a pool of initialized MCP sessions
 """
 
 import aiohttp
+import asyncio
 import json
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from api_metrics import observe_mcp_tool
+from tracing import inject_headers, start_span
+from .mcp_inprocess import InProcessMCPTransport
+
 logger = logging.getLogger(__name__)
 
+# Session pool tuning (FastMCP handles requests of one session in order, so
+# parallel tool calls need several sessions to actually run in parallel)
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "4"))
+MCP_SESSION_CONCURRENCY = int(os.getenv("MCP_SESSION_CONCURRENCY", "2"))
+MCP_HEALTH_CHECK_INTERVAL = float(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "60"))
+
+# "http" (default, split deployments) or "inprocess" (backend and mcp-backend co-located)
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "http").lower()
+
+
+class MCPSession:
+    """One initialized MCP protocol session (mcp-session-id) in the client pool"""
+
+    def __init__(self, index: int, max_concurrency: int):
+        self.index = index
+        self.session_id = None
+        self.initialized = False
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.init_lock = asyncio.Lock()
+        self.in_flight = 0
+        self.last_used = 0.0
+        self.reinitializations = 0
+
+    def invalidate(self):
+        """Forget the server-side session so the next lease re-initializes it"""
+        self.session_id = None
+        self.initialized = False
+        self.reinitializations += 1
+
 
 class MCPClientFixed:
     """
     Fixed MCP Client that matches Postman's working format exactly
-    No session initialization - direct tools/call requests
+    Keeps a pool of initialized MCP sessions with health checks; a session the
+    server no longer knows (e.g. after a restart) is re-initialized transparently
     """
     
-    def __init__(self, base_url: str = None):
+    def __init__(self, base_url: str = None, pool_size: int = MCP_POOL_SIZE,
+                 session_concurrency: int = MCP_SESSION_CONCURRENCY, transport: str = None):
         self.base_url = base_url or os.getenv("MCP_BASE_URL", "https://mia-analytics.ngrok.app")
+        self.transport = (transport or MCP_TRANSPORT).lower()
+        # In-process mode calls the mcp-backend tool functions directly; HTTP stays the default
+        self._inprocess = InProcessMCPTransport() if self.transport == "inprocess" else None
         self.session = None
         self._request_id = 0
-        self._session_id = None
         self._authenticated_user_id = None
-        self._initialized = False
+        self.pool_size = max(1, pool_size)
+        self.session_concurrency = max(1, session_concurrency)
+        self._mcp_sessions: List[MCPSession] = []
         
     def _next_id(self) -> int:
         """Generate next request ID for JSON-RPC"""
@@ -37,11 +82,13 @@ class MCPClientFixed:
         if self.session is None:
             # Create session with cookie handling - use unsafe=True to allow sharing cookies across domains
             cookie_jar = aiohttp.CookieJar(unsafe=True)
+            # Leave room for every pooled session to use all of its slots
+            pool_capacity = self.pool_size * self.session_concurrency
             connector = aiohttp.TCPConnector(
                 keepalive_timeout=600, 
                 enable_cleanup_closed=True,
-                limit=100,
-                limit_per_host=30
+                limit=max(100, pool_capacity),
+                limit_per_host=max(30, pool_capacity)
             )
             timeout = aiohttp.ClientTimeout(total=300, connect=60, sock_read=300)
             
@@ -138,9 +185,82 @@ class MCPClientFixed:
         print(f"[DEBUG] Using hardcoded user ID: {user_id}")
         return self._authenticated_user_id
     
-    async def _initialize_mcp_session(self):
+    def _pick_session(self) -> MCPSession:
+        """Choose the pooled session for the next call, growing the pool up to pool_size"""
+        idle = [s for s in self._mcp_sessions if s.in_flight == 0]
+        if idle:
+            # Prefer sessions that are already initialized
+            return max(idle, key=lambda s: s.initialized)
+
+        if len(self._mcp_sessions) < self.pool_size:
+            mcp_session = MCPSession(len(self._mcp_sessions), self.session_concurrency)
+            self._mcp_sessions.append(mcp_session)
+            return mcp_session
+
+        # Pool is full - least loaded session (waits on its semaphore if saturated)
+        return min(self._mcp_sessions, key=lambda s: s.in_flight)
+
+    @asynccontextmanager
+    async def _lease_session(self, mcp_session: Optional[MCPSession] = None):
+        """Borrow an initialized, healthy session from the pool for one request"""
+        mcp_session = mcp_session or self._pick_session()
+        mcp_session.in_flight += 1
+        try:
+            async with mcp_session.semaphore:
+                await self._ensure_session_ready(mcp_session)
+                yield mcp_session
+        finally:
+            mcp_session.in_flight -= 1
+            mcp_session.last_used = time.monotonic()
+
+    async def _ensure_session_ready(self, mcp_session: MCPSession):
+        """Initialize the session, or health-check it if it has been idle for a while"""
+        async with mcp_session.init_lock:
+            idle_for = time.monotonic() - mcp_session.last_used
+            if mcp_session.initialized and idle_for > MCP_HEALTH_CHECK_INTERVAL:
+                if not await self._ping_session(mcp_session):
+                    print(f"[DEBUG] MCP session #{mcp_session.index} failed health check, re-initializing")
+                    mcp_session.invalidate()
+
+            if not mcp_session.initialized:
+                await self._initialize_mcp_session(mcp_session)
+
+    async def _ping_session(self, mcp_session: MCPSession) -> bool:
+        """MCP ping on an existing session - False if the server no longer knows it"""
+        await self._ensure_session()
+
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json, text/event-stream'
+        }
+        if mcp_session.session_id:
+            headers['mcp-session-id'] = mcp_session.session_id
+        ping_request = {"method": "ping", "jsonrpc": "2.0", "id": self._next_id()}
+
+        try:
+            async with self.session.post(f"{self.base_url}/llm/mcp", json=ping_request,
+                                         headers=headers, timeout=10) as response:
+                await response.read()
+                return response.status == 200
+        except Exception as e:
+            print(f"[DEBUG] MCP ping failed for session #{mcp_session.index}: {e}")
+            return False
+
+    def _on_session_lost(self, mcp_session: MCPSession):
+        """Re-initialize a lost session; the rest of the pool is health-checked on next use"""
+        mcp_session.invalidate()
+        # A lost session usually means the server restarted, so the siblings are suspect too
+        for other in self._mcp_sessions:
+            other.last_used = 0.0
+
+    @staticmethod
+    def _is_unknown_session(status: int, error_text: str) -> bool:
+        """FastMCP answers 404 (or 400 naming the session) for session IDs it has not issued"""
+        return status == 404 or (status == 400 and 'session' in error_text.lower())
+
+    async def _initialize_mcp_session(self, mcp_session: MCPSession):
         """Initialize MCP session with FastMCP protocol"""
-        if self._initialized:
+        if mcp_session.initialized:
             return
 
         await self._ensure_session()
@@ -172,8 +292,8 @@ class MCPClientFixed:
                 # Get session ID from response headers
                 session_id = response.headers.get('mcp-session-id')
                 if session_id:
-                    self._session_id = session_id
-                    print(f"[DEBUG] Got MCP session ID: {session_id}")
+                    mcp_session.session_id = session_id
+                    print(f"[DEBUG] Got MCP session ID for pool session #{mcp_session.index}: {session_id}")
 
                 if response.status == 200:
                     # Parse the initialization response
@@ -186,29 +306,29 @@ class MCPClientFixed:
                                     print(f"[DEBUG] MCP protocol initialized: {data['result']['protocolVersion']}")
 
                                     # Send notifications/initialized to complete the handshake
-                                    await self._send_initialized_notification(url, headers)
+                                    await self._send_initialized_notification(url, headers, mcp_session)
                                     return
                             except:
                                 continue
 
                     # Fallback - mark as initialized if we got a session ID
-                    if self._session_id:
+                    if mcp_session.session_id:
                         # Send notifications/initialized to complete the handshake
-                        await self._send_initialized_notification(url, headers)
-                        print(f"[DEBUG] MCP session initialized with ID: {self._session_id}")
+                        await self._send_initialized_notification(url, headers, mcp_session)
+                        print(f"[DEBUG] MCP session initialized with ID: {mcp_session.session_id}")
                 else:
                     print(f"[DEBUG] MCP initialization failed: {response.status}")
 
         except Exception as e:
             print(f"[ERROR] MCP initialization error: {e}")
 
-    async def _send_initialized_notification(self, url: str, headers: Dict[str, str]):
+    async def _send_initialized_notification(self, url: str, headers: Dict[str, str], mcp_session: MCPSession):
         """Send notifications/initialized to complete MCP handshake"""
         try:
             # Add session ID to headers if available
             notification_headers = headers.copy()
-            if self._session_id:
-                notification_headers['mcp-session-id'] = self._session_id
+            if mcp_session.session_id:
+                notification_headers['mcp-session-id'] = mcp_session.session_id
 
             initialized_notification = {
                 "method": "notifications/initialized",
@@ -218,29 +338,44 @@ class MCPClientFixed:
 
             async with self.session.post(url, json=initialized_notification, headers=notification_headers) as response:
                 if response.status in [200, 202]:  # 202 is also success for notifications
-                    self._initialized = True
+                    mcp_session.initialized = True
                     print(f"[DEBUG] MCP session fully initialized with notifications/initialized")
                 else:
                     print(f"[DEBUG] Notification failed: {response.status}")
                     # Still mark as initialized since the main init succeeded
-                    self._initialized = True
+                    mcp_session.initialized = True
 
         except Exception as e:
             print(f"[ERROR] Failed to send notifications/initialized: {e}")
             # Still mark as initialized since the main init succeeded
-            self._initialized = True
+            mcp_session.initialized = True
 
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Call an MCP tool using proper MCP protocol initialization
+        Call an MCP tool through the configured transport.
+        Both transports return the tool's result dict (or None / an error dict).
+        """
+        transport = "inprocess" if self._inprocess is not None else "http"
+        started = time.perf_counter()
+        result = None
+        with start_span(f"mcp.call {tool_name}", kind=SpanKind.CLIENT,
+                        **{"mcp.tool": tool_name, "mcp.transport": transport}) as span:
+            try:
+                if self._inprocess is not None:
+                    result = await self._inprocess.call_tool(tool_name, arguments)
+                else:
+                    result = await self._call_tool_http(tool_name, arguments)
+                return result
+            finally:
+                observe_mcp_tool(tool_name, transport, time.perf_counter() - started, result)
+                if result is None or (isinstance(result, dict) and result.get("success") is False):
+                    span.set_status(Status(StatusCode.ERROR, "tool call failed"))
+
+    async def _call_tool_http(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Call an MCP tool on a pooled, initialized MCP session.
+        Retries once on a fresh session if the server reports the session as unknown.
         """
-        # Ensure MCP session is properly initialized
-        await self._initialize_mcp_session()
-        
-        if not self._initialized:
-            print("[ERROR] MCP session not initialized")
-            return None
-        
         url = f"{self.base_url}/llm/mcp"
         
         # Exact format from Postman screenshots
@@ -254,38 +389,82 @@ class MCPClientFixed:
             "id": self._next_id()
         }
         
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json, text/event-stream'
-        }
-
-        # Add session ID if available (required for FastMCP)
-        if self._session_id:
-            headers['mcp-session-id'] = self._session_id
-        
-        try:
-            print(f"[DEBUG] Calling MCP tool: {tool_name}")
-            print(f"[DEBUG] Request: {json.dumps(request, indent=2)}")
-            print(f"[DEBUG] URL: {url}")
-            print(f"[DEBUG] Headers: {headers}")
-            
-            # Direct request with initialized session - increased timeout for large responses
-            async with self.session.post(url, json=request, headers=headers, timeout=300) as response:
-                print(f"[DEBUG] Response status: {response.status}")
-                
-                if response.status == 200:
-                    return await self._parse_sse_response(response)
-                else:
-                    error_text = await response.text()
-                    print(f"[DEBUG] Error response: {error_text}")
-                    logger.error(f"MCP tool call failed: {response.status} - {error_text}")
+        retry_session = None
+        for attempt in range(2):
+            async with self._lease_session(retry_session) as mcp_session:
+                if not mcp_session.initialized:
+                    print("[ERROR] MCP session not initialized")
                     return None
                 
-        except Exception as e:
-            logger.error(f"MCP tool call error: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+                headers = {
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json, text/event-stream'
+                }
+                # Session ID is required for FastMCP; servers that didn't assign one get no header
+                if mcp_session.session_id:
+                    headers['mcp-session-id'] = mcp_session.session_id
+                # traceparent: mcp-backend's tool span joins this request's trace
+                inject_headers(headers)
+                
+                try:
+                    print(f"[DEBUG] Calling MCP tool: {tool_name} (pool session #{mcp_session.index})")
+                    print(f"[DEBUG] Request: {json.dumps(request, indent=2)}")
+                    print(f"[DEBUG] URL: {url}")
+                    
+                    # Direct request with initialized session - increased timeout for large responses
+                    async with self.session.post(url, json=request, headers=headers, timeout=300) as response:
+                        print(f"[DEBUG] Response status: {response.status}")
+                        
+                        if response.status == 200:
+                            return await self._parse_sse_response(response)
+                        
+                        error_text = await response.text()
+                        if attempt == 0 and self._is_unknown_session(response.status, error_text):
+                            # Server restarted or expired the session - re-initialize and retry
+                            print(f"[DEBUG] MCP server does not know session #{mcp_session.index}, re-initializing")
+                            self._on_session_lost(mcp_session)
+                            retry_session = mcp_session
+                            continue
+                        
+                        print(f"[DEBUG] Error response: {error_text}")
+                        logger.error(f"MCP tool call failed: {response.status} - {error_text}")
+                        return None
+                
+                except aiohttp.ClientConnectionError as e:
+                    # Connection dropped (e.g. server restart mid-call) - retry on a fresh session
+                    logger.error(f"MCP connection error on session #{mcp_session.index}: {e}")
+                    self._on_session_lost(mcp_session)
+                    if attempt == 0:
+                        retry_session = mcp_session
+                        continue
+                    return None
+                except Exception as e:
+                    logger.error(f"MCP tool call error: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    return None
+        
+        return None
+    
+    def pool_status(self) -> Dict[str, Any]:
+        """Snapshot of the MCP session pool for status endpoints"""
+        if self._inprocess is not None:
+            return self._inprocess.status()
+        return {
+            "transport": "http",
+            "pool_size": self.pool_size,
+            "session_concurrency": self.session_concurrency,
+            "sessions": [
+                {
+                    "index": s.index,
+                    "initialized": s.initialized,
+                    "in_flight": s.in_flight,
+                    "reinitializations": s.reinitializations,
+                    "idle_seconds": round(time.monotonic() - s.last_used, 1) if s.last_used else None
+                }
+                for s in self._mcp_sessions
+            ]
+        }
     
     async def _parse_sse_response(self, response) -> Optional[Dict[str, Any]]:
         """Parse Server-Sent Events response from MCP server"""
@@ -497,7 +676,9 @@ class MCPClientFixed:
     async def query_google_ads_data(self, user_id: str, customer_id: Optional[str] = None, 
                                   query_type: str = "campaigns", start_date: Optional[str] = None, 
                                   end_date: Optional[str] = None, dimensions: Optional[List[str]] = None,
-                                  metrics: Optional[List[str]] = None, custom_query: Optional[str] = None) -> Optional[Dict[str, Any]]:
+                                  metrics: Optional[List[str]] = None, custom_query: Optional[str] = None,
+                                  fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                                  order_by: Optional[str] = None, cursor: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Query Google Ads data directly with specific parameters"""
         arguments = {
             "user_id": user_id,
@@ -517,13 +698,16 @@ class MCPClientFixed:
             arguments["metrics"] = metrics
         if custom_query:
             arguments["custom_query"] = custom_query
+        arguments.update(self._page_arguments(fields, limit, order_by, cursor))
         
         return await self.call_tool("query_google_ads_data", arguments)
         
     async def query_ga4_data(self, user_id: str, property_id: Optional[str] = None, 
                            query_type: str = "overview", start_date: Optional[str] = None, 
                            end_date: Optional[str] = None, dimensions: Optional[List[str]] = None,
-                           metrics: Optional[List[str]] = None, filters: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+                           metrics: Optional[List[str]] = None, filters: Optional[Dict] = None,
+                           fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                           order_by: Optional[str] = None, cursor: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Query GA4 data directly with specific parameters"""
         arguments = {
             "user_id": user_id,
@@ -543,9 +727,17 @@ class MCPClientFixed:
             arguments["metrics"] = metrics
         if filters:
             arguments["filters"] = filters
+        arguments.update(self._page_arguments(fields, limit, order_by, cursor))
         
         return await self.call_tool("query_ga4_data", arguments)
     
+    @staticmethod
+    def _page_arguments(fields: Optional[List[str]], limit: Optional[int],
+                        order_by: Optional[str], cursor: Optional[str]) -> Dict[str, Any]:
+        """Projection/pagination arguments understood by the MCP query tools"""
+        arguments = {"fields": fields, "limit": limit, "order_by": order_by, "cursor": cursor}
+        return {k: v for k, v in arguments.items() if v is not None}
+    
     async def get_meta_ads_accounts(self, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Call get_meta_ads_accounts with proper format"""
         # Use authenticated user ID if not provided
@@ -559,9 +751,12 @@ class MCPClientFixed:
     
     async def close(self):
         """Close the session"""
+        if self._inprocess is not None:
+            await self._inprocess.close()
         if self.session:
             await self.session.close()
             self.session = None
+        self._mcp_sessions = []
 
 
 # Singleton instance
@@ -0,0 +1,147 @@
+"""
+In-Process MCP Transport
+Calls the FastMCP tool functions of mcp-backend/main.py directly when backend
+and mcp-backend are deployed side by side, skipping HTTP, JSON-RPC and SSE
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+from typing import Dict, Any, Optional
+
+from mcp_shared import MCP_BACKEND_PATH, import_shared
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessMCPTransport:
+    """
+    Executes MCP tools by calling the mcp-backend tool functions in this process.
+
+    mcp-backend runs on its own thread and event loop, inside its app's
+    lifespan (MCP session manager, analysis job workers), so tool work never
+    runs on backend's loop. Tools return their native result dicts.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.max_concurrency = max_concurrency or int(os.getenv("MCP_INPROCESS_CONCURRENCY", "8"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._module = None
+        self._loop = None
+        self._thread = None
+        self._shutdown = None
+        self._load_lock = threading.Lock()
+        self._calls = 0
+        self._in_flight = 0
+
+    def _load_module(self):
+        """Import mcp-backend/main.py and start its event loop and lifespan (once)"""
+        with self._load_lock:
+            if self._module is not None:
+                if self._thread.is_alive():
+                    return self._module
+                logger.error("mcp-backend event loop stopped; restarting it")
+                self._loop.close()
+                self._module = None
+
+            module = import_shared("main")
+            loop = asyncio.new_event_loop()
+            started = concurrent.futures.Future()
+            thread = threading.Thread(
+                target=loop.run_until_complete, args=(self._serve(module.app, started),),
+                name="mcp-inprocess", daemon=True
+            )
+            thread.start()
+            try:
+                # Raises if the lifespan failed to start
+                started.result()
+            except BaseException:
+                thread.join()
+                loop.close()
+                raise
+
+            print(f"[MCP-INPROCESS] Loaded mcp-backend tools from {module.__file__}")
+            self._loop, self._thread = loop, thread
+            self._module = module
+            return module
+
+    async def _serve(self, app, started: concurrent.futures.Future):
+        """Hold mcp-backend's lifespan open until close(); tool calls run on this loop meanwhile"""
+        self._shutdown = asyncio.Event()
+        try:
+            async with app.router.lifespan_context(app):
+                started.set_result(None)
+                await self._shutdown.wait()
+        except BaseException as e:
+            if not started.done():
+                started.set_exception(e)
+            else:
+                logger.error(f"mcp-backend lifespan failed: {e}")
+
+    def _resolve_tool(self, tool_name: str):
+        """Return the plain async function behind an @mcp.tool() definition"""
+        module = self._load_module()
+        tool = getattr(module, tool_name, None)
+        # FastMCP's decorator returns a tool object wrapping the function in .fn
+        fn = getattr(tool, 'fn', None)
+        if fn is None and asyncio.iscoroutinefunction(tool) and tool.__module__ == module.__name__:
+            fn = tool
+        if tool_name.startswith('_') or not callable(fn):
+            return None
+        return fn
+
+    @staticmethod
+    async def _run_tool(fn, arguments: Dict[str, Any], context: contextvars.Context):
+        # The tool task runs in a copy of the caller's context (trace span, platform priority)
+        task = context.run(asyncio.get_running_loop().create_task, fn(**arguments))
+        return await task
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Call a tool and return its native result (same shape as the parsed HTTP response)"""
+        try:
+            fn = await asyncio.to_thread(self._resolve_tool, tool_name)
+        except Exception as e:
+            logger.error(f"In-process MCP transport unavailable: {e}")
+            return {'error': str(e), 'success': False}
+
+        if fn is None:
+            return {'error': f"Unknown tool: {tool_name}", 'success': False}
+
+        async with self._semaphore:
+            self._in_flight += 1
+            self._calls += 1
+            try:
+                print(f"[DEBUG] Calling MCP tool in-process: {tool_name}")
+                future = asyncio.run_coroutine_threadsafe(
+                    self._run_tool(fn, arguments, contextvars.copy_context()), self._loop
+                )
+                return await asyncio.wrap_future(future)
+            except Exception as e:
+                logger.error(f"In-process MCP tool {tool_name} failed: {e}")
+                return {'error': str(e), 'success': False}
+            finally:
+                self._in_flight -= 1
+
+    async def close(self):
+        """Leave mcp-backend's lifespan (stopping its job workers) and end its event loop"""
+        with self._load_lock:
+            loop, thread, shutdown = self._loop, self._thread, self._shutdown
+            self._module = self._loop = self._thread = self._shutdown = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(shutdown.set)
+        await asyncio.to_thread(thread.join)
+        loop.close()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "transport": "inprocess",
+            "mcp_backend_path": MCP_BACKEND_PATH,
+            "loaded": self._module is not None,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "total_calls": self._calls
+        }
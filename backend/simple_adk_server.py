@@ -9,7 +9,7 @@ FIXED: Removed duplicate OAuth endpoints to prevent session conflicts.
 
 from fastapi import FastAPI, Depends, UploadFile, File, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
@@ -33,12 +33,17 @@ sys.path.append('')
 # Import all models FIRST to register them with Base
 from models.chat import ChatHistory, UserSession
 from models.session import ChatSession
-from models.creative import AdCreative, CreativeInsight
+from models.creative import AdCreative, CreativeInsight, CreativeAssetAggregate
 
 # Then import other modules
 from services.adk_mcp_integration import get_adk_marketing_agent, reset_adk_marketing_agent
 from database import get_db, init_db
+from json_response import OrjsonResponse
+from api_metrics import HTTP_METRICS, MetricsMiddleware, metrics_response
+from tracing import TracingMiddleware, debug_trace, debug_traces, require_traces_token, setup_tracing
+from services.mcp_client_fixed import MCP_TRANSPORT
 from services.creative_import import CreativeDataImporter, get_creative_insights, get_ad_creative_summary
+from services.card_snapshots import card_prewarmer
 
 # Import modular endpoints
 from endpoints import (
@@ -49,6 +54,7 @@ from endpoints import (
     growth_router,
     optimize_router,
     protect_router,
+    snapshot_router,
     static_router
 )
 
@@ -69,8 +75,10 @@ def extract_account_info_from_request(request) -> Dict[str, Any]:
         "deprecated": True
     }
 
+setup_tracing("mia-backend")
+
 # Create FastAPI app
-app = FastAPI(title="MIA Marketing Intelligence Agent - Modular Server")
+app = FastAPI(title="MIA Marketing Intelligence Agent - Modular Server", default_response_class=OrjsonResponse)
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -80,6 +88,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware, metrics=HTTP_METRICS)
+app.add_middleware(TracingMiddleware)
 
 # Include modular routers - AUTHENTICATION IS HANDLED BY auth_router AND meta_auth_router
 app.include_router(auth_router, tags=["auth"])
@@ -90,8 +100,27 @@ app.include_router(creative_router_v2, tags=["creative-v2"])  # Refactored creat
 app.include_router(growth_router, tags=["growth"])
 app.include_router(optimize_router, tags=["optimize"])
 app.include_router(protect_router, tags=["protect"])
+app.include_router(snapshot_router, tags=["snapshots"])
 app.include_router(static_router, tags=["static"])
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
+
+# Recent request traces (X-Trace-Token must match TRACES_TOKEN); a trace's waterfall includes mcp-backend's spans when it runs as a separate service
+@app.get("/debug/traces", include_in_schema=False, dependencies=[Depends(require_traces_token)])
+async def recent_traces(limit: int = 20, min_ms: float = 0.0):
+    return debug_traces(limit=limit, min_ms=min_ms)
+
+@app.get("/debug/traces/{trace_id}", include_in_schema=False, dependencies=[Depends(require_traces_token)])
+async def trace_waterfall(trace_id: str, format: str = "json"):
+    mcp_base_url = None if MCP_TRANSPORT == "inprocess" else os.getenv("MCP_BASE_URL", "https://mia-analytics.ngrok.app")
+    result = await debug_trace(trace_id, mcp_base_url=mcp_base_url)
+    if format == "text":
+        return PlainTextResponse(result["text"])
+    return result
+
 # Global agent instance for proper cleanup
 _global_agent = None
 
@@ -121,10 +150,16 @@ async def test_account_mappings(db: Session = Depends(get_db)):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+@app.on_event("startup")
+async def startup_event():
+    """Schedule off-hours prewarming of the card snapshots"""
+    card_prewarmer.start()
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up resources on server shutdown"""
     global _global_agent
+    await card_prewarmer.stop()
     if _global_agent:
         try:
             await _global_agent.close()
@@ -302,7 +337,7 @@ async def initialize_meta_account_mappings(db: Session):
 
 @app.post("/api/mcp/reset-agent")
 async def reset_mcp_agent():
-    """Manually reset MCP agent to clear cached sessions (for debugging)"""
+    """Manually reset MCP agent and its session pool (debugging only - lost sessions recover automatically)"""
     try:
         await reset_adk_marketing_agent()
         return {"success": True, "message": "MCP agent reset successfully"}
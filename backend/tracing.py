@@ -0,0 +1,61 @@
+"""
+OpenTelemetry tracing for the backend API. Each request opens a server span;
+MCP tool calls, the agent's analysis and Anthropic API calls are child spans,
+and the trace context is sent to mcp-backend in the traceparent header so its
+tool, fetch and analysis spans join the same trace.
+
+The implementation is mcp-backend's mcp_tracing module (loaded from
+MCP_BACKEND_PATH by mcp_shared), so both services share one span buffer,
+exporter setup and middleware; this module only adds merging mcp-backend's
+spans into a waterfall when it runs as a separate service. See mcp_tracing for
+the environment settings, including TRACES_TOKEN which gates /debug/traces.
+"""
+
+from typing import Any, Dict, List, Optional
+import logging
+
+import httpx
+
+from mcp_shared import import_shared
+
+import_shared("mcp_tracing")
+from mcp_tracing import (  # noqa: E402
+    TRACES_TOKEN,
+    TracingMiddleware,
+    debug_traces,
+    inject_headers,
+    require_traces_token,
+    setup_tracing,
+    start_span,
+    trace_buffer,
+    traced,
+    waterfall,
+)
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "TracingMiddleware", "debug_trace", "debug_traces", "inject_headers", "require_traces_token",
+    "setup_tracing", "start_span", "traced",
+]
+
+
+async def _remote_spans(mcp_base_url: str, trace_id: str) -> List[Dict[str, Any]]:
+    try:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(f"{mcp_base_url}/debug/traces/{trace_id}",
+                                        headers={"X-Trace-Token": TRACES_TOKEN or ""})
+        if response.status_code == 200:
+            return response.json().get("spans", [])
+    except (httpx.HTTPError, ValueError) as e:
+        logger.debug(f"mcp-backend spans for {trace_id} unavailable: {e}")
+    return []
+
+
+async def debug_trace(trace_id: str, mcp_base_url: Optional[str] = None) -> Dict[str, Any]:
+    """Waterfall of one trace; with mcp_base_url, mcp-backend's spans of the same trace are merged in"""
+    spans = trace_buffer.get(trace_id)
+    if mcp_base_url:
+        seen = {span["span_id"] for span in spans}
+        spans += [span for span in await _remote_spans(mcp_base_url, trace_id) if span["span_id"] not in seen]
+    return {"trace_id": trace_id, **waterfall(spans)}
@@ -0,0 +1,431 @@
+"""
+Analysis Jobs Module
+Runs long analyses (complete website insights, comprehensive insights, file
+insights, predictions) as background jobs: a submission is stored in SQLite,
+queued by priority and replayed against the app by a small worker pool, so the
+client only holds a connection long enough to get a job id
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+
+from opentelemetry import propagate
+from starlette.routing import Match
+
+from credential_db import TimedConnection
+from mcp_tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", "200"))
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "900"))
+# A successful job is handed to identical submissions for this long after it finished
+JOB_DEDUP_SECONDS = float(os.getenv("JOB_DEDUP_SECONDS", "600"))
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "24"))
+
+# Endpoints that can be submitted as jobs; bind() keeps the ones the app actually serves
+JOB_PATHS = (
+    "/complete-website-insights",
+    "/comprehensive-insights",
+    "/file-insights",
+    "/predict",
+    "/predict-traffic",
+    "/predict-conversions",
+    "/predict-user-segments",
+    "/predict-revenue-impact",
+    "/predict-seasonal-trends",
+)
+
+PRIORITIES = {"high": 0, "normal": 5, "low": 9}
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+
+class JobQueueFull(Exception):
+    """Raised when JOB_QUEUE_LIMIT jobs are already waiting"""
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp else None
+
+
+async def submission_key(path: str, content_type: str, body: bytes, form=None) -> str:
+    """
+    Identity of a submission. Form fields and uploaded files are hashed after
+    parsing, so the random multipart boundary doesn't make equal uploads differ.
+    """
+    digest = hashlib.sha256(path.encode())
+    if form is not None:
+        for name, value in sorted(form.multi_items(), key=lambda item: item[0]):
+            digest.update(b"\0" + name.encode() + b"\0")
+            if isinstance(value, str):
+                digest.update(value.encode())
+            else:
+                digest.update((value.filename or "").encode() + b"\0")
+                digest.update(hashlib.sha256(await value.read()).digest())
+        return digest.hexdigest()
+    if content_type.startswith("application/json"):
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+        except ValueError:
+            pass
+    digest.update(b"\0" + body)
+    return digest.hexdigest()
+
+
+class JobStore:
+    """The jobs table; request bodies are kept until the job finishes so queued work survives a restart"""
+
+    def __init__(self, db_path: str = JOBS_DB_PATH):
+        self.db_path = db_path
+        self._init_database()
+
+    def _init_database(self):
+        with sqlite3.connect(self.db_path, factory=TimedConnection) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_jobs (
+                    id TEXT PRIMARY KEY,
+                    dedup_key TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    content_type TEXT,
+                    request_body BLOB,
+                    status_code INTEGER,
+                    result_type TEXT,
+                    result BLOB,
+                    error TEXT,
+                    submitted_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_jobs_dedup ON analysis_jobs (dedup_key, status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_jobs_finished ON analysis_jobs (finished_at)")
+            conn.commit()
+
+    @contextmanager
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def insert(self, job_id: str, dedup_key: str, path: str, priority: int, content_type: str, body: bytes):
+        with self.get_connection() as conn:
+            conn.execute("""
+                INSERT INTO analysis_jobs (id, dedup_key, path, priority, status, content_type, request_body, submitted_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (job_id, dedup_key, path, priority, QUEUED, content_type, body, time.time()))
+            conn.commit()
+
+    def find_reusable(self, dedup_key: str) -> Optional[sqlite3.Row]:
+        """A queued or running job with this key, else one that succeeded within JOB_DEDUP_SECONDS"""
+        with self.get_connection() as conn:
+            return conn.execute("""
+                SELECT id, status FROM analysis_jobs
+                WHERE dedup_key = ? AND (status IN (?, ?) OR (status = ? AND finished_at >= ?))
+                ORDER BY submitted_at DESC LIMIT 1
+            """, (dedup_key, QUEUED, RUNNING, SUCCEEDED, time.time() - JOB_DEDUP_SECONDS)).fetchone()
+
+    def get(self, job_id: str, with_result: bool = False) -> Optional[sqlite3.Row]:
+        columns = "*" if with_result else (
+            "id, path, priority, status, status_code, error, submitted_at, started_at, finished_at"
+        )
+        with self.get_connection() as conn:
+            return conn.execute(f"SELECT {columns} FROM analysis_jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def list(self, limit: int = 50) -> List[sqlite3.Row]:
+        with self.get_connection() as conn:
+            return conn.execute("""
+                SELECT id, path, priority, status, status_code, error, submitted_at, started_at, finished_at
+                FROM analysis_jobs ORDER BY submitted_at DESC LIMIT ?
+            """, (limit,)).fetchall()
+
+    def mark_running(self, job_id: str) -> bool:
+        with self.get_connection() as conn:
+            cursor = conn.execute("UPDATE analysis_jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+                                  (RUNNING, time.time(), job_id, QUEUED))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    def finish(self, job_id: str, status: str, status_code: Optional[int] = None, result_type: Optional[str] = None,
+               result: Optional[bytes] = None, error: Optional[str] = None):
+        with self.get_connection() as conn:
+            conn.execute("""
+                UPDATE analysis_jobs
+                SET status = ?, status_code = ?, result_type = ?, result = ?, error = ?, finished_at = ?,
+                    request_body = NULL
+                WHERE id = ?
+            """, (status, status_code, result_type, result, error, time.time(), job_id))
+            conn.commit()
+
+    def requeue_unfinished(self) -> List[Tuple[int, str]]:
+        """Jobs a previous process queued or was running, reset to queued, in submission order"""
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT id, priority FROM analysis_jobs
+                WHERE status IN (?, ?) AND request_body IS NOT NULL ORDER BY submitted_at
+            """, (QUEUED, RUNNING)).fetchall()
+            conn.execute("UPDATE analysis_jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING))
+            conn.commit()
+        return [(row["priority"], row["id"]) for row in rows]
+
+    def purge(self, older_than: float) -> int:
+        with self.get_connection() as conn:
+            cursor = conn.execute("DELETE FROM analysis_jobs WHERE finished_at < ?", (older_than,))
+            conn.commit()
+            return cursor.rowcount
+
+
+def describe(row: sqlite3.Row) -> Dict[str, Any]:
+    """Public view of a job row"""
+    job = {
+        "job_id": row["id"],
+        "path": row["path"],
+        "status": row["status"],
+        "priority": row["priority"],
+        "submitted_at": _iso(row["submitted_at"]),
+        "started_at": _iso(row["started_at"]),
+        "finished_at": _iso(row["finished_at"]),
+        "status_url": f"/jobs/{row['id']}",
+        "events_url": f"/jobs/{row['id']}/events",
+    }
+    if row["status"] in FINISHED:
+        job["status_code"] = row["status_code"]
+        job["error"] = row["error"]
+        job["result_url"] = f"/jobs/{row['id']}/result"
+    return job
+
+
+class AnalysisJobManager:
+    """
+    Priority queue of job ids drained by JOB_WORKERS asyncio workers. A job is
+    run by replaying its stored request against the ASGI app, so the analysis
+    code and its response are exactly those of the synchronous endpoint.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, workers: int = JOB_WORKERS,
+                 queue_limit: int = JOB_QUEUE_LIMIT, timeout: float = JOB_TIMEOUT):
+        self._store = store
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._app = None
+        self.paths: Tuple[str, ...] = ()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._sequence = itertools.count()
+        self._watchers: Dict[str, Set[asyncio.Queue]] = {}
+        self._running = 0
+        self._submitted = 0
+        self._deduplicated = 0
+        self._rejected = 0
+        self._succeeded = 0
+        self._failed = 0
+
+    @property
+    def store(self) -> JobStore:
+        if self._store is None:
+            self._store = JobStore()
+        return self._store
+
+    def bind(self, app):
+        """The ASGI app jobs are replayed against; call it once the routers are included"""
+        self._app = app
+        self.paths = tuple(path for path in JOB_PATHS if _serves_post(app, path))
+        unmounted = sorted(set(JOB_PATHS) - set(self.paths))
+        if unmounted:
+            logger.info(f"Not accepting jobs for unmounted endpoints: {', '.join(unmounted)}")
+
+    def start(self):
+        """Start the workers on the running loop and requeue jobs left over from a previous process"""
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        removed = self.store.purge(time.time() - JOB_RETENTION_HOURS * 3600)
+        resumed = self.store.requeue_unfinished()
+        for priority, job_id in resumed:
+            self._queue.put_nowait((priority, next(self._sequence), job_id))
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Analysis jobs: {self.workers} workers started, {len(resumed)} jobs resumed, {removed} purged")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, path: str, content_type: str, body: bytes, dedup_key: str,
+                     priority: int = PRIORITIES["normal"]) -> Tuple[Dict[str, Any], bool]:
+        """Queue a request for `path`, or return the job an identical submission already has"""
+        self.start()
+        existing = self.store.find_reusable(dedup_key)
+        if existing is not None:
+            self._deduplicated += 1
+            return describe(self.store.get(existing["id"])), True
+        if self._queue.qsize() >= self.queue_limit:
+            self._rejected += 1
+            raise JobQueueFull(f"{self._queue.qsize()} analysis jobs are already queued")
+        job_id = uuid.uuid4().hex
+        self.store.insert(job_id, dedup_key, path, priority, content_type, body)
+        self._queue.put_nowait((priority, next(self._sequence), job_id))
+        self._submitted += 1
+        return describe(self.store.get(job_id)), False
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self.store.get(job_id)
+        return describe(row) if row is not None else None
+
+    def result(self, job_id: str) -> Optional[sqlite3.Row]:
+        return self.store.get(job_id, with_result=True)
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return [describe(row) for row in self.store.list(limit)]
+
+    @contextmanager
+    def watch(self, job_id: str):
+        """A queue receiving the job's status every time it changes"""
+        updates: asyncio.Queue = asyncio.Queue()
+        self._watchers.setdefault(job_id, set()).add(updates)
+        try:
+            yield updates
+        finally:
+            watchers = self._watchers.get(job_id)
+            if watchers is not None:
+                watchers.discard(updates)
+                if not watchers:
+                    del self._watchers[job_id]
+
+    def _notify(self, job_id: str):
+        watchers = self._watchers.get(job_id)
+        if not watchers:
+            return
+        job = self.get(job_id)
+        for updates in watchers:
+            updates.put_nowait(job)
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Analysis job {job_id} could not be recorded: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        if not self.store.mark_running(job_id):
+            return
+        self._running += 1
+        self._notify(job_id)
+        job = self.store.get(job_id, with_result=True)
+        try:
+            with start_span("analysis_job", job_id=job_id, path=job["path"]):
+                status_code, result_type, result = await asyncio.wait_for(
+                    self._replay(job_id, job["path"], job["content_type"], job["request_body"]), self.timeout
+                )
+        except asyncio.TimeoutError:
+            self._finish(job_id, FAILED, error=f"Job exceeded JOB_TIMEOUT ({self.timeout:.0f}s)")
+        except Exception as e:
+            logger.error(f"Analysis job {job_id} ({job['path']}) failed: {e}")
+            self._finish(job_id, FAILED, error=str(e))
+        else:
+            status = SUCCEEDED if 200 <= status_code < 300 else FAILED
+            error = None if status == SUCCEEDED else f"{job['path']} returned HTTP {status_code}"
+            self._finish(job_id, status, status_code, result_type, result, error)
+        finally:
+            self._running -= 1
+
+    def _finish(self, job_id: str, status: str, status_code: Optional[int] = None, result_type: Optional[str] = None,
+                result: Optional[bytes] = None, error: Optional[str] = None):
+        self.store.finish(job_id, status, status_code, result_type, result, error)
+        if status == SUCCEEDED:
+            self._succeeded += 1
+        else:
+            self._failed += 1
+        self._notify(job_id)
+
+    async def _replay(self, job_id: str, path: str, content_type: str, body: bytes) -> Tuple[int, str, bytes]:
+        """Send the stored request through the app and collect its response"""
+        if self._app is None:
+            raise RuntimeError("No app bound to the analysis job manager")
+        carrier: Dict[str, str] = {}
+        propagate.inject(carrier)
+        headers = [(b"content-type", (content_type or "").encode()), (b"content-length", str(len(body)).encode()),
+                   (b"x-analysis-job", job_id.encode())]
+        headers += [(key.encode(), value.encode()) for key, value in carrier.items()]
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+            "headers": headers, "client": ("analysis-job", 0), "server": ("localhost", 80),
+        }
+        response_done = asyncio.Event()
+        body_sent = False
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        status_code, result_type, chunks = 500, "application/json", []
+
+        async def send(message):
+            nonlocal status_code, result_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for key, value in message.get("headers", []):
+                    if key.lower() == b"content-type":
+                        result_type = value.decode()
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        try:
+            await self._app(scope, receive, send)
+        finally:
+            response_done.set()
+        return status_code, result_type, b"".join(chunks)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "submitted": self._submitted,
+            "deduplicated": self._deduplicated,
+            "rejected": self._rejected,
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+        }
+
+
+def _serves_post(app, path: str) -> bool:
+    """Whether a route of `app` fully matches POST `path` (included routers are matched too)"""
+    scope = {"type": "http", "method": "POST", "path": path, "root_path": ""}
+    return any(route.matches(scope)[0] == Match.FULL for route in app.routes)
+
+
+# Shared instance used by routes/jobs.py and main.py
+analysis_jobs = AnalysisJobManager()
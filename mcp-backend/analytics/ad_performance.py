@@ -4,33 +4,23 @@ Analyzes advertising performance across platforms
 """
 
 import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import logging
 
+from analytics.metrics_frame import MetricsFrame
+from analytics.analysis_cache import memoize
+
 logger = logging.getLogger(__name__)
 
 class AdPerformanceAnalyzer:
     """Analyzes advertising performance and generates insights"""
     
-    def __init__(self, ad_data: pd.DataFrame):
-        self.ad_data = ad_data.copy()
-        self._prepare_data()
-    
-    def _prepare_data(self):
-        """Prepare data with calculated metrics"""
-        if self.ad_data.empty:
-            return
-        
-        # Calculate performance metrics
-        self.ad_data['roas'] = self.ad_data['conversions'] / (self.ad_data['spend'] + 0.001)
-        self.ad_data['cost_per_conversion'] = self.ad_data['spend'] / (self.ad_data['conversions'] + 0.001)
-        self.ad_data['conversion_rate'] = self.ad_data['conversions'] / (self.ad_data['clicks'] + 0.001)
-        
-        # Clean infinite and NaN values
-        numeric_cols = ['roas', 'cost_per_conversion', 'conversion_rate']
-        for col in numeric_cols:
-            self.ad_data[col] = self.ad_data[col].replace([float('inf'), float('-inf')], 0).fillna(0)
+    def __init__(self, ad_data: Union[pd.DataFrame, MetricsFrame]):
+        self.metrics = MetricsFrame.of(ad_data)
+        # Row-level data with roas, cost_per_conversion and conversion_rate
+        self.ad_data = self.metrics.frame
     
+    @memoize(state=('metrics',))
     def analyze_performance(self) -> Dict[str, Any]:
         """Comprehensive performance analysis"""
         if self.ad_data.empty:
@@ -61,17 +51,9 @@ class AdPerformanceAnalyzer:
         if 'source' not in self.ad_data.columns:
             return {}
         
-        platform_stats = self.ad_data.groupby('source').agg({
-            'spend': 'sum',
-            'conversions': 'sum',
-            'clicks': 'sum',
-            'impressions': 'sum',
-            'ctr': 'mean',
-            'cpc': 'mean'
-        }).round(4)
-        
-        # Calculate platform ROAS
-        platform_stats['roas'] = (platform_stats['conversions'] / (platform_stats['spend'] + 0.001)).round(4)
+        platform_stats = self.metrics.grouped('source')[
+            ['spend', 'conversions', 'clicks', 'impressions', 'ctr', 'cpc', 'roas']
+        ].round(4)
         
         return platform_stats.to_dict('index')
     
@@ -83,7 +65,7 @@ class AdPerformanceAnalyzer:
         for metric in metrics:
             if metric in self.ad_data.columns:
                 # Get top performers for this metric
-                top_threshold = self.ad_data[metric].quantile(0.9)
+                top_threshold = self.metrics.quantile(metric, 0.9)
                 top_ads = self.ad_data[self.ad_data[metric] >= top_threshold]
                 
                 # Select relevant columns and convert to records
@@ -102,7 +84,8 @@ class AdPerformanceAnalyzer:
         metrics = ['ctr', 'roas', 'conversion_rate']
         
         # Filter to ads with significant spend
-        significant_spend = self.ad_data[self.ad_data['spend'] >= min_spend]
+        significant = self.metrics.with_min_spend(min_spend)
+        significant_spend = significant.frame
         
         if significant_spend.empty:
             return bottom_performers
@@ -110,7 +93,7 @@ class AdPerformanceAnalyzer:
         for metric in metrics:
             if metric in significant_spend.columns:
                 # Get bottom performers for this metric
-                bottom_threshold = significant_spend[metric].quantile(0.1)
+                bottom_threshold = significant.quantile(metric, 0.1)
                 bottom_ads = significant_spend[significant_spend[metric] <= bottom_threshold]
                 
                 # Select relevant columns and convert to records
@@ -128,42 +111,35 @@ class AdPerformanceAnalyzer:
         if 'campaign_name' not in self.ad_data.columns:
             return {}
         
-        campaign_summary = self.ad_data.groupby('campaign_name').agg({
-            'impressions': 'sum',
-            'clicks': 'sum',
-            'spend': 'sum',
-            'conversions': 'sum',
-            'ctr': 'mean',
-            'cpc': 'mean',
-            'cpm': 'mean'
-        }).round(4)
-        
-        # Calculate campaign-level ROAS and conversion rate
-        campaign_summary['roas'] = (campaign_summary['conversions'] / (campaign_summary['spend'] + 0.001)).round(4)
-        campaign_summary['conversion_rate'] = (campaign_summary['conversions'] / (campaign_summary['clicks'] + 0.001)).round(4)
+        # Campaign-level ROAS and conversion rate are ratios of the campaign totals
+        campaign_summary = self.metrics.grouped('campaign')[
+            ['impressions', 'clicks', 'spend', 'conversions', 'ctr', 'cpc', 'cpm', 'roas', 'conversion_rate']
+        ].round(4)
         
         return campaign_summary.to_dict('index')
 
 class CampaignComparator:
     """Compares campaign performance side by side"""
     
-    def __init__(self, ad_data: pd.DataFrame):
-        self.ad_data = ad_data
+    def __init__(self, ad_data: Union[pd.DataFrame, MetricsFrame]):
+        self.metrics = MetricsFrame.of(ad_data)
+        self.ad_data = self.metrics.raw
     
+    @memoize(state=('metrics',))
     def compare_campaigns(self, campaign_list: List[str] = None) -> Dict[str, Any]:
         """Compare specific campaigns or all campaigns"""
         if self.ad_data.empty or 'campaign_name' not in self.ad_data.columns:
             return {"error": "No campaign data available"}
         
         # Filter to specific campaigns if provided
-        data = self.ad_data
+        metrics = self.metrics
         if campaign_list:
-            data = data[data['campaign_name'].isin(campaign_list)]
+            metrics = MetricsFrame(self.ad_data[self.ad_data['campaign_name'].isin(campaign_list)])
         
-        if data.empty:
+        if metrics.empty:
             return {"error": "No matching campaigns found"}
         
-        campaign_metrics = self._calculate_campaign_metrics(data)
+        campaign_metrics = self._calculate_campaign_metrics(metrics)
         rankings = self._rank_campaigns(campaign_metrics)
         
         return {
@@ -172,24 +148,14 @@ class CampaignComparator:
             "total_campaigns": len(campaign_metrics)
         }
     
-    def _calculate_campaign_metrics(self, data: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    def _calculate_campaign_metrics(self, metrics: MetricsFrame) -> Dict[str, Dict[str, float]]:
         """Calculate metrics for each campaign"""
-        metrics = data.groupby('campaign_name').agg({
-            'impressions': 'sum',
-            'clicks': 'sum',
-            'spend': 'sum',
-            'conversions': 'sum',
-            'ctr': 'mean',
-            'cpc': 'mean',
-            'cpm': 'mean'
-        }).round(4)
-        
-        # Calculate additional metrics
-        metrics['roas'] = (metrics['conversions'] / (metrics['spend'] + 0.001)).round(4)
-        metrics['conversion_rate'] = (metrics['conversions'] / (metrics['clicks'] + 0.001)).round(4)
-        metrics['cost_per_conversion'] = (metrics['spend'] / (metrics['conversions'] + 0.001)).round(4)
-        
-        return metrics.to_dict('index')
+        campaign_metrics = metrics.grouped('campaign')[
+            ['impressions', 'clicks', 'spend', 'conversions', 'ctr', 'cpc', 'cpm',
+             'roas', 'conversion_rate', 'cost_per_conversion']
+        ].round(4)
+        
+        return campaign_metrics.to_dict('index')
     
     def _rank_campaigns(self, campaign_metrics: Dict[str, Dict[str, float]]) -> Dict[str, List[str]]:
         """Rank campaigns by different metrics"""
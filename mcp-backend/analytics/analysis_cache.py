@@ -0,0 +1,216 @@
+"""
+Analysis Cache Module
+Memoizes pure analysis functions by a content fingerprint of their input
+frames plus their parameters, so repeated dashboard panels over identical data
+cost a hash and a lookup instead of a recomputation
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "512"))
+ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+class Unfingerprintable(TypeError):
+    """Raised for arguments that have no stable content fingerprint; the call is not cached"""
+
+
+def _hash_values(value: Any) -> bytes:
+    try:
+        return pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes()
+    except TypeError as e:
+        # Unhashable cell values (lists, dicts) in object columns
+        raise Unfingerprintable(str(e))
+
+
+def frame_fingerprint(value: Any) -> str:
+    """
+    Content hash of a DataFrame/Series/ndarray: shape, column names, dtypes
+    and values (vectorized via pandas' row hashing), so equal data from
+    different requests maps to the same key.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((value.shape, [str(col) for col in value.columns],
+                            [str(dtype) for dtype in value.dtypes])).encode())
+        # hash_pandas_object combines the columns' values but not their names
+        digest.update(_hash_values(value))
+    elif isinstance(value, pd.Series):
+        digest.update(repr((value.shape, str(value.name), str(value.dtype))).encode())
+        digest.update(_hash_values(value))
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.shape, str(value.dtype))).encode())
+        digest.update(np.ascontiguousarray(value).tobytes() if value.dtype != object else pickle.dumps(value))
+    else:
+        raise Unfingerprintable(type(value).__name__)
+    return digest.hexdigest()
+
+
+def _fingerprint_value(value: Any) -> str:
+    if value is None or isinstance(value, (bool, str)):
+        return repr(value)
+    if isinstance(value, (int, float, np.number)):
+        # min_spend=100 and min_spend=100.0 give the same result
+        return repr(float(value))
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return frame_fingerprint(value)
+    if callable(getattr(value, "fingerprint", None)):
+        # e.g. MetricsFrame, which memoizes the fingerprint of its read-only data
+        return value.fingerprint()
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_fingerprint_value(item) for item in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{key!r}:{_fingerprint_value(item)}" for key, item in sorted(value.items(), key=lambda kv: repr(kv[0]))) + "}"
+    raise Unfingerprintable(type(value).__name__)
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU of analysis results bounded by entry count and by total
+    size. Results are stored pickled, so every hit returns a fresh copy that
+    callers are free to modify.
+    """
+
+    def __init__(self, max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES, max_bytes: int = ANALYSIS_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(found, value)"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return True, pickle.loads(payload)
+
+    def set(self, key: str, value: Any):
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Not caching unpicklable analysis result: {e}")
+            return
+        if len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = payload
+            self._bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Shared instance used by all memoized analysis functions in this process
+analysis_cache = AnalysisCache()
+
+
+def memoize(fn: Optional[Callable] = None, *, state: Sequence[str] = ()) -> Callable:
+    """
+    Cache a pure analysis function in analysis_cache.
+
+    The key is the function's qualified name plus fingerprints of its
+    arguments after binding them to the signature (so defaults, positional and
+    keyword forms share a key): DataFrames/Series/arrays by content,
+    MetricsFrames via fingerprint(), scalars and lists by value. Calls with any
+    other argument type simply run uncached. For methods, pass the instance
+    attributes the result depends on, e.g. @memoize(state=('metrics', 'min_spend')).
+
+    The wrapper keeps @offloadable working: compute_executor looks the result
+    up in the parent process with cache_lookup()/cache_store() and runs the
+    unwrapped function in the worker.
+    """
+    def decorator(fn: Callable) -> Callable:
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        signature = inspect.signature(fn)
+
+        def make_key(args: tuple, kwargs: dict) -> Optional[str]:
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                return None
+            bound.apply_defaults()
+            arguments = list(bound.arguments.items())
+            try:
+                parts = []
+                if state:
+                    (_, instance), arguments = arguments[0], arguments[1:]
+                    parts += [f"self.{attr}={_fingerprint_value(getattr(instance, attr, None))}" for attr in state]
+                parts += [f"{key}={_fingerprint_value(value)}" for key, value in arguments]
+            except Unfingerprintable:
+                return None
+            return hashlib.blake2b(f"{name}({','.join(parts)})".encode(), digest_size=16).hexdigest()
+
+        def cache_lookup(args: tuple, kwargs: dict) -> Tuple[Optional[str], bool, Any]:
+            """(key, found, value); key is None when the call can't be cached"""
+            if not ANALYSIS_CACHE_ENABLED:
+                return None, False, None
+            key = make_key(args, kwargs)
+            if key is None:
+                return None, False, None
+            found, value = analysis_cache.get(key)
+            return key, found, value
+
+        def cache_store(key: Optional[str], value: Any):
+            if key is not None:
+                analysis_cache.set(key, value)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key, found, value = cache_lookup(args, kwargs)
+            if found:
+                return value
+            result = fn(*args, **kwargs)
+            cache_store(key, result)
+            return result
+
+        wrapper.__memoized__ = True
+        wrapper.cache_lookup = cache_lookup
+        wrapper.cache_store = cache_store
+        return wrapper
+
+    return decorator(fn) if fn is not None else decorator
@@ -0,0 +1,200 @@
+"""
+Forecasting Module
+Batched trend + weekly seasonality forecasts for many metrics and accounts at once
+"""
+
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional
+import logging
+
+from analytics.analysis_cache import memoize
+
+logger = logging.getLogger(__name__)
+
+# Intercept, linear trend and six day-of-week offsets (Monday is the baseline)
+N_PARAMS = 8
+RIDGE = 1e-6
+
+
+def _design_matrix(day_index: np.ndarray, day_of_week: np.ndarray) -> np.ndarray:
+    """Rows of [1, t, is_tue, ..., is_sun] for the given days"""
+    X = np.zeros((len(day_index), N_PARAMS))
+    X[:, 0] = 1.0
+    X[:, 1] = day_index
+    weekday = np.asarray(day_of_week)
+    rows = np.nonzero(weekday > 0)[0]
+    X[rows, 1 + weekday[rows]] = 1.0
+    return X
+
+
+def daily_series(data: pd.DataFrame, metrics: List[str], date_col: str = 'date',
+                 group_col: Optional[str] = None) -> pd.DataFrame:
+    """
+    Pivot long platform data into one column per series with a daily DatetimeIndex.
+    With group_col the columns are a (group, metric) MultiIndex, one series per account.
+    """
+    keys = [pd.to_datetime(data[date_col]).dt.normalize().rename(date_col)]
+    if group_col:
+        keys.append(data[group_col])
+
+    daily = data[metrics].apply(pd.to_numeric, errors='coerce').groupby(keys).sum()
+    if group_col:
+        daily = daily.unstack(group_col).swaplevel(axis=1).sort_index(axis=1)
+    return daily.sort_index()
+
+
+class WeeklyTrendModel:
+    """
+    Linear trend plus additive day-of-week effects, fitted for every column of a
+    daily frame in one batched least-squares solve. Missing values (NaN) are
+    excluded per series, so accounts with different histories can share a frame.
+
+    Only the normal-equation sums are kept, so new days can be appended with
+    update() and the model can be persisted and restored via get_state()/from_state().
+    """
+
+    def __init__(self, history: pd.DataFrame):
+        if history.empty:
+            raise ValueError("Cannot fit a forecast on empty history")
+
+        history = history.sort_index()
+        self.columns = history.columns
+        self.origin = pd.Timestamp(history.index[0]).normalize()
+        self.last_date = self.origin
+
+        n_series = len(self.columns)
+        self._xtx = np.zeros((n_series, N_PARAMS, N_PARAMS))
+        self._xty = np.zeros((n_series, N_PARAMS))
+        self._yty = np.zeros(n_series)
+        self.n_obs = np.zeros(n_series, dtype=int)
+
+        self._accumulate(history)
+        self._solve()
+
+    def _accumulate(self, history: pd.DataFrame):
+        """Add the rows of a daily frame to the per-series normal-equation sums"""
+        dates = pd.DatetimeIndex(pd.to_datetime(history.index)).normalize()
+        X = _design_matrix((dates - self.origin).days.to_numpy(dtype=float), dates.dayofweek.to_numpy())
+        Y = history.reindex(columns=self.columns).to_numpy(dtype=float)
+        observed = ~np.isnan(Y)
+        Y_obs = np.where(observed, Y, 0.0)
+
+        self._xtx += np.einsum('ns,np,nq->spq', observed.astype(float), X, X)
+        self._xty += np.einsum('ns,np->sp', Y_obs, X)
+        self._yty += (Y_obs ** 2).sum(axis=0)
+        self.n_obs += observed.sum(axis=0)
+        self.last_date = max(self.last_date, dates.max())
+
+    def _solve(self):
+        # Per-series normal equations (series, params, params), solved together
+        xtx = self._xtx + RIDGE * np.eye(N_PARAMS)
+        self.coefficients = np.linalg.solve(xtx, self._xty[..., None])[..., 0]
+        self._xtx_inv = np.linalg.inv(xtx)
+
+        # Residual sum of squares from the sums: y'y - 2b'X'y + b'X'Xb
+        rss = (self._yty
+               - 2 * np.einsum('sp,sp->s', self.coefficients, self._xty)
+               + np.einsum('sp,spq,sq->s', self.coefficients, self._xtx, self.coefficients))
+        dof = self.n_obs - N_PARAMS
+        self.sigma = np.where(dof > 0, np.sqrt(np.maximum(rss, 0.0) / np.maximum(dof, 1)), np.nan)
+
+    def update(self, new_days: pd.DataFrame) -> "WeeklyTrendModel":
+        """Append days after last_date without revisiting the history already fitted"""
+        new_days = new_days[pd.to_datetime(new_days.index).normalize() > self.last_date]
+        if not new_days.empty:
+            self._accumulate(new_days.sort_index())
+            self._solve()
+        return self
+
+    def get_state(self) -> Dict[str, Any]:
+        """Arrays and metadata needed to restore the fitted model"""
+        return {
+            "origin": self.origin.isoformat(),
+            "last_date": self.last_date.isoformat(),
+            "columns": [list(col) if isinstance(col, tuple) else col for col in self.columns],
+            "column_names": list(self.columns.names),
+            "xtx": self._xtx.copy(),
+            "xty": self._xty.copy(),
+            "yty": self._yty.copy(),
+            "n_obs": self.n_obs.copy()
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "WeeklyTrendModel":
+        model = cls.__new__(cls)
+        if state["column_names"] and len(state["column_names"]) > 1:
+            model.columns = pd.MultiIndex.from_tuples([tuple(col) for col in state["columns"]],
+                                                      names=state["column_names"])
+        else:
+            model.columns = pd.Index(state["columns"], name=state["column_names"][0] if state["column_names"] else None)
+        model.origin = pd.Timestamp(state["origin"])
+        model.last_date = pd.Timestamp(state["last_date"])
+        # Copies: update() adds into these in place, and the state may be the registry's cached one
+        model._xtx = np.array(state["xtx"], dtype=float, copy=True)
+        model._xty = np.array(state["xty"], dtype=float, copy=True)
+        model._yty = np.array(state["yty"], dtype=float, copy=True)
+        model.n_obs = np.array(state["n_obs"], dtype=int, copy=True)
+        model._solve()
+        return model
+
+    @property
+    def trend_slope(self) -> pd.Series:
+        """Daily change of each series after removing the weekly pattern"""
+        return pd.Series(self.coefficients[:, 1], index=self.columns)
+
+    @property
+    def weekly_profile(self) -> pd.DataFrame:
+        """Expected offset from Monday for each weekday (rows 0=Monday .. 6=Sunday)"""
+        profile = np.vstack([np.zeros(len(self.columns)), self.coefficients[:, 2:].T])
+        return pd.DataFrame(profile, index=range(7), columns=self.columns)
+
+    def forecast(self, horizon: int, interval: float = 0.8, non_negative: bool = True) -> Dict[str, pd.DataFrame]:
+        """
+        Forecast every series for the next `horizon` days.
+
+        Returns "mean", "lower" and "upper" frames indexed by forecast date, with
+        lower/upper bounding a central prediction interval of the given coverage.
+        """
+        future = pd.date_range(self.last_date + pd.Timedelta(days=1), periods=horizon, freq='D')
+        X_future = _design_matrix((future - self.origin).days.to_numpy(dtype=float), future.dayofweek.to_numpy())
+
+        mean = X_future @ self.coefficients.T
+        leverage = np.einsum('hp,spq,hq->hs', X_future, self._xtx_inv, X_future)
+        spread = NormalDist().inv_cdf(0.5 + interval / 2) * self.sigma[None, :] * np.sqrt(1.0 + leverage)
+        lower, upper = mean - spread, mean + spread
+
+        if non_negative:
+            mean, lower, upper = (np.maximum(values, 0.0) for values in (mean, lower, upper))
+
+        return {
+            name: pd.DataFrame(values, index=future, columns=self.columns)
+            for name, values in (("mean", mean), ("lower", lower), ("upper", upper))
+        }
+
+
+@memoize
+def forecast_frame(data: pd.DataFrame, metrics: List[str], horizon: int, date_col: str = 'date',
+                   group_col: Optional[str] = None, interval: float = 0.8) -> pd.DataFrame:
+    """
+    Forecast all metrics (and all groups, e.g. accounts) of a long frame in one fit.
+
+    Returns one row per (group, metric, date) with mean/lower/upper columns, ready
+    to be stored for portfolio-wide reporting.
+    """
+    history = daily_series(data, metrics, date_col=date_col, group_col=group_col)
+    result = WeeklyTrendModel(history).forecast(horizon, interval=interval)
+
+    dates = result["mean"].index
+    n_dates, n_series = result["mean"].shape
+
+    series = history.columns.to_frame(index=False)
+    series.columns = [group_col, 'metric'] if group_col else ['metric']
+    frame = pd.concat([
+        pd.DataFrame({date_col: np.repeat(dates, n_series)}),
+        series.iloc[np.tile(np.arange(n_series), n_dates)].reset_index(drop=True)
+    ], axis=1)
+    for name, values in result.items():
+        frame[name] = values.to_numpy().ravel()
+    return frame
@@ -7,6 +7,8 @@ import pandas as pd
 from typing import Dict, List, Any
 import logging
 
+from analytics.analysis_cache import memoize
+
 logger = logging.getLogger(__name__)
 
 class FunnelOptimizer:
@@ -16,6 +18,7 @@ class FunnelOptimizer:
         self.ga4_data = ga4_data
         self.ad_data = ad_data
     
+    @memoize(state=('ga4_data', 'ad_data'))
     def generate_optimization_plan(self, budget_limit: float = 50) -> Dict[str, Any]:
         """Generate comprehensive optimization plan"""
         if hasattr(self.ga4_data, 'empty') and self.ga4_data.empty:
@@ -7,6 +7,8 @@ import pandas as pd
 from typing import Dict, Any
 import logging
 
+from analytics.analysis_cache import memoize
+
 logger = logging.getLogger(__name__)
 
 class JourneyAnalyzer:
@@ -16,6 +18,7 @@ class JourneyAnalyzer:
         self.ga4_data = ga4_data
         self.ad_data = ad_data
     
+    @memoize(state=('ga4_data', 'ad_data'))
     def analyze_funnel(self) -> Dict[str, Any]:
         """Analyze the complete conversion funnel"""
         if (hasattr(self.ga4_data, 'empty') and self.ga4_data.empty) and (hasattr(self.ad_data, 'empty') and self.ad_data.empty):
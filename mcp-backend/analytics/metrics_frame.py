@@ -0,0 +1,131 @@
+"""
+Metrics Frame Module
+Derived ad metrics and standard groupings, computed once per dataset and shared by all analyzers
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple, Union
+import logging
+
+from analytics.analysis_cache import frame_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Avoids division by zero in per-row and per-group ratios
+EPSILON = 0.001
+
+SUM_COLUMNS = ['impressions', 'clicks', 'spend', 'conversions']
+MEAN_COLUMNS = ['ctr', 'cpc', 'cpm']
+DERIVED_COLUMNS = ['roas', 'cost_per_conversion', 'conversion_rate']
+
+GROUPINGS = {
+    'source': ['source'],
+    'campaign': ['campaign_name'],
+    'source_campaign': ['source', 'campaign_name'],
+    'ad': ['campaign_name', 'ad_name'],
+    'date': ['date']
+}
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    values = numerator / (denominator + EPSILON)
+    return values.replace([np.inf, -np.inf], 0).fillna(0)
+
+
+class MetricsFrame:
+    """
+    Ad-level data plus ROAS, cost per conversion and conversion rate, with the
+    standard groupings (source, campaign, source+campaign, ad, date) computed
+    lazily and memoized, so every analyzer in a request shares one set of
+    aggregations.
+
+    Grouped frames contain, per group:
+    - sums of impressions, clicks, spend and conversions
+    - means of ctr, cpc and cpm
+    - roas / conversion_rate / cost_per_conversion as ratios of the sums
+    - roas_mean / conversion_rate_mean / cost_per_conversion_mean, the mean of the per-row values
+    - rows, the number of rows in the group
+
+    The underlying data is never modified; treat returned frames as read-only.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.raw = data
+        self._frame = None
+        self._groups: Dict[str, pd.DataFrame] = {}
+        self._subsets: Dict[Tuple[float, bool], "MetricsFrame"] = {}
+        self._quantiles: Dict[Tuple[str, float], float] = {}
+        self._fingerprint = None
+
+    @classmethod
+    def of(cls, data: Union[pd.DataFrame, "MetricsFrame"]) -> "MetricsFrame":
+        """Wrap a frame, or pass an existing MetricsFrame through so its memoized results are reused"""
+        return data if isinstance(data, MetricsFrame) else cls(data)
+
+    def fingerprint(self) -> str:
+        """Content hash of the underlying data, computed once; used as the analysis cache key"""
+        if self._fingerprint is None:
+            self._fingerprint = frame_fingerprint(self.raw)
+        return self._fingerprint
+
+    @property
+    def empty(self) -> bool:
+        return self.raw.empty
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Row-level data with the derived metric columns"""
+        if self._frame is None:
+            frame = self.raw.copy(deep=False)
+            if {'conversions', 'spend', 'clicks'}.issubset(frame.columns):
+                frame['roas'] = _ratio(frame['conversions'], frame['spend'])
+                frame['cost_per_conversion'] = _ratio(frame['spend'], frame['conversions'])
+                frame['conversion_rate'] = _ratio(frame['conversions'], frame['clicks'])
+            self._frame = frame
+        return self._frame
+
+    def grouped(self, by: str) -> pd.DataFrame:
+        """Aggregates for one of GROUPINGS, e.g. grouped('campaign')"""
+        if by not in self._groups:
+            keys = GROUPINGS[by]
+            frame = self.frame
+            aggregations = {col: 'sum' for col in SUM_COLUMNS if col in frame.columns}
+            aggregations.update({col: 'mean' for col in MEAN_COLUMNS if col in frame.columns})
+            aggregations.update({col: 'mean' for col in DERIVED_COLUMNS if col in frame.columns})
+
+            missing = [key for key in keys if key not in frame.columns]
+            if missing:
+                raise KeyError(f"Cannot group by {by}: missing columns {missing}")
+
+            # observed=True: connector labels are categoricals, and subsets must not
+            # report empty groups for categories they filtered out
+            groupby = frame.groupby(keys, observed=True)
+            grouped = groupby.agg(aggregations)
+            grouped = grouped.rename(columns={col: f"{col}_mean" for col in DERIVED_COLUMNS})
+            grouped['rows'] = groupby.size()
+            grouped['roas'] = _ratio(grouped['conversions'], grouped['spend'])
+            grouped['cost_per_conversion'] = _ratio(grouped['spend'], grouped['conversions'])
+            grouped['conversion_rate'] = _ratio(grouped['conversions'], grouped['clicks'])
+            self._groups[by] = grouped
+        return self._groups[by]
+
+    def with_min_spend(self, min_spend: float, inclusive: bool = True) -> "MetricsFrame":
+        """Memoized MetricsFrame of the rows with spend >= min_spend (> with inclusive=False)"""
+        key = (float(min_spend), inclusive)
+        if self.empty:
+            return self
+        if key not in self._subsets:
+            spend = self.frame['spend']
+            mask = spend >= min_spend if inclusive else spend > min_spend
+            subset = MetricsFrame(self.raw[mask.to_numpy()])
+            # Derived columns are row-wise, so reuse them instead of recomputing
+            subset._frame = self.frame[mask.to_numpy()]
+            self._subsets[key] = subset
+        return self._subsets[key]
+
+    def quantile(self, column: str, q: float) -> float:
+        key = (column, q)
+        if key not in self._quantiles:
+            self._quantiles[key] = self.frame[column].quantile(q)
+        return self._quantiles[key]
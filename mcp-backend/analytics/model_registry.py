@@ -0,0 +1,174 @@
+"""
+Model Registry Module
+Persists fitted prediction model state per GA4 property, model type and training window
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "model_registry")
+MODEL_REGISTRY_MEMORY_ENTRIES = int(os.getenv("MODEL_REGISTRY_MEMORY_ENTRIES", "64"))
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', str(value))
+
+
+class ModelRegistry:
+    """
+    Stores model state as one .npz file per (property, model type, window hash),
+    with an in-memory LRU in front so repeated predictions skip disk as well.
+
+    State values may be numpy arrays, DataFrames or JSON-serializable metadata;
+    nothing is pickled.
+    """
+
+    def __init__(self, root: str = MODEL_REGISTRY_DIR, memory_entries: int = MODEL_REGISTRY_MEMORY_ENTRIES):
+        self.root = root
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._update_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    @staticmethod
+    def window_hash(window: Dict[str, Any]) -> str:
+        payload = json.dumps(window, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def _path(self, property_id: str, model_type: str, window: Dict[str, Any]) -> str:
+        return os.path.join(self.root, _safe_name(property_id),
+                            f"{_safe_name(model_type)}-{self.window_hash(window)}.npz")
+
+    def update_lock(self, property_id: str, model_type: str, window: Dict[str, Any]) -> asyncio.Lock:
+        """Held around load -> update -> save so concurrent requests don't both extend the same model"""
+        path = self._path(property_id, model_type, window)
+        with self._lock:
+            lock = self._update_locks.get(path)
+            if lock is None:
+                lock = asyncio.Lock()
+                self._update_locks[path] = lock
+            return lock
+
+    def load(self, property_id: str, model_type: str, window: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        path = self._path(property_id, model_type, window)
+        with self._lock:
+            if path in self._memory:
+                self._memory.move_to_end(path)
+                return self._memory[path]
+
+        if not os.path.exists(path):
+            return None
+
+        try:
+            state = self._read(path)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable model state {path}: {e}")
+            return None
+
+        self._remember(path, state)
+        return state
+
+    def save(self, property_id: str, model_type: str, window: Dict[str, Any], state: Dict[str, Any]):
+        path = self._path(property_id, model_type, window)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = path + ".tmp.npz"
+        self._write(tmp_path, state)
+        os.replace(tmp_path, path)
+        self._remember(path, state)
+
+    def invalidate(self, property_id: str, model_type: Optional[str] = None) -> int:
+        """Drop stored models for a property (optionally one model type); returns how many were removed"""
+        directory = os.path.join(self.root, _safe_name(property_id))
+        prefix = f"{_safe_name(model_type)}-" if model_type else ""
+        removed = 0
+
+        with self._lock:
+            for path in list(self._memory):
+                if os.path.dirname(path) == directory and os.path.basename(path).startswith(prefix):
+                    del self._memory[path]
+
+        if os.path.isdir(directory):
+            for filename in os.listdir(directory):
+                if filename.endswith(".npz") and filename.startswith(prefix):
+                    os.remove(os.path.join(directory, filename))
+                    removed += 1
+        return removed
+
+    def _remember(self, path: str, state: Dict[str, Any]):
+        with self._lock:
+            self._memory[path] = state
+            self._memory.move_to_end(path)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    @staticmethod
+    def _write(path: str, state: Dict[str, Any]):
+        arrays, meta, frames = {}, {}, {}
+        for name, value in state.items():
+            if isinstance(value, pd.DataFrame):
+                arrays[f"{name}__values"] = value.to_numpy(dtype=float)
+                is_datetime = isinstance(value.index, pd.DatetimeIndex)
+                arrays[f"{name}__index"] = (value.index.to_numpy(dtype='datetime64[ns]') if is_datetime
+                                            else value.index.astype(str).to_numpy(dtype=str))
+                frames[name] = {"columns": [str(col) for col in value.columns],
+                                "index_name": value.index.name, "datetime_index": is_datetime}
+            elif isinstance(value, np.ndarray):
+                arrays[name] = value
+            elif isinstance(value, dict) and any(isinstance(v, np.ndarray) for v in value.values()):
+                # One level of nesting, e.g. a model's get_state()
+                for key, item in value.items():
+                    if isinstance(item, np.ndarray):
+                        arrays[f"{name}__{key}"] = item
+                    else:
+                        meta.setdefault(f"{name}__nested", {})[key] = item
+            else:
+                meta[name] = value
+
+        arrays["__meta__"] = np.array(json.dumps({"meta": meta, "frames": frames}, default=str))
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Any]:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+
+        header = json.loads(str(arrays.pop("__meta__")))
+        state: Dict[str, Any] = {}
+
+        for name, frame_meta in header["frames"].items():
+            index = arrays.pop(f"{name}__index")
+            index = pd.DatetimeIndex(index) if frame_meta["datetime_index"] else pd.Index(index.astype(str))
+            state[name] = pd.DataFrame(arrays.pop(f"{name}__values"), index=index.rename(frame_meta["index_name"]),
+                                       columns=frame_meta["columns"])
+
+        for key, value in header["meta"].items():
+            if key.endswith("__nested"):
+                state[key[:-len("__nested")]] = dict(value)
+            else:
+                state[key] = value
+
+        for key, value in arrays.items():
+            if "__" in key:
+                parent, child = key.split("__", 1)
+                state.setdefault(parent, {})[child] = value
+            else:
+                state[key] = value
+        return state
+
+
+# Shared instance used by the predict endpoints
+model_registry = ModelRegistry()
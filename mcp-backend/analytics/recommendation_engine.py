@@ -4,27 +4,24 @@ Generates actionable recommendations for ad optimization
 """
 
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 import logging
 
+from analytics.metrics_frame import MetricsFrame
+from analytics.analysis_cache import memoize
+
 logger = logging.getLogger(__name__)
 
 class RecommendationEngine:
     """Generates actionable optimization recommendations"""
     
-    def __init__(self, ad_data: pd.DataFrame, min_spend: float = 100):
-        self.ad_data = ad_data.copy()
+    def __init__(self, ad_data: Union[pd.DataFrame, MetricsFrame], min_spend: float = 100):
+        self.metrics = MetricsFrame.of(ad_data)
+        # Row-level data with roas and conversion_rate
+        self.ad_data = self.metrics.frame
         self.min_spend = min_spend
-        self._prepare_data()
-    
-    def _prepare_data(self):
-        """Prepare data with calculated metrics"""
-        if self.ad_data.empty:
-            return
-        
-        self.ad_data['roas'] = self.ad_data['conversions'] / (self.ad_data['spend'] + 0.001)
-        self.ad_data['conversion_rate'] = self.ad_data['conversions'] / (self.ad_data['clicks'] + 0.001)
     
+    @memoize(state=('metrics', 'min_spend'))
     def generate_recommendations(self) -> List[Dict[str, Any]]:
         """Generate all types of recommendations"""
         recommendations = []
@@ -53,13 +50,14 @@ class RecommendationEngine:
     
     def _recommend_pausing(self) -> Dict[str, Any]:
         """Recommend campaigns to pause"""
-        significant_spend = self.ad_data[self.ad_data['spend'] >= self.min_spend]
+        significant = self.metrics.with_min_spend(self.min_spend)
+        significant_spend = significant.frame
         
         if significant_spend.empty:
             return {}
         
         poor_performers = significant_spend[
-            (significant_spend['ctr'] < significant_spend['ctr'].quantile(0.2)) &
+            (significant_spend['ctr'] < significant.quantile('ctr', 0.2)) &
             (significant_spend['roas'] < 1.0)
         ]
         
@@ -79,13 +77,14 @@ class RecommendationEngine:
     
     def _recommend_scaling(self) -> Dict[str, Any]:
         """Recommend campaigns to scale"""
-        significant_spend = self.ad_data[self.ad_data['spend'] >= self.min_spend]
+        significant = self.metrics.with_min_spend(self.min_spend)
+        significant_spend = significant.frame
         
         if significant_spend.empty:
             return {}
         
         top_performers = significant_spend[
-            (significant_spend['roas'] > significant_spend['roas'].quantile(0.8)) &
+            (significant_spend['roas'] > significant.quantile('roas', 0.8)) &
             (significant_spend['ctr'] > significant_spend['ctr'].mean())
         ]
         
@@ -105,11 +104,10 @@ class RecommendationEngine:
         if 'source' not in self.ad_data.columns:
             return {}
         
-        platform_performance = self.ad_data.groupby('source').agg({
-            'roas': 'mean',
-            'ctr': 'mean',
-            'spend': 'sum'
-        }).round(4)
+        # Platforms are compared on their average ad-level ROAS
+        platform_performance = self.metrics.grouped('source')[['roas_mean', 'ctr', 'spend']].rename(
+            columns={'roas_mean': 'roas'}
+        ).round(4)
         
         if len(platform_performance) < 2:
             return {}
@@ -138,11 +136,9 @@ class RecommendationEngine:
         if 'campaign_name' not in self.ad_data.columns:
             return {}
         
-        campaign_performance = self.ad_data.groupby('campaign_name').agg({
-            'roas': 'mean',
-            'spend': 'sum',
-            'conversions': 'sum'
-        }).round(4)
+        campaign_performance = self.metrics.grouped('campaign')[['roas_mean', 'spend', 'conversions']].rename(
+            columns={'roas_mean': 'roas'}
+        ).round(4)
         
         underperforming = campaign_performance[
             (campaign_performance['roas'] < 0.5) & 
@@ -172,18 +168,12 @@ class RecommendationEngine:
 class ActionPlanGenerator:
     """Generates detailed action plans for optimization"""
     
-    def __init__(self, ad_data: pd.DataFrame):
-        self.ad_data = ad_data.copy()
-        self._prepare_data()
-    
-    def _prepare_data(self):
-        """Prepare data with calculated metrics"""
-        if self.ad_data.empty:
-            return
-        
-        self.ad_data['roas'] = self.ad_data['conversions'] / (self.ad_data['spend'] + 0.001)
-        self.ad_data['conversion_rate'] = self.ad_data['conversions'] / (self.ad_data['clicks'] + 0.001)
+    def __init__(self, ad_data: Union[pd.DataFrame, MetricsFrame]):
+        self.metrics = MetricsFrame.of(ad_data)
+        # Row-level data with roas and conversion_rate
+        self.ad_data = self.metrics.frame
     
+    @memoize(state=('metrics',))
     def generate_action_plan(self, budget_increase_limit: float = 50) -> Dict[str, Any]:
         """Generate comprehensive action plan"""
         if self.ad_data.empty:
@@ -204,7 +194,7 @@ class ActionPlanGenerator:
         worst_performers = self.ad_data[
             (self.ad_data['spend'] >= 50) & 
             (self.ad_data['roas'] < 0.5) & 
-            (self.ad_data['ctr'] < self.ad_data['ctr'].quantile(0.2))
+            (self.ad_data['ctr'] < self.metrics.quantile('ctr', 0.2))
         ]
         
         if not worst_performers.empty:
@@ -219,7 +209,7 @@ class ActionPlanGenerator:
         
         # Scale top performers
         top_performers = self.ad_data[
-            (self.ad_data['roas'] > self.ad_data['roas'].quantile(0.8)) & 
+            (self.ad_data['roas'] > self.metrics.quantile('roas', 0.8)) & 
             (self.ad_data['ctr'] > self.ad_data['ctr'].mean()) &
             (self.ad_data['spend'] >= 100)
         ]
@@ -0,0 +1,112 @@
+"""
+Fixtures and options for the offline benchmark suite.
+
+    python -m pytest benchmarks -q                          # small scale, report only
+    python -m pytest benchmarks --bench-scale=medium --bench-compare
+    python -m pytest benchmarks --bench-save-baseline      # refresh baseline.json
+    python -m pytest benchmarks --bench-json=results.json
+"""
+
+import json
+import os
+
+import pytest
+
+from benchmarks.fake_connectors import SCALES, build_fake_integrator, ga4_frame, google_ads_frame, meta_ads_frame
+from benchmarks.harness import BASELINE_PATH, BenchRecorder, load_baseline, save_baseline
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench", "offline benchmarks")
+    group.addoption("--bench-scale", default=os.getenv("BENCH_SCALE", "small"), choices=list(SCALES),
+                    help="synthetic data scale (accounts x campaigns x ads x days)")
+    group.addoption("--bench-rounds", type=int, default=int(os.getenv("BENCH_ROUNDS", "5")),
+                    help="timed rounds per scenario")
+    group.addoption("--bench-json", default=None, help="write this session's results to a JSON file")
+    group.addoption("--bench-compare", action="store_true",
+                    help=f"fail scenarios slower than {os.path.basename(BASELINE_PATH)}")
+    group.addoption("--bench-save-baseline", action="store_true",
+                    help=f"merge this session's results into {os.path.basename(BASELINE_PATH)}")
+
+
+def _option(config, name, default=None):
+    # The options are only registered when this directory is on the command line
+    return config.getoption(name, default=default)
+
+
+@pytest.fixture(scope="session")
+def bench_recorder(request):
+    recorder = BenchRecorder(_option(request.config, "--bench-scale", os.getenv("BENCH_SCALE", "small")),
+                             rounds=_option(request.config, "--bench-rounds", 5))
+    request.config._bench_recorder = recorder
+    yield recorder
+    recorder.close()
+
+
+@pytest.fixture
+def bench(request, bench_recorder):
+    """
+    bench(fn, *args, **kwargs) times fn and returns its result; the scenario
+    is recorded under the test's name (pass name=... to record several per test).
+    """
+    baseline = load_baseline() if _option(request.config, "--bench-compare", False) else None
+    module = request.node.module.__name__.rsplit(".", 1)[-1]
+
+    def run(fn, *args, name=None, **kwargs):
+        key = f"{module}::{name or request.node.name}"
+        result = bench_recorder.measure(key, fn, *args, **kwargs)
+        if baseline is not None:
+            message = bench_recorder.regression(key, baseline)
+            if message:
+                pytest.fail(message)
+        return result
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def bench_scale(bench_recorder):
+    return SCALES[bench_recorder.scale]
+
+
+@pytest.fixture(scope="session")
+def meta_df(bench_scale):
+    return meta_ads_frame(**bench_scale)
+
+
+@pytest.fixture(scope="session")
+def google_df(bench_scale):
+    return google_ads_frame(**bench_scale)
+
+
+@pytest.fixture(scope="session")
+def ga4_df(bench_scale):
+    return ga4_frame(**bench_scale)
+
+
+@pytest.fixture
+def fake_integrator(bench_recorder):
+    # No simulated latency: benchmarks time our code, not the sleep
+    return build_fake_integrator(bench_recorder.scale, latency=0.0, latency_per_1k_rows=0.0)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    recorder = getattr(config, "_bench_recorder", None)
+    if recorder is None or not recorder.results:
+        return
+
+    terminalreporter.section(f"benchmarks (scale={recorder.scale}, rounds={recorder.rounds})")
+    width = max(len(name) for name in recorder.results)
+    terminalreporter.write_line(f"{'scenario'.ljust(width)}  {'min ms':>10}  {'median ms':>10}  {'mean ms':>10}")
+    for name, result in sorted(recorder.results.items()):
+        terminalreporter.write_line(f"{name.ljust(width)}  {result['min'] * 1000:>10.2f}  "
+                                    f"{result['median'] * 1000:>10.2f}  {result['mean'] * 1000:>10.2f}")
+
+    path = _option(config, "--bench-json")
+    if path:
+        with open(path, "w") as f:
+            json.dump(recorder.report(), f, indent=2)
+        terminalreporter.write_line(f"results written to {path}")
+    if _option(config, "--bench-save-baseline", False):
+        save_baseline(recorder)
+        terminalreporter.write_line(f"baseline updated: {BASELINE_PATH}")
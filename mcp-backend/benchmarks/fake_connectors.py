@@ -0,0 +1,349 @@
+"""
+Fake Connectors Module
+Seeded synthetic stand-ins for the Meta Ads, Google Ads and GA4 connectors.
+Frames have the same columns and dtypes as the real connectors' output
+(including normalize_dtypes) at a configurable scale of
+accounts x campaigns x ads x days, and fetch_data simulates API latency.
+"""
+
+import asyncio
+import io
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+from data_integrator import DataIntegrator, DataSourceConnector
+from dtype_normalizer import normalize_dtypes
+
+logger = logging.getLogger(__name__)
+
+# Named scales; rows per platform are roughly accounts * campaigns * ads * days
+# (Google Ads is campaign level, GA4 uses ads as traffic segments per campaign)
+SCALES: Dict[str, Dict[str, int]] = {
+    'small': {'accounts': 1, 'campaigns': 6, 'ads': 4, 'days': 30},
+    'medium': {'accounts': 2, 'campaigns': 20, 'ads': 8, 'days': 90},
+    'large': {'accounts': 4, 'campaigns': 40, 'ads': 12, 'days': 180}
+}
+
+DEFAULT_END_DATE = "2025-06-30"
+
+# Simulated API round trip: base seconds plus seconds per 1k rows, with +/- jitter
+FAKE_API_LATENCY = float(os.getenv("FAKE_API_LATENCY", "0.05"))
+FAKE_API_LATENCY_PER_1K_ROWS = float(os.getenv("FAKE_API_LATENCY_PER_1K_ROWS", "0.01"))
+FAKE_API_JITTER = float(os.getenv("FAKE_API_JITTER", "0.2"))
+
+GA4_CHANNELS = ['Organic Search', 'Paid Search', 'Paid Social', 'Direct', 'Referral', 'Email', 'Display']
+GA4_SOURCE_MEDIUMS = {
+    'Organic Search': ['google / organic', 'bing / organic'],
+    'Paid Search': ['google / cpc'],
+    'Paid Social': ['facebook / paid', 'instagram / paid'],
+    'Direct': ['(direct) / (none)'],
+    'Referral': ['partner.com / referral', 'news.site / referral'],
+    'Email': ['newsletter / email'],
+    'Display': ['google / display']
+}
+GA4_DEVICES = ['desktop', 'mobile', 'tablet']
+GA4_LOCATIONS = [('Johannesburg', 'South Africa'), ('Cape Town', 'South Africa'), ('London', 'United Kingdom'),
+                 ('New York', 'United States'), ('Sydney', 'Australia'), ('Berlin', 'Germany')]
+
+
+def resolve_scale(scale) -> Dict[str, int]:
+    """A named scale from SCALES, or a dict overriding some of the 'small' dimensions"""
+    if isinstance(scale, str):
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale '{scale}', expected one of {list(SCALES)}")
+        return dict(SCALES[scale])
+    return {**SCALES['small'], **(scale or {})}
+
+
+def _dates(days: int, end_date: str = DEFAULT_END_DATE) -> pd.DatetimeIndex:
+    return pd.date_range(end=pd.Timestamp(end_date), periods=days, freq='D')
+
+
+def _entity_grid(rng: np.random.Generator, accounts: int, campaigns: int, ads: int) -> pd.DataFrame:
+    """One row per ad with a stable baseline (daily impressions, CTR, CPC, conversion rate)"""
+    account = np.repeat(np.arange(accounts), campaigns * ads)
+    campaign = np.tile(np.repeat(np.arange(campaigns), ads), accounts)
+    ad = np.tile(np.arange(ads), accounts * campaigns)
+    n = len(ad)
+
+    # Campaign-level quality shared by its ads, so campaigns differ clearly
+    campaign_quality = rng.lognormal(0, 0.5, size=accounts * campaigns)[account * campaigns + campaign]
+    return pd.DataFrame({
+        'account': account,
+        'campaign': campaign,
+        'ad': ad,
+        'impressions': rng.lognormal(7.5, 1.0, size=n),
+        'ctr': np.clip(rng.beta(2, 60, size=n) * campaign_quality, 0.001, 0.3),
+        'cpc': rng.lognormal(0.2, 0.5, size=n),
+        'cvr': np.clip(rng.beta(2, 40, size=n) * campaign_quality, 0.0, 0.5)
+    })
+
+
+def _daily_activity(rng: np.random.Generator, grid: pd.DataFrame, dates: pd.DatetimeIndex) -> pd.DataFrame:
+    """Cross the entity grid with the dates and draw impressions, clicks, spend and conversions"""
+    n_entities, n_days = len(grid), len(dates)
+    rows = grid.loc[grid.index.repeat(n_days)].reset_index(drop=True)
+    rows['date'] = np.tile(dates.to_numpy(), n_entities)
+
+    # Weekly seasonality (weekends lower) and a mild trend over the period
+    weekday = pd.DatetimeIndex(rows['date']).dayofweek.to_numpy()
+    seasonality = np.where(weekday >= 5, 0.75, 1.05)
+    trend = 1 + 0.3 * np.tile(np.linspace(-0.5, 0.5, n_days), n_entities)
+
+    expected = rows['impressions'].to_numpy() * seasonality * trend
+    impressions = rng.poisson(np.maximum(expected, 1))
+    clicks = rng.binomial(impressions, rows['ctr'].to_numpy())
+    cpc = rows['cpc'].to_numpy() * rng.lognormal(0, 0.15, size=len(rows))
+    rows['impressions'] = impressions
+    rows['clicks'] = clicks
+    rows['spend'] = np.round(clicks * cpc, 2)
+    rows['conversions'] = rng.binomial(clicks, rows['cvr'].to_numpy())
+    return rows
+
+
+def meta_ads_frame(accounts: int = 1, campaigns: int = 6, ads: int = 4, days: int = 30,
+                   end_date: str = DEFAULT_END_DATE, seed: int = 0) -> pd.DataFrame:
+    """Ad-level daily insights as returned by MetaAdsConnector.fetch_data"""
+    rng = np.random.default_rng(seed)
+    rows = _daily_activity(rng, _entity_grid(rng, accounts, campaigns, ads), _dates(days, end_date))
+
+    impressions = rows['impressions'].to_numpy()
+    clicks = rows['clicks'].to_numpy()
+    spend = rows['spend'].to_numpy()
+    frequency = np.round(rng.uniform(1.0, 3.0, size=len(rows)), 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df = pd.DataFrame({
+            'campaign_name': [f"Meta Acct{a + 1} Campaign {c + 1}" for a, c in zip(rows['account'], rows['campaign'])],
+            'adset_name': [f"Adset {c + 1}.{ad % 3 + 1}" for c, ad in zip(rows['campaign'], rows['ad'])],
+            'ad_name': [f"Ad {c + 1}.{ad + 1}" for c, ad in zip(rows['campaign'], rows['ad'])],
+            'impressions': impressions,
+            'clicks': clicks,
+            'spend': spend,
+            'reach': np.floor(impressions / frequency).astype(np.int64),
+            'frequency': frequency,
+            'ctr': np.nan_to_num(clicks / impressions * 100),
+            'cpc': np.nan_to_num(spend / clicks),
+            'cpm': np.nan_to_num(spend / impressions * 1000),
+            'conversions': rows['conversions'].to_numpy(),
+            'source': 'meta_ads',
+            'date': rows['date'].to_numpy()
+        })
+    return normalize_dtypes(df, 'meta_ads', dataset='Meta Ads (fake)')
+
+
+def google_ads_frame(accounts: int = 1, campaigns: int = 6, ads: int = 4, days: int = 30,
+                     end_date: str = DEFAULT_END_DATE, seed: int = 1) -> pd.DataFrame:
+    """
+    Campaign-level daily metrics as returned by GoogleAdsConnector.fetch_data.
+    The GAQL query is per campaign, so each campaign's ads are summed into one row.
+    """
+    rng = np.random.default_rng(seed)
+    rows = _daily_activity(rng, _entity_grid(rng, accounts, campaigns, ads), _dates(days, end_date))
+    rows = rows.groupby(['account', 'campaign', 'date'], sort=False, as_index=False)[
+        ['impressions', 'clicks', 'spend', 'conversions']].sum()
+
+    impressions = rows['impressions'].to_numpy()
+    clicks = rows['clicks'].to_numpy()
+    spend = rows['spend'].to_numpy()
+    status = np.where(rng.random(size=accounts * campaigns) < 0.85, 'ENABLED', 'PAUSED')
+    campaign_index = (rows['account'] * campaigns + rows['campaign']).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        average_cpc = np.nan_to_num(spend / clicks * 1000000)
+        df = pd.DataFrame({
+            'date': rows['date'].to_numpy(),
+            'campaign_id': (1000000 + campaign_index).astype(str),
+            'campaign_name': [f"Search Acct{a + 1} Campaign {c + 1}" for a, c in zip(rows['account'], rows['campaign'])],
+            'campaign_status': status[campaign_index],
+            'impressions': impressions,
+            'clicks': clicks,
+            # Google reports fractional (modelled) conversions
+            'conversions': rows['conversions'].to_numpy() * rng.uniform(0.9, 1.1, size=len(rows)),
+            'ctr': np.nan_to_num(clicks / impressions),
+            'average_cpc': average_cpc,
+            'source': 'google_ads',
+            'spend': spend,
+            'cpc': average_cpc / 1000000,
+            'cpm': np.nan_to_num(spend / (impressions / 1000))
+        })
+    return normalize_dtypes(df, 'google_ads', dataset='Google Ads (fake)')
+
+
+def ga4_frame(accounts: int = 1, campaigns: int = 6, ads: int = 4, days: int = 30,
+              end_date: str = DEFAULT_END_DATE, seed: int = 2) -> pd.DataFrame:
+    """
+    Daily GA4 report rows for the dimensions and metrics requested by
+    comprehensive_insights, after GA4Connector's column renames. Each day has
+    accounts * campaigns * ads traffic segments (channel, source/medium,
+    campaign, device, location).
+    """
+    rng = np.random.default_rng(seed)
+    dates = _dates(days, end_date)
+    segments = accounts * campaigns * ads
+
+    channel = rng.choice(GA4_CHANNELS, size=segments, p=[0.3, 0.2, 0.15, 0.15, 0.08, 0.07, 0.05])
+    source_medium = [GA4_SOURCE_MEDIUMS[c][rng.integers(len(GA4_SOURCE_MEDIUMS[c]))] for c in channel]
+    campaign = [f"Campaign {rng.integers(campaigns) + 1}" if c.startswith('Paid') or c == 'Display' else '(not set)'
+                for c in channel]
+    device = rng.choice(GA4_DEVICES, size=segments, p=[0.4, 0.52, 0.08])
+    location = rng.integers(len(GA4_LOCATIONS), size=segments)
+    base_sessions = rng.lognormal(3.0, 1.0, size=segments)
+
+    n = segments * days
+    weekday = np.repeat(dates.dayofweek.to_numpy(), segments)
+    sessions = rng.poisson(np.tile(base_sessions, days) * np.where(weekday >= 5, 0.8, 1.05))
+    engagement = np.clip(rng.normal(0.6, 0.12, size=n), 0.05, 0.98)
+    key_events = rng.binomial(sessions, 0.03)
+    df = pd.DataFrame({
+        'date': np.repeat(dates.to_numpy(), segments),
+        'channel_grouping': np.tile(channel, days),
+        'source_medium': np.tile(source_medium, days),
+        'sessionCampaignName': np.tile(campaign, days),
+        'deviceCategory': np.tile(device, days),
+        'city': np.tile([GA4_LOCATIONS[i][0] for i in location], days),
+        'country': np.tile([GA4_LOCATIONS[i][1] for i in location], days),
+        'sessions': sessions,
+        'newUsers': rng.binomial(sessions, 0.55),
+        'screenPageViews': sessions + rng.poisson(sessions * 1.8),
+        'engagementRate': np.round(engagement, 4),
+        'userEngagementDuration': np.round(sessions * rng.lognormal(4.0, 0.4, size=n), 1),
+        'keyEvents': key_events,
+        'totalRevenue': np.round(key_events * rng.lognormal(4.0, 0.5, size=n), 2),
+        'source': 'ga4'
+    })
+    return normalize_dtypes(df, 'ga4', dataset='GA4 (fake)')
+
+
+def _days_between(start_date: Optional[str], end_date: Optional[str], default: int) -> int:
+    if not start_date or not end_date:
+        return default
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    return max((end - start).days + 1, 1)
+
+
+class FakeConnector(DataSourceConnector):
+    """
+    Base for the fake platform connectors. Frames are generated once per date
+    range and a copy is returned for every fetch, after sleeping for the
+    simulated API latency (seeded, so runs are reproducible).
+    """
+
+    frame_builder = None
+
+    def __init__(self, scale='small', seed: int = 0, latency: float = FAKE_API_LATENCY,
+                 latency_per_1k_rows: float = FAKE_API_LATENCY_PER_1K_ROWS, jitter: float = FAKE_API_JITTER):
+        self.scale = resolve_scale(scale)
+        self.seed = seed
+        self.latency = latency
+        self.latency_per_1k_rows = latency_per_1k_rows
+        self.jitter = jitter
+        self.calls = 0
+        self._rng = np.random.default_rng(seed)
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+
+    def validate_credentials(self) -> bool:
+        return True
+
+    def simulated_latency(self, rows: int) -> float:
+        latency = self.latency + self.latency_per_1k_rows * rows / 1000
+        return max(latency * (1 + self._rng.uniform(-self.jitter, self.jitter)), 0.0)
+
+    def frame(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """The (cached) synthetic frame for a date range; defaults to the scale's days"""
+        days = _days_between(start_date, end_date, self.scale['days'])
+        key = (days, end_date or DEFAULT_END_DATE)
+        if key not in self._frames:
+            scale = {**self.scale, 'days': days}
+            self._frames[key] = type(self).frame_builder(**scale, end_date=key[1], seed=self.seed)
+        return self._frames[key]
+
+    async def fetch_data(self, start_date: str, end_date: str, **kwargs) -> pd.DataFrame:
+        self.calls += 1
+        df = self.frame(start_date, end_date)
+        await asyncio.sleep(self.simulated_latency(len(df)))
+        # Callers (and DataIntegrator) add columns to the result, so hand out a copy
+        result = df.copy()
+        result.attrs = dict(df.attrs)
+        return result
+
+
+class FakeMetaAdsConnector(FakeConnector):
+    """Stand-in for MetaAdsConnector"""
+
+    frame_builder = staticmethod(meta_ads_frame)
+
+
+class FakeGoogleAdsConnector(FakeConnector):
+    """Stand-in for GoogleAdsConnector"""
+
+    frame_builder = staticmethod(google_ads_frame)
+
+
+class FakeGA4Connector(FakeConnector):
+    """Stand-in for GA4Connector; property_id is read and swapped by comprehensive_insights"""
+
+    frame_builder = staticmethod(ga4_frame)
+
+    def __init__(self, scale='small', seed: int = 2, property_id: str = "properties/000000", **kwargs):
+        super().__init__(scale, seed=seed, **kwargs)
+        self.property_id = property_id
+
+
+def build_fake_integrator(scale='small', latency: float = FAKE_API_LATENCY, **kwargs) -> DataIntegrator:
+    """DataIntegrator with fake connectors registered under the real connector names"""
+    integrator = DataIntegrator()
+    integrator.add_connector('meta_ads', FakeMetaAdsConnector(scale, seed=0, latency=latency, **kwargs))
+    integrator.add_connector('google_ads', FakeGoogleAdsConnector(scale, seed=1, latency=latency, **kwargs))
+    integrator.add_connector('ga4', FakeGA4Connector(scale, seed=2, latency=latency, **kwargs))
+    return integrator
+
+
+def _export(header_lines: List[str], df: pd.DataFrame, total_row: Optional[List] = None, sep: str = ',') -> bytes:
+    buffer = io.StringIO()
+    for line in header_lines:
+        buffer.write(line + '\n')
+    df.to_csv(buffer, index=False, sep=sep)
+    if total_row is not None:
+        buffer.write(sep.join(str(value) for value in total_row) + '\n')
+    return buffer.getvalue().encode('utf-8')
+
+
+def meta_ads_export_csv(df: pd.DataFrame) -> bytes:
+    """A tab-separated 'Ad group report' export (title rows, report columns, Total row) of a meta_ads_frame"""
+    export = pd.DataFrame({
+        'Ad group status': 'Enabled',
+        'Ad group': df['adset_name'].astype(str),
+        'Campaign': df['campaign_name'].astype(str),
+        'Day': pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d'),
+        'Currency code': 'ZAR',
+        'Impr.': df['impressions'],
+        'Interactions': df['clicks'],
+        'Interaction rate': (df['ctr'].round(2)).astype(str) + '%',
+        'Avg. cost': df['cpc'].round(2),
+        'Cost': df['spend'].round(2),
+        'Conversions': df['conversions']
+    })
+    total = ['Total: Account', '', '', '', 'ZAR', int(df['impressions'].sum()), int(df['clicks'].sum()),
+             '', '', round(float(df['spend'].sum()), 2), int(df['conversions'].sum())]
+    return _export(['Ad group report', 'All time'], export, total_row=total, sep='\t')
+
+
+def google_ads_export_csv(df: pd.DataFrame) -> bytes:
+    """A Google Ads campaign performance CSV export (title rows + report columns) of a google_ads_frame"""
+    export = pd.DataFrame({
+        'Campaign': df['campaign_name'].astype(str),
+        'Ad group': df['campaign_name'].astype(str) + ' - Ad group 1',
+        'Day': pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d'),
+        'Clicks': df['clicks'],
+        'Impr.': df['impressions'],
+        'CTR': (df['ctr'] * 100).round(2).astype(str) + '%',
+        'Avg. CPC': df['cpc'].round(2),
+        'Cost': df['spend'].round(2),
+        'Conversions': df['conversions'].round(2)
+    })
+    return _export(['Campaign performance report', 'All time'], export)
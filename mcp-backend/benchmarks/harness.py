@@ -0,0 +1,137 @@
+"""
+Benchmark Harness Module
+Minimal timing harness for the offline benchmarks: repeated rounds per
+scenario, summary statistics, JSON results and comparison against a stored
+baseline (benchmarks/baseline.json). No plugin dependency, so the suite runs
+wherever the analytics code does.
+"""
+
+import asyncio
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+from analytics.analysis_cache import analysis_cache
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# A scenario regresses when its median exceeds baseline * (1 + tolerance) + slack;
+# the slack keeps millisecond-scale scenarios from flapping on timer noise
+BENCH_TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.5"))
+BENCH_SLACK_SECONDS = float(os.getenv("BENCH_SLACK_SECONDS", "0.005"))
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": f"{platform.system()} {platform.machine()}",
+        "cpus": str(os.cpu_count())
+    }
+
+
+class BenchRecorder:
+    """Collects timings for one pytest session at one data scale"""
+
+    def __init__(self, scale: str, rounds: int = 5, warmup: int = 1):
+        self.scale = scale
+        self.rounds = rounds
+        self.warmup = warmup
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _call(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        result = fn(*args, **kwargs)
+        if asyncio.iscoroutine(result):
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+            result = self._loop.run_until_complete(result)
+        return result
+
+    def measure(self, name: str, fn: Callable, *args, rounds: Optional[int] = None, **kwargs) -> Any:
+        """
+        Time fn(*args, **kwargs) (sync or async) over several rounds and
+        record the statistics under name. The analysis cache is cleared before
+        every round so memoized functions are timed on a cold cache.
+        Returns the result of the last round.
+        """
+        rounds = rounds or self.rounds
+        for _ in range(self.warmup):
+            analysis_cache.clear()
+            self._call(fn, args, kwargs)
+
+        timings = []
+        result = None
+        for _ in range(rounds):
+            analysis_cache.clear()
+            started = time.perf_counter()
+            result = self._call(fn, args, kwargs)
+            timings.append(time.perf_counter() - started)
+
+        self.results[name] = {
+            "rounds": rounds,
+            "min": min(timings),
+            "max": max(timings),
+            "mean": statistics.fmean(timings),
+            "median": statistics.median(timings),
+            "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0
+        }
+        return result
+
+    def regression(self, name: str, baseline: Dict[str, Any], tolerance: float = BENCH_TOLERANCE) -> Optional[str]:
+        """A message when name is slower than its baseline entry for this scale, else None"""
+        reference = baseline.get("scales", {}).get(self.scale, {}).get(name)
+        if not reference or name not in self.results:
+            return None
+        median, limit = self.results[name]["median"], reference["median"] * (1 + tolerance) + BENCH_SLACK_SECONDS
+        if median > limit:
+            return (f"{name} regressed at scale '{self.scale}': median {median * 1000:.1f} ms vs "
+                    f"baseline {reference['median'] * 1000:.1f} ms (limit {limit * 1000:.1f} ms)")
+        return None
+
+    def close(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.close()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "environment": environment(),
+            "scale": self.scale,
+            "results": self.results
+        }
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(recorder: BenchRecorder, path: str = BASELINE_PATH):
+    """Merge this session's results into the baseline for its scale; other entries are kept"""
+    baseline = load_baseline(path)
+    scales = baseline.setdefault("scales", {})
+    entries = scales.setdefault(recorder.scale, {})
+    for name, result in recorder.results.items():
+        entries[name] = {key: round(value, 6) if isinstance(value, float) else value
+                         for key, value in result.items()}
+    scales[recorder.scale] = dict(sorted(entries.items()))
+    baseline["environment"] = environment()
+    baseline["updated"] = datetime.now().isoformat(timespec="seconds")
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+    logger.info(f"Saved {len(recorder.results)} baseline results for scale '{recorder.scale}' to {path}")
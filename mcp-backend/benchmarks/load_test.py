@@ -0,0 +1,250 @@
+"""
+Load Test Module
+Drives concurrent requests at backend (/api/growth-data) or mcp-backend
+(/comprehensive-insights) and reports latency percentiles and throughput.
+Run it against services whose platform endpoints point at the local
+stand-in (benchmarks/platform_standin.py):
+
+    python -m benchmarks.platform_standin --scale medium --latency-ms 120
+    python -m benchmarks.load_test comprehensive --seed-credentials --concurrency 16 --duration 60
+    python -m benchmarks.load_test growth --url http://localhost:8000 --requests 200
+
+The growth scenario runs the backend's full path, including its Anthropic
+call; responses with success=false are counted as application errors.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import logging
+
+import httpx
+import numpy as np
+
+from benchmarks.harness import environment
+
+logger = logging.getLogger(__name__)
+
+LOAD_TEST_USER_ID = "load-test-user"
+STANDIN_GA4_PROPERTY_ID = "428236885"
+STANDIN_GOOGLE_ADS_CUSTOMER_ID = "5550000000"
+STANDIN_META_ACCOUNT_ID = "act_1000000000"
+
+
+def comprehensive_body(user_id: str, days: int = 30) -> Dict[str, Any]:
+    end = datetime.now() - timedelta(days=1)
+    date_range = {"start": (end - timedelta(days=days - 1)).strftime("%Y-%m-%d"), "end": end.strftime("%Y-%m-%d")}
+    return {
+        "user_id": user_id,
+        "start_date": date_range["start"],
+        "end_date": date_range["end"],
+        "data_selections": [
+            {"platform": "facebook", "account_id": STANDIN_META_ACCOUNT_ID, "date_range": date_range},
+            {"platform": "google_ads", "account_id": STANDIN_GOOGLE_ADS_CUSTOMER_ID, "date_range": date_range},
+            {"platform": "google_analytics", "property_id": STANDIN_GA4_PROPERTY_ID, "date_range": date_range}
+        ]
+    }
+
+
+def growth_body(user_id: str) -> Dict[str, Any]:
+    return {
+        "question": "Where should we scale spend next month?",
+        "session_id": "load-test",
+        "user_id": user_id,
+        "account_id": STANDIN_GOOGLE_ADS_CUSTOMER_ID,
+        "property_id": STANDIN_GA4_PROPERTY_ID
+    }
+
+
+SCENARIOS = {
+    "comprehensive": {"url": "http://localhost:8001", "path": "/comprehensive-insights", "body": comprehensive_body},
+    "growth": {"url": "http://localhost:8000", "path": "/api/growth-data", "body": growth_body}
+}
+
+
+def seed_credentials(user_id: str) -> bool:
+    """Store placeholder credentials for every platform; the stand-in accepts any token"""
+    from credential_db import credential_storage
+
+    return credential_storage.store_credentials(user_id, {
+        "meta_ads": {"access_token": "standin-token", "app_id": "standin", "app_secret": "standin"},
+        "google_ads": {"developer_token": "standin", "client_id": "standin", "client_secret": "standin",
+                       "refresh_token": "standin"},
+        "ga4": {"property_id": STANDIN_GA4_PROPERTY_ID, "oauth_credentials": {
+            "token": "standin-token", "refresh_token": "standin", "token_uri": "http://localhost/token",
+            "client_id": "standin", "client_secret": "standin"
+        }}
+    })
+
+
+class LoadResult:
+    """Per-request outcomes of one load test run"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self.finished = self.started
+
+    def add(self, latency: float, status: str):
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = max(self.finished - self.started, 1e-9)
+        latencies = np.array(self.latencies) * 1000
+        summary = {
+            "requests": len(self.latencies),
+            "ok": self.statuses.get("ok", 0),
+            "errors": {status: count for status, count in sorted(self.statuses.items()) if status != "ok"},
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_rps": round(len(self.latencies) / elapsed, 3)
+        }
+        if len(latencies):
+            summary["latency_ms"] = {
+                "p50": round(float(np.percentile(latencies, 50)), 2),
+                "p95": round(float(np.percentile(latencies, 95)), 2),
+                "p99": round(float(np.percentile(latencies, 99)), 2),
+                "max": round(float(latencies.max()), 2),
+                "mean": round(float(latencies.mean()), 2)
+            }
+        return summary
+
+
+async def _send(client: httpx.AsyncClient, path: str, body: Dict[str, Any]) -> str:
+    """One request; returns 'ok' or the error class it is counted under"""
+    try:
+        response = await client.post(path, json=body)
+    except httpx.TimeoutException:
+        return "timeout"
+    except httpx.HTTPError as e:
+        return type(e).__name__
+    if response.status_code != 200:
+        return f"http_{response.status_code}"
+    try:
+        payload = response.json()
+    except ValueError:
+        return "invalid_json"
+    if isinstance(payload, dict) and payload.get("success") is False:
+        return "success_false"
+    return "ok"
+
+
+async def run_load(url: str, path: str, body: Dict[str, Any], concurrency: int = 8,
+                   requests: Optional[int] = None, duration: Optional[float] = None,
+                   warmup: int = 1, timeout: float = 300.0, transport=None) -> LoadResult:
+    """
+    Keep `concurrency` requests in flight until `requests` have completed or
+    `duration` seconds have passed. Warmup requests are sent first and not recorded.
+    """
+    result = LoadResult()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits, transport=transport) as client:
+        for _ in range(warmup):
+            await _send(client, path, body)
+
+        result.started = time.perf_counter()
+        deadline = result.started + duration if duration else None
+        issued = 0
+
+        async def worker():
+            nonlocal issued
+            while True:
+                if requests is not None and issued >= requests:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                issued += 1
+                started = time.perf_counter()
+                status = await _send(client, path, body)
+                result.add(time.perf_counter() - started, status)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        result.finished = time.perf_counter()
+    return result
+
+
+async def standin_stats(url: str) -> Optional[Dict[str, Any]]:
+    try:
+        async with httpx.AsyncClient(base_url=url, timeout=5.0) as client:
+            response = await client.get("/_standin/stats")
+            return response.json() if response.status_code == 200 else None
+    except httpx.HTTPError:
+        return None
+
+
+def _print_summary(scenario: str, summary: Dict[str, Any]):
+    print(f"\n{scenario}: {summary['requests']} requests in {summary['elapsed_seconds']:.1f}s "
+          f"({summary['throughput_rps']:.2f} req/s), {summary['ok']} ok")
+    for status, count in summary["errors"].items():
+        print(f"  {status}: {count}")
+    latency = summary.get("latency_ms")
+    if latency:
+        print("  latency ms  " + "  ".join(f"{key} {value:.1f}" for key, value in latency.items()))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Concurrent load test for backend and mcp-backend")
+    parser.add_argument("scenario", choices=list(SCENARIOS) + ["custom"])
+    parser.add_argument("--url", default=None, help="service base URL (default depends on the scenario)")
+    parser.add_argument("--path", default=None, help="request path (custom scenario)")
+    parser.add_argument("--body", default=None, help="JSON request body or @file (custom scenario)")
+    parser.add_argument("--user-id", default=LOAD_TEST_USER_ID)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many requests")
+    parser.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--seed-credentials", action="store_true",
+                        help="store stand-in credentials for --user-id in mcp-backend's credential database")
+    parser.add_argument("--standin-url", default="http://127.0.0.1:8090", help="include stand-in call counts")
+    parser.add_argument("--json", default=None, help="write the summary to a JSON file")
+    args = parser.parse_args(argv)
+
+    if args.requests is None and args.duration is None:
+        args.requests = 100
+    if args.scenario == "custom":
+        if not (args.url and args.path):
+            parser.error("custom scenario needs --url and --path")
+        body_text = args.body or "{}"
+        if body_text.startswith("@"):
+            with open(body_text[1:]) as f:
+                body_text = f.read()
+        url, path, body = args.url, args.path, json.loads(body_text)
+    else:
+        scenario = SCENARIOS[args.scenario]
+        url, path, body = args.url or scenario["url"], scenario["path"], scenario["body"](args.user_id)
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.seed_credentials and not seed_credentials(args.user_id):
+        parser.error(f"could not store credentials for {args.user_id}")
+
+    result = asyncio.run(run_load(url, path, body, concurrency=args.concurrency, requests=args.requests,
+                                  duration=args.duration, warmup=args.warmup, timeout=args.timeout))
+    summary = result.summary()
+    _print_summary(args.scenario, summary)
+
+    stats = asyncio.run(standin_stats(args.standin_url)) if args.standin_url else None
+    if stats:
+        print(f"  stand-in calls {stats['calls']}, injected errors {stats['injected_errors']}")
+
+    if args.json:
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "environment": environment(),
+            "scenario": args.scenario,
+            "target": f"{url}{path}",
+            "concurrency": args.concurrency,
+            "summary": summary,
+            "standin": stats
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,708 @@
+"""
+Platform Stand-in Module
+Local stand-in for the Meta Graph API (ad accounts, campaigns, insights), the
+GA4 Data API (runReport / batchRunReports over REST) and the Google Ads API
+(GAQL Search / SearchStream over gRPC). Responses are built from the seeded
+fake_connectors data with injected latency, pagination and error rates, so
+the real request paths can be load-tested without live accounts.
+
+    python -m benchmarks.platform_standin --scale medium --latency-ms 120 --error-rate 0.02
+
+then start mcp-backend with the endpoint overrides it prints (see platform_endpoints).
+"""
+
+import argparse
+import asyncio
+import base64
+import importlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent import futures
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from benchmarks.fake_connectors import FakeGA4Connector, FakeGoogleAdsConnector, FakeMetaAdsConnector, resolve_scale
+
+logger = logging.getLogger(__name__)
+
+META_ACCOUNT_ID_BASE = 1000000000
+GOOGLE_ADS_CUSTOMER_ID_BASE = 5550000000
+GOOGLE_ADS_PAGE_SIZE = 10000  # fixed by the API since v17
+GA4_DEFAULT_LIMIT = 10000
+
+GRAPH_BREAKDOWN_VALUES = {
+    'age': ['18-24', '25-34', '35-44', '45-54', '55-64', '65+'],
+    'gender': ['female', 'male', 'unknown'],
+    'country': ['ZA', 'GB', 'US'],
+    'region': ['Gauteng', 'Western Cape', 'London', 'New York'],
+    'dma': ['unknown'],
+    'impression_device': ['android_smartphone', 'iphone', 'desktop'],
+    'platform_position': ['feed', 'story', 'reels', 'marketplace'],
+    'publisher_platform': ['facebook', 'instagram', 'audience_network'],
+    'device_platform': ['mobile_app', 'mobile_web', 'desktop']
+}
+GRAPH_SUM_FIELDS = ['impressions', 'clicks', 'spend', 'reach', 'conversions']
+
+
+class StandinConfig:
+    """Scale of the synthetic data and the faults injected into every API call"""
+
+    def __init__(self, scale='medium', seed: int = 0, latency: float = 0.08, jitter: float = 0.3,
+                 error_rate: float = 0.0, page_size: int = 100):
+        self.scale = resolve_scale(scale)
+        self.seed = seed
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.page_size = page_size
+
+
+class PlatformStandin:
+    """Synthetic per-platform data plus seeded latency/error injection and call counters"""
+
+    def __init__(self, config: StandinConfig):
+        self.config = config
+        self.meta = FakeMetaAdsConnector(config.scale, seed=config.seed)
+        self.google_ads = FakeGoogleAdsConnector(config.scale, seed=config.seed + 1)
+        self.ga4 = FakeGA4Connector(config.scale, seed=config.seed + 2)
+        self._rng = np.random.default_rng(config.seed)
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.config.jitter, self.config.jitter)
+        return max(self.config.latency * (1 + jitter), 0.0)
+
+    def record(self, api: str) -> bool:
+        """Count a call; True when this call should fail with an injected error"""
+        with self._lock:
+            self.calls[api] = self.calls.get(api, 0) + 1
+            failed = bool(self._rng.random() < self.config.error_rate)
+            if failed:
+                self.errors[api] = self.errors.get(api, 0) + 1
+        return failed
+
+    def coin(self) -> bool:
+        with self._lock:
+            return bool(self._rng.random() < 0.5)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": dict(self.calls), "injected_errors": dict(self.errors)}
+
+    def frame(self, connector, start_date: str, end_date: str) -> pd.DataFrame:
+        with self._lock:
+            return connector.frame(start_date, end_date)
+
+
+def _resolve_date(value: Optional[str], today: datetime) -> str:
+    """YYYY-MM-DD, 'today', 'yesterday' or 'NdaysAgo' (GA4 date syntax) as YYYY-MM-DD"""
+    if not value or value == 'today':
+        return today.strftime('%Y-%m-%d')
+    if value == 'yesterday':
+        return (today - timedelta(days=1)).strftime('%Y-%m-%d')
+    match = re.fullmatch(r'(\d+)daysAgo', value)
+    if match:
+        return (today - timedelta(days=int(match.group(1)))).strftime('%Y-%m-%d')
+    return value
+
+
+def _date_range(start_date: Optional[str], end_date: Optional[str], default_days: int = 30) -> Tuple[str, str]:
+    today = datetime.now()
+    end = _resolve_date(end_date, today)
+    start = _resolve_date(start_date, today) if start_date else \
+        (datetime.strptime(end, '%Y-%m-%d') - timedelta(days=default_days - 1)).strftime('%Y-%m-%d')
+    return start, end
+
+
+def _number(value: Any) -> str:
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    return f"{float(value):.6g}" if abs(float(value)) < 1e6 else f"{float(value):.2f}"
+
+
+def _encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(str(offset).encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        return 0
+
+
+# --- Meta Graph API ---
+
+def _meta_account_index(account_id: str, accounts: int) -> Optional[int]:
+    digits = account_id.replace('act_', '')
+    if digits.isdigit() and 0 <= int(digits) - META_ACCOUNT_ID_BASE < accounts:
+        return int(digits) - META_ACCOUNT_ID_BASE
+    return None
+
+
+def _meta_rows(standin: PlatformStandin, account_id: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Ad-level daily rows for one ad account (all accounts for unknown ids) with Graph ids"""
+    df = standin.frame(standin.meta, start_date, end_date)
+    index = _meta_account_index(account_id, standin.config.scale['accounts'])
+    if index is not None:
+        df = df[df['campaign_name'].astype(str).str.startswith(f"Meta Acct{index + 1} ")]
+
+    df = df.copy()
+    for level in ['campaign', 'adset', 'ad']:
+        names = df[f'{level}_name'].astype('category')
+        prefix = {'campaign': 2385, 'adset': 2386, 'ad': 2387}[level]
+        df[f'{level}_id'] = [f"{prefix}{code:09d}" for code in names.cat.codes]
+    return df
+
+
+def _graph_levels(level: str) -> List[str]:
+    return {
+        'account': [],
+        'campaign': ['campaign_id', 'campaign_name'],
+        'adset': ['campaign_id', 'campaign_name', 'adset_id', 'adset_name'],
+        'ad': ['campaign_id', 'campaign_name', 'adset_id', 'adset_name', 'ad_id', 'ad_name']
+    }.get(level, [])
+
+
+def graph_insights(df: pd.DataFrame, fields: List[str], level: str, daily: bool,
+                   breakdowns: List[str], start_date: str, end_date: str, seed: int = 0) -> List[Dict[str, Any]]:
+    """Aggregate ad-level rows to Graph insights records (numbers as strings, like the API)"""
+    df = df.copy()
+    rng = np.random.default_rng(seed)
+    breakdowns = [b for b in breakdowns if b in GRAPH_BREAKDOWN_VALUES]
+    for breakdown in breakdowns:
+        df[breakdown] = rng.choice(GRAPH_BREAKDOWN_VALUES[breakdown], size=len(df))
+
+    keys = _graph_levels(level) + breakdowns + (['date'] if daily else [])
+    sums = df.groupby(keys, observed=True, sort=True)[GRAPH_SUM_FIELDS].sum().reset_index() if keys else \
+        df[GRAPH_SUM_FIELDS].sum().to_frame().T
+
+    records = []
+    for row in sums.to_dict('records'):
+        impressions, clicks, spend, reach = row['impressions'], row['clicks'], row['spend'], row['reach']
+        values = {
+            'impressions': int(impressions),
+            'clicks': int(clicks),
+            'spend': round(float(spend), 2),
+            'reach': int(reach),
+            'frequency': impressions / reach if reach else 0.0,
+            'ctr': clicks / impressions * 100 if impressions else 0.0,
+            'cpc': spend / clicks if clicks else 0.0,
+            'cpm': spend / impressions * 1000 if impressions else 0.0,
+            'cpp': spend / reach * 1000 if reach else 0.0
+        }
+        record = {key: str(row[key]) for key in _graph_levels(level) + breakdowns}
+        for field in fields:
+            if field in values:
+                record[field] = _number(values[field])
+            elif field == 'actions':
+                record['actions'] = [
+                    {'action_type': 'link_click', 'value': str(int(clicks))},
+                    {'action_type': 'purchase', 'value': str(int(row['conversions']))}
+                ]
+            elif field == 'account_id':
+                record['account_id'] = str(META_ACCOUNT_ID_BASE)
+        day = pd.Timestamp(row['date']).strftime('%Y-%m-%d') if daily else None
+        record['date_start'] = day or start_date
+        record['date_stop'] = day or end_date
+        records.append(record)
+    return records
+
+
+def _graph_page(request: Request, records: List[Dict[str, Any]], page_size: int) -> Dict[str, Any]:
+    limit = int(request.query_params.get('limit') or page_size)
+    offset = _decode_cursor(request.query_params.get('after'))
+    page = records[offset:offset + limit]
+    body: Dict[str, Any] = {'data': page}
+    if records:
+        body['paging'] = {'cursors': {'before': _encode_cursor(offset), 'after': _encode_cursor(offset + len(page))}}
+        if offset + limit < len(records):
+            body['paging']['next'] = str(request.url.include_query_params(after=_encode_cursor(offset + limit)))
+    return body
+
+
+def _graph_error(standin: PlatformStandin) -> Tuple[int, Dict[str, Any]]:
+    if standin.coin():
+        return 400, {'error': {'message': '(#17) User request limit reached', 'type': 'OAuthException',
+                               'is_transient': True, 'code': 17, 'fbtrace_id': 'standin'}}
+    return 500, {'error': {'message': 'An unknown error has occurred.', 'type': 'OAuthException',
+                           'is_transient': True, 'code': 1, 'fbtrace_id': 'standin'}}
+
+
+def _split_fields(fields: str) -> Tuple[List[str], List[str]]:
+    """Top-level fields and the nested insights{...} fields of a Graph fields parameter"""
+    nested = re.search(r'insights\{([^}]*)\}', fields or '')
+    insight_fields = [f.strip() for f in nested.group(1).split(',')] if nested else []
+    top_level = re.sub(r'insights\{[^}]*\}', 'insights', fields or '')
+    return [f.strip() for f in top_level.split(',') if f.strip()], insight_fields
+
+
+def _graph_time_range(request: Request) -> Tuple[str, str]:
+    time_range = request.query_params.get('time_range')
+    if time_range:
+        parsed = json.loads(time_range)
+        return _date_range(parsed.get('since'), parsed.get('until'))
+    preset = request.query_params.get('date_preset', 'last_30d')
+    days = int(re.sub(r'\D', '', preset) or 30) if preset.startswith('last_') else 30
+    return _date_range(None, 'yesterday', default_days=days)
+
+
+# --- GA4 Data API ---
+
+GA4_DIMENSION_COLUMNS = {
+    'sessionDefaultChannelGrouping': 'channel_grouping',
+    'sessionDefaultChannelGroup': 'channel_grouping',
+    'defaultChannelGroup': 'channel_grouping',
+    'firstUserDefaultChannelGroup': 'channel_grouping',
+    'sessionSourceMedium': 'source_medium',
+    'sessionCampaignName': 'sessionCampaignName',
+    'campaignName': 'sessionCampaignName',
+    'deviceCategory': 'deviceCategory',
+    'city': 'city',
+    'country': 'country'
+}
+GA4_SUM_COLUMNS = ['sessions', 'newUsers', 'screenPageViews', 'userEngagementDuration', 'keyEvents', 'totalRevenue']
+GA4_METRIC_TYPES = {
+    'totalRevenue': 'TYPE_CURRENCY',
+    'userEngagementDuration': 'TYPE_SECONDS',
+    'averageSessionDuration': 'TYPE_SECONDS',
+    'engagementRate': 'TYPE_FLOAT',
+    'bounceRate': 'TYPE_FLOAT',
+    'screenPageViewsPerSession': 'TYPE_FLOAT'
+}
+
+
+def _ga4_dimension(df: pd.DataFrame, name: str) -> pd.Series:
+    if name == 'date':
+        return pd.to_datetime(df['date']).dt.strftime('%Y%m%d')
+    if name in ('sessionSource', 'sessionMedium'):
+        parts = df['source_medium'].astype(str).str.split(' / ', n=1, expand=True)
+        return parts[0 if name == 'sessionSource' else 1]
+    if name in GA4_DIMENSION_COLUMNS:
+        return df[GA4_DIMENSION_COLUMNS[name]].astype(str)
+    return pd.Series('(not set)', index=df.index)
+
+
+def _ga4_metrics(sums: pd.DataFrame, name: str) -> pd.Series:
+    sessions = sums['sessions'].replace(0, np.nan)
+    derived = {
+        'totalUsers': lambda: np.round(sums['newUsers'] * 1.35),
+        'activeUsers': lambda: np.round(sums['newUsers'] * 1.3),
+        'conversions': lambda: sums['keyEvents'],
+        'engagedSessions': lambda: np.round(sums['engaged']),
+        'engagementRate': lambda: sums['engaged'] / sessions,
+        'bounceRate': lambda: 1 - sums['engaged'] / sessions,
+        'averageSessionDuration': lambda: sums['userEngagementDuration'] / sessions,
+        'screenPageViewsPerSession': lambda: sums['screenPageViews'] / sessions,
+        'eventCount': lambda: sums['screenPageViews'] * 3 + sums['keyEvents'],
+        'purchaseRevenue': lambda: sums['totalRevenue']
+    }
+    if name in GA4_SUM_COLUMNS:
+        return sums[name]
+    if name in derived:
+        return derived[name]().fillna(0)
+    return pd.Series(0, index=sums.index)
+
+
+def ga4_report(df: pd.DataFrame, body: Dict[str, Any]) -> Dict[str, Any]:
+    """A runReport response (REST JSON) for a request body"""
+    dimensions = [d['name'] for d in body.get('dimensions', [])]
+    metrics = [m['name'] for m in body.get('metrics', [])]
+    limit = int(body.get('limit') or GA4_DEFAULT_LIMIT)
+    offset = int(body.get('offset') or 0)
+
+    values = df[GA4_SUM_COLUMNS].copy()
+    values['engaged'] = df['sessions'] * df['engagementRate']
+    if dimensions:
+        keys = [_ga4_dimension(df, name).rename(f"d{i}") for i, name in enumerate(dimensions)]
+        sums = values.groupby(keys, sort=True).sum()
+        # GA4 orders by the first metric (descending) when no orderBys are given
+        if metrics:
+            sums = sums.assign(_order=_ga4_metrics(sums, metrics[0])).sort_values('_order', ascending=False)
+    else:
+        sums = values.sum().to_frame().T
+
+    metric_values = {name: _ga4_metrics(sums, name) for name in metrics}
+    rows = []
+    for position in range(offset, min(offset + limit, len(sums))):
+        key = sums.index[position]
+        key = key if isinstance(key, tuple) else (key,)
+        rows.append({
+            'dimensionValues': [{'value': str(value)} for value in key] if dimensions else [],
+            'metricValues': [{'value': _number(metric_values[name].iloc[position])} for name in metrics]
+        })
+
+    return {
+        'dimensionHeaders': [{'name': name} for name in dimensions],
+        'metricHeaders': [{'name': name, 'type': GA4_METRIC_TYPES.get(name, 'TYPE_INTEGER')} for name in metrics],
+        'rows': rows,
+        'rowCount': len(sums),
+        'metadata': {'currencyCode': 'ZAR', 'timeZone': 'Africa/Johannesburg'},
+        'kind': 'analyticsData#runReport'
+    }
+
+
+def _ga4_error(standin: PlatformStandin) -> Tuple[int, Dict[str, Any]]:
+    if standin.coin():
+        return 429, {'error': {'code': 429, 'status': 'RESOURCE_EXHAUSTED',
+                               'message': 'Exhausted concurrent requests quota.'}}
+    return 503, {'error': {'code': 503, 'status': 'UNAVAILABLE', 'message': 'The service is currently unavailable.'}}
+
+
+def create_app(standin: PlatformStandin) -> FastAPI:
+    """HTTP stand-in for the Graph API and the GA4 Data API REST endpoints"""
+    app = FastAPI(title="Platform API stand-in")
+    page_size = standin.config.page_size
+
+    async def call(api: str, error_response) -> Optional[JSONResponse]:
+        failed = standin.record(api)
+        await asyncio.sleep(standin.delay())
+        if failed:
+            status, body = error_response(standin)
+            return JSONResponse(body, status_code=status)
+        return None
+
+    @app.get("/_standin/stats")
+    async def stats():
+        return standin.stats()
+
+    @app.post("/v1beta/properties/{property_id}:runReport")
+    async def run_report(property_id: str, request: Request):
+        error = await call("ga4.runReport", _ga4_error)
+        if error:
+            return error
+        body = await request.json()
+        return _run_report(body)
+
+    @app.post("/v1beta/properties/{property_id}:batchRunReports")
+    async def batch_run_reports(property_id: str, request: Request):
+        error = await call("ga4.batchRunReports", _ga4_error)
+        if error:
+            return error
+        body = await request.json()
+        return {'reports': [_run_report(report) for report in body.get('requests', [])],
+                'kind': 'analyticsData#batchRunReports'}
+
+    def _run_report(body: Dict[str, Any]) -> Dict[str, Any]:
+        date_range = (body.get('dateRanges') or [{}])[0]
+        start, end = _date_range(date_range.get('startDate'), date_range.get('endDate'))
+        return ga4_report(standin.frame(standin.ga4, start, end), body)
+
+    @app.get("/{version}/oauth/access_token")
+    async def access_token():
+        return {'access_token': 'standin-token', 'token_type': 'bearer', 'expires_in': 5183944}
+
+    @app.get("/{version}/me")
+    async def me():
+        return {'id': '1000000000000001', 'name': 'Load Test User', 'email': 'load-test@example.com'}
+
+    @app.get("/{version}/me/adaccounts")
+    async def ad_accounts(request: Request):
+        error = await call("graph.adaccounts", _graph_error)
+        if error:
+            return error
+        accounts = [{
+            'id': f"act_{META_ACCOUNT_ID_BASE + index}",
+            'account_id': str(META_ACCOUNT_ID_BASE + index),
+            'name': f"Load Test Account {index + 1}",
+            'currency': 'ZAR',
+            'timezone_name': 'Africa/Johannesburg',
+            'account_status': 1
+        } for index in range(standin.config.scale['accounts'])]
+        return _graph_page(request, accounts, page_size)
+
+    @app.get("/{version}/{account_id}/insights")
+    async def insights(account_id: str, request: Request):
+        error = await call("graph.insights", _graph_error)
+        if error:
+            return error
+        params = request.query_params
+        start, end = _graph_time_range(request)
+        fields = [f.strip() for f in params.get('fields', 'impressions,clicks,spend').split(',') if f.strip()]
+        breakdowns = [b.strip() for b in params.get('breakdowns', '').strip('[]').replace('"', '').split(',') if b.strip()]
+        records = graph_insights(
+            _meta_rows(standin, account_id, start, end), fields, params.get('level', 'account'),
+            daily=params.get('time_increment') == '1' or 'date' in breakdowns,
+            breakdowns=breakdowns, start_date=start, end_date=end, seed=standin.config.seed
+        )
+        return _graph_page(request, records, page_size)
+
+    @app.get("/{version}/{account_id}/{edge}")
+    async def entities(account_id: str, edge: str, request: Request):
+        if edge not in ('campaigns', 'adsets', 'ads'):
+            return JSONResponse({'error': {'message': f"Unknown path components: /{edge}", 'type': 'OAuthException',
+                                           'code': 2500}}, status_code=400)
+        error = await call(f"graph.{edge}", _graph_error)
+        if error:
+            return error
+        start, end = _graph_time_range(request)
+        rows = _meta_rows(standin, account_id, start, end)
+        fields, insight_fields = _split_fields(request.query_params.get('fields', 'id,name'))
+        level = {'campaigns': 'campaign', 'adsets': 'adset', 'ads': 'ad'}[edge]
+        entity_insights = {}
+        if 'insights' in fields:
+            for record in graph_insights(rows, insight_fields, level, daily=False, breakdowns=[],
+                                         start_date=start, end_date=end, seed=standin.config.seed):
+                entity_insights[record[f'{level}_id']] = record
+
+        records = []
+        for entity in rows[_graph_levels(level)].drop_duplicates().to_dict('records'):
+            entity_id = str(entity[f'{level}_id'])
+            values = {'id': entity_id, 'name': str(entity[f'{level}_name']), 'status': 'ACTIVE',
+                      'effective_status': 'ACTIVE', 'objective': 'OUTCOME_SALES', 'daily_budget': '50000',
+                      'campaign_id': str(entity['campaign_id']), 'adset_id': str(entity.get('adset_id', ''))}
+            record = {field: values[field] for field in fields if field in values}
+            if 'insights' in fields and entity_id in entity_insights:
+                record['insights'] = {'data': [entity_insights[entity_id]]}
+            records.append(record)
+        return _graph_page(request, records, page_size)
+
+    return app
+
+
+# --- Google Ads API (gRPC) ---
+
+def _gaql_dates(query: str) -> Tuple[str, str]:
+    between = re.search(r"segments\.date\s+BETWEEN\s+'([\d-]+)'\s+AND\s+'([\d-]+)'", query, re.I)
+    if between:
+        return between.group(1), between.group(2)
+    during = re.search(r"segments\.date\s+DURING\s+(\w+)", query, re.I)
+    days = {'LAST_7_DAYS': 7, 'LAST_14_DAYS': 14, 'LAST_30_DAYS': 30, 'LAST_90_DAYS': 90,
+            'YESTERDAY': 1, 'TODAY': 1}.get(during.group(1).upper(), 30) if during else 30
+    end = 'today' if during and during.group(1).upper() == 'TODAY' else 'yesterday'
+    return _date_range(None, end, default_days=days)
+
+
+def gaql_rows(standin: PlatformStandin, customer_id: str, query: str) -> List[Dict[str, Any]]:
+    """GoogleAdsRow-shaped dicts for the fields a GAQL query selects"""
+    select = re.search(r"SELECT\s+(.+?)\s+FROM\s+(\w+)", query, re.I | re.S)
+    if not select:
+        raise ValueError("Invalid GAQL query")
+    fields = [f.strip() for f in select.group(1).split(',') if f.strip()]
+    resource = select.group(2).lower()
+    limit = re.search(r"\bLIMIT\s+(\d+)", query, re.I)
+
+    customer = {'id': int(customer_id or GOOGLE_ADS_CUSTOMER_ID_BASE), 'descriptive_name': f"Load Test Account {customer_id}",
+                'currency_code': 'ZAR', 'time_zone': 'Africa/Johannesburg',
+                'resource_name': f"customers/{customer_id}"}
+    if resource == 'customer' and not any(f.startswith(('metrics.', 'segments.')) for f in fields):
+        rows = [{'customer': customer}]
+    else:
+        start, end = _gaql_dates(query)
+        df = standin.frame(standin.google_ads, start, end)
+        index = int(customer_id or 0) - GOOGLE_ADS_CUSTOMER_ID_BASE
+        if 0 <= index < standin.config.scale['accounts']:
+            df = df[df['campaign_name'].astype(str).str.startswith(f"Search Acct{index + 1} ")]
+
+        daily = 'segments.date' in fields
+        keys = ['campaign_id', 'campaign_name', 'campaign_status'] + (['date'] if daily else [])
+        df = df.groupby(keys, observed=True, sort=True)[['impressions', 'clicks', 'spend', 'conversions']].sum().reset_index()
+        rows = []
+        for row in df.to_dict('records'):
+            impressions, clicks, spend, conversions = row['impressions'], row['clicks'], row['spend'], row['conversions']
+            campaign_id = int(row['campaign_id'])
+            rows.append({
+                'customer': customer,
+                'campaign': {'id': campaign_id, 'name': str(row['campaign_name']), 'status': str(row['campaign_status']),
+                             'resource_name': f"customers/{customer_id}/campaigns/{campaign_id}",
+                             'advertising_channel_type': 'SEARCH'},
+                'ad_group': {'id': campaign_id * 10 + 1, 'name': f"{row['campaign_name']} - Ad group 1", 'status': 'ENABLED',
+                             'resource_name': f"customers/{customer_id}/adGroups/{campaign_id * 10 + 1}"},
+                'metrics': {
+                    'impressions': int(impressions),
+                    'clicks': int(clicks),
+                    'cost_micros': int(round(spend * 1000000)),
+                    'conversions': float(conversions),
+                    'conversions_value': float(conversions) * 450.0,
+                    'all_conversions': float(conversions) * 1.1,
+                    'interactions': int(clicks),
+                    'ctr': clicks / impressions if impressions else 0.0,
+                    'average_cpc': spend / clicks * 1000000 if clicks else 0.0,
+                    'average_cpm': spend / impressions * 1000000000 if impressions else 0.0,
+                    'cost_per_conversion': spend / conversions * 1000000 if conversions else 0.0
+                },
+                'segments': {'date': pd.Timestamp(row['date']).strftime('%Y-%m-%d')} if daily else {}
+            })
+
+    # Keep only the selected fields, like the API does
+    selected = []
+    for row in rows:
+        shaped: Dict[str, Dict[str, Any]] = {}
+        for field in fields:
+            parts = field.split('.')
+            if len(parts) == 2 and parts[1] in row.get(parts[0], {}):
+                shaped.setdefault(parts[0], {})[parts[1]] = row[parts[0]][parts[1]]
+        selected.append(shaped)
+    return selected[:int(limit.group(1))] if limit else selected
+
+
+def _grpc_handlers(standin: PlatformStandin, version: str):
+    import grpc
+
+    service_types = importlib.import_module(f"google.ads.googleads.{version}.services.types.google_ads_service")
+    customer_types = importlib.import_module(f"google.ads.googleads.{version}.services.types.customer_service")
+    GoogleAdsRow = service_types.GoogleAdsRow
+
+    def fault(context, api: str):
+        failed = standin.record(api)
+        time.sleep(standin.delay())
+        if failed:
+            code = grpc.StatusCode.RESOURCE_EXHAUSTED if standin.coin() else grpc.StatusCode.UNAVAILABLE
+            context.abort(code, "Injected stand-in error")
+
+    def rows_for(request, context) -> List[Any]:
+        try:
+            return [GoogleAdsRow(row) for row in gaql_rows(standin, request.customer_id, request.query)]
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+    def search(request, context):
+        fault(context, "google_ads.search")
+        rows = rows_for(request, context)
+        offset = int(request.page_token or 0)
+        page = rows[offset:offset + GOOGLE_ADS_PAGE_SIZE]
+        next_offset = offset + GOOGLE_ADS_PAGE_SIZE
+        return service_types.SearchGoogleAdsResponse(
+            results=page,
+            next_page_token=str(next_offset) if next_offset < len(rows) else "",
+            total_results_count=len(rows) if request.return_total_results_count else 0
+        )
+
+    def search_stream(request, context) -> Iterator[Any]:
+        fault(context, "google_ads.search_stream")
+        rows = rows_for(request, context)
+        for offset in range(0, len(rows), GOOGLE_ADS_PAGE_SIZE):
+            yield service_types.SearchGoogleAdsStreamResponse(results=rows[offset:offset + GOOGLE_ADS_PAGE_SIZE])
+
+    def list_accessible_customers(request, context):
+        fault(context, "google_ads.list_accessible_customers")
+        return customer_types.ListAccessibleCustomersResponse(resource_names=[
+            f"customers/{GOOGLE_ADS_CUSTOMER_ID_BASE + index}" for index in range(standin.config.scale['accounts'])
+        ])
+
+    google_ads_service = grpc.method_handlers_generic_handler(
+        f"google.ads.googleads.{version}.services.GoogleAdsService", {
+            "Search": grpc.unary_unary_rpc_method_handler(
+                search,
+                request_deserializer=service_types.SearchGoogleAdsRequest.deserialize,
+                response_serializer=service_types.SearchGoogleAdsResponse.serialize),
+            "SearchStream": grpc.unary_stream_rpc_method_handler(
+                search_stream,
+                request_deserializer=service_types.SearchGoogleAdsStreamRequest.deserialize,
+                response_serializer=service_types.SearchGoogleAdsStreamResponse.serialize)
+        })
+    customer_service = grpc.method_handlers_generic_handler(
+        f"google.ads.googleads.{version}.services.CustomerService", {
+            "ListAccessibleCustomers": grpc.unary_unary_rpc_method_handler(
+                list_accessible_customers,
+                request_deserializer=customer_types.ListAccessibleCustomersRequest.deserialize,
+                response_serializer=customer_types.ListAccessibleCustomersResponse.serialize)
+        })
+    return [google_ads_service, customer_service]
+
+
+def ensure_certificate(directory: str) -> Tuple[str, str]:
+    """Self-signed localhost certificate for the gRPC stand-in (the Google Ads client only speaks TLS)"""
+    os.makedirs(directory, exist_ok=True)
+    cert_file, key_file = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    if not (os.path.exists(cert_file) and os.path.exists(key_file)):
+        subprocess.run([
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "365",
+            "-keyout", key_file, "-out", cert_file, "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"
+        ], check=True, capture_output=True)
+    return cert_file, key_file
+
+
+def start_google_ads_server(standin: PlatformStandin, host: str, port: int, versions: List[str],
+                            cert_dir: Optional[str] = None, workers: int = 32):
+    """Start the Google Ads gRPC stand-in (TLS unless cert_dir is None); returns the grpc.Server"""
+    import grpc
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers))
+    for version in versions:
+        server.add_generic_rpc_handlers(_grpc_handlers(standin, version))
+
+    address = f"{host}:{port}"
+    if cert_dir:
+        cert_file, key_file = ensure_certificate(cert_dir)
+        with open(cert_file, "rb") as cert, open(key_file, "rb") as key:
+            server.add_secure_port(address, grpc.ssl_server_credentials([(key.read(), cert.read())]))
+    else:
+        server.add_insecure_port(address)
+    server.start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None):
+    from platform_endpoints import GOOGLE_ADS_API_VERSION
+
+    parser = argparse.ArgumentParser(description="Local Meta Graph / GA4 Data / Google Ads API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--http-port", type=int, default=8090, help="Graph API and GA4 Data API (REST)")
+    parser.add_argument("--grpc-port", type=int, default=8091, help="Google Ads API (gRPC); 0 disables it")
+    parser.add_argument("--scale", default="medium", help="fake_connectors scale: small, medium or large")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="mean injected latency per call")
+    parser.add_argument("--jitter", type=float, default=0.3, help="latency jitter as a fraction of the mean")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls failing with a transient error")
+    parser.add_argument("--page-size", type=int, default=100, help="Graph API page size when no limit is given")
+    parser.add_argument("--google-ads-version", action="append", default=None,
+                        help=f"Google Ads API version(s) to serve (default {GOOGLE_ADS_API_VERSION})")
+    parser.add_argument("--cert-dir", default=os.path.join(os.getcwd(), ".platform-standin"),
+                        help="where the self-signed gRPC certificate is kept")
+    parser.add_argument("--insecure-grpc", action="store_true", help="serve gRPC without TLS")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    standin = PlatformStandin(StandinConfig(
+        scale=args.scale, seed=args.seed, latency=args.latency_ms / 1000, jitter=args.jitter,
+        error_rate=args.error_rate, page_size=args.page_size
+    ))
+
+    environment = {
+        "META_GRAPH_API_BASE": f"http://{args.host}:{args.http_port}",
+        "GA4_DATA_API_ENDPOINT": f"http://{args.host}:{args.http_port}",
+        "PLATFORM_ANONYMOUS_CREDENTIALS": "true"
+    }
+    grpc_server = None
+    if args.grpc_port:
+        try:
+            cert_dir = None if args.insecure_grpc else args.cert_dir
+            grpc_server = start_google_ads_server(standin, args.host, args.grpc_port,
+                                                  args.google_ads_version or [GOOGLE_ADS_API_VERSION], cert_dir)
+            environment["GOOGLE_ADS_API_ENDPOINT"] = f"localhost:{args.grpc_port}"
+            if cert_dir:
+                environment["GRPC_DEFAULT_SSL_ROOTS_FILE_PATH"] = os.path.join(cert_dir, "cert.pem")
+        except ImportError as e:
+            logger.warning(f"Google Ads stand-in disabled ({e}); install grpcio and google-ads to serve GAQL")
+
+    print("Start mcp-backend with:")
+    for key, value in environment.items():
+        print(f"  export {key}={value}")
+
+    import uvicorn
+    try:
+        uvicorn.run(create_app(standin), host=args.host, port=args.http_port, log_level="warning")
+    finally:
+        if grpc_server is not None:
+            grpc_server.stop(grace=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmarks for every routes/ad_insights.py analysis on combined Meta + Google Ads data
+"""
+
+import asyncio
+
+import pytest
+
+ad_insights = pytest.importorskip("routes.ad_insights")
+
+
+@pytest.fixture(scope="module")
+def ads_df(bench_recorder):
+    # The same shape the ad insight endpoints get from fetch_specific_data
+    from benchmarks.fake_connectors import build_fake_integrator
+    integrator = build_fake_integrator(bench_recorder.scale, latency=0.0, latency_per_1k_rows=0.0)
+    return asyncio.run(integrator.fetch_specific_data(['meta_ads', 'google_ads'], None, None))
+
+
+def test_analyze_ad_performance(bench, ads_df):
+    bench(ad_insights._analyze_ad_performance, ads_df)
+
+
+def test_compare_campaigns(bench, ads_df):
+    bench(ad_insights._compare_campaigns, ads_df)
+
+
+def test_generate_recommendations(bench, ads_df):
+    bench(ad_insights._generate_recommendations, ads_df, 100)
+
+
+@pytest.mark.parametrize("metric", ['ctr', 'cpc', 'conversions'])
+def test_analyze_trends(bench, ads_df, metric):
+    bench(ad_insights._analyze_trends, ads_df, metric)
+
+
+def test_generate_action_plan(bench, ads_df):
+    bench(ad_insights._generate_action_plan, ads_df, 50)
+
+
+def test_calculate_budget_reallocation(bench, ads_df):
+    bench(ad_insights._calculate_budget_reallocation, ads_df, 10000)
+
+
+def test_run_file_insight_analyses(bench, ads_df):
+    result = bench(ad_insights._run_file_insight_analyses, ads_df)
+    assert "error" not in result["performance_analysis"]
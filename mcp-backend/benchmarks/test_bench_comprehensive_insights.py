@@ -0,0 +1,44 @@
+"""
+Benchmarks for the comprehensive insights endpoint: per-platform and combined
+insight generation, and the whole request against fake connectors
+"""
+
+import pandas as pd
+
+from benchmarks.fake_connectors import DEFAULT_END_DATE
+from credential_manager import credential_manager
+from routes import comprehensive_insights as ci
+
+
+def test_google_ads_insights(bench, google_df):
+    insights = bench(ci._generate_google_ads_insights, google_df, 100)
+    assert "error" not in insights
+
+
+def test_ga4_insights(bench, ga4_df):
+    # _generate_ga4_insights converts columns in place
+    insights = bench(ci._generate_ga4_insights, ga4_df.copy())
+    assert "error" not in insights
+
+
+def test_combined_insights(bench, meta_df, google_df, ga4_df):
+    platform_data = {'facebook': meta_df, 'google_ads': google_df, 'google_analytics': ga4_df.copy()}
+    bench(ci._generate_combined_insights, platform_data, list(platform_data), 100, 50)
+
+
+def test_comprehensive_insights_request(bench, bench_scale, fake_integrator, monkeypatch):
+    monkeypatch.setattr(credential_manager, "build_integrator_for_user", lambda user_id: fake_integrator)
+    end = pd.Timestamp(DEFAULT_END_DATE)
+    date_range = {
+        "start_date": (end - pd.Timedelta(days=bench_scale['days'] - 1)).strftime('%Y-%m-%d'),
+        "end_date": end.strftime('%Y-%m-%d')
+    }
+    request = ci.ComprehensiveInsightsRequest(
+        user_id="bench-user",
+        **date_range,
+        data_selections=[ci.DataSelection(platform=platform, date_range=date_range)
+                         for platform in ['facebook', 'google_ads', 'google_analytics']]
+    )
+
+    response = bench(ci.comprehensive_insights, request)
+    assert response["configuration"]["platforms_analyzed"] == ['facebook', 'google_ads', 'google_analytics']
@@ -0,0 +1,29 @@
+"""
+DataLoader parsing benchmarks on synthetic Meta and Google Ads CSV exports
+"""
+
+import pytest
+
+from benchmarks.fake_connectors import google_ads_export_csv, meta_ads_export_csv
+from data_loader import DataLoader
+
+
+@pytest.fixture(scope="module")
+def meta_export(meta_df):
+    return meta_ads_export_csv(meta_df)
+
+
+@pytest.fixture(scope="module")
+def google_export(google_df):
+    return google_ads_export_csv(google_df)
+
+
+def test_load_meta_export(bench, meta_export, meta_df):
+    df = bench(DataLoader.load_csv_from_bytes, meta_export, "Ad group report.csv")
+    # Title rows and the Total: row are dropped
+    assert len(df) == len(meta_df)
+
+
+def test_load_google_export(bench, google_export, google_df):
+    df = bench(DataLoader.load_csv_from_bytes, google_export, "google_ads_campaigns.csv")
+    assert len(df) == len(google_df)
@@ -0,0 +1,50 @@
+"""
+Benchmarks for the batched forecasting model and the model registry the
+predict endpoints persist it in
+"""
+
+import pytest
+
+from analytics.forecasting import WeeklyTrendModel, daily_series
+from analytics.model_registry import ModelRegistry
+
+METRICS = ['sessions', 'newUsers', 'screenPageViews', 'keyEvents']
+WINDOW = {"start_date": "2025-01-01", "metrics": METRICS}
+
+
+@pytest.fixture(scope="module")
+def daily(ga4_df):
+    # One series per campaign and metric, as for a multi-account forecast
+    return daily_series(ga4_df, METRICS, group_col='sessionCampaignName')
+
+
+@pytest.fixture(scope="module")
+def model_state(daily):
+    return WeeklyTrendModel(daily.iloc[:-7]).get_state()
+
+
+def test_trend_model_fit(bench, daily):
+    bench(WeeklyTrendModel, daily)
+
+
+def test_trend_model_update(bench, daily, model_state):
+    model = bench(lambda: WeeklyTrendModel.from_state(model_state).update(daily.iloc[-7:]))
+    assert list(model.n_obs) == [len(daily)] * daily.shape[1]
+
+
+def test_trend_model_forecast(bench, daily):
+    model = WeeklyTrendModel(daily)
+    bench(model.forecast, 30)
+
+
+def test_model_registry_round_trip(bench, tmp_path, model_state):
+    registry = ModelRegistry(root=str(tmp_path))
+    state = {"trained_through": "2025-06-23", "model": model_state}
+
+    def save_and_load_cold():
+        registry.save("bench-property", "traffic", WINDOW, state)
+        # A fresh registry has an empty memory LRU, so the load reads the .npz file
+        return ModelRegistry(root=str(tmp_path)).load("bench-property", "traffic", WINDOW)
+
+    loaded = bench(save_and_load_cold)
+    assert loaded["trained_through"] == "2025-06-23"
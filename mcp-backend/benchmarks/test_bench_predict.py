@@ -0,0 +1,51 @@
+"""
+Benchmarks for the routes/predict.py GA4 prediction models
+"""
+
+import pytest
+
+predict = pytest.importorskip("routes.predict")
+
+from analytics.forecasting import WeeklyTrendModel, daily_series
+
+
+@pytest.fixture(scope="module")
+def ga4_predict_df(ga4_df):
+    # The predict endpoints request totalUsers and conversions instead of newUsers/keyEvents
+    return predict._preprocess_ga4_data(ga4_df.rename(columns={'newUsers': 'totalUsers', 'keyEvents': 'conversions'}))
+
+
+@pytest.fixture(scope="module")
+def daily(ga4_predict_df):
+    return daily_series(ga4_predict_df, ['sessions', 'totalUsers', 'screenPageViews', 'conversions'])
+
+
+def test_daily_series(bench, ga4_predict_df):
+    bench(daily_series, ga4_predict_df, ['sessions', 'totalUsers', 'screenPageViews', 'conversions'])
+
+
+def test_traffic_prediction_model(bench, daily):
+    bench(predict._build_traffic_prediction_model, daily[['sessions', 'totalUsers', 'screenPageViews']], 30)
+
+
+def test_conversion_prediction_model(bench, daily):
+    bench(predict._build_conversion_prediction_model, daily[['conversions', 'sessions']], 30)
+
+
+def test_trend_model_update(bench, daily):
+    model = WeeklyTrendModel(daily.iloc[:-7])
+    bench(lambda: WeeklyTrendModel.from_state(model.get_state()).update(daily.iloc[-7:]))
+
+
+def test_user_segments(bench, ga4_predict_df):
+    bench(lambda: predict._predict_user_segments(predict._segment_channel_stats(ga4_predict_df)))
+
+
+def test_revenue_impact(bench, ga4_predict_df):
+    revenue = ga4_predict_df[['date', 'totalRevenue']]
+    bench(predict._predict_revenue_impact, ga4_predict_df, revenue, [])
+
+
+def test_seasonal_trends(bench, daily):
+    result = bench(predict._predict_seasonal_trends, daily)
+    assert "error" not in result
@@ -4,20 +4,93 @@ Main consolidation class for uploaded data
 """
 
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import logging
 
+from analytics.metrics_frame import MetricsFrame
 from data_standardizer import DataStandardizer
 from insights_generator import InsightsGenerator
 
 logger = logging.getLogger(__name__)
 
+class ConsolidationBuilder:
+    """
+    Collects standardized chunks and materializes them with a single concat.
+
+    Appending to a growing frame copies everything added so far on every call;
+    here each chunk is kept as-is until build(), where column dtypes are unified
+    across all chunks in one pass and the result is assembled once.
+    """
+    
+    def __init__(self):
+        self._chunks: List[pd.DataFrame] = []
+        self._built: Optional[pd.DataFrame] = None
+    
+    def add(self, df: pd.DataFrame) -> None:
+        if df is None or df.empty:
+            return
+        self._chunks.append(df)
+        self._built = None
+    
+    def build(self) -> pd.DataFrame:
+        """The consolidated frame; cached until more chunks are added"""
+        if self._built is not None:
+            return self._built
+        if not self._chunks:
+            return pd.DataFrame()
+        
+        target_dtypes = self._unified_dtypes()
+        chunks = []
+        for chunk in self._chunks:
+            casts = {col: dtype for col, dtype in target_dtypes.items()
+                     if col in chunk.columns and chunk[col].dtype != dtype}
+            chunks.append(chunk.astype(casts, copy=False) if casts else chunk)
+        
+        self._built = pd.concat(chunks, ignore_index=True, sort=False)
+        # The chunks are now part of the built frame; keep it as the only chunk
+        self._chunks = [self._built]
+        return self._built
+    
+    def _unified_dtypes(self) -> Dict[str, Any]:
+        """One dtype per column across all chunks, so concat never falls back per pair"""
+        seen: Dict[str, List[Any]] = {}
+        for chunk in self._chunks:
+            for col, dtype in chunk.dtypes.items():
+                seen.setdefault(col, []).append(dtype)
+        
+        target = {}
+        for col, dtypes in seen.items():
+            if col in DataStandardizer.NUMERIC_COLUMNS:
+                target[col] = 'float64'
+            elif all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) for dtype in dtypes):
+                if len(set(dtypes)) > 1:
+                    target[col] = 'float64'
+            elif len(set(dtypes)) > 1:
+                # Mixed text/number/date across platforms
+                target[col] = object
+        return target
+
+
 class CleanDataConsolidator:
     """Clean, modular data consolidator for API uploads"""
     
     def __init__(self):
-        self.data = pd.DataFrame()
+        self.builder = ConsolidationBuilder()
         self.standardizer = DataStandardizer()
+        self._metrics: Optional[MetricsFrame] = None
+    
+    @property
+    def data(self) -> pd.DataFrame:
+        """Consolidated data, materialized once from the collected chunks"""
+        return self.builder.build()
+    
+    @property
+    def metrics(self) -> MetricsFrame:
+        """Derived metrics and groupings over the consolidated data, shared by all insights"""
+        data = self.data
+        if self._metrics is None or self._metrics.raw is not data:
+            self._metrics = MetricsFrame(data)
+        return self._metrics
     
     def add_ga4_data(self, df: pd.DataFrame) -> bool:
         """Add GA4 data from DataFrame"""
@@ -49,12 +122,26 @@ class CleanDataConsolidator:
         logger.info(f"Added {len(standardized)} Google Ads records")
         return True
     
+    def add_standardized_data(self, df: pd.DataFrame, source: str) -> bool:
+        """
+        Add data that already uses the standardized column names and types
+        (Parquet/Arrow uploads); skips column mapping and numeric cleanup
+        """
+        if df is None or df.empty:
+            return False
+        
+        if 'source' not in df.columns:
+            df = df.assign(source=source)
+        self._append_data(df)
+        logger.info(f"Added {len(df)} pre-standardized {source} records")
+        return True
+    
     def generate_insights(self) -> Dict[str, Any]:
         """Generate all insights from consolidated data"""
         if self.data.empty:
             return {"error": "No data available"}
         
-        insights_gen = InsightsGenerator(self.data)
+        insights_gen = InsightsGenerator(self.metrics)
         
         return {
             "summary": insights_gen.generate_summary(),
@@ -68,13 +155,15 @@ class CleanDataConsolidator:
         if self.data.empty:
             return {"error": "No data available"}
         
-        return InsightsGenerator(self.data).generate_summary()
+        return InsightsGenerator(self.metrics).generate_summary()
     
-    def get_data(self) -> pd.DataFrame:
-        """Get copy of consolidated data"""
-        return self.data.copy()
+    def get_data(self, copy: bool = False) -> pd.DataFrame:
+        """
+        Get consolidated data. By default this is a shallow view sharing the
+        column arrays: adding or replacing columns is fine, in-place edits are not.
+        """
+        return self.data.copy(deep=copy)
     
     def _append_data(self, df: pd.DataFrame) -> None:
-        """Append standardized data to main dataset"""
-        standardized = self.standardizer.ensure_required_columns(df)
-        self.data = pd.concat([self.data, standardized], ignore_index=True)
\ No newline at end of file
+        """Add standardized data as a chunk; merged on first access to self.data"""
+        self.builder.add(self.standardizer.ensure_required_columns(df))
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Columnar IO Module
+Parquet and Arrow IPC uploads/exports of standardized data, so batch jobs can
+exchange pre-typed files with the service instead of CSV
+"""
+
+import io
+import os
+from typing import BinaryIO, List, Optional
+import logging
+
+import pandas as pd
+
+from data_standardizer import DataStandardizer
+
+logger = logging.getLogger(__name__)
+
+PARQUET_MAGIC = b'PAR1'
+ARROW_FILE_MAGIC = b'ARROW1'
+# Arrow IPC streams start with a continuation marker
+ARROW_STREAM_MAGIC = b'\xff\xff\xff\xff'
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc', '.arrows')
+
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+class SchemaValidationError(ValueError):
+    """Raised when a columnar upload does not match the standardized column set"""
+
+    def __init__(self, filename: str, problems: List[str]):
+        self.problems = problems
+        super().__init__(f"{filename}: " + "; ".join(problems))
+
+
+class ColumnarReadError(ValueError):
+    """Raised when a Parquet or Arrow upload is corrupt or not in the format it claims to be"""
+
+    def __init__(self, filename: str, fmt: str, reason: str):
+        self.fmt = fmt
+        label = "Parquet" if fmt == 'parquet' else "Arrow IPC"
+        super().__init__(f"'{filename}' is not a readable {label} file: {reason}")
+
+
+def detect_upload_format(stream: BinaryIO, filename: Optional[str] = None) -> str:
+    """'parquet', 'arrow' or 'csv', from the file name and the leading magic bytes"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        return 'parquet'
+    if extension in ARROW_EXTENSIONS:
+        return 'arrow'
+
+    start = stream.tell()
+    head = stream.read(8)
+    stream.seek(start)
+    if head.startswith(PARQUET_MAGIC):
+        return 'parquet'
+    if head.startswith(ARROW_FILE_MAGIC) or head.startswith(ARROW_STREAM_MAGIC):
+        return 'arrow'
+    return 'csv'
+
+
+def _is_string(arrow_type) -> bool:
+    import pyarrow as pa
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+
+def _is_numeric(arrow_type) -> bool:
+    import pyarrow as pa
+    return (pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type)
+            or pa.types.is_decimal(arrow_type) or pa.types.is_boolean(arrow_type))
+
+
+def _is_date(arrow_type) -> bool:
+    import pyarrow as pa
+    return pa.types.is_date(arrow_type) or pa.types.is_timestamp(arrow_type) or _is_string(arrow_type)
+
+
+def validate_standardized_schema(schema, filename: str = "") -> None:
+    """
+    Check an Arrow schema against DataStandardizer's column set: standardized
+    columns must have compatible types and at least one metric must be present.
+    Other columns are passed through untouched, as with CSV uploads.
+    """
+    import pyarrow as pa
+
+    checks = (
+        [(col, _is_string, "string") for col in DataStandardizer.STRING_COLUMNS + DataStandardizer.OPTIONAL_STRING_COLUMNS]
+        + [(col, _is_numeric, "numeric") for col in DataStandardizer.NUMERIC_COLUMNS + DataStandardizer.OPTIONAL_NUMERIC_COLUMNS]
+        + [(col, _is_date, "date, timestamp or string") for col in DataStandardizer.DATE_COLUMNS]
+    )
+
+    problems = []
+    for col, is_compatible, expected in checks:
+        if col not in schema.names:
+            continue
+        arrow_type = schema.field(col).type
+        if not (pa.types.is_null(arrow_type) or is_compatible(arrow_type)):
+            problems.append(f"column '{col}' is {arrow_type}, expected {expected}")
+
+    if not any(col in schema.names for col in DataStandardizer.NUMERIC_COLUMNS):
+        problems.append(f"no standardized metric columns; expected at least one of {DataStandardizer.NUMERIC_COLUMNS}")
+
+    if problems:
+        raise SchemaValidationError(filename or "upload", problems)
+
+
+def read_columnar(stream: BinaryIO, fmt: str, filename: str = "") -> pd.DataFrame:
+    """
+    Read a Parquet or Arrow IPC upload, validating its schema before any data is loaded.
+    Raises SchemaValidationError or, for unreadable files, ColumnarReadError.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if fmt not in ('parquet', 'arrow'):
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+
+    try:
+        if fmt == 'parquet':
+            parquet_file = pq.ParquetFile(stream)
+            validate_standardized_schema(parquet_file.schema_arrow, filename)
+            table = parquet_file.read()
+        else:
+            start = stream.tell()
+            try:
+                reader = pa.ipc.open_file(stream)
+            except pa.ArrowInvalid:
+                stream.seek(start)
+                reader = pa.ipc.open_stream(stream)
+            validate_standardized_schema(reader.schema, filename)
+            table = reader.read_all()
+    except (pa.ArrowException, OSError) as e:
+        # ArrowInvalid and friends; truncated files surface as OSError
+        raise ColumnarReadError(filename or "upload", fmt, str(e))
+
+    logger.info(f"Read {fmt} upload {filename}: {table.num_rows} rows, {table.num_columns} columns")
+    return table.to_pandas(split_blocks=True, self_destruct=True, date_as_object=False)
+
+
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """Serialize a consolidated frame to Parquet"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = df.copy(deep=False)
+    for col in df.columns[df.dtypes == object]:
+        # Unmapped source columns can mix numbers and text across platforms
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,394 @@
+"""
+Compute Executor Module
+Runs CPU-heavy analytics in a managed process pool so they don't block the event loop
+"""
+
+import asyncio
+import cProfile
+import functools
+import gc
+import marshal
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from mcp_profiling import current_profile
+from mcp_tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+COMPUTE_WORKERS = int(os.getenv("COMPUTE_WORKERS", str(min(4, os.cpu_count() or 1))))
+COMPUTE_TASK_TIMEOUT = float(os.getenv("COMPUTE_TASK_TIMEOUT", "120"))
+COMPUTE_MP_CONTEXT = os.getenv("COMPUTE_MP_CONTEXT", "spawn")
+# DataFrames/arrays below this size are pickled normally; larger ones go through shared memory
+COMPUTE_SHM_MIN_BYTES = int(os.getenv("COMPUTE_SHM_MIN_BYTES", str(256 * 1024)))
+
+
+class ComputeTimeoutError(TimeoutError):
+    """Raised when an offloaded task exceeds its timeout; the worker running it is replaced"""
+
+
+def offloadable(fn: Callable) -> Callable:
+    """
+    Mark a module-level analysis function as safe to run in a worker process:
+    it must be importable by name and take/return only picklable values.
+    """
+    fn.__offloadable__ = True
+    return fn
+
+
+class _SharedPayload:
+    """
+    A DataFrame/Series/ndarray whose buffers live in one shared memory block.
+    Only the pickle-5 metadata stream (and object columns) crosses the pipe.
+    """
+
+    def __init__(self, value: Any):
+        buffers: List[pickle.PickleBuffer] = []
+        self.header = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+        raw = [buffer.raw() for buffer in buffers]
+        self.sizes = [view.nbytes for view in raw]
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, sum(self.sizes)))
+        self.name = self._shm.name
+        offset = 0
+        for view in raw:
+            self._shm.buf[offset:offset + view.nbytes] = view.cast('B')
+            offset += view.nbytes
+
+    def __getstate__(self):
+        return {"header": self.header, "sizes": self.sizes, "name": self.name}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = None
+
+    def attach(self):
+        """Worker side: rebuild the object on top of the shared buffers (zero-copy)"""
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.name, track=False)
+        except TypeError:
+            # Python < 3.13: workers share the parent's resource tracker, which already knows the block
+            self._shm = shared_memory.SharedMemory(name=self.name)
+
+        views, offset = [], 0
+        for size in self.sizes:
+            views.append(self._shm.buf[offset:offset + size])
+            offset += size
+        return pickle.loads(self.header, buffers=views)
+
+    def detach(self):
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                # Something still references the shared buffers; the mapping goes with the process
+                pass
+
+    def release(self):
+        """Parent side: free the shared block once the task is finished"""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(index=True, deep=False)))
+    return value.nbytes
+
+
+def _run_task(fn: Callable, args: tuple, kwargs: dict) -> bytes:
+    """Worker entry point: materialize shared arguments, run, and return the pickled result"""
+    shared = [value for value in list(args) + list(kwargs.values()) if isinstance(value, _SharedPayload)]
+    try:
+        args = tuple(value.attach() if isinstance(value, _SharedPayload) else value for value in args)
+        kwargs = {key: value.attach() if isinstance(value, _SharedPayload) else value for key, value in kwargs.items()}
+        if getattr(fn, "__memoized__", False):
+            # The parent process already checked (and will fill) the analysis cache
+            fn = fn.__wrapped__
+        result = fn(*args, **kwargs)
+        # Serialize while the shared buffers are still mapped, in case the result holds views into them
+        payload = pickle.dumps(result, protocol=5)
+        del result, args, kwargs
+        return payload
+    finally:
+        gc.collect()
+        for value in shared:
+            value.detach()
+
+
+def _worker_main(conn):
+    """Worker process loop: run each (call, args) message and send back (ok, result or exception)"""
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        call, args = message
+        try:
+            outcome = (True, call(*args))
+        except BaseException as e:
+            outcome = (False, e)
+        try:
+            conn.send(outcome)
+        except Exception as e:
+            # The exception itself couldn't be pickled
+            conn.send((False, RuntimeError(f"{type(outcome[1]).__name__}: {outcome[1]} ({e})")))
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe; used by a single dispatch thread at a time"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        # Daemonic, so idle workers don't keep the interpreter from exiting
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.pid = self.process.pid
+
+    def call(self, call: Callable, args: tuple) -> Any:
+        self.conn.send((call, args))
+        try:
+            ok, value = self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(1)
+            raise BrokenProcessPool(f"Compute worker {self.pid} exited with code {self.process.exitcode}")
+        if not ok:
+            raise value
+        return value
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def terminate(self):
+        self.process.terminate()
+
+    def close(self):
+        self.conn.close()
+
+
+class _Task:
+    """A submitted message; `worker` is set while a worker process runs it"""
+
+    def __init__(self, message: Tuple[Callable, tuple]):
+        self.message = message
+        self.worker: Optional[_Worker] = None
+        self.abandoned = False
+        self.lock = threading.Lock()
+
+
+def _profiled(call: Callable, *args) -> Tuple[Any, bytes]:
+    """Run call(*args) under cProfile for a profiled request; returns the result and the marshalled stats"""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(call, *args)
+    profiler.create_stats()
+    return result, marshal.dumps(profiler.stats)
+
+
+class ComputeExecutor:
+    """
+    Managed worker processes for offloadable analysis functions.
+
+    - Large DataFrames/arrays are passed via shared memory instead of being pickled
+    - Each task has a timeout; only the worker running a timed-out (or
+      cancelled) task is terminated, and a new one is started in its place
+    - stats() exposes queue depth, task counters and worker PIDs for health/metrics endpoints
+    - Tasks started by a profiled request (see mcp_profiling) run under cProfile
+
+    Every dispatch thread owns one worker process and hands it one task at a
+    time, so the executor always knows which PID is running which task.
+    With COMPUTE_WORKERS=0 tasks run on a thread instead (local development, tests).
+    """
+
+    def __init__(self, max_workers: int = COMPUTE_WORKERS, task_timeout: float = COMPUTE_TASK_TIMEOUT,
+                 mp_context: str = COMPUTE_MP_CONTEXT):
+        self.max_workers = max_workers
+        self.task_timeout = task_timeout
+        self.mp_context = mp_context
+        self._dispatcher: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self._workers: Dict[int, _Worker] = {}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._restarts = 0
+        self._busy_seconds = 0.0
+
+    def _get_dispatcher(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="compute")
+                logger.info(f"Compute executor started with up to {self.max_workers} {self.mp_context} workers")
+            return self._dispatcher
+
+    def _thread_worker(self) -> _Worker:
+        """The calling dispatch thread's worker process, started (or replaced) as needed"""
+        worker = getattr(self._local, "worker", None)
+        if worker is not None and worker.alive():
+            return worker
+        if worker is not None:
+            self._discard(worker)
+        worker = _Worker(get_context(self.mp_context))
+        with self._lock:
+            self._workers[worker.pid] = worker
+        self._local.worker = worker
+        return worker
+
+    def _discard(self, worker: _Worker):
+        with self._lock:
+            self._workers.pop(worker.pid, None)
+        if getattr(self._local, "worker", None) is worker:
+            self._local.worker = None
+        worker.close()
+
+    def _dispatch(self, task: _Task) -> Any:
+        """Dispatch thread: run the task on this thread's worker process"""
+        with task.lock:
+            if task.abandoned:
+                return None
+            worker = task.worker = self._thread_worker()
+        try:
+            return worker.call(*task.message)
+        except BrokenProcessPool:
+            self._discard(worker)
+            raise
+        finally:
+            with task.lock:
+                task.worker = None
+
+    def _abandon(self, task: _Task, reason: str):
+        """Stop a task that timed out or was cancelled; a running one takes its worker process with it"""
+        with task.lock:
+            task.abandoned = True
+            if task.worker is None:
+                return
+            # Still holding the task's lock, so the worker can't have moved on to another task
+            task.worker.terminate()
+            pid = task.worker.pid
+        with self._lock:
+            self._restarts += 1
+        logger.warning(f"Compute worker {pid} terminated ({reason}); a new one starts on next use")
+
+    @staticmethod
+    def _share(value: Any) -> Any:
+        if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)) and _nbytes(value) >= COMPUTE_SHM_MIN_BYTES:
+            try:
+                return _SharedPayload(value)
+            except BufferError:
+                # Non-contiguous buffers can't be exported out-of-band; fall back to plain pickling
+                return value
+        return value
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run an @offloadable function off the event loop and return its result"""
+        if not getattr(fn, "__offloadable__", False):
+            raise ValueError(f"{fn.__qualname__} is not marked @offloadable")
+
+        timeout = timeout or self.task_timeout
+        mode = "thread" if self.max_workers <= 0 else "process"
+        memoized = bool(getattr(fn, "__memoized__", False))
+        with start_span(f"compute {fn.__name__}", **{"compute.mode": mode, "compute.memoized": memoized}):
+            self._in_flight += 1
+            started = time.monotonic()
+            try:
+                if self.max_workers <= 0:
+                    profile = current_profile()
+                    if profile is None:
+                        result = await asyncio.wait_for(asyncio.to_thread(fn, *args, **kwargs), timeout)
+                    else:
+                        call = functools.partial(fn, *args, **kwargs)
+                        result, stats = await asyncio.wait_for(asyncio.to_thread(_profiled, call), timeout)
+                        profile.add_worker_stats(fn.__name__, stats)
+                elif memoized:
+                    # Fingerprinting is vectorized but not free; keep it off the event loop
+                    key, found, result = await asyncio.to_thread(fn.cache_lookup, args, kwargs)
+                    if not found:
+                        result = await self._run_in_pool(fn, args, kwargs, timeout)
+                        fn.cache_store(key, result)
+                else:
+                    result = await self._run_in_pool(fn, args, kwargs, timeout)
+                self._completed += 1
+                return result
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                self._failed += 1
+                raise ComputeTimeoutError(f"{fn.__name__} exceeded {timeout:g}s")
+            except Exception:
+                self._failed += 1
+                raise
+            finally:
+                self._in_flight -= 1
+                self._busy_seconds += time.monotonic() - started
+
+    async def _run_in_pool(self, fn: Callable, args: tuple, kwargs: dict, timeout: float) -> Any:
+        shared_args = tuple(self._share(value) for value in args)
+        shared_kwargs = {key: self._share(value) for key, value in kwargs.items()}
+        shared = [value for value in list(shared_args) + list(shared_kwargs.values())
+                  if isinstance(value, _SharedPayload)]
+
+        try:
+            profile = current_profile()
+            if profile is None:
+                task = _Task((_run_task, (fn, shared_args, shared_kwargs)))
+            else:
+                task = _Task((_profiled, (_run_task, fn, shared_args, shared_kwargs)))
+            future = self._get_dispatcher().submit(self._dispatch, task)
+            try:
+                payload = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                self._abandon(task, f"{fn.__name__} exceeded {timeout:g}s")
+                raise
+            except asyncio.CancelledError:
+                self._abandon(task, f"{fn.__name__} was cancelled")
+                raise
+            if profile is not None:
+                payload, stats = payload
+                profile.add_worker_stats(fn.__name__, stats)
+            return pickle.loads(payload)
+        finally:
+            for value in shared:
+                value.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "process" if self.max_workers > 0 else "thread",
+            "workers": self.max_workers,
+            "pool_started": self._dispatcher is not None,
+            "worker_pids": sorted(self._workers),
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - max(self.max_workers, 1)),
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "restarts": self._restarts,
+            "busy_seconds": round(self._busy_seconds, 3)
+        }
+
+    def shutdown(self):
+        with self._lock:
+            dispatcher, self._dispatcher = self._dispatcher, None
+            workers, self._workers = list(self._workers.values()), {}
+        if dispatcher is not None:
+            dispatcher.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.terminate()
+
+
+# Shared instance used by the analytics routes
+compute_executor = ComputeExecutor()
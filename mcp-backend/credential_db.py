@@ -1,14 +1,36 @@
 import sqlite3
 import json
 import os
+import time
 from typing import Dict, List, Optional, Any
 from contextlib import contextmanager
 import logging
 
+from mcp_metrics import observe_sqlite_statement
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = "credentials.db"
 
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection reporting statement and commit time to /metrics"""
+
+    def execute(self, sql, parameters=(), /):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            observe_sqlite_statement(sql, time.perf_counter() - started)
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            observe_sqlite_statement("COMMIT", time.perf_counter() - started)
+
+
 class CredentialStorage:
     """Handles persistent storage of user credentials"""
     
@@ -18,7 +40,7 @@ class CredentialStorage:
     
     def _init_database(self):
         """Initialize the database schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with sqlite3.connect(self.db_path, factory=TimedConnection) as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS user_credentials (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -35,7 +57,7 @@ class CredentialStorage:
     @contextmanager
     def get_connection(self):
         """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, factory=TimedConnection)
         conn.row_factory = sqlite3.Row
         try:
             yield conn
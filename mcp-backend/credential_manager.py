@@ -1,5 +1,5 @@
 import data_integrator
-from database import credential_storage
+from credential_db import credential_storage
 from shared_integrator import data_integrator_instance
 import logging
 from typing import Dict, Any, Optional
@@ -0,0 +1,231 @@
+"""
+CSV Ingestion Module
+Single-pass CSV loading for uploads: encoding, delimiter and header row are
+sniffed from a bounded prefix, then the file is parsed once into typed columns
+"""
+
+import codecs
+import csv
+import io
+import os
+from collections import Counter
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bytes read up front to detect encoding, delimiter and header row
+CSV_SNIFF_BYTES = int(os.getenv("CSV_SNIFF_BYTES", str(64 * 1024)))
+# Block size for the pyarrow reader; memory grows with the parsed output, not the file
+CSV_BLOCK_BYTES = int(os.getenv("CSV_BLOCK_BYTES", str(4 * 1024 * 1024)))
+
+CANDIDATE_DELIMITERS = [',', '\t', ';', '|']
+
+# pandas' default NA markers, so both readers turn the same cells into NaN
+NULL_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+               '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+
+def peek(stream: BinaryIO, size: int = CSV_SNIFF_BYTES) -> bytes:
+    """Read the first bytes of a stream and rewind it"""
+    start = stream.tell()
+    prefix = stream.read(size)
+    stream.seek(start)
+    return prefix
+
+
+def detect_encoding(prefix: bytes) -> str:
+    """Pick an encoding from BOMs, a strict UTF-8 check, chardet (if installed), then cp1252/latin-1"""
+    if prefix.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if prefix.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+
+    # UTF-16 without BOM: ASCII text leaves every other byte zero
+    sample = prefix[:4096]
+    if len(sample) >= 4 and sample.count(b'\x00') > len(sample) // 4:
+        return 'utf-16-le' if sample[1::2].count(b'\x00') > sample[0::2].count(b'\x00') else 'utf-16-be'
+
+    try:
+        # Not final: the prefix may end in the middle of a multi-byte character
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    try:
+        import chardet
+        detected = chardet.detect(prefix)
+        if detected.get('encoding') and detected.get('confidence', 0) >= 0.7:
+            codecs.lookup(detected['encoding'])
+            return detected['encoding']
+    except (ImportError, LookupError):
+        pass
+
+    try:
+        prefix.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def peek_text(stream: BinaryIO, size: int = CSV_SNIFF_BYTES) -> Tuple[str, str]:
+    """Decoded prefix of a stream and the encoding it was decoded with"""
+    prefix = peek(stream, size)
+    encoding = detect_encoding(prefix)
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(prefix, final=False)
+    if len(prefix) >= size:
+        # Drop the (possibly truncated) last line
+        text = text[:text.rfind('\n') + 1] or text
+    return text, encoding
+
+
+def _field_counts(lines: List[str], delimiter: str) -> List[int]:
+    return [len(row) for row in csv.reader(lines, delimiter=delimiter)]
+
+
+def _is_data_line(line: str) -> bool:
+    return bool(line.strip()) and not line.startswith('#')
+
+
+def sniff_layout(text: str, header_indicators: Optional[Sequence[str]] = None,
+                 delimiter: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Find the delimiter and the header row in a decoded prefix.
+
+    The delimiter is the candidate that splits most lines into the same number
+    (> 1) of fields. The header is the first line with that many fields, which
+    skips title rows ("Ad group report", "All time") and GA4 "#" comments; with
+    header_indicators the first line containing at least three of them wins.
+    """
+    lines = text.splitlines()
+    candidates = [line for line in lines if _is_data_line(line)]
+
+    if delimiter is None:
+        best_score = 0
+        delimiter = ','
+        for candidate in CANDIDATE_DELIMITERS:
+            counts = Counter(count for count in _field_counts(candidates, candidate) if count > 1)
+            if counts:
+                score = counts.most_common(1)[0][1]
+                if score > best_score:
+                    best_score, delimiter = score, candidate
+
+    counts = Counter(count for count in _field_counts(candidates, delimiter) if count > 1)
+    width = counts.most_common(1)[0][0] if counts else None
+
+    header_row = None
+    if header_indicators:
+        required = min(3, len(header_indicators))
+        for i, line in enumerate(lines):
+            if sum(1 for indicator in header_indicators if indicator in line) >= required:
+                header_row = i
+                break
+
+    if header_row is None:
+        for i, line in enumerate(lines):
+            if _is_data_line(line) and (width is None or _field_counts([line], delimiter)[0] == width):
+                header_row = i
+                break
+
+    return {"delimiter": delimiter, "header_row": header_row or 0, "width": width}
+
+
+def _read_with_pyarrow(stream: BinaryIO, encoding: str, layout: Dict[str, Any], filename: str,
+                       sample: str = "") -> pd.DataFrame:
+    """
+    Read with pyarrow, converting values the way pd.read_csv does: the same
+    cells become NaN, and date/time columns stay strings for callers to parse.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    skipped = []
+
+    def skip_invalid_row(row):
+        skipped.append(row.number)
+        return 'skip'
+
+    # pyarrow has no switch for date inference, so columns it would read as dates in
+    # the sniffed prefix are declared as strings up front
+    column_types = {}
+    if sample:
+        sample_table = pa_csv.read_csv(
+            io.BytesIO(sample.encode('utf-8')),
+            read_options=pa_csv.ReadOptions(skip_rows=layout["header_row"]),
+            parse_options=pa_csv.ParseOptions(delimiter=layout["delimiter"], invalid_row_handler=lambda row: 'skip'),
+            convert_options=pa_csv.ConvertOptions(null_values=NULL_VALUES, strings_can_be_null=True)
+        )
+        column_types = {field.name: pa.string() for field in sample_table.schema if pa.types.is_temporal(field.type)}
+
+    read_options = pa_csv.ReadOptions(
+        # pyarrow skips a UTF-8 BOM itself; anything else is transcoded while streaming
+        encoding='utf8' if encoding in ('utf-8', 'utf-8-sig') else encoding,
+        skip_rows=layout["header_row"],
+        block_size=CSV_BLOCK_BYTES
+    )
+    parse_options = pa_csv.ParseOptions(delimiter=layout["delimiter"], invalid_row_handler=skip_invalid_row)
+    convert_options = pa_csv.ConvertOptions(null_values=NULL_VALUES, strings_can_be_null=True,
+                                            column_types=column_types)
+    table = pa_csv.read_csv(stream, read_options=read_options, parse_options=parse_options,
+                            convert_options=convert_options)
+
+    for i, field in enumerate(table.schema):
+        if pa.types.is_temporal(field.type):
+            # Null throughout the prefix, dates further down
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+
+    if skipped:
+        logger.info(f"Skipped {len(skipped)} malformed rows in {filename}")
+    # Hand the Arrow buffers over to pandas column by column instead of copying the whole table
+    return table.to_pandas(split_blocks=True, self_destruct=True, date_as_object=False)
+
+
+def _read_with_pandas(stream: BinaryIO, encoding: str, layout: Dict[str, Any]) -> pd.DataFrame:
+    text_stream = io.TextIOWrapper(stream, encoding=encoding, errors='replace', newline='')
+    try:
+        return pd.read_csv(text_stream, sep=layout["delimiter"], skiprows=layout["header_row"],
+                           on_bad_lines='skip', low_memory=False)
+    finally:
+        # Don't close the caller's stream along with the wrapper
+        text_stream.detach()
+
+
+def read_csv_stream(
+    stream: BinaryIO,
+    filename: str = "",
+    header_indicators: Optional[Sequence[str]] = None,
+    delimiter: Optional[str] = None,
+    skip_row_prefixes: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Parse a binary CSV stream (upload file object, BytesIO, open file) in one pass.
+
+    Uses pyarrow's multithreaded reader when available and pandas' C parser
+    otherwise. Rows with the wrong number of fields are skipped; rows whose first
+    value starts with one of skip_row_prefixes (e.g. "Total:") are dropped.
+    """
+    text, encoding = peek_text(stream)
+    layout = sniff_layout(text, header_indicators=header_indicators, delimiter=delimiter)
+    logger.info(f"Reading {filename or 'CSV'}: encoding={encoding}, "
+                f"delimiter={layout['delimiter']!r}, header_row={layout['header_row']}")
+
+    start = stream.tell()
+    try:
+        df = _read_with_pyarrow(stream, encoding, layout, filename, sample=text)
+    except ImportError:
+        df = _read_with_pandas(stream, encoding, layout)
+    except Exception as e:
+        # e.g. a quoted field pyarrow rejects; the C parser is more lenient
+        logger.warning(f"pyarrow could not parse {filename or 'CSV'} ({e}); falling back to pandas")
+        stream.seek(start)
+        df = _read_with_pandas(stream, encoding, layout)
+
+    if skip_row_prefixes and not df.empty:
+        first = df.iloc[:, 0].astype(str)
+        keep = ~first.str.startswith(tuple(skip_row_prefixes))
+        if not keep.all():
+            df = df[keep].reset_index(drop=True)
+    return df
@@ -5,6 +5,12 @@ import asyncio
 from abc import ABC, abstractmethod
 import logging
 
+from dtype_normalizer import concat_normalized, normalize_dtypes
+from mcp_metrics import instrument_fetch, record_connector_error
+from mcp_tracing import traced
+from platform_endpoints import ga4_client, google_ads_client, init_facebook_ads_api
+from platform_limiter import hedged_platform_call, platform_call
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,6 +42,8 @@ class MetaAdsConnector(DataSourceConnector):
             logger.error(f"Meta Ads credential validation failed: {e}")
             return False
 
+    @instrument_fetch("meta_ads")
+    @traced("connector.fetch meta_ads", connector="meta_ads")
     async def fetch_data(self, start_date: str, end_date: str,
                         account_id: str = None, fields: List[str] = None) -> pd.DataFrame:
         """
@@ -48,12 +56,11 @@ class MetaAdsConnector(DataSourceConnector):
             fields: List of fields to fetch
         """
         try:
-            from facebook_business.api import FacebookAdsApi
             from facebook_business.adobjects.adaccount import AdAccount
             from facebook_business.adobjects.adsinsights import AdsInsights
 
             # Initialize the API
-            FacebookAdsApi.init(access_token=self.access_token)
+            init_facebook_ads_api(self.access_token)
 
             # Default fields if none provided
             if not fields:
@@ -78,7 +85,7 @@ class MetaAdsConnector(DataSourceConnector):
             if not account_id:
                 from facebook_business.adobjects.user import User
                 me = User(fbid='me')
-                accounts = me.get_ad_accounts()
+                accounts = await platform_call("meta_ads", None, lambda: list(me.get_ad_accounts()))
                 if not accounts:
                     logger.warning("No accessible ad accounts found")
                     return pd.DataFrame()
@@ -101,8 +108,10 @@ class MetaAdsConnector(DataSourceConnector):
                 'breakdowns': [AdsInsights.Breakdowns.date],
             }
 
-            # Fetch insights
-            insights = account.get_insights(fields=fields, params=params)
+            # Fetch insights (the cursor pages lazily, so it is drained inside the limited call)
+            insights = await hedged_platform_call(
+                "meta_ads", account_id, lambda: list(account.get_insights(fields=fields, params=params))
+            )
 
             # Convert to DataFrame
             data_rows = []
@@ -142,12 +151,14 @@ class MetaAdsConnector(DataSourceConnector):
                     df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
 
             logger.info(f"Fetched {len(df)} rows from Meta Ads")
-            return df
+            return normalize_dtypes(df, 'meta_ads', dataset='Meta Ads')
 
-        except ImportError:
+        except ImportError as e:
+            record_connector_error("meta_ads", e)
             logger.error("facebook-business package not installed. Run: pip install facebook-business")
             return pd.DataFrame()
         except Exception as e:
+            record_connector_error("meta_ads", e)
             logger.error(f"Error fetching Meta Ads data: {e}")
             return pd.DataFrame()
 
@@ -168,6 +179,8 @@ class GoogleAdsConnector(DataSourceConnector):
             logger.error(f"Google Ads credential validation failed: {e}")
             return False
 
+    @instrument_fetch("google_ads")
+    @traced("connector.fetch google_ads", connector="google_ads")
     async def fetch_data(self, start_date: str, end_date: str,
                         customer_id: str = None, query: str = None) -> pd.DataFrame:
         """
@@ -180,7 +193,6 @@ class GoogleAdsConnector(DataSourceConnector):
             query: Custom GAQL query
         """
         try:
-            from google.ads.googleads.client import GoogleAdsClient
             from google.ads.googleads.errors import GoogleAdsException
 
             # Create Google Ads client
@@ -192,12 +204,12 @@ class GoogleAdsConnector(DataSourceConnector):
                 "use_proto_plus": True
             }
 
-            client = GoogleAdsClient.load_from_dict(credentials)
+            client = google_ads_client(credentials)
 
             # If no customer_id provided, get the first accessible customer
             if not customer_id:
                 customer_service = client.get_service("CustomerService")
-                accessible_customers = customer_service.list_accessible_customers()
+                accessible_customers = await platform_call("google_ads", None, customer_service.list_accessible_customers)
                 if not accessible_customers.resource_names:
                     logger.warning("No accessible customers found")
                     return pd.DataFrame()
@@ -231,7 +243,10 @@ class GoogleAdsConnector(DataSourceConnector):
             search_request.customer_id = customer_id
             search_request.query = query
 
-            results = ga_service.search(request=search_request)
+            # The pager fetches further pages while iterating, so drain it inside the limited call
+            results = await hedged_platform_call(
+                "google_ads", customer_id, lambda: list(ga_service.search(request=search_request))
+            )
 
             # Convert results to DataFrame
             data_rows = []
@@ -277,17 +292,20 @@ class GoogleAdsConnector(DataSourceConnector):
                     df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
 
             logger.info(f"Fetched {len(df)} rows from Google Ads")
-            return df
+            return normalize_dtypes(df, 'google_ads', dataset='Google Ads')
 
-        except ImportError:
+        except ImportError as e:
+            record_connector_error("google_ads", e)
             logger.error("google-ads package not installed. Run: pip install google-ads")
             return pd.DataFrame()
         except GoogleAdsException as ex:
+            record_connector_error("google_ads", ex)
             logger.error(f"Google Ads API error: {ex}")
             for error in ex.failure.errors:
                 logger.error(f"Error: {error.message}")
             return pd.DataFrame()
         except Exception as e:
+            record_connector_error("google_ads", e)
             logger.error(f"Error fetching Google Ads data: {e}")
             return pd.DataFrame()
 
@@ -315,6 +333,8 @@ class GA4Connector(DataSourceConnector):
             logger.error(f"GA4 credential validation failed: {e}")
             return False
 
+    @instrument_fetch("ga4")
+    @traced("connector.fetch ga4", connector="ga4")
     async def fetch_data(self, start_date: str, end_date: str,
                         dimensions: List[str] = None, metrics: List[str] = None) -> pd.DataFrame:
         """
@@ -327,7 +347,6 @@ class GA4Connector(DataSourceConnector):
             metrics: List of GA4 metrics
         """
         try:
-            from google.analytics.data_v1beta import BetaAnalyticsDataClient
             from google.analytics.data_v1beta.types import (
                 RunReportRequest,
                 Dimension,
@@ -356,7 +375,7 @@ class GA4Connector(DataSourceConnector):
                 )
 
             # Initialize the client
-            client = BetaAnalyticsDataClient(credentials=credentials)
+            client = ga4_client(credentials)
 
             # Default dimensions and metrics if none provided
             if not dimensions:
@@ -380,7 +399,7 @@ class GA4Connector(DataSourceConnector):
             )
 
             # Execute the request
-            response = client.run_report(request=request)
+            response = await hedged_platform_call("ga4", self.property_id, client.run_report, request=request)
 
             # Convert response to DataFrame
             data_rows = []
@@ -426,12 +445,14 @@ class GA4Connector(DataSourceConnector):
             df = df.rename(columns=column_mapping)
 
             logger.info(f"Fetched {len(df)} rows from GA4")
-            return df
+            return normalize_dtypes(df, 'ga4', dataset='GA4')
 
-        except ImportError:
+        except ImportError as e:
+            record_connector_error("ga4", e)
             logger.error("google-analytics-data package not installed. Run: pip install google-analytics-data")
             return pd.DataFrame()
         except Exception as e:
+            record_connector_error("ga4", e)
             logger.error(f"Error fetching GA4 data: {e}")
             return pd.DataFrame()
 
@@ -440,6 +461,8 @@ class DataIntegrator:
 
     def __init__(self):
         self.connectors: Dict[str, DataSourceConnector] = {}
+        # Latest dtype/memory report per connector, see dtype_normalizer.normalize_dtypes
+        self.memory_reports: Dict[str, Dict[str, Any]] = {}
 
     def add_connector(self, name: str, connector: DataSourceConnector):
         """Add a data source connector"""
@@ -468,36 +491,7 @@ class DataIntegrator:
         if not self.connectors:
             logger.warning("No connectors configured")
             return pd.DataFrame()
-
-        # Prepare tasks for async execution
-        tasks = []
-        for name, connector in self.connectors.items():
-            config = connector_configs.get(name, {}) if connector_configs else {}
-            task = connector.fetch_data(start_date, end_date, **config)
-            tasks.append((name, task))
-
-        # Execute all tasks concurrently
-        results = []
-        for name, task in tasks:
-            try:
-                data = await task
-                if not data.empty:
-                    data['connector_name'] = name
-                    results.append(data)
-                    logger.info(f"Successfully fetched data from {name}")
-                else:
-                    logger.warning(f"No data returned from {name}")
-            except Exception as e:
-                logger.error(f"Failed to fetch data from {name}: {e}")
-
-        # Combine all data
-        if results:
-            combined_df = pd.concat(results, ignore_index=True)
-            logger.info(f"Combined data shape: {combined_df.shape}")
-            return combined_df
-        else:
-            logger.warning("No data fetched from any connector")
-            return pd.DataFrame()
+        return await self._fetch_from(self.connectors, start_date, end_date, connector_configs)
 
     async def fetch_specific_data(self, connector_names: List[str], start_date: str,
                                 end_date: str, connector_configs: Dict[str, Dict] = None) -> pd.DataFrame:
@@ -519,23 +513,50 @@ class DataIntegrator:
             logger.warning(f"No valid connectors found from: {connector_names}")
             return pd.DataFrame()
 
-        # Temporarily store original connectors
-        original_connectors = self.connectors.copy()
-        self.connectors = filtered_connectors
+        return await self._fetch_from(filtered_connectors, start_date, end_date, connector_configs)
 
-        try:
-            # Fetch data using existing method
-            result = await self.fetch_all_data(start_date, end_date, connector_configs)
-            return result
-        finally:
-            # Restore original connectors
-            self.connectors = original_connectors
+    async def _fetch_from(self, connectors: Dict[str, DataSourceConnector], start_date: str, end_date: str,
+                          connector_configs: Dict[str, Dict] = None) -> pd.DataFrame:
+        """Fetch from the given connectors concurrently, so one slow platform doesn't delay the others"""
+        names = list(connectors)
+        fetches = [connectors[name].fetch_data(start_date, end_date,
+                                               **(connector_configs.get(name, {}) if connector_configs else {}))
+                   for name in names]
+        outcomes = await asyncio.gather(*fetches, return_exceptions=True)
+
+        results = []
+        for name, data in zip(names, outcomes):
+            if isinstance(data, BaseException):
+                if not isinstance(data, Exception):
+                    raise data
+                logger.error(f"Failed to fetch data from {name}: {data}")
+            elif not data.empty:
+                if 'memory_report' in data.attrs:
+                    self.memory_reports[name] = data.attrs['memory_report']
+                data['connector_name'] = pd.Series(name, index=data.index, dtype='category')
+                results.append(data)
+                logger.info(f"Successfully fetched data from {name}")
+            else:
+                logger.warning(f"No data returned from {name}")
+
+        # Combine all data
+        if results:
+            combined_df = concat_normalized(results)
+            logger.info(f"Combined data shape: {combined_df.shape}")
+            return combined_df
+        else:
+            logger.warning("No data fetched from any connector")
+            return pd.DataFrame()
 
     def get_connector_status(self) -> Dict[str, bool]:
         """Get status of all connectors"""
         return {name: connector.validate_credentials()
                 for name, connector in self.connectors.items()}
 
+    def get_memory_reports(self) -> Dict[str, Dict[str, Any]]:
+        """Get the latest per-connector memory report (rows, bytes before/after normalization)"""
+        return dict(self.memory_reports)
+
     def get_available_connectors(self) -> List[str]:
         """Get list of available connector names"""
         return list(self.connectors.keys())
@@ -13,6 +13,14 @@ logger = logging.getLogger(__name__)
 class DataStandardizer:
     """Standardizes data from different marketing platforms"""
     
+    # Columns every consolidated dataset has after ensure_required_columns
+    STRING_COLUMNS = ['campaign_name', 'adset_name', 'ad_name', 'source']
+    NUMERIC_COLUMNS = ['impressions', 'clicks', 'spend', 'conversions', 'sessions', 'users', 'pageviews', 'ctr', 'cpc', 'cpm']
+    # Standardized columns that only some sources have
+    OPTIONAL_STRING_COLUMNS = ['channel', 'source_medium', 'medium']
+    OPTIONAL_NUMERIC_COLUMNS = ['new_users', 'reach']
+    DATE_COLUMNS = ['date']
+    
     @staticmethod
     def standardize_ga4_data(df: pd.DataFrame) -> pd.DataFrame:
         """Standardize Google Analytics 4 data"""
@@ -159,21 +167,23 @@ class DataStandardizer:
     @staticmethod
     def ensure_required_columns(df: pd.DataFrame) -> pd.DataFrame:
         """Ensure all required columns exist with proper types"""
-        result = df.copy()
+        # Shallow: whole columns are replaced below, the input's arrays are never written to
+        result = df.copy(deep=False)
         
         # Required string columns
-        string_columns = ['campaign_name', 'adset_name', 'ad_name', 'source']
-        for col in string_columns:
+        for col in DataStandardizer.STRING_COLUMNS:
             if col not in result.columns:
                 result[col] = 'Unknown'
             else:
                 result[col] = result[col].fillna('Unknown').astype(str)
         
         # Required numeric columns
-        numeric_columns = ['impressions', 'clicks', 'spend', 'conversions', 'sessions', 'users', 'pageviews', 'ctr', 'cpc', 'cpm']
-        for col in numeric_columns:
+        for col in DataStandardizer.NUMERIC_COLUMNS:
             if col not in result.columns:
                 result[col] = 0.0
+            elif pd.api.types.is_numeric_dtype(result[col]):
+                # Already typed (standardized CSVs, Parquet/Arrow uploads); only fill gaps
+                result[col] = result[col].fillna(0.0)
             else:
                 result[col] = pd.to_numeric(result[col], errors='coerce').fillna(0.0)
         
@@ -0,0 +1,160 @@
+"""
+Dtype Normalizer Module
+Schema-driven compact dtypes for connector DataFrames: repeated labels become
+categoricals (or Arrow strings when mostly unique), counts use the smallest safe
+integer type, and every normalization logs a memory report
+"""
+
+import os
+from typing import Dict, List, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+# Labels with at most this many distinct values per row become categoricals
+CATEGORY_MAX_RATIO = float(os.getenv("CATEGORY_MAX_RATIO", "0.5"))
+
+# Per-connector column roles. Columns missing from a frame are ignored.
+# - labels: strings repeated on many rows (names, ids, dimensions)
+# - counts: integers; downcast only when every value is integral
+# - floats: money, rates and durations; coerced to numbers but kept float64 so
+#   rounded outputs (ROAS, CPC, ...) are unchanged
+CONNECTOR_SCHEMAS: Dict[str, Dict[str, List[str]]] = {
+    'meta_ads': {
+        'labels': ['source', 'campaign_name', 'adset_name', 'ad_name', 'campaign_id', 'adset_id', 'ad_id'],
+        'counts': ['impressions', 'clicks', 'reach', 'conversions'],
+        'floats': ['spend', 'frequency', 'ctr', 'cpc', 'cpm']
+    },
+    'google_ads': {
+        'labels': ['source', 'campaign_id', 'campaign_name', 'campaign_status'],
+        'counts': ['impressions', 'clicks'],
+        'floats': ['spend', 'conversions', 'ctr', 'average_cpc', 'cpc', 'cpm']
+    },
+    'ga4': {
+        'labels': ['source', 'channel_grouping', 'source_medium', 'sessionCampaignName',
+                   'deviceCategory', 'city', 'country'],
+        'counts': ['sessions', 'users', 'newUsers', 'pageviews', 'screenPageViews', 'keyEvents'],
+        'floats': ['bounce_rate', 'avg_session_duration', 'averageSessionDuration', 'engagementRate',
+                   'userEngagementDuration', 'totalRevenue']
+    }
+}
+
+_INTEGER_TYPES = [np.int32, np.int64]
+
+
+def _arrow_string_dtype():
+    """NaN-compatible Arrow-backed string dtype for this pandas version, or None"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    for factory in (lambda: pd.StringDtype("pyarrow", na_value=np.nan),  # pandas >= 2.3
+                    lambda: pd.StringDtype("pyarrow_numpy")):             # pandas 2.1 - 2.2
+        try:
+            return factory()
+        except (TypeError, ValueError, ImportError):
+            continue
+    return None
+
+
+def memory_report(df: pd.DataFrame) -> Dict[str, int]:
+    """Deep memory usage in bytes per column, plus a 'total'"""
+    usage = df.memory_usage(deep=True, index=False)
+    report = {str(col): int(size) for col, size in usage.items()}
+    report['total'] = int(usage.sum())
+    return report
+
+
+def _compact_label(series: pd.Series, string_dtype) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    # Ids and names may arrive as ints or mixed types; labels are always text
+    values = series.where(series.isna(), series.astype(str))
+    if len(values) and values.nunique(dropna=True) <= len(values) * CATEGORY_MAX_RATIO:
+        return values.astype('category')
+    if string_dtype is not None and series.dtype == object:
+        return values.astype(string_dtype)
+    return series
+
+
+def _compact_count(series: pd.Series) -> pd.Series:
+    values = pd.to_numeric(series, errors='coerce').fillna(0)
+    if values.empty or values.dtype.kind not in 'iuf':
+        return values
+    if values.dtype.kind == 'f' and not np.array_equal(values.to_numpy(), np.floor(values.to_numpy())):
+        return values
+    low, high = values.min(), values.max()
+    # int32 at the smallest: narrower types overflow in ordinary row arithmetic
+    for dtype in _INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+def normalize_dtypes(df: pd.DataFrame, schema: str, dataset: Optional[str] = None) -> pd.DataFrame:
+    """
+    Convert a connector frame's columns (in place) according to one of
+    CONNECTOR_SCHEMAS and log how much memory that saved. The report is kept
+    in df.attrs['memory_report'].
+    """
+    if df.empty:
+        return df
+
+    roles = CONNECTOR_SCHEMAS[schema]
+    before = memory_report(df)
+    string_dtype = _arrow_string_dtype()
+
+    for col in roles.get('labels', []):
+        if col in df.columns:
+            df[col] = _compact_label(df[col], string_dtype)
+    for col in roles.get('counts', []):
+        if col in df.columns:
+            df[col] = _compact_count(df[col])
+    for col in roles.get('floats', []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(np.float64)
+
+    after = memory_report(df)
+    df.attrs['memory_report'] = {
+        "dataset": dataset or schema,
+        "rows": len(df),
+        "bytes_before": before['total'],
+        "bytes_after": after['total'],
+        "columns": after
+    }
+    logger.info(f"{dataset or schema}: {len(df)} rows, {before['total'] / 1e6:.2f} MB -> "
+                f"{after['total'] / 1e6:.2f} MB ({before['total'] / max(after['total'], 1):.1f}x smaller)")
+    return df
+
+
+def concat_normalized(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate normalized frames without falling back to object columns:
+    categoricals that differ only in their categories are unioned first.
+    """
+    frames = [frame for frame in frames if not frame.empty]
+    if len(frames) < 2:
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    frames = [frame.copy(deep=False) for frame in frames]
+    categorical = {col for frame in frames for col in frame.columns
+                   if isinstance(frame[col].dtype, pd.CategoricalDtype)}
+    for col in categorical:
+        present = [frame for frame in frames if col in frame.columns]
+        if all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in present):
+            categories = union_categoricals([frame[col].array for frame in present]).categories
+            for frame in present:
+                frame[col] = frame[col].cat.set_categories(categories)
+
+    combined = pd.concat(frames, ignore_index=True)
+    for col in categorical:
+        # A column missing from some frames comes back as object
+        if not isinstance(combined[col].dtype, pd.CategoricalDtype):
+            combined[col] = combined[col].astype('category')
+    combined.attrs.pop('memory_report', None)
+    return combined
@@ -0,0 +1,144 @@
+"""
+Fast JSON Module
+orjson-based responses that serialize NumPy scalars/arrays, NaN/inf, Timestamps
+and DataFrames natively, so analysis results skip jsonable_encoder and the
+recursive cleaning passes
+"""
+
+import asyncio
+import datetime
+import functools
+import inspect
+from decimal import Decimal
+from typing import Any, Callable
+import logging
+
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+# NaN and +/-inf are written as null, numpy arrays and scalars natively
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson doesn't handle itself; anything unknown goes through jsonable_encoder"""
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict('records')
+    if isinstance(obj, pd.Series):
+        return obj.to_dict()
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, pd.Timedelta):
+        return str(obj)
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        return value.isoformat() if isinstance(value, (datetime.datetime, datetime.date)) else value
+    if isinstance(obj, (np.ndarray, pd.Index, pd.api.extensions.ExtensionArray)):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return jsonable_encoder(obj)
+
+
+def _json_key(key: Any) -> Any:
+    if key is None or isinstance(key, (str, int, float, bool)):
+        return key
+    if isinstance(key, (pd.Timestamp, np.generic)):
+        return _default(key)
+    if isinstance(key, (datetime.datetime, datetime.date)):
+        return key.isoformat()
+    return str(key)
+
+
+def _normalize_keys(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {_json_key(key): _normalize_keys(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_normalize_keys(item) for item in obj]
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return _normalize_keys(_default(obj))
+    return obj
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize a response payload to JSON bytes"""
+    try:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        # Keys orjson can't write (Timestamps, numpy scalars, tuples, e.g. from
+        # to_dict('index')): normalize them and retry
+        return orjson.dumps(_normalize_keys(content), default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; the default response class of the app"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _respond_with_fast_json(endpoint: Callable, status_code: Any) -> Callable:
+    def to_response(result: Any) -> Any:
+        if isinstance(result, Response):
+            return result
+        return FastJSONResponse(result, status_code=status_code or 200)
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return to_response(await endpoint(*args, **kwargs))
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            return to_response(endpoint(*args, **kwargs))
+    wrapper.__fast_json__ = True
+    return wrapper
+
+
+def _uses_response_parameter(endpoint: Callable) -> bool:
+    for parameter in inspect.signature(endpoint).parameters.values():
+        annotation = parameter.annotation
+        if inspect.isclass(annotation) and issubclass(annotation, Response):
+            return True
+    return False
+
+
+def _explicit(value: Any) -> Any:
+    """The value the route was declared with; None for FastAPI's Default(...) placeholders"""
+    return None if isinstance(value, DefaultPlaceholder) else value
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route whose plain (dict/list) return values are rendered straight to a
+    FastJSONResponse. FastAPI would otherwise run jsonable_encoder over the whole
+    payload first, which is where large to_dict('records') results spent their
+    time. Routes with an explicit response_model, a custom response_class or an
+    injected Response parameter keep FastAPI's normal handling.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        response_model = _explicit(kwargs.get("response_model"))
+        response_class = _explicit(kwargs.get("response_class"))
+        keep_default_handling = (
+            getattr(endpoint, "__fast_json__", False)  # already wrapped, e.g. by include_router
+            or response_model is not None
+            or response_class not in (None, JSONResponse, FastJSONResponse)
+            or _uses_response_parameter(endpoint)
+        )
+        if not keep_default_handling:
+            endpoint = _respond_with_fast_json(endpoint, _explicit(kwargs.get("status_code")))
+        super().__init__(path, endpoint, **kwargs)
+
@@ -0,0 +1,97 @@
+"""
+HTTP Metrics Module
+Request latency and event-loop lag metrics shared by mcp-backend (mcp_metrics)
+and backend (api_metrics, which imports this module from MCP_BACKEND_PATH).
+Each service creates one HTTPMetrics under its own metric prefix, so both sets
+can be registered in one process when backend runs mcp-backend in-process.
+"""
+
+import asyncio
+import time
+import weakref
+
+from prometheus_client import Gauge, Histogram
+
+EVENT_LOOP_LAG_INTERVAL = 0.5
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def statement_type(sql: str) -> str:
+    """SQL statement label (SELECT, INSERT, ...) for query time histograms"""
+    return sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "EMPTY"
+
+
+class HTTPMetrics:
+    """A service's request latency, in-flight gauge and event-loop lag, named <prefix>_..."""
+
+    def __init__(self, prefix: str):
+        self.request_seconds = Histogram(
+            f"{prefix}_http_request_duration_seconds", "HTTP request latency by route template",
+            ["method", "route", "status"], buckets=LATENCY_BUCKETS
+        )
+        self.requests_in_flight = Gauge(f"{prefix}_http_requests_in_flight", "HTTP requests being served")
+        self.event_loop_lag_seconds = Histogram(
+            f"{prefix}_event_loop_lag_seconds",
+            f"Delay of a {EVENT_LOOP_LAG_INTERVAL}s asyncio sleep beyond its deadline", buckets=LAG_BUCKETS
+        )
+        # One lag monitor per running event loop
+        self._loop_monitors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def _monitor_event_loop(self, interval: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            self.event_loop_lag_seconds.observe(max(loop.time() - started - interval, 0.0))
+
+    def ensure_event_loop_monitor(self, interval: float = EVENT_LOOP_LAG_INTERVAL):
+        """Start sampling event-loop lag on the running loop (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if loop not in self._loop_monitors:
+            self._loop_monitors[loop] = loop.create_task(self._monitor_event_loop(interval))
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency per route template (not per raw
+    path, to keep label cardinality bounded). Streaming responses such as
+    the MCP SSE endpoint are timed until the body is complete.
+    """
+
+    def __init__(self, app, metrics: HTTPMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.metrics.ensure_event_loop_monitor()
+        root_path = scope.get("root_path", "")
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        self.metrics.requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.requests_in_flight.dec()
+            route = getattr(scope.get("route"), "path", None)
+            # Routes of mounted apps (/llm) are relative to the mount point
+            label = scope.get("root_path", "")[len(root_path):] + route if route else "unmatched"
+            if label != "/metrics":
+                self.metrics.request_seconds.labels(scope["method"], label, str(status)).observe(
+                    time.perf_counter() - started
+                )
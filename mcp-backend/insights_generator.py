@@ -4,16 +4,20 @@ Generates actionable insights from consolidated marketing data
 """
 
 import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import logging
 
+from analytics.metrics_frame import MetricsFrame
+
 logger = logging.getLogger(__name__)
 
 class InsightsGenerator:
     """Generates insights from consolidated marketing data"""
     
-    def __init__(self, data: pd.DataFrame):
-        self.data = data
+    def __init__(self, data: Union[pd.DataFrame, MetricsFrame]):
+        # Groupings are shared with any other analyzer using the same MetricsFrame
+        self.metrics = MetricsFrame.of(data)
+        self.data = self.metrics.raw
     
     def generate_summary(self) -> Dict[str, Any]:
         """Generate high-level summary statistics"""
@@ -37,12 +41,7 @@ class InsightsGenerator:
         if self.data.empty:
             return {"error": "No data available"}
         
-        platform_stats = self.data.groupby('source').agg({
-            'spend': 'sum',
-            'conversions': 'sum',
-            'clicks': 'sum',
-            'impressions': 'sum'
-        }).round(2)
+        platform_stats = self.metrics.grouped('source')[['spend', 'conversions', 'clicks', 'impressions']].round(2)
         
         # Add calculated metrics
         platform_stats['roas'] = platform_stats.apply(
@@ -62,16 +61,12 @@ class InsightsGenerator:
     
     def get_top_campaigns(self, limit: int = 5) -> Dict[str, Any]:
         """Identify top performing campaigns"""
-        campaigns_with_spend = self.data[self.data['spend'] > 50].copy()
+        campaigns_with_spend = self.metrics.with_min_spend(50, inclusive=False)
         
         if campaigns_with_spend.empty:
             return {"message": "No campaigns with significant spend"}
         
-        campaign_stats = campaigns_with_spend.groupby(['source', 'campaign_name']).agg({
-            'spend': 'sum',
-            'conversions': 'sum',
-            'clicks': 'sum'
-        }).round(2)
+        campaign_stats = campaigns_with_spend.grouped('source_campaign')[['spend', 'conversions', 'clicks']].round(2)
         
         campaign_stats['roas'] = campaign_stats.apply(
             lambda row: self._calculate_roas(row['conversions'], row['spend']),
@@ -108,14 +103,11 @@ class InsightsGenerator:
     
     def _find_poor_performers(self) -> Dict[str, Any]:
         """Find campaigns that should be paused"""
-        campaigns = self.data[self.data['spend'] > 100].copy()
+        campaigns = self.metrics.with_min_spend(100, inclusive=False)
         if campaigns.empty:
             return {}
         
-        campaign_stats = campaigns.groupby(['source', 'campaign_name']).agg({
-            'spend': 'sum',
-            'conversions': 'sum'
-        })
+        campaign_stats = campaigns.grouped('source_campaign')[['spend', 'conversions']]
         
         poor_roas = campaign_stats[
             campaign_stats.apply(
@@ -136,14 +128,11 @@ class InsightsGenerator:
     
     def _find_scaling_opportunities(self) -> Dict[str, Any]:
         """Find high-performing campaigns to scale"""
-        campaigns = self.data[self.data['spend'] > 50].copy()
+        campaigns = self.metrics.with_min_spend(50, inclusive=False)
         if campaigns.empty:
             return {}
         
-        campaign_stats = campaigns.groupby(['source', 'campaign_name']).agg({
-            'spend': 'sum',
-            'conversions': 'sum'
-        })
+        campaign_stats = campaigns.grouped('source_campaign')[['spend', 'conversions']]
         
         high_performers = campaign_stats[
             campaign_stats.apply(
@@ -163,10 +152,7 @@ class InsightsGenerator:
     
     def _analyze_platform_efficiency(self) -> Dict[str, Any]:
         """Analyze which platform is most efficient"""
-        platform_stats = self.data.groupby('source').agg({
-            'spend': 'sum',
-            'conversions': 'sum'
-        })
+        platform_stats = self.metrics.grouped('source')[['spend', 'conversions']]
         
         if len(platform_stats) < 2:
             return {}
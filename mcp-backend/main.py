@@ -1,76 +1,66 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+from startup_report import STARTUP_WARMUP, startup_report, warm_up
+
+with startup_report.step("framework"):
+    from fastapi import Depends, FastAPI
+    from fastapi.responses import PlainTextResponse
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastmcp import FastMCP
 from datetime import datetime
-from fastmcp import FastMCP
 from typing import Any, Dict, List, Optional
 from contextlib import asynccontextmanager
 
-# Load environment variables from .env file
-load_dotenv()
-from routes.data_sources import router as data_sources_router
-from routes.eda import router as eda_router
-# from routes.analyze import router as analyze_router  # Removed - requires AutoGluon
-from routes.ad_insights import router as ad_insights_router
-from routes.website_analytics import router as website_analytics_router
-from routes.clean_insights import router as clean_insights_router
-from routes.clean_website_analytics import router as clean_website_router
-from routes.clean_ad_insights import router as clean_ad_router
-from routes.comprehensive_insights import router as comprehensive_router
-from routes.google_oauth import router as google_oauth_router
-from routes.google_ads_api import router as google_ads_router
-from routes.meta_oauth import router as meta_oauth_router
-from routes.meta_ads_api import router as meta_ads_router
-from routes.google_analytics_api import router as google_analytics_router
-# from routes.multi_platform_insights import router as multi_platform_router  # Removed - requires AutoGluon
-from database import credential_storage
+# Imported one at a time so /debug/startup shows what each router costs. The
+# platform SDKs are imported by the connectors and routes on first use.
+ROUTER_MODULES = [
+    "routes.data_sources",
+    "routes.eda",
+    # "routes.analyze",  # Removed - requires AutoGluon
+    "routes.ad_insights",
+    "routes.website_analytics",
+    "routes.clean_insights",
+    "routes.clean_website_analytics",
+    "routes.clean_ad_insights",
+    "routes.comprehensive_insights",
+    "routes.google_oauth",
+    "routes.google_ads_api",
+    "routes.meta_oauth",
+    "routes.meta_ads_api",
+    "routes.google_analytics_api",
+    "routes.profiling",
+    "routes.jobs",
+    # "routes.multi_platform_insights",  # Removed - requires AutoGluon
+]
+routers = [startup_report.import_module(name).router for name in ROUTER_MODULES]
+
+with startup_report.step("helpers"):
+    from credential_db import credential_storage
+    from query_cache import (
+        query_result_cache, QueryResultCache, CursorError, is_paged, paginate_result, paginate_new_result,
+        page_from_cursor
+    )
+    from compute_executor import compute_executor
+    from analysis_jobs import analysis_jobs
+    from fast_json import FastJSONResponse, FastJSONRoute
+    from platform_endpoints import graph_url
+    from platform_limiter import platform_call
+    from mcp_metrics import HTTP_METRICS, MetricsMiddleware, instrument_tool, metrics_response
+    from mcp_tracing import TracingMiddleware, debug_trace, debug_traces, require_traces_token, setup_tracing, trace_tool
+    from mcp_profiling import PROFILING_TOKEN, ProfilingMiddleware
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Will be redefined later with MCP lifespan
-app = FastAPI()
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:3000","*"],  # Frontend URLs
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database and restore any existing connectors"""
-    logger.info("Starting up application...")
-    
-    # Initialize database (tables will be created if they don't exist)
-    credential_storage._init_database()
-    logger.info("Database initialized")
-    
-    # Note: Connectors will be loaded on-demand when users make requests
-    # This prevents issues with invalid credentials on startup
-    logger.info("Application startup complete")
+if STARTUP_WARMUP:
+    # Before the app exists, so a preloading server does this once, pre-fork
+    warm_up()
 
-# Register routers
-app.include_router(data_sources_router)
-app.include_router(eda_router)
-# app.include_router(analyze_router)  # Removed - requires AutoGluon
-app.include_router(ad_insights_router)
-app.include_router(website_analytics_router)
-app.include_router(clean_insights_router)
-app.include_router(clean_website_router)
-app.include_router(clean_ad_router)
-app.include_router(comprehensive_router)
-app.include_router(google_oauth_router)
-app.include_router(google_ads_router)
-app.include_router(meta_oauth_router)
-app.include_router(meta_ads_router)
-app.include_router(google_analytics_router)
-# app.include_router(multi_platform_router)  # Removed - requires AutoGluon
+setup_tracing("mcp-backend")
 
 # 1. Create MCP server with selective tools (not from FastAPI)
 mcp = FastMCP("Marketing Analytics MCP")
@@ -78,45 +68,74 @@ mcp = FastMCP("Marketing Analytics MCP")
 # 2. Create the MCP's ASGI app
 mcp_app = mcp.http_app(path='/mcp')
 
-# 3. Recreate FastAPI app with MCP lifespan and mount
-app = FastAPI(title="Marketing Analytics API", lifespan=mcp_app.lifespan)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """MCP session manager plus the analysis job workers, which resume jobs queued before a restart"""
+    async with mcp_app.lifespan(app):
+        analysis_jobs.start()
+        startup_report.mark_ready()
+        try:
+            yield
+        finally:
+            await analysis_jobs.stop()
+
+# 3. Build the FastAPI app with the MCP lifespan and mount
+app = FastAPI(title="Marketing Analytics API", lifespan=lifespan, default_response_class=FastJSONResponse)
+# Plain dict results from the app-level routes are rendered with orjson directly
+app.router.route_class = FastJSONRoute
 
-# Re-add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:3000","*"],
+    allow_origins=["http://localhost:5173", "http://localhost:3000","*"],  # Frontend URLs
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added last so they wrap CORS and the mounted MCP app: every request is timed and traced
+if PROFILING_TOKEN:
+    # Innermost of the three, so a profile records the request's trace id
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware, metrics=HTTP_METRICS)
+app.add_middleware(TracingMiddleware)
+
+for router in routers:
+    app.include_router(router)
 
-# Re-register all routers
-app.include_router(data_sources_router)
-app.include_router(eda_router)
-# app.include_router(analyze_router)  # Removed - requires AutoGluon
-app.include_router(ad_insights_router)
-app.include_router(website_analytics_router)
-app.include_router(clean_insights_router)
-app.include_router(clean_website_router)
-app.include_router(clean_ad_router)
-app.include_router(comprehensive_router)
-app.include_router(google_oauth_router)
-app.include_router(google_ads_router)
-app.include_router(meta_oauth_router)
-app.include_router(meta_ads_router)
-app.include_router(google_analytics_router)
-# app.include_router(multi_platform_router)  # Removed - requires AutoGluon
+# Jobs replay their request through the full app, middleware included
+analysis_jobs.bind(app)
 
 # Mount MCP
 app.mount("/llm", mcp_app)
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
+
+# Import cost per startup step, slowest first
+@app.get("/debug/startup", include_in_schema=False)
+async def startup_timing():
+    return startup_report.report()
+
+# Recent traces (newest first, optionally only slow ones) and per-trace waterfalls
+@app.get("/debug/traces", include_in_schema=False, dependencies=[Depends(require_traces_token)])
+async def recent_traces(limit: int = 20, min_ms: float = 0.0):
+    return debug_traces(limit=limit, min_ms=min_ms)
+
+@app.get("/debug/traces/{trace_id}", include_in_schema=False, dependencies=[Depends(require_traces_token)])
+async def trace_waterfall(trace_id: str, format: str = "json"):
+    result = debug_trace(trace_id)
+    if format == "text":
+        return PlainTextResponse(result["text"])
+    return result
+
 # Health check endpoint for Docker deployments
 @app.get("/health")
 async def health_check():
     """Health check endpoint for load balancers and container orchestration"""
     try:
         # Check database connection
-        from database import credential_storage
+        from credential_db import credential_storage
         credential_storage._init_database()
         
         return {
@@ -126,7 +145,9 @@ async def health_check():
             "services": {
                 "database": "operational",
                 "api": "operational"
-            }
+            },
+            "compute": compute_executor.stats(),
+            "jobs": analysis_jobs.stats()
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -138,6 +159,8 @@ async def health_check():
 
 # MCP Tools
 @mcp.tool()
+@instrument_tool
+@trace_tool
 async def get_comprehensive_insights(
     user_id: str,
     data_selections: List[Dict[str, Any]],
@@ -378,6 +401,8 @@ def _get_field_value(row, field_path: str):
         return None
 
 @mcp.tool()
+@instrument_tool
+@trace_tool
 async def query_google_ads_data(
     user_id: str,
     customer_id: Optional[str] = None,
@@ -386,7 +411,11 @@ async def query_google_ads_data(
     end_date: Optional[str] = None,
     dimensions: Optional[List[str]] = None,
     metrics: Optional[List[str]] = None,
-    custom_query: Optional[str] = None
+    custom_query: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Query Google Ads data directly for specific insights like demographics, campaign performance, etc.
@@ -408,9 +437,14 @@ async def query_google_ads_data(
         dimensions: List of dimensions to include (e.g., ["gender", "age_range"])
         metrics: List of metrics to include (e.g., ["impressions", "clicks", "cost_micros"])
         custom_query: Custom Google Ads query string for advanced queries
+        fields: Result columns to return (e.g., ["campaign_name", "clicks"]). Defaults to all columns.
+        limit: Maximum number of rows to return. Defaults to all rows.
+        order_by: Result column to sort by, e.g. "clicks DESC" or "-clicks"
+        cursor: next_cursor from a previous response to fetch the following page
     
     Returns:
-        Google Ads data formatted for easy analysis
+        Google Ads data formatted for easy analysis. Results are cached briefly, so
+        further pages are served via pagination.next_cursor without re-querying Google Ads.
     
     Example usage for "Which gender viewed the campaign the most":
     - query_type: "demographics"
@@ -420,6 +454,18 @@ async def query_google_ads_data(
     try:
         logger.info(f"MCP: Querying Google Ads data for user {user_id}")
         
+        if cursor:
+            return page_from_cursor(query_result_cache, cursor, user_id, fields, limit)
+        
+        cache_key = QueryResultCache.make_key(
+            "query_google_ads_data", user_id=user_id, customer_id=customer_id, query_type=query_type,
+            start_date=start_date, end_date=end_date, dimensions=dimensions, metrics=metrics,
+            custom_query=custom_query
+        )
+        cached = query_result_cache.get(cache_key) if is_paged(fields, limit, order_by) else None
+        if cached is not None:
+            return paginate_result(cached, cache_key, fields, limit, order_by)
+        
         from routes.google_ads_api import get_google_ads_client
         from google.ads.googleads.errors import GoogleAdsException
         from datetime import datetime, timedelta
@@ -432,7 +478,7 @@ async def query_google_ads_data(
         if not customer_id:
             customer_service = client.get_service("CustomerService")
             request = client.get_type("ListAccessibleCustomersRequest")
-            response = customer_service.list_accessible_customers(request=request)
+            response = await platform_call("google_ads", None, customer_service.list_accessible_customers, request=request)
             if response.resource_names:
                 customer_id = response.resource_names[0].split("/")[-1]
             else:
@@ -467,13 +513,13 @@ async def query_google_ads_data(
             dim_list = dimensions or []
             met_list = metrics or ["impressions", "clicks", "cost_micros", "conversions", "ctr"]
             
-            fields = ["campaign.id", "campaign.name", "campaign.status"]
-            fields.extend([f"metrics.{met}" for met in met_list])
+            select_fields = ["campaign.id", "campaign.name", "campaign.status"]
+            select_fields.extend([f"metrics.{met}" for met in met_list])
             if dim_list:
-                fields.extend([f"segments.{dim}" for dim in dim_list])
+                select_fields.extend([f"segments.{dim}" for dim in dim_list])
             
             query = f"""
-                SELECT {', '.join(fields)}
+                SELECT {', '.join(select_fields)}
                 FROM campaign
                 WHERE segments.date BETWEEN '{start_date}' AND '{end_date}'
                 AND campaign.status != 'REMOVED'
@@ -528,7 +574,9 @@ async def query_google_ads_data(
         
         # Execute query
         logger.info(f"Executing Google Ads query: {query}")
-        response = ga_service.search(customer_id=customer_id, query=query)
+        response = await platform_call(
+            "google_ads", customer_id, lambda: list(ga_service.search(customer_id=customer_id, query=query))
+        )
         
         # Process results
         results = []
@@ -581,7 +629,7 @@ async def query_google_ads_data(
             
             results.append(row_data)
         
-        return {
+        result = {
             "success": True,
             "query_type": query_type,
             "customer_id": customer_id,
@@ -590,7 +638,10 @@ async def query_google_ads_data(
             "data": results,
             "query_executed": query
         }
+        return paginate_new_result(query_result_cache, cache_key, user_id, result, fields, limit, order_by)
         
+    except CursorError as e:
+        return {"success": False, "error": str(e)}
     except GoogleAdsException as ex:
         logger.error(f"MCP: Google Ads API error: {ex}")
         return {"success": False, "error": f"Google Ads API error: {str(ex)}"}
@@ -599,6 +650,8 @@ async def query_google_ads_data(
         return {"success": False, "error": str(e)}
 
 @mcp.tool()
+@instrument_tool
+@trace_tool
 async def query_ga4_data(
     user_id: str,
     property_id: Optional[str] = None,
@@ -607,7 +660,11 @@ async def query_ga4_data(
     end_date: Optional[str] = None,
     dimensions: Optional[List[str]] = None,
     metrics: Optional[List[str]] = None,
-    filters: Optional[Dict[str, str]] = None
+    filters: Optional[Dict[str, str]] = None,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Query Google Analytics 4 data directly for specific insights about website/app performance.
@@ -629,9 +686,13 @@ async def query_ga4_data(
         dimensions: List of GA4 dimensions (e.g., ["userGender", "userAgeBracket"])
         metrics: List of GA4 metrics (e.g., ["sessions", "screenPageViews"])
         filters: Optional filters to apply to the data
+        fields: Result columns to return (e.g., ["sessionSource", "sessions"]). Defaults to all columns.
+        limit: Maximum number of rows to return. Defaults to all rows.
+        order_by: Result column to sort by, e.g. "sessions DESC" or "-sessions"
+        cursor: next_cursor from a previous response to fetch the following page
     
     Returns:
-        GA4 data formatted for easy analysis
+        GA4 data formatted for easy analysis. Totals always cover all rows, not just the page.
     
     Example usage for website demographics:
     - query_type: "demographics" 
@@ -641,6 +702,18 @@ async def query_ga4_data(
     try:
         logger.info(f"MCP: Querying GA4 data for user {user_id}")
         
+        if cursor:
+            return page_from_cursor(query_result_cache, cursor, user_id, fields, limit)
+        
+        cache_key = QueryResultCache.make_key(
+            "query_ga4_data", user_id=user_id, property_id=property_id, query_type=query_type,
+            start_date=start_date, end_date=end_date, dimensions=dimensions, metrics=metrics,
+            filters=filters
+        )
+        cached = query_result_cache.get(cache_key) if is_paged(fields, limit, order_by) else None
+        if cached is not None:
+            return paginate_result(cached, cache_key, fields, limit, order_by)
+        
         from routes.google_analytics_api import get_analytics_client
         from routes.google_oauth import get_user_credentials
         from google.analytics.data_v1beta.types import (
@@ -653,12 +726,14 @@ async def query_ga4_data(
         if not property_id:
             credentials = get_user_credentials(user_id)
             admin_client = AnalyticsAdminServiceClient(credentials=credentials)
-            accounts_response = admin_client.list_accounts()
+            accounts_response = await platform_call("ga4", None, lambda: list(admin_client.list_accounts()))
             
             for account in accounts_response:
                 from google.analytics.admin_v1alpha.types import ListPropertiesRequest
                 request = ListPropertiesRequest(filter=f"parent:{account.name}")
-                properties_response = admin_client.list_properties(request=request)
+                properties_response = await platform_call(
+                    "ga4", None, lambda: list(admin_client.list_properties(request=request))
+                )
                 
                 for prop in properties_response:
                     property_id = prop.name.split('/')[-1]
@@ -726,7 +801,7 @@ async def query_ga4_data(
             pass
         
         # Execute request
-        response = client.run_report(request=request)
+        response = await platform_call("ga4", property_id, client.run_report, request=request)
         
         # Process results
         results = []
@@ -760,7 +835,7 @@ async def query_ga4_data(
                     values = [row.get(metric, 0) for row in results if row.get(metric, 0) > 0]
                     totals[metric] = sum(values) / len(values) if values else 0.0
         
-        return {
+        result = {
             "success": True,
             "query_type": query_type,
             "property_id": property_id,
@@ -771,12 +846,17 @@ async def query_ga4_data(
             "dimensions": dim_list,
             "metrics": met_list
         }
+        return paginate_new_result(query_result_cache, cache_key, user_id, result, fields, limit, order_by)
         
+    except CursorError as e:
+        return {"success": False, "error": str(e)}
     except Exception as e:
         logger.error(f"MCP: Error querying GA4 data: {e}")
         return {"success": False, "error": str(e)}
 
 @mcp.tool()
+@instrument_tool
+@trace_tool
 async def get_ga4_properties(user_id: str) -> Dict[str, Any]:
     """
     Get all accessible Google Analytics 4 properties for the authenticated user.
@@ -811,6 +891,8 @@ async def get_ga4_properties(user_id: str) -> Dict[str, Any]:
         }
 
 @mcp.tool()
+@instrument_tool
+@trace_tool
 async def get_google_ads_accounts(user_id: str) -> Dict[str, Any]:
     """
     Get all accessible Google Ads accounts for the authenticated user.
@@ -832,7 +914,7 @@ async def get_google_ads_accounts(user_id: str) -> Dict[str, Any]:
         
         # Get accessible customers
         request = client.get_type("ListAccessibleCustomersRequest")
-        response = customer_service.list_accessible_customers(request=request)
+        response = await platform_call("google_ads", None, customer_service.list_accessible_customers, request=request)
         
         accounts = []
         for resource_name in response.resource_names:
@@ -842,7 +924,8 @@ async def get_google_ads_accounts(user_id: str) -> Dict[str, Any]:
             try:
                 customer_request = client.get_type("GetCustomerRequest")
                 customer_request.resource_name = resource_name
-                customer = customer_service.get_customer(request=customer_request)
+                customer = await platform_call("google_ads", customer_id, customer_service.get_customer,
+                                               request=customer_request)
                 
                 accounts.append({
                     "customer_id": customer_id,
@@ -879,6 +962,8 @@ async def get_google_ads_accounts(user_id: str) -> Dict[str, Any]:
         }
 
 @mcp.tool()
+@instrument_tool
+@trace_tool
 async def get_meta_ads_accounts(user_id: str) -> Dict[str, Any]:
     """
     Get all accessible Meta (Facebook) Ads accounts for the authenticated user.
@@ -915,13 +1000,13 @@ async def get_meta_ads_accounts(user_id: str) -> Dict[str, Any]:
             }
         
         # Get ad accounts
-        url = f"https://graph.facebook.com/v18.0/me/adaccounts"
+        url = graph_url("me/adaccounts")
         params = {
             "access_token": access_token,
             "fields": "id,name,account_id,currency,account_status,business,timezone_name,spend_cap,funding_source"
         }
         
-        response = requests.get(url, params=params)
+        response = await platform_call("meta_ads", None, requests.get, url, params=params)
         response.raise_for_status()
         
         data = response.json()
@@ -943,13 +1028,19 @@ async def get_meta_ads_accounts(user_id: str) -> Dict[str, Any]:
         }
 
 @mcp.tool()
+@instrument_tool
+@trace_tool
 async def query_meta_ads_data(
     user_id: str,
     account_id: Optional[str] = None,
     query_type: str = "campaigns",
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    custom_fields: Optional[List[str]] = None
+    custom_fields: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Query Meta (Facebook) Ads data for various insights including campaigns, demographics, and performance metrics.
@@ -961,6 +1052,10 @@ async def query_meta_ads_data(
         start_date: Start date for data query (YYYY-MM-DD format)
         end_date: End date for data query (YYYY-MM-DD format)
         custom_fields: Custom fields to query (overrides default fields for query_type)
+        fields: Result columns to return (e.g., ["campaign_name", "spend"]). Defaults to all columns.
+        limit: Maximum number of rows to return. Defaults to all rows.
+        order_by: Result column to sort by, e.g. "spend DESC" or "-spend"
+        cursor: next_cursor from a previous response to fetch the following page
 
     Returns:
         Meta Ads data based on query type with metrics and insights
@@ -968,6 +1063,17 @@ async def query_meta_ads_data(
     try:
         logger.info(f"MCP: Querying Meta Ads data for user {user_id}")
 
+        if cursor:
+            return page_from_cursor(query_result_cache, cursor, user_id, fields, limit)
+
+        cache_key = QueryResultCache.make_key(
+            "query_meta_ads_data", user_id=user_id, account_id=account_id, query_type=query_type,
+            start_date=start_date, end_date=end_date, custom_fields=custom_fields
+        )
+        cached = query_result_cache.get(cache_key) if is_paged(fields, limit, order_by) else None
+        if cached is not None:
+            return paginate_result(cached, cache_key, fields, limit, order_by)
+
         from credential_manager import credential_manager
         import requests
         from datetime import datetime, timedelta
@@ -993,13 +1099,13 @@ async def query_meta_ads_data(
 
         # If no account_id provided, get the first available account
         if not account_id:
-            accounts_url = f"https://graph.facebook.com/v18.0/me/adaccounts"
+            accounts_url = graph_url("me/adaccounts")
             accounts_params = {
                 "access_token": access_token,
                 "fields": "id,account_id"
             }
 
-            accounts_response = requests.get(accounts_url, params=accounts_params)
+            accounts_response = await platform_call("meta_ads", None, requests.get, accounts_url, params=accounts_params)
             accounts_response.raise_for_status()
             accounts_data = accounts_response.json()
             accounts = accounts_data.get("data", [])
@@ -1021,7 +1127,7 @@ async def query_meta_ads_data(
 
         # Define fields based on query type
         if custom_fields:
-            fields = custom_fields
+            api_fields = custom_fields
         else:
             base_metrics = [
                 "impressions", "clicks", "spend", "reach", "frequency",
@@ -1029,32 +1135,32 @@ async def query_meta_ads_data(
             ]
 
             if query_type == "campaigns":
-                fields = ["campaign_id", "campaign_name"] + base_metrics
+                api_fields = ["campaign_id", "campaign_name"] + base_metrics
             elif query_type == "demographics":
-                fields = ["age", "gender"] + base_metrics
+                api_fields = ["age", "gender"] + base_metrics
             elif query_type == "interests":
-                fields = ["actions", "action_type"] + base_metrics
+                api_fields = ["actions", "action_type"] + base_metrics
             elif query_type == "devices":
-                fields = ["platform_position", "impression_device"] + base_metrics
+                api_fields = ["platform_position", "impression_device"] + base_metrics
             elif query_type == "locations":
-                fields = ["country", "region", "dma"] + base_metrics
+                api_fields = ["country", "region", "dma"] + base_metrics
             elif query_type == "performance":
-                fields = ["date_start", "date_stop"] + base_metrics
+                api_fields = ["date_start", "date_stop"] + base_metrics
             else:
-                fields = base_metrics
+                api_fields = base_metrics
 
         # Build API URL based on query type
         if query_type == "campaigns":
-            url = f"https://graph.facebook.com/v18.0/{account_id}/campaigns"
+            url = graph_url(f"{account_id}/campaigns")
             params = {
                 "access_token": access_token,
-                "fields": f"id,name,status,insights{{{',' .join(fields)}}}"
+                "fields": f"id,name,status,insights{{{',' .join(api_fields)}}}"
             }
         elif query_type in ["demographics", "interests", "devices", "locations", "performance"]:
-            url = f"https://graph.facebook.com/v18.0/{account_id}/insights"
+            url = graph_url(f"{account_id}/insights")
             params = {
                 "access_token": access_token,
-                "fields": ",".join(fields),
+                "fields": ",".join(api_fields),
                 "time_range": f'{{"since":"{start_date}","until":"{end_date}"}}',
                 "time_increment": 1
             }
@@ -1070,15 +1176,15 @@ async def query_meta_ads_data(
                 params["breakdowns"] = "country,region,dma"
         else:
             # Default to insights
-            url = f"https://graph.facebook.com/v18.0/{account_id}/insights"
+            url = graph_url(f"{account_id}/insights")
             params = {
                 "access_token": access_token,
-                "fields": ",".join(fields),
+                "fields": ",".join(api_fields),
                 "time_range": f'{{"since":"{start_date}","until":"{end_date}"}}'
             }
 
         # Make API request
-        response = requests.get(url, params=params)
+        response = await platform_call("meta_ads", account_id, requests.get, url, params=params)
         response.raise_for_status()
 
         data = response.json()
@@ -1101,21 +1207,26 @@ async def query_meta_ads_data(
             else:
                 processed_results.append(item)
 
-        return {
+        result = {
             "success": True,
             "query_type": query_type,
             "account_id": account_id,
             "date_range": {"start": start_date, "end": end_date},
             "total_rows": len(processed_results),
             "data": processed_results,
-            "fields_requested": fields
+            "fields_requested": api_fields
         }
+        return paginate_new_result(query_result_cache, cache_key, user_id, result, fields, limit, order_by)
 
+    except CursorError as e:
+        return {"success": False, "error": str(e)}
     except Exception as e:
         logger.error(f"MCP: Error querying Meta Ads data: {e}")
         return {"success": False, "error": str(e)}
 
 @mcp.tool()
+@instrument_tool
+@trace_tool
 async def get_platform_examples() -> Dict[str, Any]:
     """
     Get examples of how to structure data_selections for different platforms.
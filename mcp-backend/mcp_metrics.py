@@ -0,0 +1,191 @@
+"""
+MCP Metrics Module
+Prometheus metrics for mcp-backend, served on /metrics: latency per HTTP route
+and per MCP tool, connector fetch latency/rows/errors, SQLite query time and
+event-loop lag. Cache and compute pool statistics are read from their stats()
+at scrape time, so they add nothing to the request path.
+"""
+
+import functools
+import time
+from typing import Any, Callable, Dict, Iterator
+import logging
+
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.responses import Response
+
+from http_metrics import LATENCY_BUCKETS, QUERY_BUCKETS, HTTPMetrics, MetricsMiddleware, statement_type
+
+logger = logging.getLogger(__name__)
+
+ROW_BUCKETS = (0, 10, 100, 1000, 10000, 100000, 1000000)
+
+# Request latency and event-loop lag; the middleware is added with metrics=HTTP_METRICS
+HTTP_METRICS = HTTPMetrics("mcp")
+TOOL_SECONDS = Histogram(
+    "mcp_tool_duration_seconds", "MCP tool call latency; outcome is ok, error (success=false) or exception",
+    ["tool", "outcome"], buckets=LATENCY_BUCKETS
+)
+CONNECTOR_FETCH_SECONDS = Histogram(
+    "mcp_connector_fetch_duration_seconds", "Platform connector fetch_data latency",
+    ["connector"], buckets=LATENCY_BUCKETS
+)
+CONNECTOR_FETCH_ROWS = Histogram(
+    "mcp_connector_fetch_rows", "Rows returned per connector fetch", ["connector"], buckets=ROW_BUCKETS
+)
+CONNECTOR_ERRORS = Counter(
+    "mcp_connector_errors_total", "Connector fetches that failed, by exception type", ["connector", "error"]
+)
+SQLITE_QUERY_SECONDS = Histogram(
+    "mcp_sqlite_query_duration_seconds", "Credential database statement time by statement type",
+    ["statement"], buckets=QUERY_BUCKETS
+)
+
+
+def observe_connector_fetch(connector: str, seconds: float, rows: int):
+    CONNECTOR_FETCH_SECONDS.labels(connector).observe(seconds)
+    CONNECTOR_FETCH_ROWS.labels(connector).observe(rows)
+
+
+def record_connector_error(connector: str, error: BaseException):
+    """Count a failed fetch; the connector's span (see mcp_tracing) is marked as failed too"""
+    CONNECTOR_ERRORS.labels(connector, type(error).__name__).inc()
+    span = trace.get_current_span()
+    span.record_exception(error)
+    span.set_status(Status(StatusCode.ERROR, str(error)[:200]))
+
+
+def instrument_fetch(connector: str) -> Callable:
+    """Decorator for a connector's async fetch_data: latency and row count per call"""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = await fn(*args, **kwargs)
+            observe_connector_fetch(connector, time.perf_counter() - started, len(result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_tool(fn: Callable) -> Callable:
+    """Decorator for an async MCP tool (apply below @mcp.tool()); the signature is kept for FastMCP"""
+    tool = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = await fn(*args, **kwargs)
+            outcome = "error" if isinstance(result, dict) and result.get("success") is False else "ok"
+            return result
+        finally:
+            TOOL_SECONDS.labels(tool, outcome).observe(time.perf_counter() - started)
+
+    return wrapper
+
+
+def observe_sqlite_statement(sql: str, seconds: float):
+    SQLITE_QUERY_SECONDS.labels(statement_type(sql)).observe(seconds)
+
+
+class _StatsCollector:
+    """Exports the caches', the compute pool's and the platform limiter's own counters when /metrics is scraped"""
+
+    def collect(self) -> Iterator[Any]:
+        hits = CounterMetricFamily("mcp_cache_hits", "Cache lookups that found an entry", labels=["cache"])
+        misses = CounterMetricFamily("mcp_cache_misses", "Cache lookups that found no entry", labels=["cache"])
+        evictions = CounterMetricFamily("mcp_cache_evictions", "Entries evicted to stay within bounds", labels=["cache"])
+        entries = GaugeMetricFamily("mcp_cache_entries", "Entries currently cached", labels=["cache"])
+        for name, stats in self._cache_stats().items():
+            hits.add_metric([name], stats.get("hits", 0))
+            misses.add_metric([name], stats.get("misses", 0))
+            evictions.add_metric([name], stats.get("evictions", 0))
+            entries.add_metric([name], stats.get("entries", 0))
+        yield from (hits, misses, evictions, entries)
+
+        from platform_limiter import platform_limiter
+        limiter = platform_limiter.stats()
+        yield CounterMetricFamily("mcp_platform_calls", "Platform API call attempts", value=limiter["calls"])
+        yield CounterMetricFamily("mcp_platform_retries", "Platform API calls retried after a retryable error",
+                                  value=limiter["retries"])
+        yield CounterMetricFamily("mcp_platform_failures", "Platform API calls that failed after retrying",
+                                  value=limiter["failures"])
+        yield CounterMetricFamily("mcp_platform_throttled_seconds", "Time platform calls waited for a token",
+                                  value=limiter["throttled_seconds"])
+        yield CounterMetricFamily("mcp_platform_timeouts", "Platform call attempts that ran past PLATFORM_CALL_TIMEOUT",
+                                  value=limiter["timeouts"])
+        yield CounterMetricFamily("mcp_platform_circuit_rejections", "Platform calls rejected by an open circuit breaker",
+                                  value=limiter["rejected"])
+        yield CounterMetricFamily("mcp_platform_hedges", "Hedged second attempts fired for slow platform reads",
+                                  value=limiter["hedges"])
+        yield CounterMetricFamily("mcp_platform_hedge_wins", "Hedged attempts that finished before the original",
+                                  value=limiter["hedge_wins"])
+        yield GaugeMetricFamily("mcp_platform_open_circuits", "Platform and account circuit breakers not closed",
+                                value=sum(breaker["state"] != "closed" for breaker in limiter["breakers"].values()))
+
+        try:
+            from analysis_jobs import analysis_jobs
+            job_stats = analysis_jobs.stats()
+        except Exception as e:
+            logger.debug(f"Analysis job stats unavailable: {e}")
+        else:
+            yield GaugeMetricFamily("mcp_analysis_jobs_queued", "Analysis jobs waiting for a job worker",
+                                    value=job_stats["queued"])
+            yield GaugeMetricFamily("mcp_analysis_jobs_running", "Analysis jobs being replayed", value=job_stats["running"])
+            submissions = CounterMetricFamily("mcp_analysis_job_submissions", "Job submissions by outcome",
+                                              labels=["outcome"])
+            for outcome in ("submitted", "deduplicated", "rejected"):
+                submissions.add_metric([outcome], job_stats[outcome])
+            yield submissions
+            finished = CounterMetricFamily("mcp_analysis_jobs_finished", "Finished analysis jobs by status",
+                                           labels=["status"])
+            for status in ("succeeded", "failed"):
+                finished.add_metric([status], job_stats[status])
+            yield finished
+
+        try:
+            from compute_executor import compute_executor
+            stats = compute_executor.stats()
+        except Exception as e:
+            logger.debug(f"Compute executor stats unavailable: {e}")
+            return
+        yield GaugeMetricFamily("mcp_compute_in_flight", "Analysis jobs running or queued", value=stats["in_flight"])
+        yield GaugeMetricFamily("mcp_compute_queue_depth", "Analysis jobs waiting for a worker",
+                                value=stats["queue_depth"])
+        jobs = CounterMetricFamily("mcp_compute_jobs", "Finished analysis jobs by outcome", labels=["outcome"])
+        for outcome in ("completed", "failed", "timeouts"):
+            jobs.add_metric([outcome], stats[outcome])
+        yield jobs
+        yield CounterMetricFamily("mcp_compute_busy_seconds", "Time spent running analysis jobs",
+                                  value=stats["busy_seconds"])
+
+    @staticmethod
+    def _cache_stats() -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        try:
+            from analytics.analysis_cache import analysis_cache
+            stats["analysis"] = analysis_cache.stats()
+        except Exception as e:
+            logger.debug(f"Analysis cache stats unavailable: {e}")
+        try:
+            from query_cache import query_result_cache
+            stats["query_result"] = query_result_cache.stats()
+        except Exception as e:
+            logger.debug(f"Query result cache stats unavailable: {e}")
+        return stats
+
+
+REGISTRY.register(_StatsCollector())
+
+
+def metrics_response() -> Response:
+    """Prometheus text exposition of every metric in this process"""
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
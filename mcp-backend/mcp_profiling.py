@@ -0,0 +1,369 @@
+"""
+MCP Profiling Module
+On-demand profiling of live requests. A request is profiled when it carries
+the X-Profile-Token header, or when profiling is switched on through the admin
+endpoints and the request is sampled. The handler runs under pyinstrument (or
+cProfile when pyinstrument is not installed) with tracemalloc tracing
+allocations; compute-pool tasks started by the request run under cProfile in
+their worker and their stats are added to the same report.
+
+Reports are written to a bounded on-disk ring: the oldest report is deleted
+once PROFILING_MAX_REPORTS are kept. Only one request is profiled at a time.
+
+Nothing is installed unless PROFILING_TOKEN is set, so profiling costs nothing
+when it is not configured; when it is configured but idle, each request pays
+for one flag check and a header lookup.
+
+Environment:
+- PROFILING_TOKEN: shared secret for the trigger header and the admin endpoints
+- PROFILING_ENABLED: initial state of sampled profiling (default off)
+- PROFILING_SAMPLE_RATE: fraction of requests profiled while sampling is on
+- PROFILING_PATHS: comma-separated path prefixes eligible for sampling (default all)
+- PROFILING_DIR: where reports are written
+- PROFILING_MAX_REPORTS: reports kept on disk
+- PROFILING_TRACEMALLOC_FRAMES: stack depth recorded per allocation
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import hmac
+import io
+import json
+import marshal
+import os
+import pstats
+import random
+import re
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import logging
+
+from opentelemetry import trace
+
+logger = logging.getLogger(__name__)
+
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0.01"))
+PROFILING_PATHS = [path.strip() for path in os.getenv("PROFILING_PATHS", "").split(",") if path.strip()]
+PROFILING_DIR = os.getenv("PROFILING_DIR", os.path.join(tempfile.gettempdir(), "mcp-profiles"))
+PROFILING_MAX_REPORTS = int(os.getenv("PROFILING_MAX_REPORTS", "50"))
+PROFILING_TRACEMALLOC_FRAMES = int(os.getenv("PROFILING_TRACEMALLOC_FRAMES", "10"))
+
+PROFILE_HEADER = b"x-profile-token"
+# Never profiled: the admin endpoints themselves and scrapes
+EXCLUDED_PREFIXES = ("/debug/", "/metrics")
+TOP_ALLOCATIONS = 50
+TOP_FUNCTIONS = 60
+
+# Report ids sort by creation time, which is what the ring relies on
+_REPORT_ID = re.compile(r"^[0-9]{8}T[0-9]{6}\.[0-9]{6}-[0-9a-f]{8}$")
+_ARTIFACT = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+_active_profile: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar(
+    "active_profile", default=None
+)
+
+
+def current_profile() -> Optional["ProfileSession"]:
+    """The profile session of the request being handled, if it is profiled"""
+    return _active_profile.get()
+
+
+def token_matches(token: Optional[str]) -> bool:
+    return bool(PROFILING_TOKEN and token) and hmac.compare_digest(token, PROFILING_TOKEN)
+
+
+class ProfileSession:
+    """Profiles one request: handler profile, allocation snapshot and compute worker stats"""
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.report_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S.%f')}-{uuid.uuid4().hex[:8]}"
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.worker_stats: List[tuple] = []
+        self._profiler = None
+        self._kind = None
+        self._started_tracemalloc = False
+        self._started = 0.0
+        self._duration = 0.0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILING_TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        try:
+            from pyinstrument import Profiler
+            self._profiler, self._kind = Profiler(async_mode="enabled"), "pyinstrument"
+        except ImportError:
+            # cProfile sees every coroutine the loop runs meanwhile, not only this request's
+            self._profiler, self._kind = cProfile.Profile(), "cProfile"
+        self._started = time.perf_counter()
+        if self._kind == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self):
+        self._duration = time.perf_counter() - self._started
+        if self._kind == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+        self.snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def add_worker_stats(self, name: str, marshalled_stats: bytes):
+        """Stats of a compute task run on this request's behalf (a .pstats file's content)"""
+        self.worker_stats.append((name, marshalled_stats))
+
+    def artifacts(self) -> Dict[str, bytes]:
+        """Report files by name; builds the renderings, so call it off the event loop"""
+        files = {}
+        if self._kind == "pyinstrument":
+            from pyinstrument.renderers import SpeedscopeRenderer
+            files["profile.html"] = self._profiler.output_html().encode()
+            files["profile.speedscope.json"] = self._profiler.output(SpeedscopeRenderer()).encode()
+            files["profile.txt"] = self._profiler.output_text(unicode=True, color=False).encode()
+        else:
+            self._profiler.create_stats()
+            files["profile.pstats"] = _marshal_stats(self._profiler)
+            files["profile.txt"] = _stats_text(pstats.Stats(self._profiler)).encode()
+
+        for index, (name, marshalled) in enumerate(self.worker_stats):
+            files[f"worker-{index:02d}-{name}.pstats"] = marshalled
+            files[f"worker-{index:02d}-{name}.txt"] = _stats_text(_load_stats(marshalled)).encode()
+
+        stats = self.snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )).statistics("lineno")
+        total = sum(stat.size for stat in stats)
+        lines = [f"Traced allocations still alive at the end of the request: {total / 1024:.1f} KiB", ""]
+        lines += [str(stat) for stat in stats[:TOP_ALLOCATIONS]]
+        files["allocations.txt"] = "\n".join(lines).encode()
+        return files
+
+    def metadata(self, status: int, trace_id: Optional[str]) -> Dict[str, Any]:
+        return {
+            "id": self.report_id,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "duration_ms": round(self._duration * 1000, 3),
+            "trigger": self.trigger,
+            "profiler": self._kind,
+            "worker_tasks": len(self.worker_stats),
+            "trace_id": trace_id
+        }
+
+
+def _marshal_stats(profiler: cProfile.Profile) -> bytes:
+    return marshal.dumps(profiler.stats)
+
+
+class _LoadedStats:
+    """Profile-like holder so pstats.Stats can read marshalled stats without a file"""
+
+    def __init__(self, marshalled: bytes):
+        self.stats = marshal.loads(marshalled)
+
+    def create_stats(self):
+        pass
+
+
+def _load_stats(marshalled: bytes) -> pstats.Stats:
+    return pstats.Stats(_LoadedStats(marshalled))
+
+
+def _stats_text(stats: pstats.Stats) -> str:
+    out = io.StringIO()
+    stats.stream = out
+    stats.strip_dirs().sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    return out.getvalue()
+
+
+class ProfileStore:
+    """Bounded ring of reports on disk, one directory per report"""
+
+    def __init__(self, directory: str = PROFILING_DIR, max_reports: int = PROFILING_MAX_REPORTS):
+        self.directory = directory
+        self.max_reports = max_reports
+        self._lock = threading.Lock()
+
+    def save(self, metadata: Dict[str, Any], files: Dict[str, bytes], snapshot: Optional[tracemalloc.Snapshot] = None):
+        report_dir = os.path.join(self.directory, metadata["id"])
+        os.makedirs(report_dir, exist_ok=True)
+        for name, content in files.items():
+            with open(os.path.join(report_dir, name), "wb") as f:
+                f.write(content)
+        if snapshot is not None:
+            # Load with tracemalloc.Snapshot.load() to compare against another report
+            snapshot.dump(os.path.join(report_dir, "allocations.tracemalloc"))
+        metadata["artifacts"] = {name: os.path.getsize(os.path.join(report_dir, name))
+                                 for name in sorted(os.listdir(report_dir))}
+        with open(os.path.join(report_dir, "report.json"), "w") as f:
+            json.dump(metadata, f, indent=2)
+        self._prune()
+
+    def _report_ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if _REPORT_ID.match(name))
+
+    def _prune(self):
+        with self._lock:
+            report_ids = self._report_ids()
+            for report_id in report_ids[:max(len(report_ids) - self.max_reports, 0)]:
+                shutil.rmtree(os.path.join(self.directory, report_id), ignore_errors=True)
+
+    def get(self, report_id: str) -> Optional[Dict[str, Any]]:
+        if not _REPORT_ID.match(report_id):
+            return None
+        try:
+            with open(os.path.join(self.directory, report_id, "report.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Report metadata, newest first"""
+        reports = (self.get(report_id) for report_id in reversed(self._report_ids()))
+        return [report for report in reports if report is not None]
+
+    def artifact_path(self, report_id: str, artifact: str) -> Optional[str]:
+        report = self.get(report_id)
+        if report is None or not _ARTIFACT.match(artifact) or artifact not in report.get("artifacts", {}):
+            return None
+        return os.path.join(self.directory, report_id, artifact)
+
+
+class ProfilingController:
+    """Sampling switch set from the admin endpoints; at most one request is profiled at a time"""
+
+    def __init__(self):
+        self.enabled = PROFILING_ENABLED
+        self.sample_rate = PROFILING_SAMPLE_RATE
+        self.paths = list(PROFILING_PATHS)
+        self.store = ProfileStore()
+        self.profiled = 0
+        self.skipped_busy = 0
+        self._busy = threading.Lock()
+
+    def configure(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None,
+                  paths: Optional[List[str]] = None):
+        if enabled is not None:
+            self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        if paths is not None:
+            self.paths = [path for path in paths if path]
+
+    def trigger(self, scope) -> Optional[str]:
+        """'header' or 'sampled' when this request should be profiled"""
+        path = scope["path"]
+        if path.startswith(EXCLUDED_PREFIXES):
+            return None
+        for key, value in scope.get("headers", []):
+            if key == PROFILE_HEADER:
+                return "header" if token_matches(value.decode("latin-1")) else None
+        if self.enabled and (not self.paths or path.startswith(tuple(self.paths))) \
+                and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def acquire(self) -> bool:
+        if self._busy.acquire(blocking=False):
+            return True
+        self.skipped_busy += 1
+        return False
+
+    def release(self):
+        self._busy.release()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "paths": self.paths or ["*"],
+            "profiling_now": self._busy.locked(),
+            "profiled": self.profiled,
+            "skipped_busy": self.skipped_busy,
+            "directory": self.store.directory,
+            "max_reports": self.store.max_reports
+        }
+
+
+# Shared instance used by the middleware and the admin endpoints
+profiling_controller = ProfilingController()
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling selected requests; the report id is
+    returned as X-Profile-Id. Only added when PROFILING_TOKEN is set.
+    """
+
+    def __init__(self, app, controller: ProfilingController = profiling_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (not self.controller.enabled and not _has_profile_header(scope)):
+            await self.app(scope, receive, send)
+            return
+        trigger = self.controller.trigger(scope)
+        if trigger is None or not self.controller.acquire():
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            session = ProfileSession(scope["method"], scope["path"], trigger)
+            status = 500
+
+            async def send_with_profile_id(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    message = {**message, "headers": list(message.get("headers", []))
+                               + [(b"x-profile-id", session.report_id.encode())]}
+                await send(message)
+
+            span_context = trace.get_current_span().get_span_context()
+            trace_id = format(span_context.trace_id, "032x") if span_context.is_valid else None
+            token = _active_profile.set(session)
+            session.start()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                session.stop()
+                _active_profile.reset(token)
+                await asyncio.to_thread(self._save, session, session.metadata(status, trace_id))
+        finally:
+            self.controller.release()
+
+    def _save(self, session: ProfileSession, metadata: Dict[str, Any]):
+        try:
+            self.controller.store.save(metadata, session.artifacts(), session.snapshot)
+            self.controller.profiled += 1
+            logger.info(f"Profiled {session.method} {session.path} ({metadata['duration_ms']:.0f} ms) "
+                        f"as {session.report_id}")
+        except Exception as e:
+            logger.warning(f"Could not save profile {session.report_id}: {e}")
+
+
+def _has_profile_header(scope) -> bool:
+    return any(key == PROFILE_HEADER for key, _ in scope.get("headers", []))
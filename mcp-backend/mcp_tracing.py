@@ -0,0 +1,321 @@
+"""
+MCP Tracing Module
+OpenTelemetry tracing shared by mcp-backend and backend (which imports this
+module from MCP_BACKEND_PATH). The W3C trace context sent by backend's MCP
+client (traceparent header) parents the tool, fetch, analysis and compute
+spans created here, so one chat turn is a single trace across both services.
+
+Finished spans are kept in an in-process ring buffer (served as waterfalls on
+/debug/traces) and can also be written to a JSON-lines file or an OTLP
+collector.
+
+Environment:
+- TRACING_ENABLED: set to false to create no spans at all
+- TRACE_BUFFER_TRACES: traces kept in memory for /debug/traces
+- TRACE_EXPORT_FILE: append every finished span to this JSON-lines file
+- OTEL_EXPORTER_OTLP_ENDPOINT: export over OTLP/HTTP (opentelemetry-exporter-otlp-proto-http)
+- TRACES_TOKEN: required in X-Trace-Token by /debug/traces; without it those endpoints don't exist
+"""
+
+import functools
+import hmac
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import logging
+
+from fastapi import Header, HTTPException
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+TRACE_BUFFER_TRACES = int(os.getenv("TRACE_BUFFER_TRACES", "200"))
+TRACE_BUFFER_SPANS_PER_TRACE = 1000
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE")
+OTEL_EXPORTER_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+# Span attributes include tool arguments (user and account ids), so the trace endpoints need a token
+TRACES_TOKEN = os.getenv("TRACES_TOKEN")
+
+tracer = trace.get_tracer(__name__)
+
+
+def span_to_dict(span: ReadableSpan) -> Dict[str, Any]:
+    parent = span.parent
+    return {
+        "trace_id": format(span.context.trace_id, "032x"),
+        "span_id": format(span.context.span_id, "016x"),
+        "parent_id": format(parent.span_id, "016x") if parent else None,
+        "name": span.name,
+        "kind": span.kind.name,
+        "service": span.resource.attributes.get("service.name"),
+        "start_ns": span.start_time,
+        "end_ns": span.end_time,
+        "duration_ms": round((span.end_time - span.start_time) / 1e6, 3),
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {})
+    }
+
+
+class TraceBuffer(SpanProcessor):
+    """Ring buffer of the most recent traces (finished spans grouped by trace id)"""
+
+    def __init__(self, max_traces: int = TRACE_BUFFER_TRACES):
+        self.max_traces = max_traces
+        self._traces: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_end(self, span: ReadableSpan):
+        record = span_to_dict(span)
+        with self._lock:
+            spans = self._traces.setdefault(record["trace_id"], [])
+            if len(spans) < TRACE_BUFFER_SPANS_PER_TRACE:
+                spans.append(record)
+            self._traces.move_to_end(record["trace_id"])
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+
+    def get(self, trace_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._traces.get(trace_id, []))
+
+    def recent(self, limit: int = 20, min_duration_ms: float = 0.0) -> List[Dict[str, Any]]:
+        """Summaries of the most recent traces whose duration is at least min_duration_ms"""
+        with self._lock:
+            traces = [(trace_id, list(spans)) for trace_id, spans in reversed(self._traces.items())]
+        summaries = []
+        for trace_id, spans in traces:
+            summary = summarize_trace(trace_id, spans)
+            if summary["duration_ms"] >= min_duration_ms:
+                summaries.append(summary)
+            if len(summaries) >= limit:
+                break
+        return summaries
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends spans to a local file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(span_to_dict(span), default=str) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.warning(f"Could not write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+
+trace_buffer = TraceBuffer()
+
+
+def setup_tracing(service_name: str):
+    """
+    Install the tracer provider once per process. When another service in the
+    same process (backend with the in-process MCP transport) already did, its
+    provider and buffer are used.
+    """
+    if not TRACING_ENABLED or isinstance(trace.get_tracer_provider(), TracerProvider):
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(trace_buffer)
+    if TRACE_EXPORT_FILE:
+        provider.add_span_processor(BatchSpanProcessor(JsonLinesSpanExporter(TRACE_EXPORT_FILE)))
+    if OTEL_EXPORTER_OTLP_ENDPOINT:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        except ImportError:
+            logger.warning("OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-exporter-otlp-proto-http "
+                           "is not installed; spans stay in the local buffer")
+    trace.set_tracer_provider(provider)
+
+
+@contextmanager
+def start_span(name: str, kind: SpanKind = SpanKind.INTERNAL, context=None, **attributes) -> Iterator[Any]:
+    """A span as the current span; None-valued attributes are dropped"""
+    if not TRACING_ENABLED:
+        yield trace.INVALID_SPAN
+        return
+    attributes = {key: value for key, value in attributes.items() if value is not None}
+    with tracer.start_as_current_span(name, context=context, kind=kind, attributes=attributes) as span:
+        yield span
+
+
+def traced(name: str, **attributes) -> Callable:
+    """Decorator running an async function inside a span"""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with start_span(name, **attributes):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def inject_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add the current trace context (traceparent) to outgoing request headers"""
+    propagate.inject(headers)
+    return headers
+
+
+def _tool_parent_context():
+    """
+    Trace context for an MCP tool call. Over HTTP the tool runs in the MCP
+    session's task rather than the request's, so the parent comes from the
+    request headers; direct (in-process) calls keep the caller's context.
+    """
+    try:
+        from fastmcp.server.dependencies import get_http_headers
+        headers = get_http_headers()
+    except Exception:
+        headers = {}
+    if not headers:
+        return None
+    # No traceparent: start a new trace rather than inherit the session's first request
+    return propagate.extract(headers, context=otel_context.Context())
+
+
+def trace_tool(fn: Callable) -> Callable:
+    """Decorator for an async MCP tool (apply below @mcp.tool()); spans carry the tool's arguments"""
+    tool = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        arguments = {f"mcp.arg.{key}": value for key, value in kwargs.items() if isinstance(value, (str, int, float, bool))}
+        with start_span(f"mcp.tool {tool}", kind=SpanKind.SERVER, context=_tool_parent_context(),
+                        **{"mcp.tool": tool}, **arguments) as span:
+            result = await fn(*args, **kwargs)
+            if isinstance(result, dict) and result.get("success") is False:
+                span.set_status(Status(StatusCode.ERROR, str(result.get("error", ""))[:200]))
+            return result
+
+    return wrapper
+
+
+def summarize_trace(trace_id: str, spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if not spans:
+        return {"trace_id": trace_id, "duration_ms": 0.0, "spans": 0}
+    span_ids = {span["span_id"] for span in spans}
+    roots = [span for span in spans if span["parent_id"] not in span_ids] or spans
+    root = min(roots, key=lambda span: span["start_ns"])
+    start = min(span["start_ns"] for span in spans)
+    end = max(span["end_ns"] for span in spans)
+    return {
+        "trace_id": trace_id,
+        "root": root["name"],
+        "service": root["service"],
+        "started_ns": start,
+        "duration_ms": round((end - start) / 1e6, 3),
+        "spans": len(spans),
+        "errors": sum(span["status"] == "ERROR" for span in spans)
+    }
+
+
+def waterfall(spans: List[Dict[str, Any]], width: int = 60) -> Dict[str, Any]:
+    """Spans of one trace in start order with depth, offset and a text bar per span"""
+    if not spans:
+        return {"duration_ms": 0.0, "spans": [], "text": ""}
+    by_id = {span["span_id"]: span for span in spans}
+    start = min(span["start_ns"] for span in spans)
+    total = max(max(span["end_ns"] for span in spans) - start, 1)
+
+    def depth(span):
+        level, parent = 0, span["parent_id"]
+        while parent in by_id and level < 50:
+            level, parent = level + 1, by_id[parent]["parent_id"]
+        return level
+
+    rows, lines = [], []
+    for span in sorted(spans, key=lambda span: (span["start_ns"], -span["end_ns"])):
+        row = {**span, "depth": depth(span), "offset_ms": round((span["start_ns"] - start) / 1e6, 3)}
+        rows.append(row)
+        left = int((span["start_ns"] - start) / total * width)
+        bar = max(int((span["end_ns"] - span["start_ns"]) / total * width), 1)
+        label = ("  " * row["depth"] + span["name"])[:48]
+        lines.append(f"{label:<48} {' ' * left}{'#' * bar:<{width - left}} "
+                     f"{row['offset_ms']:>9.1f} +{span['duration_ms']:.1f} ms [{span['service']}]")
+    return {"duration_ms": round(total / 1e6, 3), "spans": rows, "text": "\n".join(lines)}
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware opening a server span per HTTP request, parented by
+    an incoming traceparent header. The trace id is returned as X-Trace-Id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        root_path = scope.get("root_path", "")
+        with start_span(f"{scope['method']} {scope['path']}", kind=SpanKind.SERVER,
+                        context=propagate.extract(headers, context=otel_context.get_current()),
+                        **{"http.method": scope["method"], "http.target": scope["path"]}) as span:
+            trace_id = format(span.get_span_context().trace_id, "032x").encode()
+
+            async def send_with_trace_id(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                    message = {**message, "headers": list(message.get("headers", [])) + [(b"x-trace-id", trace_id)]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    route = scope.get("root_path", "")[len(root_path):] + route
+                    span.set_attribute("http.route", route)
+                    span.update_name(f"{scope['method']} {route}")
+
+
+def traces_token_matches(token: Optional[str]) -> bool:
+    return bool(TRACES_TOKEN and token) and hmac.compare_digest(token, TRACES_TOKEN)
+
+
+def require_traces_token(x_trace_token: Optional[str] = Header(None)):
+    """Dependency for /debug/traces*: needs X-Trace-Token; without TRACES_TOKEN they don't exist"""
+    if not TRACES_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not traces_token_matches(x_trace_token):
+        raise HTTPException(status_code=403, detail="Invalid trace token")
+
+
+def debug_traces(limit: int = 20, min_ms: float = 0.0) -> Dict[str, Any]:
+    return {"traces": trace_buffer.recent(limit=limit, min_duration_ms=min_ms)}
+
+
+def debug_trace(trace_id: str) -> Dict[str, Any]:
+    spans = trace_buffer.get(trace_id)
+    return {"trace_id": trace_id, **waterfall(spans)}
@@ -0,0 +1,118 @@
+"""
+Platform Endpoints Module
+Configurable API endpoints for the Meta Graph, Google Ads and GA4 Data clients,
+so every request path can be pointed at a local stand-in server
+(benchmarks/platform_standin.py) for load testing.
+
+Environment:
+- META_GRAPH_API_BASE: Graph API origin, e.g. http://localhost:8090
+- META_GRAPH_API_VERSION: Graph API version used in request paths
+- GOOGLE_ADS_API_ENDPOINT: host:port of the Google Ads gRPC endpoint
+- GOOGLE_ADS_API_VERSION: Google Ads API version for every client
+- GA4_DATA_API_ENDPOINT: GA4 Data API endpoint; an http(s):// URL selects the REST transport
+- PLATFORM_ANONYMOUS_CREDENTIALS: send no OAuth credentials to Google (stand-ins only)
+"""
+
+import os
+from typing import Any, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_META_GRAPH_API_BASE = "https://graph.facebook.com"
+
+META_GRAPH_API_BASE = os.getenv("META_GRAPH_API_BASE", DEFAULT_META_GRAPH_API_BASE).rstrip("/")
+META_GRAPH_API_VERSION = os.getenv("META_GRAPH_API_VERSION", "v18.0")
+GOOGLE_ADS_API_ENDPOINT = os.getenv("GOOGLE_ADS_API_ENDPOINT") or None
+GOOGLE_ADS_API_VERSION = os.getenv("GOOGLE_ADS_API_VERSION", "v21")
+GA4_DATA_API_ENDPOINT = os.getenv("GA4_DATA_API_ENDPOINT") or None
+PLATFORM_ANONYMOUS_CREDENTIALS = os.getenv("PLATFORM_ANONYMOUS_CREDENTIALS", "false").lower() in ("1", "true", "yes")
+
+
+def graph_url(path: str) -> str:
+    """Versioned Graph API URL for a path such as 'me/adaccounts' or '{account_id}/insights'"""
+    return f"{META_GRAPH_API_BASE}/{META_GRAPH_API_VERSION}/{path.lstrip('/')}"
+
+
+def init_facebook_ads_api(access_token: str):
+    """FacebookAdsApi.init() against META_GRAPH_API_BASE; returns the default API instance"""
+    from facebook_business.api import FacebookAdsApi
+    from facebook_business.session import FacebookSession
+
+    if META_GRAPH_API_BASE == DEFAULT_META_GRAPH_API_BASE:
+        return FacebookAdsApi.init(access_token=access_token)
+
+    session = FacebookSession(access_token=access_token)
+    # The SDK builds request URLs from the session's GRAPH origin
+    session.GRAPH = META_GRAPH_API_BASE
+    api = FacebookAdsApi(session, api_version=META_GRAPH_API_VERSION)
+    FacebookAdsApi.set_default_api(api)
+    return api
+
+
+def _anonymous_credentials():
+    from google.auth.credentials import AnonymousCredentials
+    return AnonymousCredentials()
+
+
+def google_ads_client(config: Dict[str, Any], version: Optional[str] = None):
+    """
+    GoogleAdsClient for a load_from_dict() style config, using
+    GOOGLE_ADS_API_ENDPOINT and GOOGLE_ADS_API_VERSION when set. With
+    PLATFORM_ANONYMOUS_CREDENTIALS the refresh token is never exchanged, so a
+    stand-in needs no OAuth server.
+    """
+    from google.ads.googleads.client import GoogleAdsClient
+
+    version = version or GOOGLE_ADS_API_VERSION
+    if PLATFORM_ANONYMOUS_CREDENTIALS:
+        return GoogleAdsClient(
+            credentials=_anonymous_credentials(),
+            developer_token=config.get("developer_token"),
+            endpoint=GOOGLE_ADS_API_ENDPOINT,
+            login_customer_id=config.get("login_customer_id"),
+            use_proto_plus=config.get("use_proto_plus", True),
+            version=version
+        )
+
+    if GOOGLE_ADS_API_ENDPOINT:
+        config = {**config, "endpoint": GOOGLE_ADS_API_ENDPOINT}
+    return GoogleAdsClient.load_from_dict(config, version=version)
+
+
+def ga4_client(credentials):
+    """
+    BetaAnalyticsDataClient using GA4_DATA_API_ENDPOINT when set. URL endpoints
+    (http://localhost:8090) use the REST transport, which also works without TLS.
+    """
+    from google.analytics.data_v1beta import BetaAnalyticsDataClient
+
+    if PLATFORM_ANONYMOUS_CREDENTIALS:
+        credentials = _anonymous_credentials()
+    if not GA4_DATA_API_ENDPOINT:
+        return BetaAnalyticsDataClient(credentials=credentials)
+
+    transport = "rest" if GA4_DATA_API_ENDPOINT.startswith(("http://", "https://")) else None
+    return BetaAnalyticsDataClient(
+        credentials=credentials,
+        transport=transport,
+        client_options={"api_endpoint": GA4_DATA_API_ENDPOINT}
+    )
+
+
+def endpoint_overrides() -> Dict[str, Any]:
+    """The endpoints that differ from the platforms' production defaults"""
+    overrides = {}
+    if META_GRAPH_API_BASE != DEFAULT_META_GRAPH_API_BASE:
+        overrides["meta_graph_api"] = graph_url("")
+    if GOOGLE_ADS_API_ENDPOINT:
+        overrides["google_ads_api"] = GOOGLE_ADS_API_ENDPOINT
+    if GA4_DATA_API_ENDPOINT:
+        overrides["ga4_data_api"] = GA4_DATA_API_ENDPOINT
+    if overrides and PLATFORM_ANONYMOUS_CREDENTIALS:
+        overrides["anonymous_credentials"] = True
+    return overrides
+
+
+if endpoint_overrides():
+    logger.warning(f"Platform API endpoints overridden: {endpoint_overrides()}")
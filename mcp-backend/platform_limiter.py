@@ -0,0 +1,683 @@
+"""
+Platform Limiter Module
+Shared scheduler for every Google Ads, GA4 and Meta API call: token buckets
+per platform and per account, priority for interactive requests over
+background work, Meta usage-header feedback and retries with jittered
+exponential backoff.
+
+A degraded platform fails fast instead of holding every analysis up: each
+attempt is bounded by PLATFORM_CALL_TIMEOUT and runs on the platform's own
+pool of worker threads (quota key "workers", default PLATFORM_CALL_WORKERS),
+so calls that hang past the timeout tie up only that platform's threads.
+Circuit breakers per platform and per account open after
+PLATFORM_BREAKER_FAILURES consecutive timeouts or transient errors, rejecting
+calls with CircuitOpenError until a probe succeeds after
+PLATFORM_BREAKER_RESET_SECONDS. Idempotent reads made with
+hedged_platform_call() fire a second attempt once the first has run past the
+platform's p95 latency, if the buckets have a spare token for it.
+
+Buckets are tuned to the published quotas (override with PLATFORM_QUOTAS, a
+JSON object merged over QUOTAS):
+- Google Ads: requests per developer token and per customer are throttled
+  with RESOURCE_EXHAUSTED; 15,000 operations/day on basic access
+- GA4 Data API: 40,000 core tokens per property per hour (about 10 per
+  request) and 10 concurrent requests per property
+- Meta Marketing API: business use case limits that scale with the account's
+  active ads and are reported in x-business-use-case-usage / x-ad-account-usage
+
+The limiter is thread-safe and not bound to an event loop: SDK calls run on
+worker threads and the in-process MCP transport runs tools on their own loops.
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+QUOTAS: Dict[str, Dict[str, Any]] = {
+    # rate: requests per second, burst: bucket size, concurrency: in-flight calls per account (0 = unlimited);
+    # an optional "workers" overrides PLATFORM_CALL_WORKERS, the platform's thread pool size
+    "google_ads": {"platform_rate": 10.0, "platform_burst": 20, "account_rate": 2.0, "account_burst": 6,
+                   "concurrency": 0},
+    "ga4": {"platform_rate": 20.0, "platform_burst": 40, "account_rate": 1.1, "account_burst": 10,
+            "concurrency": 10},
+    "meta_ads": {"platform_rate": 20.0, "platform_burst": 40, "account_rate": 4.0, "account_burst": 10,
+                 "concurrency": 0},
+}
+QUOTAS.update({platform: {**QUOTAS.get(platform, {}), **quota}
+               for platform, quota in json.loads(os.getenv("PLATFORM_QUOTAS") or "{}").items()})
+
+RETRY_ATTEMPTS = int(os.getenv("PLATFORM_RETRY_ATTEMPTS", "5"))
+RETRY_BASE_DELAY = float(os.getenv("PLATFORM_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("PLATFORM_RETRY_MAX_DELAY", "30"))
+# Share of each bucket that background work leaves for interactive requests
+INTERACTIVE_RESERVE = float(os.getenv("PLATFORM_INTERACTIVE_RESERVE", "0.3"))
+# Meta usage (percent of the budget) above which the account's rate is scaled down
+META_USAGE_SLOWDOWN = 75.0
+BACKGROUND_POLL_SECONDS = 0.05
+
+CALL_TIMEOUT = float(os.getenv("PLATFORM_CALL_TIMEOUT", "60"))
+CALL_WORKERS = int(os.getenv("PLATFORM_CALL_WORKERS", "16"))
+BREAKER_FAILURES = int(os.getenv("PLATFORM_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("PLATFORM_BREAKER_RESET_SECONDS", "30"))
+HEDGING_ENABLED = os.getenv("PLATFORM_HEDGING", "true").lower() in ("1", "true", "yes")
+# Successful attempts kept per platform for the hedging threshold, and how many are needed before hedging
+LATENCY_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+
+RETRYABLE_HTTP_STATUS = {429, 500, 502, 503, 504}
+# Graph API throttling and transient error codes
+RETRYABLE_META_CODES = {1, 2, 4, 17, 32, 341, 613, 80000, 80001, 80002, 80003, 80004, 80005, 80006,
+                        80008, 80009, 80014}
+RETRYABLE_GRPC_CODES = {"RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED", "INTERNAL", "ABORTED"}
+RETRYABLE_EXCEPTIONS = {"ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+                        "BadGateway", "GatewayTimeout", "DeadlineExceeded", "ConnectionError", "Timeout",
+                        "ConnectTimeout", "ReadTimeout"}
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("platform_call_priority", default=INTERACTIVE)
+_degradation: contextvars.ContextVar[Optional[Dict[str, str]]] = contextvars.ContextVar(
+    "platform_degradation", default=None
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a platform (or account) whose circuit breaker is open"""
+
+
+class PlatformTimeout(TimeoutError):
+    """A single platform call attempt ran past PLATFORM_CALL_TIMEOUT"""
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Platform calls made inside this block yield to interactive requests"""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def degradation_report() -> Iterator[Dict[str, str]]:
+    """
+    Collect the platforms that failed fast or gave up inside this block
+    (platform -> reason), so callers can return partial results flagged as
+    degraded. Tasks started inside the block report into the same dict.
+    """
+    report: Dict[str, str] = {}
+    token = _degradation.set(report)
+    try:
+        yield report
+    finally:
+        _degradation.reset(token)
+
+
+def _report_degradation(platform: str, reason: str):
+    report = _degradation.get()
+    if report is not None:
+        report.setdefault(platform, reason)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker: closed until `failures` failures in a row,
+    then open (calls rejected) for `reset_seconds`, then half-open, where one
+    probe call is let through; its outcome closes or re-opens the circuit.
+
+    A platform-wide breaker (spread=True) only opens when the failures span
+    at least two accounts or include account-less calls, so one broken account
+    trips its own breaker without cutting off the platform's other accounts.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, spread: bool = False, failures: int = BREAKER_FAILURES,
+                 reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.name = name
+        self.spread = spread
+        self.failure_threshold = failures
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.failing_accounts: set = set()
+        self.opened_at = 0.0
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state, self.probing = self.HALF_OPEN, False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def abandon_probe(self):
+        """Give the probe slot back when the call did not go ahead after all"""
+        with self._lock:
+            self.probing = False
+
+    def retry_in(self) -> float:
+        with self._lock:
+            return max(self.opened_at + self.reset_seconds - time.monotonic(), 0.0)
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.failures, self.probing = self.CLOSED, 0, False
+            self.failing_accounts.clear()
+
+    def record_failure(self, account: Optional[str] = None):
+        with self._lock:
+            self.failures += 1
+            self.failing_accounts.add(account)
+            widespread = not self.spread or None in self.failing_accounts or len(self.failing_accounts) > 1
+            if self.state == self.HALF_OPEN or (self.failures >= self.failure_threshold and widespread):
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit {self.name} opened after {self.failures} consecutive failures")
+                self.state, self.opened_at, self.probing = self.OPEN, time.monotonic(), False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+class TokenBucket:
+    """
+    Token bucket shared across threads and event loops. Interactive callers
+    reserve the next token even if that drives the balance negative (they
+    wait until it is repaid); background callers only take a token when the
+    balance stays above the interactive reserve and nobody interactive waits.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.interactive_waiting = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, priority: str) -> Optional[float]:
+        """Seconds to wait for a reserved token, or None if a background caller should retry later"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            pause = max(self.paused_until - now, 0.0)
+            if priority == BACKGROUND:
+                reserve = min(self.burst * INTERACTIVE_RESERVE, self.burst - 1)
+                if pause or self.interactive_waiting or self.tokens - 1 < reserve:
+                    return None
+                self.tokens -= 1
+                return 0.0
+            self.tokens -= 1
+            return max(pause, -self.tokens / self.rate if self.tokens < 0 else 0.0)
+
+    def refund(self):
+        """Return a reserved token that wasn't used"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def set_rate_factor(self, factor: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = self.base_rate * min(max(factor, 0.05), 1.0)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def waiting(self, delta: int):
+        with self._lock:
+            self.interactive_waiting += delta
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {"rate": round(self.rate, 3), "tokens": round(self.tokens, 2),
+                    "paused_seconds": round(max(self.paused_until - time.monotonic(), 0.0), 1)}
+
+
+class PlatformLimiter:
+    """
+    Buckets and circuit breakers per platform and per (platform, account),
+    plus the retry and hedging loop around each call
+    """
+
+    def __init__(self, quotas: Dict[str, Dict[str, Any]] = QUOTAS):
+        self.quotas = quotas
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+        self._breakers: Dict[Tuple[str, Optional[str]], CircuitBreaker] = {}
+        self._slots: Dict[Tuple[str, str], threading.BoundedSemaphore] = {}
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._latencies: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.throttled_seconds = 0.0
+
+    def bucket(self, platform: str, account: Optional[str] = None) -> TokenBucket:
+        key = (platform, account)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                quota = self.quotas.get(platform, {})
+                scope = "account" if account else "platform"
+                bucket = TokenBucket(quota.get(f"{scope}_rate", 10.0), quota.get(f"{scope}_burst", 10))
+                self._buckets[key] = bucket
+            return bucket
+
+    def breaker(self, platform: str, account: Optional[str] = None) -> CircuitBreaker:
+        key = (platform, account)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(f"{platform}:{account or '*'}", spread=account is None)
+            return breaker
+
+    def executor(self, platform: str) -> ThreadPoolExecutor:
+        """Worker threads for the platform's calls; attempts queue here once they are all busy"""
+        with self._lock:
+            executor = self._executors.get(platform)
+            if executor is None:
+                workers = self.quotas.get(platform, {}).get("workers", CALL_WORKERS)
+                executor = self._executors[platform] = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix=f"platform-{platform}"
+                )
+            return executor
+
+    def _slot(self, platform: str, account: Optional[str]) -> Optional[threading.BoundedSemaphore]:
+        limit = self.quotas.get(platform, {}).get("concurrency", 0)
+        if not limit or not account:
+            return None
+        with self._lock:
+            return self._slots.setdefault((platform, account), threading.BoundedSemaphore(limit))
+
+    async def acquire(self, platform: str, account: Optional[str] = None):
+        """Wait for a token from the platform bucket and, with an account, from the account bucket"""
+        buckets = [self.bucket(platform)] + ([self.bucket(platform, account)] if account else [])
+        if _priority.get() == BACKGROUND:
+            # Both tokens or neither, so a background call doesn't hold the platform token while it polls
+            while not _reserve_all(buckets):
+                self.throttled_seconds += BACKGROUND_POLL_SECONDS
+                await asyncio.sleep(BACKGROUND_POLL_SECONDS)
+            return
+        for bucket in buckets:
+            bucket.waiting(1)
+            try:
+                delay = bucket.reserve(INTERACTIVE)
+                if delay:
+                    self.throttled_seconds += delay
+                    await asyncio.sleep(delay)
+            finally:
+                bucket.waiting(-1)
+
+    async def call(self, platform: str, account: Optional[str], fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking SDK/HTTP call on a worker thread under the platform's
+        limits, retrying retryable failures. Responses with a status_code
+        (requests) are retried on 429/5xx and Graph throttling codes and
+        returned as-is once retries are exhausted.
+        """
+        return await self._call(platform, account, fn, args, kwargs, hedge=False)
+
+    async def call_hedged(self, platform: str, account: Optional[str], fn: Callable, *args, **kwargs) -> Any:
+        """call() for idempotent reads, hedged past the platform's p95 latency (see PLATFORM_HEDGING)"""
+        return await self._call(platform, account, fn, args, kwargs, hedge=HEDGING_ENABLED)
+
+    async def _call(self, platform: str, account: Optional[Any], fn: Callable, args: tuple, kwargs: dict,
+                    hedge: bool) -> Any:
+        account = _normalize_account(account)
+        breakers = [self.breaker(platform)] + ([self.breaker(platform, account)] if account else [])
+        for attempt in range(RETRY_ATTEMPTS):
+            self._check_circuits(platform, account, breakers)
+            await self.acquire(platform, account)
+            try:
+                if hedge:
+                    result = await self._hedged_attempt(platform, account, fn, args, kwargs)
+                else:
+                    result = await self._attempt(platform, account, fn, args, kwargs)
+            except Exception as e:
+                self._observe_error(platform, account, e)
+                unhealthy = _is_unhealthy(e)
+                self._record_outcome(breakers, account, None if unhealthy is None else not unhealthy)
+                if not is_retryable(e) or attempt == RETRY_ATTEMPTS - 1:
+                    self.failures += 1
+                    if unhealthy:
+                        _report_degradation(platform, f"{type(e).__name__}: {str(e)[:120]}")
+                    raise
+                delay = self._backoff(attempt, retry_after(e))
+                logger.warning(f"{platform} call failed ({type(e).__name__}: {str(e)[:120]}); "
+                               f"retry {attempt + 1} in {delay:.1f}s")
+            else:
+                headers = getattr(result, "headers", None)
+                if platform == "meta_ads" and headers is not None:
+                    self.observe_meta_usage(headers, account)
+                retryable = is_retryable_response(result)
+                self._record_outcome(breakers, account, None if retryable and result.status_code == 429 else not retryable)
+                if not retryable or attempt == RETRY_ATTEMPTS - 1:
+                    if retryable:
+                        _report_degradation(platform, f"HTTP {result.status_code}")
+                    return result
+                delay = self._backoff(attempt, retry_after(result))
+                logger.warning(f"{platform} call returned {result.status_code}; retry {attempt + 1} in {delay:.1f}s")
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    def _check_circuits(self, platform: str, account: Optional[str], breakers: List[CircuitBreaker]):
+        allowed = []
+        for breaker in breakers:
+            if not breaker.allow():
+                for other in allowed:
+                    other.abandon_probe()
+                self.rejected += 1
+                scope = f"account {account}" if breaker is not breakers[0] else "all accounts"
+                reason = f"circuit open for {scope}, retry in {breaker.retry_in():.0f}s"
+                _report_degradation(platform, reason)
+                raise CircuitOpenError(f"{platform}: {reason}")
+            allowed.append(breaker)
+
+    @staticmethod
+    def _record_outcome(breakers: List[CircuitBreaker], account: Optional[str], healthy: Optional[bool]):
+        # None: the platform answered but the outcome says nothing about its health (quota)
+        if healthy is None:
+            for breaker in breakers:
+                breaker.abandon_probe()
+            return
+        for breaker in breakers:
+            if healthy:
+                breaker.record_success()
+            else:
+                breaker.record_failure(account)
+
+    async def _attempt(self, platform: str, account: Optional[str], fn: Callable, args: tuple, kwargs: dict) -> Any:
+        slot = self._slot(platform, account)
+
+        def run():
+            # The slot is held by the worker thread, so a timed-out call keeps it until it really ends
+            if slot is None:
+                return fn(*args, **kwargs)
+            with slot:
+                return fn(*args, **kwargs)
+
+        self.calls += 1
+        started = time.monotonic()
+        # Like asyncio.to_thread, the call sees the caller's context (trace spans, priority)
+        context = contextvars.copy_context()
+        future = asyncio.get_running_loop().run_in_executor(self.executor(platform), context.run, run)
+        try:
+            result = await asyncio.wait_for(future, CALL_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PlatformTimeout(f"{platform} call did not finish within {CALL_TIMEOUT:g}s") from None
+        self._latency_window(platform).append(time.monotonic() - started)
+        return result
+
+    async def _hedged_attempt(self, platform: str, account: Optional[str], fn: Callable, args: tuple,
+                              kwargs: dict) -> Any:
+        """First of two attempts to succeed; the second only starts once the first passes the p95 latency"""
+        first = asyncio.ensure_future(self._attempt(platform, account, fn, args, kwargs))
+        pending = {first}
+        try:
+            delay = self.hedge_delay(platform)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and self._spare_token(platform, account):
+                    self.hedges += 1
+                    pending.add(asyncio.ensure_future(self._attempt(platform, account, fn, args, kwargs)))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _spare_token(self, platform: str, account: Optional[str]) -> bool:
+        # A hedge is extra load: it only goes out if it can take tokens without waiting or eating the reserve
+        return _reserve_all([self.bucket(platform)] + ([self.bucket(platform, account)] if account else []))
+
+    def _latency_window(self, platform: str) -> deque:
+        with self._lock:
+            return self._latencies.setdefault(platform, deque(maxlen=LATENCY_WINDOW))
+
+    def hedge_delay(self, platform: str) -> Optional[float]:
+        """The platform's p95 attempt latency, or None until HEDGE_MIN_SAMPLES attempts have succeeded"""
+        samples = sorted(self._latency_window(platform))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    @staticmethod
+    def _backoff(attempt: int, hint: Optional[float]) -> float:
+        # Full jitter: callers that failed together don't retry together
+        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+        return max(delay, min(hint, RETRY_MAX_DELAY)) if hint else delay
+
+    def _observe_error(self, platform: str, account: Optional[str], error: BaseException):
+        headers = _call_or_get(error, "http_headers")
+        if platform == "meta_ads" and headers:
+            self.observe_meta_usage(headers, account)
+        elif _is_quota_error(error):
+            # Out of quota: hold the whole bucket back instead of letting every caller find out
+            self.bucket(platform, account).pause(retry_after(error) or RETRY_BASE_DELAY * 4)
+
+    def observe_meta_usage(self, headers, account: Optional[str] = None):
+        """
+        Adapt Meta budgets from x-business-use-case-usage, x-ad-account-usage
+        and x-app-usage: the account's rate is scaled down as usage passes
+        META_USAGE_SLOWDOWN percent and paused while Meta reports a time to
+        regain access.
+        """
+        for name, (usage, regain_seconds) in _meta_usage(headers, _normalize_account(account)).items():
+            target = self.bucket("meta_ads") if name == "app" else self.bucket("meta_ads", name)
+            if regain_seconds:
+                target.pause(regain_seconds)
+            if usage >= META_USAGE_SLOWDOWN:
+                target.set_rate_factor((100.0 - usage) / (100.0 - META_USAGE_SLOWDOWN))
+            else:
+                target.set_rate_factor(1.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = dict(self._buckets)
+            breakers = dict(self._breakers)
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "buckets": {f"{platform}:{account or '*'}": bucket.stats() for (platform, account), bucket in buckets.items()},
+            "breakers": {f"{platform}:{account or '*'}": breaker.stats()
+                         for (platform, account), breaker in breakers.items()}
+        }
+
+
+def _reserve_all(buckets: List[TokenBucket]) -> bool:
+    """Take a background token from every bucket, or from none: tokens already taken are refunded"""
+    taken = []
+    for bucket in buckets:
+        if bucket.reserve(BACKGROUND) is None:
+            for reserved in taken:
+                reserved.refund()
+            return False
+        taken.append(bucket)
+    return True
+
+
+def _normalize_account(account: Optional[Any]) -> Optional[str]:
+    if account is None or account == "":
+        return None
+    account = str(account).replace("-", "")
+    return account[4:] if account.startswith("act_") else account
+
+
+def _call_or_get(obj: Any, name: str) -> Any:
+    value = getattr(obj, name, None)
+    try:
+        return value() if callable(value) else value
+    except Exception:
+        return None
+
+
+def _grpc_code_name(error: BaseException) -> Optional[str]:
+    # GoogleAdsException wraps the grpc call as .error; grpc.RpcError has .code()
+    for candidate in (getattr(error, "error", None), error):
+        code = _call_or_get(candidate, "code")
+        name = getattr(code, "name", None)
+        if isinstance(name, str):
+            return name
+    return None
+
+
+def _is_quota_error(error: BaseException) -> bool:
+    return (type(error).__name__ in ("ResourceExhausted", "TooManyRequests")
+            or _grpc_code_name(error) == "RESOURCE_EXHAUSTED"
+            or _call_or_get(error, "api_error_code") in (4, 17, 32, 613, 80000, 80004))
+
+
+def _is_unhealthy(error: BaseException) -> Optional[bool]:
+    """Whether a failed call counts against the circuit breakers; None for quota errors (the buckets handle those)"""
+    if _is_quota_error(error):
+        return None
+    return isinstance(error, PlatformTimeout) or is_retryable(error)
+
+
+def is_retryable(error: BaseException) -> bool:
+    if type(error).__name__ in RETRYABLE_EXCEPTIONS or _grpc_code_name(error) in RETRYABLE_GRPC_CODES:
+        return True
+    # facebook_business FacebookRequestError
+    if _call_or_get(error, "api_error_code") in RETRYABLE_META_CODES:
+        return True
+    status = _call_or_get(error, "http_status")
+    return isinstance(status, int) and status in RETRYABLE_HTTP_STATUS
+
+
+def is_retryable_response(response: Any) -> bool:
+    status = getattr(response, "status_code", None)
+    if not isinstance(status, int) or status < 400:
+        return False
+    if status in RETRYABLE_HTTP_STATUS:
+        return True
+    try:
+        error = response.json().get("error", {})
+    except Exception:
+        return False
+    return isinstance(error, dict) and (error.get("code") in RETRYABLE_META_CODES or bool(error.get("is_transient")))
+
+
+def retry_after(result: Any) -> Optional[float]:
+    """Server-suggested wait in seconds (Retry-After, or Meta's estimated time to regain access)"""
+    headers = getattr(result, "headers", None) or _call_or_get(result, "http_headers") or {}
+    try:
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        if value:
+            return float(value)
+    except (TypeError, ValueError):
+        pass
+    regain = [seconds for _, seconds in _meta_usage(headers).values() if seconds]
+    return max(regain) if regain else None
+
+
+def _header(headers, name: str) -> Optional[str]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.title())
+    return value
+
+
+def _meta_usage(headers, account: Optional[str] = None) -> Dict[str, Tuple[float, float]]:
+    """
+    (usage percent, seconds until access is regained) per ad account id, and
+    'app' for the app-wide usage. x-ad-account-usage is about the account the
+    request was for, so it is only read when that account is known.
+    """
+    usage: Dict[str, Tuple[float, float]] = {}
+
+    def merge(key: str, percent: float, regain_seconds: float):
+        previous = usage.get(key, (0.0, 0.0))
+        usage[key] = (max(previous[0], percent), max(previous[1], regain_seconds))
+
+    def parse(name: str) -> Any:
+        raw = _header(headers, name)
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+
+    business = parse("x-business-use-case-usage")
+    if isinstance(business, dict):
+        for account_id, entries in business.items():
+            for entry in entries if isinstance(entries, list) else [entries]:
+                percent = max(float(entry.get(key) or 0) for key in ("call_count", "total_cputime", "total_time"))
+                regain_seconds = float(entry.get("estimated_time_to_regain_access") or 0) * 60
+                merge(_normalize_account(account_id), percent, regain_seconds)
+
+    ad_account = parse("x-ad-account-usage")
+    if account and isinstance(ad_account, dict):
+        percent = float(ad_account.get("acc_id_util_pct") or 0)
+        merge(account, percent, float(ad_account.get("reset_time_duration") or 0) if percent >= 100 else 0.0)
+
+    app = parse("x-app-usage")
+    if isinstance(app, dict):
+        merge("app", max(float(app.get(key) or 0) for key in ("call_count", "total_cputime", "total_time")), 0.0)
+    return usage
+
+
+# Shared instance used by the connectors, MCP tools and API routes
+platform_limiter = PlatformLimiter()
+
+
+async def platform_call(platform: str, account: Optional[Any], fn: Callable, *args, **kwargs) -> Any:
+    """Shorthand for platform_limiter.call()"""
+    return await platform_limiter.call(platform, account, fn, *args, **kwargs)
+
+
+async def hedged_platform_call(platform: str, account: Optional[Any], fn: Callable, *args, **kwargs) -> Any:
+    """Shorthand for platform_limiter.call_hedged(); only for idempotent reads"""
+    return await platform_limiter.call_hedged(platform, account, fn, *args, **kwargs)
+
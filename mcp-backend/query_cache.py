@@ -0,0 +1,223 @@
+"""
+Query Result Cache Module
+Short-lived cache of full MCP query results so that projected, limited and
+cursor-paginated pages are served without re-querying the ad platforms.
+Plain calls (no fields, limit, order_by or cursor) always query the platform.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("MCP_QUERY_CACHE_TTL", "300"))
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("MCP_QUERY_CACHE_MAX_ENTRIES", "128"))
+
+
+class CursorError(ValueError):
+    """Raised when a pagination cursor is malformed, expired or belongs to another user"""
+
+
+class QueryResultCache:
+    """Thread-safe LRU of full query results with a per-entry TTL"""
+
+    def __init__(self, ttl_seconds: float = QUERY_CACHE_TTL_SECONDS, max_entries: int = QUERY_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(tool_name: str, **params) -> str:
+        """Stable key for a tool call; pagination parameters must not be passed in"""
+        payload = json.dumps({"tool": tool_name, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if time.monotonic() - entry["stored_at"] > self.ttl_seconds:
+                del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    @staticmethod
+    def new_entry(user_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        return {"user_id": user_id, "result": result, "stored_at": time.monotonic(), "orderings": {}}
+
+    def set(self, key: str, user_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        return self.put(key, self.new_entry(user_id, result))
+
+    def put(self, key: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def _encode_cursor(state: Dict[str, Any]) -> str:
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise CursorError("Invalid cursor")
+    if not isinstance(state, dict) or "key" not in state or "offset" not in state:
+        raise CursorError("Invalid cursor")
+    return state
+
+
+def _parse_order_by(order_by: str):
+    """Accepts "field", "-field", "field DESC" or "field ASC" """
+    spec = order_by.strip()
+    descending = False
+    if spec.startswith("-"):
+        spec, descending = spec[1:], True
+    else:
+        parts = spec.split()
+        if len(parts) == 2 and parts[1].upper() in ("ASC", "DESC"):
+            spec, descending = parts[0], parts[1].upper() == "DESC"
+    return spec, descending
+
+
+def _ordered_rows(entry: Dict[str, Any], order_by: Optional[str]) -> List[Dict[str, Any]]:
+    rows = entry["result"].get("data") or []
+    if not order_by:
+        return rows
+
+    orderings = entry["orderings"]
+    if order_by not in orderings:
+        field, descending = _parse_order_by(order_by)
+        present = [row for row in rows if isinstance(row, dict) and row.get(field) is not None]
+        missing = [row for row in rows if not (isinstance(row, dict) and row.get(field) is not None)]
+        try:
+            present.sort(key=lambda row: row[field], reverse=descending)
+        except TypeError:
+            present.sort(key=lambda row: str(row[field]), reverse=descending)
+        # Rows without the field always go last, whatever the direction
+        orderings[order_by] = present + missing
+    return orderings[order_by]
+
+
+def paginate_result(
+    entry: Dict[str, Any],
+    key: str,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    offset: int = 0
+) -> Dict[str, Any]:
+    """Build one page of a cached result; without fields/limit/order_by this is the full result"""
+    result = entry["result"]
+    rows = _ordered_rows(entry, order_by)
+    total_rows = len(rows)
+
+    end = total_rows if not limit or limit <= 0 else min(offset + limit, total_rows)
+    page = rows[offset:end]
+    if fields:
+        page = [{field: row[field] for field in fields if field in row} for row in page]
+
+    response = {k: v for k, v in result.items() if k != "data"}
+    response["total_rows"] = total_rows
+    response["data"] = page
+
+    if fields or limit or order_by or offset:
+        has_more = end < total_rows
+        response["pagination"] = {
+            "offset": offset,
+            "returned_rows": len(page),
+            "has_more": has_more,
+            "next_cursor": _encode_cursor({
+                "key": key, "offset": end, "fields": fields, "limit": limit, "order_by": order_by
+            }) if has_more else None
+        }
+    return response
+
+
+def is_paged(fields: Optional[List[str]] = None, limit: Optional[int] = None, order_by: Optional[str] = None) -> bool:
+    """Whether a call asks for a page of the result rather than all of it; only paged calls use the cache"""
+    return bool(fields or limit or order_by)
+
+
+def paginate_new_result(
+    cache: QueryResultCache,
+    key: str,
+    user_id: str,
+    result: Dict[str, Any],
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None
+) -> Dict[str, Any]:
+    """Page a freshly queried result, caching it only when the page hands out a next_cursor"""
+    entry = QueryResultCache.new_entry(user_id, result)
+    response = paginate_result(entry, key, fields, limit, order_by)
+    if response.get("pagination", {}).get("next_cursor"):
+        cache.put(key, entry)
+    return response
+
+
+def page_from_cursor(
+    cache: QueryResultCache,
+    cursor: str,
+    user_id: str,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """Serve the page a cursor points at; fields/limit override the values carried by the cursor"""
+    state = _decode_cursor(cursor)
+    entry = cache.get(state["key"])
+    if entry is None:
+        raise CursorError("Cursor expired; re-run the query without a cursor")
+    if entry["user_id"] != user_id:
+        raise CursorError("Invalid cursor")
+    return paginate_result(
+        entry,
+        state["key"],
+        fields=fields if fields is not None else state.get("fields"),
+        limit=limit if limit is not None else state.get("limit"),
+        order_by=state.get("order_by"),
+        offset=int(state["offset"])
+    )
+
+
+# Shared instance used by the MCP query tools
+query_result_cache = QueryResultCache()
@@ -1,87 +1,46 @@
 from fastapi import APIRouter, HTTPException, Form, UploadFile, File
+from fast_json import FastJSONRoute
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from credential_manager import credential_manager
 from shared_integrator import data_integrator_instance
-from models import LoadUserCredentialsRequest
-import seaborn as sns
-import matplotlib.pyplot as plt
-import io
+from request_models import LoadUserCredentialsRequest
 import base64
-import chardet  # Add chardet for encoding detection
+from csv_ingest import read_csv_stream
+from columnar_io import ColumnarReadError, SchemaValidationError, detect_upload_format, read_columnar
+from compute_executor import compute_executor, offloadable
+from analytics.metrics_frame import MetricsFrame, MEAN_COLUMNS
+from analytics.analysis_cache import memoize
 
-def _detect_encoding_and_read_csv(file_obj, filename: str, **kwargs):
+def _detect_encoding_and_read_csv(file_obj, filename: str, sep: Optional[str] = None):
     """
-    Detect file encoding and read CSV with proper encoding handling
+    Read an uploaded CSV in a single pass. Encoding, separator (unless given)
+    and header row are detected from the start of the file.
+    Parquet and Arrow uploads are read directly and must use standardized column names.
     """
-    # Reset file position
     file_obj.seek(0)
+    try:
+        fmt = detect_upload_format(file_obj, filename)
+        if fmt != 'csv':
+            df = read_columnar(file_obj, fmt, filename)
+        else:
+            df = read_csv_stream(file_obj, filename, delimiter=sep)
+    except SchemaValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Schema validation failed for {e}")
+    except ColumnarReadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise Exception(
+            f"Could not read '{filename}': {str(e)}. "
+            f"Please save the file as UTF-8 CSV or check if it's corrupted."
+        )
 
-    # Read a sample of the file to detect encoding
-    sample = file_obj.read(10000)  # Read first 10KB
-    file_obj.seek(0)  # Reset position
-
-    # Detect encoding
-    detected = chardet.detect(sample)
-    encoding = detected.get('encoding', 'utf-8')
-    confidence = detected.get('confidence', 0)
-
-    print(f"🔍 Detected encoding for '{filename}': {encoding} (confidence: {confidence:.2f})")
-
-    # List of encodings to try in order of preference
-    encodings_to_try = [
-        encoding,  # Start with detected encoding
-        'utf-8',
-        'utf-16',
-        'utf-8-sig',  # UTF-8 with BOM
-        'windows-1252',  # Common Windows encoding
-        'iso-8859-1',   # Latin-1
-        'cp1252'        # Another Windows encoding
-    ]
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_encodings = []
-    for enc in encodings_to_try:
-        if enc and enc.lower() not in seen:
-            seen.add(enc.lower())
-            unique_encodings.append(enc)
-
-    last_error = None
-
-    for encoding_attempt in unique_encodings:
-        try:
-            file_obj.seek(0)
-            print(f"🔄 Trying to read '{filename}' with encoding: {encoding_attempt}")
-
-            # Create a text wrapper with the specific encoding
-            text_file = io.TextIOWrapper(file_obj, encoding=encoding_attempt)
-            df = pd.read_csv(text_file, **kwargs)
-
-            print(f"✅ Successfully read '{filename}' with encoding: {encoding_attempt}")
-            print(f"   Loaded {len(df)} rows with columns: {list(df.columns)[:5]}...")
-
-            return df
-
-        except UnicodeDecodeError as e:
-            last_error = e
-            print(f"❌ Encoding {encoding_attempt} failed: {str(e)}")
-            continue
-        except Exception as e:
-            last_error = e
-            print(f"❌ Reading with {encoding_attempt} failed: {str(e)}")
-            continue
-
-    # If all encodings failed, raise a helpful error
-    raise Exception(
-        f"Could not read '{filename}' with any supported encoding. "
-        f"Tried: {', '.join(unique_encodings)}. "
-        f"Last error: {str(last_error)}. "
-        f"Please save the file as UTF-8 CSV or check if it's corrupted."
-    )
+    print(f"✅ Successfully read '{filename}'")
+    print(f"   Loaded {len(df)} rows with columns: {list(df.columns)[:5]}...")
+    return df
 
 async def _get_automatic_date_range(user_id: str) -> Dict[str, str]:
     """
@@ -149,7 +108,7 @@ async def _get_automatic_date_range(user_id: str) -> Dict[str, str]:
             "end_date": end_date.strftime('%Y-%m-%d')
         }
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/debug-ad-data-availability")
 async def debug_ad_data_availability(request: str = Form(...)):
@@ -260,7 +219,7 @@ async def ad_performance_analysis(request: str = Form(...)):
             )
         
         # Calculate key performance metrics
-        analysis = _analyze_ad_performance(df)
+        analysis = await compute_executor.run(_analyze_ad_performance, df)
         
         return {
             "user_id": user_id,
@@ -314,7 +273,7 @@ async def campaign_comparison(request: str = Form(...)):
         df = df[df['campaign_name'].isin(campaigns)]
     
     # Compare campaigns
-    comparison = _compare_campaigns(df)
+    comparison = await compute_executor.run(_compare_campaigns, df)
     
     return {
         "user_id": user_id,
@@ -360,7 +319,7 @@ async def ad_recommendations(request: str = Form(...)):
         )
     
     # Generate recommendations
-    recommendations = _generate_recommendations(df, min_spend)
+    recommendations = await compute_executor.run(_generate_recommendations, df, min_spend)
     
     return {
         "user_id": user_id,
@@ -405,7 +364,7 @@ async def performance_trends(request: str = Form(...)):
         )
     
     # Analyze trends
-    trends = _analyze_trends(df, metric)
+    trends = await compute_executor.run(_analyze_trends, df, metric)
     
     return {
         "user_id": user_id,
@@ -451,7 +410,7 @@ async def optimization_action_plan(request: str = Form(...)):
         )
     
     # Generate comprehensive action plan
-    action_plan = _generate_action_plan(df, budget_increase_limit)
+    action_plan = await compute_executor.run(_generate_action_plan, df, budget_increase_limit)
     
     return {
         "user_id": user_id,
@@ -497,7 +456,7 @@ async def budget_reallocation_plan(request: str = Form(...)):
         )
     
     # Calculate optimal budget allocation
-    reallocation = _calculate_budget_reallocation(df, total_monthly_budget)
+    reallocation = await compute_executor.run(_calculate_budget_reallocation, df, total_monthly_budget)
     
     return {
         "user_id": user_id,
@@ -507,18 +466,15 @@ async def budget_reallocation_plan(request: str = Form(...)):
         "reallocation_plan": reallocation
     }
 
-def _analyze_ad_performance(df: pd.DataFrame) -> Dict:
+@offloadable
+@memoize
+def _analyze_ad_performance(df: Union[pd.DataFrame, MetricsFrame]) -> Dict:
     """Analyze what works and what doesn't work in ads"""
     
-    # Calculate performance metrics with NaN handling
-    df['roas'] = df['conversions'] / (df['spend'] + 0.001)  # Avoid division by zero
-    df['cost_per_conversion'] = df['spend'] / (df['conversions'] + 0.001)
-    df['conversion_rate'] = df['conversions'] / (df['clicks'] + 0.001)
-    
-    # Replace infinite and NaN values with 0
-    df['roas'] = df['roas'].replace([float('inf'), float('-inf')], 0).fillna(0)
-    df['cost_per_conversion'] = df['cost_per_conversion'].replace([float('inf'), float('-inf')], 0).fillna(0)
-    df['conversion_rate'] = df['conversion_rate'].replace([float('inf'), float('-inf')], 0).fillna(0)
+    # Performance metrics (roas, cost_per_conversion, conversion_rate) with NaN/inf set to 0
+    metrics = MetricsFrame.of(df)
+    df = metrics.frame
+    min_spend_metrics = metrics.with_min_spend(50)  # Only consider ads with at least $50 spend
     
     # Identify top and bottom performers
     performance_metrics = ['ctr', 'cpc', 'cpm', 'roas', 'conversion_rate']
@@ -529,13 +485,13 @@ def _analyze_ad_performance(df: pd.DataFrame) -> Dict:
     for metric in performance_metrics:
         if metric in df.columns:
             # Top 10% performers
-            top_threshold = df[metric].quantile(0.9)
+            top_threshold = metrics.quantile(metric, 0.9)
             top_ads = df[df[metric] >= top_threshold][['campaign_name', 'adset_name', 'ad_name', metric, 'spend', 'conversions']].to_dict('records')
             
             # Bottom 10% performers (with minimum spend requirement)
-            min_spend_df = df[df['spend'] >= 50]  # Only consider ads with at least $50 spend
+            min_spend_df = min_spend_metrics.frame
             if not min_spend_df.empty:
-                bottom_threshold = min_spend_df[metric].quantile(0.1)
+                bottom_threshold = min_spend_metrics.quantile(metric, 0.1)
                 bottom_ads = min_spend_df[min_spend_df[metric] <= bottom_threshold][['campaign_name', 'adset_name', 'ad_name', metric, 'spend', 'conversions']].to_dict('records')
             else:
                 bottom_ads = []
@@ -543,32 +499,15 @@ def _analyze_ad_performance(df: pd.DataFrame) -> Dict:
             top_performers[metric] = top_ads[:10]  # Limit to top 10
             bottom_performers[metric] = bottom_ads[:10]  # Limit to bottom 10
     
-    # Campaign-level insights
-    campaign_summary = df.groupby('campaign_name').agg({
-        'impressions': 'sum',
-        'clicks': 'sum', 
-        'spend': 'sum',
-        'conversions': 'sum',
-        'ctr': 'mean',
-        'cpc': 'mean',
-        'cpm': 'mean'
-    }).round(4)
-    
-    # Calculate campaign-level metrics
-    campaign_summary['roas'] = campaign_summary['conversions'] / (campaign_summary['spend'] + 0.001)
-    campaign_summary['conversion_rate'] = campaign_summary['conversions'] / (campaign_summary['clicks'] + 0.001)
-    campaign_summary = campaign_summary.round(4)
+    # Campaign-level insights; roas and conversion_rate are ratios of the campaign totals
+    campaign_summary = metrics.grouped('campaign')[
+        ['impressions', 'clicks', 'spend', 'conversions', 'ctr', 'cpc', 'cpm', 'roas', 'conversion_rate']
+    ].round(4)
     
     # Find patterns in high-performing ads
     if not df.empty:
         # Group by source to see which platform performs better
-        source_performance = df.groupby('source').agg({
-            'ctr': 'mean',
-            'cpc': 'mean',
-            'conversions': 'sum',
-            'spend': 'sum'
-        }).round(4)
-        source_performance['roas'] = (source_performance['conversions'] / (source_performance['spend'] + 0.001)).round(4)
+        source_performance = metrics.grouped('source')[['ctr', 'cpc', 'conversions', 'spend', 'roas']].round(4)
     else:
         source_performance = pd.DataFrame()
     
@@ -586,23 +525,15 @@ def _analyze_ad_performance(df: pd.DataFrame) -> Dict:
         }
     }
 
-def _compare_campaigns(df: pd.DataFrame) -> Dict:
+@offloadable
+@memoize
+def _compare_campaigns(df: Union[pd.DataFrame, MetricsFrame]) -> Dict:
     """Compare campaign performance side by side"""
     
-    campaign_metrics = df.groupby('campaign_name').agg({
-        'impressions': 'sum',
-        'clicks': 'sum',
-        'spend': 'sum',
-        'conversions': 'sum',
-        'ctr': 'mean',
-        'cpc': 'mean',
-        'cpm': 'mean'
-    }).round(4)
-    
-    # Calculate additional metrics
-    campaign_metrics['roas'] = (campaign_metrics['conversions'] / (campaign_metrics['spend'] + 0.001)).round(4)
-    campaign_metrics['conversion_rate'] = (campaign_metrics['conversions'] / (campaign_metrics['clicks'] + 0.001)).round(4)
-    campaign_metrics['cost_per_conversion'] = (campaign_metrics['spend'] / (campaign_metrics['conversions'] + 0.001)).round(4)
+    campaign_metrics = MetricsFrame.of(df).grouped('campaign')[
+        ['impressions', 'clicks', 'spend', 'conversions', 'ctr', 'cpc', 'cpm',
+         'roas', 'conversion_rate', 'cost_per_conversion']
+    ].round(4)
     
     # Rank campaigns by different metrics
     rankings = {}
@@ -619,24 +550,23 @@ def _compare_campaigns(df: pd.DataFrame) -> Dict:
         "total_campaigns": len(campaign_metrics)
     }
 
-def _generate_recommendations(df: pd.DataFrame, min_spend: float) -> List[Dict]:
+@offloadable
+@memoize
+def _generate_recommendations(df: Union[pd.DataFrame, MetricsFrame], min_spend: float) -> List[Dict]:
     """Generate actionable recommendations for ad optimization"""
     
     recommendations = []
     
     # Filter ads with sufficient spend for meaningful analysis
-    significant_ads = df[df['spend'] >= min_spend].copy()
+    significant = MetricsFrame.of(df).with_min_spend(min_spend)
+    significant_ads = significant.frame
     
     if significant_ads.empty:
         return [{"type": "warning", "message": f"No ads found with minimum spend of ${min_spend}"}]
     
-    # Calculate performance metrics
-    significant_ads['roas'] = significant_ads['conversions'] / (significant_ads['spend'] + 0.001)
-    significant_ads['conversion_rate'] = significant_ads['conversions'] / (significant_ads['clicks'] + 0.001)
-    
     # Recommendation 1: Stop poor performers
     poor_performers = significant_ads[
-        (significant_ads['ctr'] < significant_ads['ctr'].quantile(0.2)) &
+        (significant_ads['ctr'] < significant.quantile('ctr', 0.2)) &
         (significant_ads['roas'] < 1.0)
     ]
     
@@ -652,7 +582,7 @@ def _generate_recommendations(df: pd.DataFrame, min_spend: float) -> List[Dict]:
     
     # Recommendation 2: Scale top performers
     top_performers = significant_ads[
-        (significant_ads['roas'] > significant_ads['roas'].quantile(0.8)) &
+        (significant_ads['roas'] > significant.quantile('roas', 0.8)) &
         (significant_ads['ctr'] > significant_ads['ctr'].mean())
     ]
     
@@ -665,12 +595,10 @@ def _generate_recommendations(df: pd.DataFrame, min_spend: float) -> List[Dict]:
             "affected_ads": top_performers[['campaign_name', 'ad_name', 'spend', 'ctr', 'roas']].to_dict('records')[:5]
         })
     
-    # Recommendation 3: Platform optimization
-    platform_performance = significant_ads.groupby('source').agg({
-        'roas': 'mean',
-        'ctr': 'mean',
-        'spend': 'sum'
-    }).round(4)
+    # Recommendation 3: Platform optimization (average ad-level ROAS per platform)
+    platform_performance = significant.grouped('source')[['roas_mean', 'ctr', 'spend']].rename(
+        columns={'roas_mean': 'roas'}
+    ).round(4)
     
     if len(platform_performance) > 1:
         best_platform = platform_performance['roas'].idxmax()
@@ -685,11 +613,9 @@ def _generate_recommendations(df: pd.DataFrame, min_spend: float) -> List[Dict]:
             })
     
     # Recommendation 4: Campaign optimization
-    campaign_performance = significant_ads.groupby('campaign_name').agg({
-        'roas': 'mean',
-        'spend': 'sum',
-        'conversions': 'sum'
-    }).round(4)
+    campaign_performance = significant.grouped('campaign')[['roas_mean', 'spend', 'conversions']].rename(
+        columns={'roas_mean': 'roas'}
+    ).round(4)
     
     underperforming_campaigns = campaign_performance[campaign_performance['roas'] < 0.5]
     if not underperforming_campaigns.empty:
@@ -704,9 +630,14 @@ def _generate_recommendations(df: pd.DataFrame, min_spend: float) -> List[Dict]:
     
     return recommendations
 
-def _analyze_trends(df: pd.DataFrame, metric: str) -> Dict:
+@offloadable
+@memoize
+def _analyze_trends(df: Union[pd.DataFrame, MetricsFrame], metric: str) -> Dict:
     """Analyze performance trends over time"""
     
+    metrics = MetricsFrame.of(df)
+    df = metrics.frame
+    
     if metric not in df.columns:
         return {"error": f"Metric '{metric}' not found in data"}
     
@@ -722,13 +653,18 @@ def _analyze_trends(df: pd.DataFrame, metric: str) -> Dict:
     
     # Group by date and calculate daily metrics
     try:
-        daily_trends = df.groupby(date_col).agg({
-            metric: 'mean',
-            'spend': 'sum',
-            'impressions': 'sum',
-            'clicks': 'sum',
-            'conversions': 'sum'
-        }).round(4)
+        if date_col == 'date' and metric in MEAN_COLUMNS + ['conversions']:
+            # Shared daily grouping: one groupby for all trend metrics
+            columns = list(dict.fromkeys([metric, 'spend', 'impressions', 'clicks', 'conversions']))
+            daily_trends = metrics.grouped('date')[columns].round(4)
+        else:
+            daily_trends = df.groupby(date_col).agg({
+                metric: 'mean',
+                'spend': 'sum',
+                'impressions': 'sum',
+                'clicks': 'sum',
+                'conversions': 'sum'
+            }).round(4)
     except Exception as e:
         return {"error": f"Error calculating trends: {str(e)}"}
         
@@ -773,13 +709,14 @@ def _analyze_trends(df: pd.DataFrame, metric: str) -> Dict:
         return {"error": f"Error analyzing trend data: {str(e)}"}
     
 
-def _generate_action_plan(df: pd.DataFrame, budget_increase_limit: float) -> Dict:
+@offloadable
+@memoize
+def _generate_action_plan(df: Union[pd.DataFrame, MetricsFrame], budget_increase_limit: float) -> Dict:
     """Generate detailed action plan with specific steps"""
     
-    # Calculate performance metrics
-    df['roas'] = df['conversions'] / (df['spend'] + 0.001)
-    df['conversion_rate'] = df['conversions'] / (df['clicks'] + 0.001)
-    df['cost_per_conversion'] = df['spend'] / (df['conversions'] + 0.001)
+    # Performance metrics (roas, conversion_rate, cost_per_conversion)
+    metrics = MetricsFrame.of(df)
+    df = metrics.frame
     
     action_plan = {
         "immediate_actions": [],  # Do today
@@ -793,7 +730,7 @@ def _generate_action_plan(df: pd.DataFrame, budget_increase_limit: float) -> Dic
     worst_performers = df[
         (df['spend'] >= 50) & 
         (df['roas'] < 0.5) & 
-        (df['ctr'] < df['ctr'].quantile(0.2))
+        (df['ctr'] < metrics.quantile('ctr', 0.2))
     ]
     
     if not worst_performers.empty:
@@ -844,12 +781,9 @@ def _generate_action_plan(df: pd.DataFrame, budget_increase_limit: float) -> Dic
     # WEEKLY ACTIONS (Do This Week)
     
     # 3. Platform optimization
-    platform_performance = df.groupby('source').agg({
-        'roas': 'mean',
-        'ctr': 'mean',
-        'spend': 'sum',
-        'conversions': 'sum'
-    }).round(4)
+    platform_performance = metrics.grouped('source')[['roas_mean', 'ctr', 'spend', 'conversions']].rename(
+        columns={'roas_mean': 'roas'}
+    ).round(4)
     
     if len(platform_performance) > 1:
         best_platform = platform_performance['roas'].idxmax()
@@ -876,12 +810,9 @@ def _generate_action_plan(df: pd.DataFrame, budget_increase_limit: float) -> Dic
             })
     
     # 4. Campaign restructuring
-    campaign_performance = df.groupby('campaign_name').agg({
-        'roas': 'mean',
-        'spend': 'sum',
-        'conversions': 'sum',
-        'ctr': 'mean'
-    }).round(4)
+    campaign_performance = metrics.grouped('campaign')[['roas_mean', 'spend', 'conversions', 'ctr']].rename(
+        columns={'roas_mean': 'roas'}
+    ).round(4)
     
     low_performing_campaigns = campaign_performance[
         (campaign_performance['roas'] < 1.0) & 
@@ -909,11 +840,9 @@ def _generate_action_plan(df: pd.DataFrame, budget_increase_limit: float) -> Dic
     # MONTHLY ACTIONS (Do This Month)
     
     # 5. Creative testing
-    ad_groups = df.groupby(['campaign_name', 'ad_name']).agg({
-        'ctr': 'mean',
-        'roas': 'mean',
-        'spend': 'sum'
-    }).round(4)
+    ad_groups = metrics.grouped('ad')[['ctr', 'roas_mean', 'spend']].rename(
+        columns={'roas_mean': 'roas'}
+    ).round(4)
     
     action_plan["monthly_actions"].append({
         "action": "CREATIVE_TESTING",
@@ -972,21 +901,21 @@ def _generate_action_plan(df: pd.DataFrame, budget_increase_limit: float) -> Dic
     
     return action_plan
 
-def _calculate_budget_reallocation(df: pd.DataFrame, total_budget: float) -> Dict:
+@offloadable
+@memoize
+def _calculate_budget_reallocation(df: Union[pd.DataFrame, MetricsFrame], total_budget: float) -> Dict:
     """Calculate optimal budget allocation based on performance"""
     
-    # Calculate performance metrics
-    df['roas'] = df['conversions'] / (df['spend'] + 0.001)
-    df['efficiency_score'] = (df['roas'] * df['ctr'] * 100)  # Combined performance score
+    metrics = MetricsFrame.of(df)
+    df = metrics.frame
+    efficiency_score = df['roas'] * df['ctr'] * 100  # Combined performance score
     
     # Group by campaign for budget allocation
-    campaign_performance = df.groupby('campaign_name').agg({
-        'spend': 'sum',
-        'conversions': 'sum',
-        'roas': 'mean',
-        'ctr': 'mean',
-        'efficiency_score': 'mean'
-    }).round(4)
+    campaign_performance = metrics.grouped('campaign')[['spend', 'conversions', 'roas_mean', 'ctr']].rename(
+        columns={'roas_mean': 'roas'}
+    )
+    campaign_performance['efficiency_score'] = efficiency_score.groupby(df['campaign_name'], observed=True).mean()
+    campaign_performance = campaign_performance.round(4)
     
     # Calculate current budget allocation
     current_total_spend = campaign_performance['spend'].sum()
@@ -1074,10 +1003,72 @@ def _calculate_budget_reallocation(df: pd.DataFrame, total_budget: float) -> Dic
         }
     }
 
+@offloadable
+@memoize
+def _run_file_insight_analyses(
+    df: pd.DataFrame,
+    min_spend: float = 100,  # Default $100 minimum spend
+    budget_increase_limit: float = 50,  # Default 50% max increase
+    total_budget: float = 10000,  # Default $10k budget
+    trend_metrics: Optional[List[str]] = None
+) -> Dict:
+    """Run every file-insights analysis over one shared MetricsFrame, with per-analysis error handling"""
+    metrics = MetricsFrame(df)
+
+    try:
+        performance_analysis = _analyze_ad_performance(metrics)
+    except Exception as e:
+        print(f"⚠️ Error in performance analysis: {str(e)}")
+        performance_analysis = {"error": "Performance analysis failed", "details": str(e)}
+    
+    try:
+        campaign_comparison = _compare_campaigns(metrics)
+    except Exception as e:
+        print(f"⚠️ Error in campaign comparison: {str(e)}")
+        campaign_comparison = {"error": "Campaign comparison failed", "details": str(e)}
+    
+    try:
+        recommendations = _generate_recommendations(metrics, min_spend=min_spend)
+    except Exception as e:
+        print(f"⚠️ Error generating recommendations: {str(e)}")
+        recommendations = [{"type": "error", "message": f"Recommendations failed: {str(e)}"}]
+    
+    try:
+        action_plan = _generate_action_plan(metrics, budget_increase_limit=budget_increase_limit)
+    except Exception as e:
+        print(f"⚠️ Error generating action plan: {str(e)}")
+        action_plan = {"error": "Action plan generation failed", "details": str(e)}
+    
+    try:
+        budget_reallocation = _calculate_budget_reallocation(metrics, total_budget=total_budget)
+    except Exception as e:
+        print(f"⚠️ Error calculating budget reallocation: {str(e)}")
+        budget_reallocation = {"error": "Budget reallocation failed", "details": str(e)}
+
+    # Analyze trends for key metrics
+    trends_analysis = {}
+    for metric in trend_metrics or ['ctr', 'cpc', 'cpm', 'conversions']:
+        if metric in df.columns:
+            try:
+                trends_analysis[metric] = _analyze_trends(metrics, metric)
+            except Exception as e:
+                print(f"⚠️ Error analyzing trends for {metric}: {str(e)}")
+                trends_analysis[metric] = {"error": f"Trend analysis failed for {metric}", "details": str(e)}
+
+    return {
+        "performance_analysis": performance_analysis,
+        "campaign_comparison": campaign_comparison,
+        "recommendations": recommendations,
+        "action_plan": action_plan,
+        "budget_reallocation": budget_reallocation,
+        "trends_analysis": trends_analysis
+    }
+
 @router.post("/file-insights")
 async def file_insights(meta_csv: UploadFile = File(...), google_csv: UploadFile = File(...)):
     """
-    Upload Meta and Google Ads CSVs and get unified ad insights.
+    Upload Meta and Google Ads CSVs (or Parquet/Arrow files with standardized
+    columns) and get unified ad insights.
     """
     try:
         # --- Meta CSV ---
@@ -1133,24 +1124,8 @@ async def file_insights(meta_csv: UploadFile = File(...), google_csv: UploadFile
             'Ends': 'campaign_ends',
         }
 
-        # Use encoding detection for Meta CSV with better separator detection
-        meta_df = _detect_encoding_and_read_csv(
-            meta_csv.file,
-            meta_csv.filename,
-            sep=None,  # Let pandas auto-detect separator
-            engine='python'
-        )
-
-        # If auto-detection failed and we have concatenated columns, try semicolon separator
-        if len(meta_df.columns) <= 3 and any(';' in str(col) for col in meta_df.columns):
-            print("🔄 Meta CSV appears to use semicolon separator, re-reading...")
-            meta_csv.file.seek(0)
-            meta_df = _detect_encoding_and_read_csv(
-                meta_csv.file,
-                meta_csv.filename,
-                sep=';',  # Force semicolon separator
-                engine='python'
-            )
+        # Encoding and separator are detected from the start of the file
+        meta_df = _detect_encoding_and_read_csv(meta_csv.file, meta_csv.filename)
 
         print(f"✅ Meta CSV loaded successfully: {len(meta_df)} rows, columns: {[str(col) for col in meta_df.columns]}")
 
@@ -1255,40 +1230,8 @@ async def file_insights(meta_csv: UploadFile = File(...), google_csv: UploadFile
                 'Call conversion': 'call_conversion'
             }
 
-            # Try to read Google CSV with auto-detection first
-            google_df = _detect_encoding_and_read_csv(
-                google_csv.file,
-                google_csv.filename,
-                sep=None,  # Let pandas auto-detect separator
-                engine='python'
-            )
-
-            # Check if we have the concatenated column issue (semicolon-separated data in one column)
-            if len(google_df.columns) == 1 and ';' in str(google_df.columns[0]):
-                print("🔄 Google CSV appears to use semicolon separator, re-reading...")
-                google_csv.file.seek(0)
-                google_df = _detect_encoding_and_read_csv(
-                    google_csv.file,
-                    google_csv.filename,
-                    sep=';',  # Force semicolon separator
-                    engine='python'
-                )
-
-            # Alternative check: if we have very few columns but expect more
-            elif len(google_df.columns) <= 3:
-                print("🔄 Google CSV has too few columns, trying semicolon separator...")
-                google_csv.file.seek(0)
-                try:
-                    google_df = _detect_encoding_and_read_csv(
-                        google_csv.file,
-                        google_csv.filename,
-                        sep=';',  # Force semicolon separator
-                        engine='python'
-                    )
-                except Exception as semicolon_error:
-                    print(f"⚠️ Semicolon separator also failed: {str(semicolon_error)}")
-                    # Continue with the original dataframe
-                    pass
+            # Encoding and separator are detected from the start of the file
+            google_df = _detect_encoding_and_read_csv(google_csv.file, google_csv.filename)
 
             print(f"✅ Google CSV loaded successfully: {len(google_df)} rows, columns: {[str(col) for col in google_df.columns[:10]]}...")
 
@@ -1308,6 +1251,8 @@ async def file_insights(meta_csv: UploadFile = File(...), google_csv: UploadFile
                 print(f"✅ Successfully renamed {len(existing_columns)} Google columns")
 
             google_df['source'] = 'google_ads'
+        except HTTPException:
+            raise
         except Exception as e:
             error_msg = str(e)
             if "Expected" in error_msg and "fields" in error_msg and "line" in error_msg:
@@ -1482,78 +1427,16 @@ async def file_insights(meta_csv: UploadFile = File(...), google_csv: UploadFile
                 "latest": None
             }
 
-        # Run ALL analysis functions with error handling
-        try:
-            performance_analysis = _analyze_ad_performance(df)
-        except Exception as e:
-            print(f"⚠️ Error in performance analysis: {str(e)}")
-            performance_analysis = {"error": "Performance analysis failed", "details": str(e)}
-        
-        try:
-            campaign_comparison = _compare_campaigns(df)
-        except Exception as e:
-            print(f"⚠️ Error in campaign comparison: {str(e)}")
-            campaign_comparison = {"error": "Campaign comparison failed", "details": str(e)}
-        
-        try:
-            recommendations = _generate_recommendations(df, min_spend=100)  # Default $100 minimum spend
-        except Exception as e:
-            print(f"⚠️ Error generating recommendations: {str(e)}")
-            recommendations = [{"type": "error", "message": f"Recommendations failed: {str(e)}"}]
-        
-        try:
-            action_plan = _generate_action_plan(df, budget_increase_limit=50)  # Default 50% max increase
-        except Exception as e:
-            print(f"⚠️ Error generating action plan: {str(e)}")
-            action_plan = {"error": "Action plan generation failed", "details": str(e)}
-        
-        try:
-            budget_reallocation = _calculate_budget_reallocation(df, total_budget=10000)  # Default $10k budget
-        except Exception as e:
-            print(f"⚠️ Error calculating budget reallocation: {str(e)}")
-            budget_reallocation = {"error": "Budget reallocation failed", "details": str(e)}
-
-        # Analyze trends for key metrics
-        trend_metrics = ['ctr', 'cpc', 'cpm', 'conversions']
-        trends_analysis = {}
-        for metric in trend_metrics:
-            if metric in df.columns:
-                try:
-                    trends_analysis[metric] = _analyze_trends(df, metric)
-                except Exception as e:
-                    print(f"⚠️ Error analyzing trends for {metric}: {str(e)}")
-                    trends_analysis[metric] = {"error": f"Trend analysis failed for {metric}", "details": str(e)}
-
-        # Clean up any NaN/infinite values before JSON serialization
-        def clean_for_json(obj):
-            """Recursively clean NaN and infinite values from nested data structures"""
-            if isinstance(obj, dict):
-                return {k: clean_for_json(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [clean_for_json(item) for item in obj]
-            elif isinstance(obj, float):
-                if pd.isna(obj) or obj == float('inf') or obj == float('-inf'):
-                    return 0.0
-                return obj
-            elif hasattr(obj, 'item'):  # numpy scalars
-                try:
-                    val = obj.item()
-                    if isinstance(val, float) and (pd.isna(val) or val == float('inf') or val == float('-inf')):
-                        return 0.0
-                    return val
-                except (ValueError, TypeError):
-                    return 0.0
-            else:
-                return obj
-        
-        # Clean all analysis results
-        performance_analysis = clean_for_json(performance_analysis)
-        campaign_comparison = clean_for_json(campaign_comparison)
-        recommendations = clean_for_json(recommendations)
-        action_plan = clean_for_json(action_plan)
-        budget_reallocation = clean_for_json(budget_reallocation)
-        trends_analysis = clean_for_json(trends_analysis)
+        # Run ALL analysis functions in one worker call so they share a single MetricsFrame
+        analyses = await compute_executor.run(_run_file_insight_analyses, df)
+        performance_analysis = analyses["performance_analysis"]
+        campaign_comparison = analyses["campaign_comparison"]
+        recommendations = analyses["recommendations"]
+        action_plan = analyses["action_plan"]
+        budget_reallocation = analyses["budget_reallocation"]
+        trends_analysis = analyses["trends_analysis"]
 
+        # NumPy values, NaN/inf and Timestamps are handled by the orjson response class
         # Return comprehensive structured response
         return {
             "summary": {
@@ -1567,9 +1450,9 @@ async def file_insights(meta_csv: UploadFile = File(...), google_csv: UploadFile
                 },
                 "data_date_range": data_date_range,
                 "total_campaigns": len(df['campaign_name'].unique()),
-                "total_spend": clean_for_json(df['spend'].sum()),
-                "total_conversions": clean_for_json(df['conversions'].sum()),
-                "overall_roas": clean_for_json(df['conversions'].sum() / (df['spend'].sum() + 0.001))
+                "total_spend": df['spend'].sum(),
+                "total_conversions": df['conversions'].sum(),
+                "overall_roas": df['conversions'].sum() / (df['spend'].sum() + 0.001)
             },
 
             "performance_analysis": {
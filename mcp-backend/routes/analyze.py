@@ -5,7 +5,7 @@ import tempfile
 import json
 from autogluon.tabular import TabularPredictor
 import shap
-from models import PredictRequest
+from request_models import PredictRequest
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import numpy as np
@@ -4,6 +4,7 @@ Simplified and focused ad performance endpoints
 """
 
 from fastapi import APIRouter, HTTPException, Form
+from fast_json import FastJSONRoute
 import json
 from typing import Dict, Any, List
 import logging
@@ -14,7 +15,7 @@ from analytics.ad_performance import AdPerformanceAnalyzer, CampaignComparator
 from analytics.recommendation_engine import RecommendationEngine, ActionPlanGenerator
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/ad-performance")
 async def ad_performance_analysis(request: str = Form(...)):
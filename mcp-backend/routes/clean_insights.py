@@ -4,14 +4,20 @@ Simplified API endpoints for data consolidation
 """
 
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import Optional
+from fastapi.responses import Response
+from fast_json import FastJSONRoute
+from typing import Optional, Tuple
 import logging
+import pandas as pd
 
 from clean_consolidator import CleanDataConsolidator
+from columnar_io import (
+    PARQUET_MEDIA_TYPE, ColumnarReadError, SchemaValidationError, detect_upload_format, read_columnar, to_parquet_bytes
+)
 from data_loader import DataLoader
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/clean-insights")
 async def clean_insights(
@@ -19,24 +25,10 @@ async def clean_insights(
     meta_file: Optional[UploadFile] = File(None),
     google_file: Optional[UploadFile] = File(None)
 ):
-    """Upload CSV files and get consolidated insights"""
-    
-    if not any([ga4_file, meta_file, google_file]):
-        raise HTTPException(
-            status_code=400,
-            detail="Upload at least one CSV file (GA4, Meta, or Google Ads)"
-        )
+    """Upload CSV, Parquet or Arrow files and get consolidated insights"""
     
     try:
-        consolidator = CleanDataConsolidator()
-        files_processed = _process_uploaded_files(consolidator, ga4_file, meta_file, google_file)
-        
-        if not files_processed or not any(files_processed.values()):
-            raise HTTPException(
-                status_code=400,
-                detail="No files could be processed successfully"
-            )
-        
+        consolidator, files_processed = _consolidate_uploads(ga4_file, meta_file, google_file)
         insights = consolidator.generate_insights()
         
         return {
@@ -45,10 +37,39 @@ async def clean_insights(
             "insights": insights
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing insights: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/clean-insights/export")
+async def export_clean_data(
+    ga4_file: Optional[UploadFile] = File(None),
+    meta_file: Optional[UploadFile] = File(None),
+    google_file: Optional[UploadFile] = File(None)
+):
+    """Upload files and download the consolidated, standardized dataset as Parquet"""
+    
+    try:
+        consolidator, files_processed = _consolidate_uploads(ga4_file, meta_file, google_file)
+        content = to_parquet_bytes(consolidator.get_data())
+        
+        return Response(
+            content=content,
+            media_type=PARQUET_MEDIA_TYPE,
+            headers={
+                "Content-Disposition": 'attachment; filename="clean_insights.parquet"',
+                "X-Files-Processed": ",".join(name for name, ok in files_processed.items() if ok)
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting consolidated data: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/clean-insights/example")
 async def insights_example():
     """Get usage examples for the clean insights endpoint"""
@@ -61,6 +82,11 @@ async def insights_example():
             "meta_file": "Meta Ads CSV export (optional)",
             "google_file": "Google Ads CSV export (optional)"
         },
+        "columnar_formats": {
+            "upload": "Any file may instead be Parquet or Arrow IPC using the standardized column names "
+                      "(campaign_name, spend, impressions, ...); these skip CSV parsing and numeric cleanup",
+            "export": "POST the same files to /clean-insights/export to download the consolidated data as Parquet"
+        },
         "example_curl": """
 curl -X POST "http://localhost:8000/clean-insights" \\
   -F "ga4_file=@analytics.csv" \\
@@ -75,6 +101,34 @@ curl -X POST "http://localhost:8000/clean-insights" \\
         ]
     }
 
+def _consolidate_uploads(
+    ga4_file: Optional[UploadFile],
+    meta_file: Optional[UploadFile],
+    google_file: Optional[UploadFile]
+) -> Tuple[CleanDataConsolidator, dict]:
+    """Load all uploads into a consolidator; raises HTTPException(400) if nothing usable was uploaded"""
+    
+    if not any([ga4_file, meta_file, google_file]):
+        raise HTTPException(
+            status_code=400,
+            detail="Upload at least one CSV, Parquet or Arrow file (GA4, Meta, or Google Ads)"
+        )
+    
+    consolidator = CleanDataConsolidator()
+    try:
+        files_processed = _process_uploaded_files(consolidator, ga4_file, meta_file, google_file)
+    except SchemaValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Schema validation failed for {e}")
+    except ColumnarReadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not files_processed or not any(files_processed.values()):
+        raise HTTPException(
+            status_code=400,
+            detail="No files could be processed successfully"
+        )
+    return consolidator, files_processed
+
 def _process_uploaded_files(
     consolidator: CleanDataConsolidator,
     ga4_file: Optional[UploadFile],
@@ -84,35 +138,37 @@ def _process_uploaded_files(
     """Process uploaded files and return which ones were successful"""
     
     files_processed = {}
+    uploads = [
+        ('ga4', 'ga4', ga4_file, consolidator.add_ga4_data),
+        ('meta', 'meta', meta_file, consolidator.add_meta_data),
+        ('google', 'google_ads', google_file, consolidator.add_google_ads_data)
+    ]
     
-    if ga4_file:
-        df = _read_uploaded_file(ga4_file)
-        if df is not None and consolidator.add_ga4_data(df):
-            files_processed['ga4'] = True
+    for name, source, file, add_csv_data in uploads:
+        if not file:
+            continue
+        df, pre_standardized = _read_uploaded_file(file)
+        if df is None:
+            files_processed[name] = False
+        elif pre_standardized:
+            files_processed[name] = consolidator.add_standardized_data(df, source)
         else:
-            files_processed['ga4'] = False
-    
-    if meta_file:
-        df = _read_uploaded_file(meta_file)
-        if df is not None and consolidator.add_meta_data(df):
-            files_processed['meta'] = True
-        else:
-            files_processed['meta'] = False
-    
-    if google_file:
-        df = _read_uploaded_file(google_file)
-        if df is not None and consolidator.add_google_ads_data(df):
-            files_processed['google'] = True
-        else:
-            files_processed['google'] = False
+            files_processed[name] = add_csv_data(df)
     
     return files_processed
 
-def _read_uploaded_file(file: UploadFile):
-    """Read uploaded file using DataLoader"""
+def _read_uploaded_file(file: UploadFile) -> Tuple[Optional[pd.DataFrame], bool]:
+    """
+    Read an uploaded CSV (via DataLoader) or Parquet/Arrow file.
+    The flag is True for columnar files, which must already be standardized.
+    """
+    fmt = detect_upload_format(file.file, file.filename)
+    if fmt != 'csv':
+        # Schema and read errors propagate so the client gets a 400 with the details
+        return read_columnar(file.file, fmt, file.filename), True
+    
     try:
-        content = file.file.read()
-        return DataLoader.load_csv_from_bytes(content, file.filename)
+        return DataLoader.load_csv(file.file, file.filename), False
     except Exception as e:
         logger.error(f"Error reading uploaded file {file.filename}: {e}")
-        return None
\ No newline at end of file
+        return None, False
\ No newline at end of file
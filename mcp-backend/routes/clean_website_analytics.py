@@ -4,6 +4,7 @@ Simplified and focused analytics endpoints
 """
 
 from fastapi import APIRouter, HTTPException, Form
+from fast_json import FastJSONRoute
 import pandas as pd
 import json
 from typing import Dict, Any
@@ -15,7 +16,7 @@ from analytics.journey_analyzer import JourneyAnalyzer
 from analytics.funnel_optimizer import FunnelOptimizer
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/journey-analysis")
 async def journey_analysis(request: str = Form(...)):
@@ -4,18 +4,25 @@ Provides individual insights per data source plus combined insights
 """
 
 from fastapi import APIRouter, HTTPException
+from fast_json import FastJSONRoute
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
 import json
 import asyncio
 import logging
+import os
 
 from credential_manager import credential_manager
+from mcp_tracing import start_span
+from platform_limiter import degradation_report
 from shared_integrator import data_integrator_instance
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# Longest wait for one platform's data before the analysis goes ahead without it
+PLATFORM_FETCH_DEADLINE = float(os.getenv("PLATFORM_FETCH_DEADLINE", "90"))
+
+router = APIRouter(route_class=FastJSONRoute)
 
 class DataSelection(BaseModel):
     platform: str  # 'facebook' | 'google_ads' | 'google_analytics'
@@ -39,15 +46,6 @@ class ComprehensiveInsightsRequest(BaseModel):
     data_selections: List[DataSelection]  # Required - must specify data sources
     analysis_options: Optional[AnalysisOptions] = None
 
-def _clean_for_json(obj):
-    """Clean up data structures for JSON serialization"""
-    if hasattr(obj, 'tolist'):
-        return obj.tolist()
-    elif hasattr(obj, '__dict__'):
-        return _clean_for_json(obj.__dict__)
-    else:
-        return obj
-
 @router.post("/comprehensive-insights")
 async def comprehensive_insights(request: ComprehensiveInsightsRequest):
     """
@@ -88,45 +86,50 @@ async def comprehensive_insights(request: ComprehensiveInsightsRequest):
             'google_analytics': 'ga4'
         }
         
-        # Fetch data per platform
-        platform_data = {}
-        for selection in data_selections:
+        # Fetch all platforms concurrently; a slow or failing one is dropped (and reported) instead of waited for
+        async def fetch_selection(selection: DataSelection):
             platform = selection.platform
             data_source = platform_map.get(platform, platform)
-            
-            try:
-                logger.info(f"Fetching data for {platform} ({data_source})")
-                
-                if data_source == 'ga4':
-                    platform_data[platform] = await _fetch_ga4_data(
-                        user_integrator, user_id, start_date, end_date, selection.property_id
-                    )
-                elif data_source == 'google_ads':
-                    platform_data[platform] = await _fetch_google_ads_data(
-                        user_integrator, user_id, start_date, end_date, selection.account_id
-                    )
-                elif data_source == 'meta_ads':
-                    platform_data[platform] = await _fetch_meta_ads_data(
-                        user_integrator, user_id, start_date, end_date, selection.account_id
-                    )
-                    
-                if platform_data[platform] is not None and hasattr(platform_data[platform], 'empty') and not platform_data[platform].empty:
-                    logger.info(f"✅ {platform} data: {len(platform_data[platform])} rows")
-                else:
-                    logger.warning(f"❌ {platform} data: empty or failed")
-                    
-            except Exception as e:
-                logger.error(f"Failed to fetch {platform} data: {e}")
-                platform_data[platform] = None
+            data = None
+            with degradation_report() as failures:
+                try:
+                    logger.info(f"Fetching data for {platform} ({data_source})")
+                    with start_span(f"fetch {platform}", platform=platform, data_source=data_source):
+                        if data_source == 'ga4':
+                            fetch = _fetch_ga4_data(user_integrator, user_id, start_date, end_date, selection.property_id)
+                        elif data_source == 'google_ads':
+                            fetch = _fetch_google_ads_data(user_integrator, user_id, start_date, end_date, selection.account_id)
+                        elif data_source == 'meta_ads':
+                            fetch = _fetch_meta_ads_data(user_integrator, user_id, start_date, end_date, selection.account_id)
+                        else:
+                            return platform, None
+                        data = await asyncio.wait_for(fetch, PLATFORM_FETCH_DEADLINE)
+                except asyncio.TimeoutError:
+                    logger.error(f"{platform} data fetch exceeded {PLATFORM_FETCH_DEADLINE:g}s")
+                    degraded_platforms[platform] = f"no data within {PLATFORM_FETCH_DEADLINE:g}s"
+                except Exception as e:
+                    logger.error(f"Failed to fetch {platform} data: {e}")
+            if failures and platform not in degraded_platforms:
+                degraded_platforms[platform] = "; ".join(f"{source}: {reason}" for source, reason in failures.items())
+
+            if data is not None and hasattr(data, 'empty') and not data.empty:
+                logger.info(f"✅ {platform} data: {len(data)} rows")
+            else:
+                logger.warning(f"❌ {platform} data: empty or failed")
+            return platform, data
+
+        degraded_platforms = {}
+        platform_data = dict(await asyncio.gather(*(fetch_selection(selection) for selection in data_selections)))
         
         # Generate individual insights per platform
         individual_insights = {}
         for platform, data in platform_data.items():
             if data is not None and hasattr(data, 'empty') and not data.empty:
                 logger.info(f"Generating insights for {platform}")
-                individual_insights[platform] = await _generate_platform_insights(
-                    platform, data, min_spend_threshold, budget_increase_limit
-                )
+                with start_span("analysis.platform_insights", platform=platform):
+                    individual_insights[platform] = await _generate_platform_insights(
+                        platform, data, min_spend_threshold, budget_increase_limit
+                    )
         
         # Generate combined insights if multiple platforms available
         combined_insights = {}
@@ -134,9 +137,10 @@ async def comprehensive_insights(request: ComprehensiveInsightsRequest):
         
         if len(available_platforms) > 1:
             logger.info(f"Generating combined insights for platforms: {available_platforms}")
-            combined_insights = await _generate_combined_insights(
-                platform_data, available_platforms, min_spend_threshold, budget_increase_limit
-            )
+            with start_span("analysis.combined_insights", platforms=",".join(available_platforms)):
+                combined_insights = await _generate_combined_insights(
+                    platform_data, available_platforms, min_spend_threshold, budget_increase_limit
+                )
         
         # Build response
         response = {
@@ -154,10 +158,13 @@ async def comprehensive_insights(request: ComprehensiveInsightsRequest):
             "data_availability": {
                 platform: data is not None and hasattr(data, 'empty') and not data.empty 
                 for platform, data in platform_data.items()
-            }
+            },
+            # Partial results: these platforms timed out or had their circuit open
+            "degraded": bool(degraded_platforms),
+            "degraded_platforms": degraded_platforms
         }
         
-        return _clean_for_json(response)
+        return response
         
     except Exception as e:
         logger.error(f"Comprehensive insights error: {e}")
@@ -363,21 +370,25 @@ async def _generate_ga4_insights(data):
 async def _generate_google_ads_insights(data, min_spend_threshold: float):
     """Generate Google Ads specific insights"""
     from analytics.ad_performance import AdPerformanceAnalyzer, CampaignComparator
+    from analytics.metrics_frame import MetricsFrame
     from analytics.recommendation_engine import RecommendationEngine
     
     insights = {}
     
     try:
+        # Derived metrics and groupings shared by all three analyzers
+        metrics = MetricsFrame(data)
+        
         # Ad performance analysis
-        analyzer = AdPerformanceAnalyzer(data)
+        analyzer = AdPerformanceAnalyzer(metrics)
         insights["ad_performance"] = analyzer.analyze_performance()
         
         # Campaign comparison
-        comparator = CampaignComparator(data)
+        comparator = CampaignComparator(metrics)
         insights["campaign_comparison"] = comparator.compare_campaigns()
         
         # Recommendations
-        engine = RecommendationEngine(data, min_spend_threshold)
+        engine = RecommendationEngine(metrics, min_spend_threshold)
         insights["recommendations"] = engine.generate_recommendations()
         
     except Exception as e:
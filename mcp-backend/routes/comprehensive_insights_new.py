@@ -4,6 +4,7 @@ Provides individual insights per data source plus combined insights
 """
 
 from fastapi import APIRouter, HTTPException
+from fast_json import FastJSONRoute
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
 import json
@@ -15,7 +16,7 @@ from shared_integrator import data_integrator_instance
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 class DataSelection(BaseModel):
     platform: str  # 'facebook' | 'google_ads' | 'google_analytics'
@@ -39,15 +40,6 @@ class ComprehensiveInsightsRequest(BaseModel):
     data_selections: List[DataSelection]  # Required - must specify data sources
     analysis_options: Optional[AnalysisOptions] = None
 
-def _clean_for_json(obj):
-    """Clean up data structures for JSON serialization"""
-    if hasattr(obj, 'tolist'):
-        return obj.tolist()
-    elif hasattr(obj, '__dict__'):
-        return _clean_for_json(obj.__dict__)
-    else:
-        return obj
-
 @router.post("/comprehensive-insights")
 async def comprehensive_insights(request: ComprehensiveInsightsRequest):
     """
@@ -157,7 +149,7 @@ async def comprehensive_insights(request: ComprehensiveInsightsRequest):
             }
         }
         
-        return _clean_for_json(response)
+        return response
         
     except Exception as e:
         logger.error(f"Comprehensive insights error: {e}")
@@ -298,21 +290,25 @@ async def _generate_ga4_insights(data):
 async def _generate_google_ads_insights(data, min_spend_threshold: float):
     """Generate Google Ads specific insights"""
     from analytics.ad_performance import AdPerformanceAnalyzer, CampaignComparator
+    from analytics.metrics_frame import MetricsFrame
     from analytics.recommendation_engine import RecommendationEngine
     
     insights = {}
     
     try:
+        # Derived metrics and groupings shared by all three analyzers
+        metrics = MetricsFrame(data)
+        
         # Ad performance analysis
-        analyzer = AdPerformanceAnalyzer(data)
+        analyzer = AdPerformanceAnalyzer(metrics)
         insights["ad_performance"] = analyzer.analyze_performance()
         
         # Campaign comparison
-        comparator = CampaignComparator(data)
+        comparator = CampaignComparator(metrics)
         insights["campaign_comparison"] = comparator.compare_campaigns()
         
         # Recommendations
-        engine = RecommendationEngine(data, min_spend_threshold)
+        engine = RecommendationEngine(metrics, min_spend_threshold)
         insights["recommendations"] = engine.generate_recommendations()
         
     except Exception as e:
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, HTTPException
+from fast_json import FastJSONRoute
 
-from models import ConfigureDataSourceRequest, LoadUserCredentialsRequest
+from request_models import ConfigureDataSourceRequest, LoadUserCredentialsRequest
 from shared_integrator import data_integrator_instance
 from credential_manager import credential_manager
 import data_integrator
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/configure-data-sources")
 async def configure_data_sources(request: ConfigureDataSourceRequest):
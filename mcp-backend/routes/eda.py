@@ -1,4 +1,5 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fast_json import FastJSONRoute
 import pandas as pd
 import tempfile
 import os
@@ -9,18 +10,28 @@ import numpy as np
 from credential_manager import credential_manager
 from shared_integrator import data_integrator_instance
 import data_integrator
+import io
+from compute_executor import compute_executor, offloadable
+from analytics.analysis_cache import memoize
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/eda")
-def run_eda(file: UploadFile = File(...)):
-    df = pd.read_csv(file.file)
+async def run_eda(file: UploadFile = File(...)):
+    csv_bytes = await file.read()
+    report_path = await compute_executor.run(_generate_eda_report, csv_bytes)
+    return {"eda_report_path": report_path}
+
+@offloadable
+def _generate_eda_report(csv_bytes: bytes) -> str:
+    """Profile an uploaded CSV and write the HTML report; runs in a compute worker"""
+    df = pd.read_csv(io.BytesIO(csv_bytes))
     from ydata_profiling import ProfileReport
     report = ProfileReport(df, title="EDA Report", minimal=True)
     temp_dir = tempfile.mkdtemp()
     report_path = os.path.join(temp_dir, "eda_report.html")
     report.to_file(report_path)
-    return {"eda_report_path": report_path}
+    return report_path
 
 @router.post("/ga4-data-availability")
 async def ga4_data_availability(request: str = Form(...)):
@@ -116,17 +127,8 @@ async def complete_website_insights(request: str = Form(...)):
         # Preprocess data to handle type issues
         ga4_data = _preprocess_ga4_data(ga4_data)
         
-        # Generate all insights
-        insights = {
-            "overview": _generate_overview_insights(ga4_data),
-            "drop_off_analysis": _analyze_drop_offs(ga4_data),
-            "traffic_source_analysis": _analyze_traffic_sources(ga4_data),
-            "user_behavior_patterns": _analyze_user_behavior(ga4_data),
-            "content_performance": _analyze_content_performance(ga4_data),
-            "device_performance": _analyze_device_performance(ga4_data),
-            "actionable_recommendations": _generate_actionable_recommendations(ga4_data),
-            "optimization_opportunities": _identify_optimization_opportunities(ga4_data)
-        }
+        # Generate all insights in one compute task so the frame is shipped once
+        insights = await compute_executor.run(_generate_complete_insights, ga4_data)
         
         return {
             "user_id": user_id,
@@ -204,6 +206,21 @@ def _preprocess_ga4_data(ga4_data: pd.DataFrame) -> pd.DataFrame:
     
     return ga4_data
 
+@offloadable
+@memoize
+def _generate_complete_insights(ga4_data: pd.DataFrame) -> Dict:
+    """All website insight sections for /complete-website-insights"""
+    return {
+        "overview": _generate_overview_insights(ga4_data),
+        "drop_off_analysis": _analyze_drop_offs(ga4_data),
+        "traffic_source_analysis": _analyze_traffic_sources(ga4_data),
+        "user_behavior_patterns": _analyze_user_behavior(ga4_data),
+        "content_performance": _analyze_content_performance(ga4_data),
+        "device_performance": _analyze_device_performance(ga4_data),
+        "actionable_recommendations": _generate_actionable_recommendations(ga4_data),
+        "optimization_opportunities": _identify_optimization_opportunities(ga4_data)
+    }
+
 def _generate_overview_insights(ga4_data: pd.DataFrame) -> Dict:
     """Generate high-level overview insights"""
     
@@ -233,6 +250,8 @@ def _generate_overview_insights(ga4_data: pd.DataFrame) -> Dict:
         }
     }
 
+@offloadable
+@memoize
 def _analyze_drop_offs(ga4_data: pd.DataFrame) -> Dict:
     """Analyze where and why users are dropping off"""
     
@@ -320,6 +339,8 @@ def _analyze_drop_offs(ga4_data: pd.DataFrame) -> Dict:
     
     return drop_off_analysis
 
+@offloadable
+@memoize
 def _analyze_traffic_sources(ga4_data: pd.DataFrame) -> Dict:
     """Analyze where users are coming from and their quality"""
     
@@ -399,6 +420,8 @@ def _analyze_traffic_sources(ga4_data: pd.DataFrame) -> Dict:
     
     return traffic_analysis
 
+@offloadable
+@memoize
 def _analyze_user_behavior(ga4_data: pd.DataFrame) -> Dict:
     """Analyze user behavior patterns"""
     
@@ -447,6 +470,8 @@ def _analyze_user_behavior(ga4_data: pd.DataFrame) -> Dict:
     
     return behavior_analysis
 
+@offloadable
+@memoize
 def _analyze_content_performance(ga4_data: pd.DataFrame) -> Dict:
     """Analyze content performance"""
     
@@ -501,6 +526,8 @@ def _analyze_content_performance(ga4_data: pd.DataFrame) -> Dict:
     
     return content_analysis
 
+@offloadable
+@memoize
 def _analyze_device_performance(ga4_data: pd.DataFrame) -> Dict:
     """Analyze device performance"""
     
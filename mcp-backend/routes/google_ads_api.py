@@ -1,15 +1,21 @@
 from fastapi import APIRouter, HTTPException, Query
+from fast_json import FastJSONRoute
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 import logging
-from google.ads.googleads.client import GoogleAdsClient
-from google.ads.googleads.errors import GoogleAdsException
 # Removed old OAuth import - now using database credentials directly
+from credential_db import credential_storage
+from platform_endpoints import google_ads_client
+from platform_limiter import platform_call
 import os
 
+# The Google Ads SDK is imported where it's used, keeping it off the startup path
+if TYPE_CHECKING:
+    from google.ads.googleads.client import GoogleAdsClient
+
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/advertising", tags=["Google Ads API"])
+router = APIRouter(prefix="/advertising", tags=["Google Ads API"], route_class=FastJSONRoute)
 
 class GoogleAdsConfig:
     def __init__(self):
@@ -42,11 +48,9 @@ class Campaign(BaseModel):
     resource_name: str
     metrics: Optional[CampaignMetrics] = None
 
-def get_google_ads_client(user_id: str) -> GoogleAdsClient:
+def get_google_ads_client(user_id: str) -> "GoogleAdsClient":
     """Create Google Ads client with stored credentials from database"""
     try:
-        from database import credential_storage
-        
         # Get stored Google Ads credentials from database
         user_credentials = credential_storage.get_user_credentials(user_id)
         
@@ -75,7 +79,7 @@ def get_google_ads_client(user_id: str) -> GoogleAdsClient:
             )
         
         # Create client
-        client = GoogleAdsClient.load_from_dict(client_config, version="v21")
+        client = google_ads_client(client_config, version="v21")
         
         return client
     except HTTPException:
@@ -87,13 +91,15 @@ def get_google_ads_client(user_id: str) -> GoogleAdsClient:
 @router.get("/accounts", response_model=List[CustomerAccount])
 async def get_accounts(user_id: str):
     """Get all accessible Google Ads accounts"""
+    from google.ads.googleads.errors import GoogleAdsException
     try:
         client = get_google_ads_client(user_id)
         
         # Get accessible customers using the proper Google Ads API v21 method
         customer_service = client.get_service("CustomerService", version="v21")
         request = client.get_type("ListAccessibleCustomersRequest", version="v21")
-        accessible_customers_response = customer_service.list_accessible_customers(request=request)
+        accessible_customers_response = await platform_call("google_ads", None, customer_service.list_accessible_customers,
+                                                            request=request)
         
         accounts = []
         
@@ -120,7 +126,8 @@ async def get_accounts(user_id: str):
                 search_request.customer_id = customer_id
                 search_request.query = query
                 
-                response = ga_service.search(request=search_request)
+                response = await platform_call("google_ads", customer_id,
+                                               lambda: list(ga_service.search(request=search_request)))
                 
                 for row in response:
                     customer = row.customer
@@ -161,6 +168,7 @@ async def get_campaigns(
     include_metrics: bool = Query(True, description="Include campaign metrics")
 ):
     """Get campaigns for a specific customer account"""
+    from google.ads.googleads.errors import GoogleAdsException
     try:
         client = get_google_ads_client(user_id)
         ga_service = client.get_service("GoogleAdsService")
@@ -190,7 +198,9 @@ async def get_campaigns(
             WHERE campaign.status != 'REMOVED'
         """
 
-        response = ga_service.search(customer_id=customer_id, query=query)
+        response = await platform_call(
+            "google_ads", customer_id, lambda: list(ga_service.search(customer_id=customer_id, query=query))
+        )
 
         campaigns = []
         for row in response:
@@ -234,6 +244,7 @@ async def get_account_performance(
     end_date: str = Query(..., description="End date in YYYY-MM-DD format")
 ):
     """Get account performance metrics for a date range"""
+    from google.ads.googleads.errors import GoogleAdsException
     try:
         client = get_google_ads_client(user_id)
         ga_service = client.get_service("GoogleAdsService")
@@ -252,7 +263,9 @@ async def get_account_performance(
             WHERE segments.date BETWEEN '{start_date}' AND '{end_date}'
         """
         
-        response = ga_service.search(customer_id=customer_id, query=query)
+        response = await platform_call(
+            "google_ads", customer_id, lambda: list(ga_service.search(customer_id=customer_id, query=query))
+        )
         
         # Aggregate metrics
         total_impressions = 0
@@ -1,23 +1,19 @@
 from fastapi import APIRouter, HTTPException, Query
+from fast_json import FastJSONRoute
 import logging
 from typing import List, Optional
 from routes.google_oauth import get_user_credentials
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
-from google.analytics.data_v1beta.types import (
-    RunReportRequest,
-    Dimension,
-    Metric,
-    DateRange
-)
+from platform_endpoints import ga4_client
+from platform_limiter import platform_call
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/analytics", tags=["Google Analytics API"])
+router = APIRouter(prefix="/analytics", tags=["Google Analytics API"], route_class=FastJSONRoute)
 
 def get_analytics_client(user_id: str):
     """Get authenticated Google Analytics client"""
     credentials = get_user_credentials(user_id)
-    return BetaAnalyticsDataClient(credentials=credentials)
+    return ga4_client(credentials)
 
 @router.get("/properties")
 async def get_properties(user_id: str):
@@ -74,6 +70,7 @@ async def get_property_metrics(
 ):
     """Get metrics for a GA4 property"""
     try:
+        from google.analytics.data_v1beta.types import DateRange, Dimension, Metric, RunReportRequest
         client = get_analytics_client(user_id)
         
         # Define metrics to fetch
@@ -100,7 +97,7 @@ async def get_property_metrics(
             date_ranges=[DateRange(start_date=start_date, end_date=end_date)]
         )
         
-        response = client.run_report(request=request)
+        response = await platform_call("ga4", property_id, client.run_report, request=request)
         
         # Process the response
         if not response.rows:
@@ -206,6 +203,7 @@ async def get_top_pages(
 ):
     """Get top pages for a GA4 property"""
     try:
+        from google.analytics.data_v1beta.types import DateRange, Dimension, Metric, RunReportRequest
         client = get_analytics_client(user_id)
         
         request = RunReportRequest(
@@ -219,7 +217,7 @@ async def get_top_pages(
             limit=limit
         )
         
-        response = client.run_report(request=request)
+        response = await platform_call("ga4", property_id, client.run_report, request=request)
         
         top_pages = []
         for row in response.rows:
@@ -248,6 +246,7 @@ async def get_traffic_sources(
 ):
     """Get traffic sources for a GA4 property"""
     try:
+        from google.analytics.data_v1beta.types import DateRange, Dimension, Metric, RunReportRequest
         client = get_analytics_client(user_id)
         
         request = RunReportRequest(
@@ -263,7 +262,7 @@ async def get_traffic_sources(
             date_ranges=[DateRange(start_date=start_date, end_date=end_date)]
         )
         
-        response = client.run_report(request=request)
+        response = await platform_call("ga4", property_id, client.run_report, request=request)
         
         traffic_sources = []
         for row in response.rows:
@@ -294,6 +293,7 @@ async def get_conversions(
 ):
     """Get conversion events for a GA4 property"""
     try:
+        from google.analytics.data_v1beta.types import DateRange, Dimension, Metric, RunReportRequest
         client = get_analytics_client(user_id)
         
         request = RunReportRequest(
@@ -306,7 +306,7 @@ async def get_conversions(
             date_ranges=[DateRange(start_date=start_date, end_date=end_date)]
         )
         
-        response = client.run_report(request=request)
+        response = await platform_call("ga4", property_id, client.run_report, request=request)
         
         conversions = []
         for row in response.rows:
@@ -332,6 +332,7 @@ async def get_conversions(
 async def get_realtime_metrics(property_id: str, user_id: str):
     """Get real-time metrics for a GA4 property"""
     try:
+        from google.analytics.data_v1beta.types import DateRange, Metric, RunReportRequest
         client = get_analytics_client(user_id)
         
         request = RunReportRequest(
@@ -343,7 +344,7 @@ async def get_realtime_metrics(property_id: str, user_id: str):
             date_ranges=[DateRange(start_date="today", end_date="today")]
         )
         
-        response = client.run_report(request=request)
+        response = await platform_call("ga4", property_id, client.run_report, request=request)
         
         active_users = 0
         if response.rows:
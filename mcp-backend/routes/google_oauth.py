@@ -1,18 +1,20 @@
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import RedirectResponse
+from fast_json import FastJSONRoute
 from pydantic import BaseModel
 import os
-from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request as GoogleRequest
-from google.oauth2.credentials import Credentials
 import json
 import logging
-from typing import Dict, Any, Optional
-from database import credential_storage
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from credential_db import credential_storage
+
+# The Google auth libraries are imported where they're used, keeping them off the startup path
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/google-oauth", tags=["Google OAuth"])
+router = APIRouter(prefix="/google-oauth", tags=["Google OAuth"], route_class=FastJSONRoute)
 
 # OAuth configuration - includes both Ads and Analytics scopes
 SCOPES = [
@@ -94,6 +96,7 @@ class TokenExchangeRequest(BaseModel):
 async def get_auth_url():
     """Generate Google OAuth authorization URL"""
     try:
+        from google_auth_oauthlib.flow import Flow
         flow = Flow.from_client_config(CLIENT_CONFIG, scopes=SCOPES)
         flow.redirect_uri = CLIENT_CONFIG["web"]["redirect_uris"][0]
         
@@ -115,6 +118,7 @@ async def get_auth_url():
 async def exchange_token(request: TokenExchangeRequest):
     """Exchange authorization code for access token"""
     try:
+        from google_auth_oauthlib.flow import Flow
         flow = Flow.from_client_config(CLIENT_CONFIG, scopes=SCOPES)
         flow.redirect_uri = CLIENT_CONFIG["web"]["redirect_uris"][0]
         
@@ -207,6 +211,8 @@ async def oauth_callback(request: Request):
 async def get_user_info(user_id: Optional[str] = None):
     """Get current user info"""
     try:
+        from google.auth.transport.requests import Request as GoogleRequest
+        from google.oauth2.credentials import Credentials
         # If no user_id provided, try to find an active session
         if not user_id:
             # Look for any active user session
@@ -253,8 +259,10 @@ async def get_user_info(user_id: Optional[str] = None):
         logger.error(f"Error getting user info: {e}")
         raise HTTPException(status_code=401, detail="Authentication failed")
 
-def get_user_credentials(user_id: str = "current_user") -> Credentials:
+def get_user_credentials(user_id: str = "current_user") -> "Credentials":
     """Get valid credentials for a user"""
+    from google.auth.transport.requests import Request as GoogleRequest
+    from google.oauth2.credentials import Credentials
     user_tokens = get_user_tokens(user_id)
     if user_id not in user_tokens:
         raise HTTPException(status_code=401, detail="User not authenticated")
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.responses import Response
+from fast_json import FastJSONRoute
+
+from analysis_jobs import FINISHED, PRIORITIES, JobQueueFull, analysis_jobs, submission_key
+
+router = APIRouter(route_class=FastJSONRoute)
+
+# Comment line sent on idle event streams so proxies don't close them
+SSE_KEEPALIVE_SECONDS = 15
+
+
+@router.post("/jobs/{path:path}", status_code=202)
+async def submit_job(path: str, request: Request, priority: str = "normal"):
+    """
+    Submit an analysis as a job. The body is exactly what the synchronous
+    endpoint takes (form fields, uploads or JSON), e.g. POST /jobs/file-insights
+    """
+    path = "/" + path.strip("/")
+    if path not in analysis_jobs.paths:
+        available = ", ".join(analysis_jobs.paths) or "none"
+        raise HTTPException(status_code=404, detail=f"{path} cannot be run as a job; available: {available}")
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {', '.join(PRIORITIES)}")
+
+    content_type = request.headers.get("content-type", "")
+    body = await request.body()
+    form = None
+    if content_type.startswith(("multipart/form-data", "application/x-www-form-urlencoded")):
+        form = await request.form()
+    try:
+        dedup_key = await submission_key(path, content_type, body, form)
+    finally:
+        if form is not None:
+            await form.close()
+
+    try:
+        job, deduplicated = await analysis_jobs.submit(path, content_type, body, dedup_key, PRIORITIES[priority])
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return {"success": True, "deduplicated": deduplicated, **job}
+
+
+@router.get("/jobs")
+async def list_jobs(limit: int = 50):
+    return {"jobs": analysis_jobs.list(limit), "stats": analysis_jobs.stats()}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """The finished job's response, with the status code and body the synchronous endpoint returned"""
+    row = analysis_jobs.result(job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if row["status"] not in FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {row['status']}")
+    if row["result"] is None:
+        raise HTTPException(status_code=500, detail=row["error"] or f"Job {job_id} produced no response")
+    return Response(content=row["result"], status_code=row["status_code"], media_type=row["result_type"])
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-sent events: a `status` event on every change, then `done` once the job finishes"""
+    if analysis_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def events():
+        with analysis_jobs.watch(job_id) as updates:
+            # Read after subscribing so a change in between isn't missed
+            job = analysis_jobs.get(job_id)
+            while True:
+                event = "done" if job["status"] in FINISHED else "status"
+                yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+                if event == "done":
+                    return
+                while True:
+                    try:
+                        job = await asyncio.wait_for(updates.get(), SSE_KEEPALIVE_SECONDS)
+                        break
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
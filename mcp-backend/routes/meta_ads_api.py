@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException, Query
+from fast_json import FastJSONRoute
 import logging
 from typing import List, Optional
 import requests
+from platform_endpoints import graph_url
+from platform_limiter import platform_call
 from routes.meta_oauth import get_meta_access_token
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/meta-ads", tags=["Meta Ads API"])
+router = APIRouter(prefix="/meta-ads", tags=["Meta Ads API"], route_class=FastJSONRoute)
 
 @router.get("/accounts")
 async def get_ad_accounts():
@@ -15,13 +18,13 @@ async def get_ad_accounts():
         access_token = get_meta_access_token()
         
         # Get ad accounts
-        url = f"https://graph.facebook.com/v18.0/me/adaccounts"
+        url = graph_url("me/adaccounts")
         params = {
             'access_token': access_token,
             'fields': 'id,name,account_id,currency,timezone_name,account_status'
         }
         
-        response = requests.get(url, params=params)
+        response = await platform_call("meta_ads", None, requests.get, url, params=params)
         
         if response.status_code != 200:
             logger.error(f"Meta Ad Accounts API error: {response.text}")
@@ -66,13 +69,13 @@ async def get_campaigns(
                 'insights{impressions,clicks,spend,reach,frequency,ctr,cpc,cpm,cpp,actions}'
             ])
         
-        url = f"https://graph.facebook.com/v18.0/{account_id}/campaigns"
+        url = graph_url(f"{account_id}/campaigns")
         params = {
             'access_token': access_token,
             'fields': ','.join(fields)
         }
         
-        response = requests.get(url, params=params)
+        response = await platform_call("meta_ads", account_id, requests.get, url, params=params)
         
         if response.status_code != 200:
             logger.error(f"Meta Campaigns API error: {response.text}")
@@ -129,7 +132,7 @@ async def get_account_performance(
     try:
         access_token = get_meta_access_token()
         
-        url = f"https://graph.facebook.com/v18.0/{account_id}/insights"
+        url = graph_url(f"{account_id}/insights")
         params = {
             'access_token': access_token,
             'fields': 'impressions,clicks,spend,reach,frequency,ctr,cpc,cpm,cpp,actions',
@@ -137,7 +140,7 @@ async def get_account_performance(
             'time_increment': 1
         }
         
-        response = requests.get(url, params=params)
+        response = await platform_call("meta_ads", account_id, requests.get, url, params=params)
         
         if response.status_code != 200:
             logger.error(f"Meta Account Performance API error: {response.text}")
@@ -188,7 +191,7 @@ async def get_adsets(
     try:
         access_token = get_meta_access_token()
         
-        url = f"https://graph.facebook.com/v18.0/{account_id}/adsets"
+        url = graph_url(f"{account_id}/adsets")
         params = {
             'access_token': access_token,
             'fields': 'id,name,status,campaign_id,daily_budget,lifetime_budget'
@@ -197,7 +200,7 @@ async def get_adsets(
         if campaign_id:
             params['filtering'] = f'[{{"field":"campaign.id","operator":"EQUAL","value":"{campaign_id}"}}]'
         
-        response = requests.get(url, params=params)
+        response = await platform_call("meta_ads", account_id, requests.get, url, params=params)
         
         if response.status_code != 200:
             logger.error(f"Meta Ad Sets API error: {response.text}")
@@ -219,7 +222,7 @@ async def get_ads(
     try:
         access_token = get_meta_access_token()
         
-        url = f"https://graph.facebook.com/v18.0/{account_id}/ads"
+        url = graph_url(f"{account_id}/ads")
         params = {
             'access_token': access_token,
             'fields': 'id,name,status,adset_id,campaign_id'
@@ -228,7 +231,7 @@ async def get_ads(
         if adset_id:
             params['filtering'] = f'[{{"field":"adset.id","operator":"EQUAL","value":"{adset_id}"}}]'
         
-        response = requests.get(url, params=params)
+        response = await platform_call("meta_ads", account_id, requests.get, url, params=params)
         
         if response.status_code != 200:
             logger.error(f"Meta Ads API error: {response.text}")
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, HTTPException
+from fast_json import FastJSONRoute
 from pydantic import BaseModel
 import os
 import logging
 from typing import Dict, Any
 import requests
+from platform_endpoints import graph_url
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/meta-oauth", tags=["Meta OAuth"])
+router = APIRouter(prefix="/meta-oauth", tags=["Meta OAuth"], route_class=FastJSONRoute)
 
 # OAuth configuration
 CLIENT_ID = os.getenv("META_CLIENT_ID")
@@ -64,7 +66,7 @@ async def exchange_token(request: TokenExchangeRequest):
             raise HTTPException(status_code=500, detail="Meta OAuth not configured")
         
         # Exchange code for access token
-        token_url = "https://graph.facebook.com/v18.0/oauth/access_token"
+        token_url = graph_url("oauth/access_token")
         
         data = {
             'client_id': CLIENT_ID,
@@ -86,7 +88,7 @@ async def exchange_token(request: TokenExchangeRequest):
             raise HTTPException(status_code=400, detail="No access token received")
         
         # Get user info
-        user_info_url = f"https://graph.facebook.com/v18.0/me?access_token={access_token}&fields=id,name,email"
+        user_info_url = graph_url(f"me?access_token={access_token}&fields=id,name,email")
         user_response = requests.get(user_info_url)
         
         if user_response.status_code != 200:
@@ -126,7 +128,7 @@ async def get_user_info():
         
         # Verify token is still valid by making a test API call
         access_token = token_data["access_token"]
-        test_url = f"https://graph.facebook.com/v18.0/me?access_token={access_token}"
+        test_url = graph_url(f"me?access_token={access_token}")
         test_response = requests.get(test_url)
         
         if test_response.status_code != 200:
@@ -152,7 +154,7 @@ def get_meta_access_token(user_id: str = "default_user") -> str:
     access_token = token_data["access_token"]
     
     # Test token validity
-    test_url = f"https://graph.facebook.com/v18.0/me?access_token={access_token}"
+    test_url = graph_url(f"me?access_token={access_token}")
     test_response = requests.get(test_url)
     
     if test_response.status_code != 200:
@@ -1,22 +1,37 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fast_json import FastJSONRoute
 import pandas as pd
 import os
 import json
 from autogluon.tabular import TabularPredictor
 import shap
-from models import PredictRequest, PredictWithDataRequest
-from typing import Dict, List, Optional
+from request_models import PredictRequest, PredictWithDataRequest
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import numpy as np
 from credential_manager import credential_manager
 from shared_integrator import data_integrator_instance
 import data_integrator
+from analytics.forecasting import WeeklyTrendModel, daily_series
+from analytics.model_registry import model_registry
+from compute_executor import compute_executor, offloadable
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 model_dir = "models"
 os.makedirs(model_dir, exist_ok=True)
 
+# Daily GA4 metrics kept per registered model type
+PREDICTION_METRICS = {
+    'traffic': ['sessions', 'totalUsers', 'screenPageViews'],
+    'conversions': ['conversions', 'sessions'],
+    'seasonal': ['sessions', 'conversions', 'totalUsers']
+}
+
+# GA4 keeps processing the most recent 24-48h, so stored models only cover days
+# older than this and the rest is refetched on every update
+GA4_SETTLE_DAYS = int(os.getenv("GA4_SETTLE_DAYS", "2"))
+
 @router.post("/predict")
 def train_predict(file: UploadFile = File(...), request: str = Form(...)):
     req_data = PredictRequest(**json.loads(request))
@@ -49,6 +64,7 @@ async def predict_traffic(request: str = Form(...)):
     start_date = req_data.get('start_date')
     end_date = req_data.get('end_date')
     forecast_days = req_data.get('forecast_days', 30)
+    refit = bool(req_data.get('refit', False))
     
     if not all([user_id, start_date, end_date]):
         raise HTTPException(status_code=400, detail="user_id, start_date, and end_date are required")
@@ -56,17 +72,13 @@ async def predict_traffic(request: str = Form(...)):
     credential_manager.load_user_connectors(user_id)
     
     try:
-        # Fetch GA4 data
-        ga4_data = await _fetch_ga4_time_series_data(user_id, start_date, end_date)
-        
-        if ga4_data.empty:
-            raise HTTPException(status_code=404, detail="No GA4 data found")
-        
-        # Preprocess data to handle type issues
-        ga4_data = _preprocess_ga4_data(ga4_data)
+        # Daily series and fitted model, appended to or served from the model registry
+        daily_traffic, model = await _load_daily_ga4_model(
+            user_id, 'traffic', start_date, end_date, refit=refit, trend_metrics=PREDICTION_METRICS['traffic']
+        )
         
         # Build traffic prediction model
-        traffic_predictions = _build_traffic_prediction_model(ga4_data, forecast_days)
+        traffic_predictions = await compute_executor.run(_build_traffic_prediction_model, daily_traffic, forecast_days, model)
         
         return {
             "user_id": user_id,
@@ -88,20 +100,17 @@ async def predict_conversions(request: str = Form(...)):
     start_date = req_data.get('start_date')
     end_date = req_data.get('end_date')
     forecast_days = req_data.get('forecast_days', 30)
+    refit = bool(req_data.get('refit', False))
     
     credential_manager.load_user_connectors(user_id)
     
     try:
-        ga4_data = await _fetch_ga4_time_series_data(user_id, start_date, end_date)
-        
-        if ga4_data.empty:
-            raise HTTPException(status_code=404, detail="No GA4 data found")
-        
-        # Preprocess data to handle type issues
-        ga4_data = _preprocess_ga4_data(ga4_data)
+        daily_conversions, model = await _load_daily_ga4_model(
+            user_id, 'conversions', start_date, end_date, refit=refit, trend_metrics=['conversions']
+        )
         
         # Build conversion prediction model
-        conversion_predictions = _build_conversion_prediction_model(ga4_data, forecast_days)
+        conversion_predictions = await compute_executor.run(_build_conversion_prediction_model, daily_conversions, forecast_days, model)
         
         return {
             "user_id": user_id,
@@ -122,20 +131,13 @@ async def predict_user_segments(request: str = Form(...)):
     user_id = req_data.get('user_id')
     start_date = req_data.get('start_date')
     end_date = req_data.get('end_date')
+    refit = bool(req_data.get('refit', False))
     
     credential_manager.load_user_connectors(user_id)
     
     try:
-        ga4_data = await _fetch_comprehensive_ga4_data(user_id, start_date, end_date)
-        
-        if ga4_data.empty:
-            raise HTTPException(status_code=404, detail="No GA4 data found")
-        
-        # Preprocess data to handle type issues
-        ga4_data = _preprocess_ga4_data(ga4_data)
-        
-        # Predict user segments and behavior
-        segment_predictions = _predict_user_segments(ga4_data)
+        # Predict user segments and behavior, reusing the stored clustering when possible
+        segment_predictions = await _load_user_segments(user_id, start_date, end_date, refit=refit)
         
         return {
             "user_id": user_id,
@@ -167,7 +169,7 @@ async def predict_revenue_impact(file: UploadFile = File(...), request: str = Fo
         ga4_data = await _fetch_comprehensive_ga4_data(user_id, start_date, end_date)
         
         # Build revenue impact prediction model
-        revenue_impact = _predict_revenue_impact(ga4_data, revenue_df, optimization_scenarios)
+        revenue_impact = await compute_executor.run(_predict_revenue_impact, ga4_data, revenue_df, optimization_scenarios)
         
         return {
             "user_id": user_id,
@@ -187,20 +189,15 @@ async def predict_seasonal_trends(request: str = Form(...)):
     user_id = req_data.get('user_id')
     start_date = req_data.get('start_date')
     end_date = req_data.get('end_date')
+    refit = bool(req_data.get('refit', False))
     
     credential_manager.load_user_connectors(user_id)
     
     try:
-        ga4_data = await _fetch_ga4_time_series_data(user_id, start_date, end_date)
-        
-        if ga4_data.empty:
-            raise HTTPException(status_code=404, detail="No GA4 data found")
-        
-        # Preprocess data to handle type issues
-        ga4_data = _preprocess_ga4_data(ga4_data)
+        daily_data, _ = await _load_daily_ga4_model(user_id, 'seasonal', start_date, end_date, refit=refit)
         
         # Analyze seasonal patterns and predict trends
-        seasonal_predictions = _predict_seasonal_trends(ga4_data)
+        seasonal_predictions = await compute_executor.run(_predict_seasonal_trends, daily_data)
         
         return {
             "user_id": user_id,
@@ -211,16 +208,196 @@ async def predict_seasonal_trends(request: str = Form(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error predicting seasonal trends: {str(e)}")
 
+@router.post("/predict-models/refit")
+async def refit_prediction_models(request: str = Form(...)):
+    """
+    Drop the stored prediction models for the user's GA4 property so the next
+    prediction request refits from the full history
+    """
+    req_data = json.loads(request)
+    user_id = req_data.get('user_id')
+    model_type = req_data.get('model_type')
+    
+    if not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required")
+    if model_type and model_type not in list(PREDICTION_METRICS) + ['segments']:
+        raise HTTPException(status_code=400, detail=f"Unknown model_type: {model_type}")
+    
+    credential_manager.load_user_connectors(user_id)
+    property_key = _ga4_property_key(user_id)
+    removed = model_registry.invalidate(property_key, model_type)
+    
+    return {
+        "user_id": user_id,
+        "property": property_key,
+        "model_type": model_type or "all",
+        "models_removed": removed
+    }
+
 # Helper functions for GA4 predictive analytics
 
+def _get_ga4_connector() -> Optional[data_integrator.GA4Connector]:
+    for name, connector in data_integrator_instance.connectors.items():
+        if name == 'ga4' and isinstance(connector, data_integrator.GA4Connector):
+            return connector
+    return None
+
+def _ga4_property_key(user_id: str) -> str:
+    """Registry key for the user's GA4 property (OAuth connectors may not know it up front)"""
+    ga4_connector = _get_ga4_connector()
+    if ga4_connector and ga4_connector.property_id:
+        return str(ga4_connector.property_id)
+    return f"user-{user_id}"
+
+def _ga4_settled_through(end_date: str) -> str:
+    """Last day up to end_date whose GA4 data is final"""
+    settled = (pd.Timestamp.now().normalize() - timedelta(days=GA4_SETTLE_DAYS)).strftime('%Y-%m-%d')
+    return min(end_date, settled)
+
+def _split_settled(ga4_data: pd.DataFrame, settled_through: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Rows up to settled_through, and the later rows GA4 may still revise"""
+    settled = pd.to_datetime(ga4_data['date']).dt.normalize() <= pd.Timestamp(settled_through)
+    return ga4_data[settled], ga4_data[~settled]
+
+async def _load_daily_ga4_model(user_id: str, model_type: str, start_date: str, end_date: str,
+                                refit: bool = False, trend_metrics: Optional[List[str]] = None
+                                ) -> Tuple[pd.DataFrame, Optional[WeeklyTrendModel]]:
+    """
+    Daily GA4 series (and, with trend_metrics, a fitted trend model) for a training window.
+    
+    A stored model for the same start date is reused as-is when it already covers
+    end_date, and otherwise only the missing days are fetched and appended. Only
+    settled days are stored; the last GA4_SETTLE_DAYS are added for this call only.
+    """
+    metrics = PREDICTION_METRICS[model_type]
+    property_key = _ga4_property_key(user_id)
+    window = {"start_date": start_date, "metrics": metrics}
+    end_date = pd.Timestamp(end_date).strftime('%Y-%m-%d')
+    settled_through = _ga4_settled_through(end_date)
+    
+    def to_daily(rows: pd.DataFrame) -> pd.DataFrame:
+        return daily_series(rows, [m for m in metrics if m in rows.columns])
+    
+    async with model_registry.update_lock(property_key, model_type, window):
+        state = None if refit else model_registry.load(property_key, model_type, window)
+        tail = pd.DataFrame()
+
+        if state is not None and state["trained_through"] <= settled_through:
+            daily = state["daily"]
+            model = WeeklyTrendModel.from_state(state["model"]) if "model" in state else None
+            if state["trained_through"] == end_date:
+                return daily, model
+
+            # Append only the days since the last fit
+            fetch_start = (pd.Timestamp(state["trained_through"]) + timedelta(days=1)).strftime('%Y-%m-%d')
+            new_data = await _fetch_ga4_time_series_data(user_id, fetch_start, end_date)
+            if not new_data.empty:
+                settled_rows, tail_rows = _split_settled(_preprocess_ga4_data(new_data), settled_through)
+                if not settled_rows.empty:
+                    new_daily = to_daily(settled_rows).reindex(columns=daily.columns, fill_value=0)
+                    daily = pd.concat([daily, new_daily]).sort_index()
+                    if model is not None:
+                        model.update(new_daily)
+                if not tail_rows.empty:
+                    tail = to_daily(tail_rows).reindex(columns=daily.columns, fill_value=0)
+        else:
+            ga4_data = await _fetch_ga4_time_series_data(user_id, start_date, end_date)
+
+            if ga4_data.empty:
+                raise HTTPException(status_code=404, detail="No GA4 data found")
+
+            # Preprocess data to handle type issues
+            ga4_data = _preprocess_ga4_data(ga4_data)
+            fitted_metrics = [m for m in (trend_metrics or []) if m in metrics and m in ga4_data.columns]
+            settled_rows, tail_rows = _split_settled(ga4_data, settled_through)
+
+            if state is not None or settled_rows.empty:
+                # Shorter window than the stored model covers, or no settled days yet; nothing to store
+                daily = to_daily(ga4_data)
+                return daily, WeeklyTrendModel(daily[fitted_metrics]) if fitted_metrics else None
+
+            daily = to_daily(settled_rows)
+            model = WeeklyTrendModel(daily[fitted_metrics]) if fitted_metrics else None
+            if not tail_rows.empty:
+                tail = to_daily(tail_rows).reindex(columns=daily.columns, fill_value=0)
+
+        if state is None or state["trained_through"] < settled_through:
+            new_state = {"trained_through": settled_through, "daily": daily}
+            if model is not None:
+                new_state["model"] = model.get_state()
+            model_registry.save(property_key, model_type, window, new_state)
+
+        if tail.empty:
+            return daily, model
+        # get_state() copied the stored arrays, so the provisional days don't reach the registry
+        if model is not None:
+            model.update(tail)
+        return pd.concat([daily, tail]).sort_index(), model
+
+async def _load_user_segments(user_id: str, start_date: str, end_date: str, refit: bool = False) -> Dict:
+    """
+    User segments for a window, served from or incrementally updated in the model registry.
+    Only settled days are stored; the last GA4_SETTLE_DAYS are added for this call only.
+    """
+    property_key = _ga4_property_key(user_id)
+    window = {"start_date": start_date}
+    end_date = pd.Timestamp(end_date).strftime('%Y-%m-%d')
+    settled_through = _ga4_settled_through(end_date)
+    
+    async with model_registry.update_lock(property_key, 'segments', window):
+        state = None if refit else model_registry.load(property_key, 'segments', window)
+        init_centers = None
+        tail_stats = None
+
+        if state is not None and state["trained_through"] == end_date and state.get("result") is not None:
+            return state["result"]
+
+        if state is not None and state["trained_through"] <= settled_through:
+            # Merge the per-channel sums of the new days into the stored ones
+            channel_stats = state["channel_stats"]
+            init_centers = state.get("centers")
+            if state["trained_through"] < end_date:
+                fetch_start = (pd.Timestamp(state["trained_through"]) + timedelta(days=1)).strftime('%Y-%m-%d')
+                new_data = await _fetch_comprehensive_ga4_data(user_id, fetch_start, end_date)
+                if not new_data.empty:
+                    settled_rows, tail_rows = _split_settled(_preprocess_ga4_data(new_data), settled_through)
+                    if not settled_rows.empty:
+                        channel_stats = channel_stats.add(_segment_channel_stats(settled_rows), fill_value=0)
+                    if not tail_rows.empty:
+                        tail_stats = _segment_channel_stats(tail_rows)
+        else:
+            ga4_data = await _fetch_comprehensive_ga4_data(user_id, start_date, end_date)
+
+            if ga4_data.empty:
+                raise HTTPException(status_code=404, detail="No GA4 data found")
+
+            # Preprocess data to handle type issues
+            settled_rows, tail_rows = _split_settled(_preprocess_ga4_data(ga4_data), settled_through)
+            channel_stats = _segment_channel_stats(settled_rows)
+            if not tail_rows.empty:
+                tail_stats = _segment_channel_stats(tail_rows)
+
+        stats = channel_stats if tail_stats is None else channel_stats.add(tail_stats, fill_value=0)
+        segment_predictions, centers = await compute_executor.run(_predict_user_segments, stats, init_centers)
+
+        # Only persist successful fits of settled days, for windows at least as long as the stored one.
+        # A result that includes provisional days isn't stored; it is recomputed from channel_stats
+        stored_through = state["trained_through"] if state is not None else None
+        extends = stored_through is None or stored_through < settled_through
+        completes = stored_through == settled_through and tail_stats is None and state.get("result") is None
+        if centers is not None and not channel_stats.empty and (extends or completes):
+            model_registry.save(property_key, 'segments', window, {
+                "trained_through": settled_through,
+                "channel_stats": channel_stats,
+                "centers": centers,
+                "result": segment_predictions if tail_stats is None else None
+            })
+        return segment_predictions
+
 async def _fetch_ga4_time_series_data(user_id: str, start_date: str, end_date: str) -> pd.DataFrame:
     """Fetch GA4 data optimized for time series analysis"""
     
-    ga4_connector = None
-    for name, connector in data_integrator_instance.connectors.items():
-        if name == 'ga4' and isinstance(connector, data_integrator.GA4Connector):
-            ga4_connector = connector
-            break
+    ga4_connector = _get_ga4_connector()
     
     if not ga4_connector:
         raise Exception("GA4 connector not found for user")
@@ -251,11 +428,7 @@ async def _fetch_ga4_time_series_data(user_id: str, start_date: str, end_date: s
 async def _fetch_comprehensive_ga4_data(user_id: str, start_date: str, end_date: str) -> pd.DataFrame:
     """Fetch comprehensive GA4 data for predictive analysis"""
     
-    ga4_connector = None
-    for name, connector in data_integrator_instance.connectors.items():
-        if name == 'ga4' and isinstance(connector, data_integrator.GA4Connector):
-            ga4_connector = connector
-            break
+    ga4_connector = _get_ga4_connector()
     
     if not ga4_connector:
         raise Exception("GA4 connector not found for user")
@@ -302,80 +475,57 @@ def _preprocess_ga4_data(ga4_data: pd.DataFrame) -> pd.DataFrame:
     
     return ga4_data
 
-def _build_traffic_prediction_model(ga4_data: pd.DataFrame, forecast_days: int) -> Dict:
-    """Build traffic prediction model using GA4 data"""
+@offloadable
+def _build_traffic_prediction_model(daily_traffic: pd.DataFrame, forecast_days: int,
+                                    model: Optional[WeeklyTrendModel] = None) -> Dict:
+    """Build traffic prediction model from daily GA4 traffic"""
     
     try:
-        # Prepare time series data
-        daily_traffic = ga4_data.groupby('date').agg({
-            'sessions': 'sum',
-            'totalUsers': 'sum',
-            'screenPageViews': 'sum'
-        }).sort_index()
+        traffic_metrics = [m for m in ['sessions', 'totalUsers', 'screenPageViews'] if m in daily_traffic.columns]
         
         if len(daily_traffic) < 14:
             return {"error": "Need at least 14 days of data for reliable predictions"}
         
-        # Simple trend analysis
-        predictions = {}
+        # Fit trend and weekly seasonality for all metrics at once
+        if model is None:
+            model = WeeklyTrendModel(daily_traffic[traffic_metrics])
+        forecast = model.forecast(forecast_days)
+        trend_slopes = model.trend_slope
+        recent_avgs = daily_traffic.tail(7).mean()
+        overall_avgs = daily_traffic.mean()
         
-        for metric in ['sessions', 'totalUsers', 'screenPageViews']:
-            if metric in daily_traffic.columns:
-                # Calculate trend
-                values = daily_traffic[metric].values
-                days = np.arange(len(values))
-                
-                # Simple linear trend
-                z = np.polyfit(days, values, 1)
-                trend_slope = z[0]
-                
-                # Calculate moving averages for seasonality
-                recent_avg = daily_traffic[metric].tail(7).mean()
-                overall_avg = daily_traffic[metric].mean()
-                
-                # Simple forecast
-                forecast_values = []
-                for i in range(forecast_days):
-                    forecast_day = len(values) + i
-                    base_prediction = z[1] + z[0] * forecast_day
-                    
-                    # Add weekly seasonality (simplified)
-                    day_of_week = forecast_day % 7
-                    weekly_pattern = daily_traffic[metric].groupby(daily_traffic.index.to_series().dt.dayofweek).mean()
-                    if day_of_week in weekly_pattern.index:
-                        seasonal_factor = weekly_pattern[day_of_week] / overall_avg
-                        base_prediction *= seasonal_factor
-                    
-                    forecast_values.append(max(0, base_prediction))
-                
-                predictions[metric] = {
-                    "historical_avg": float(overall_avg),
-                    "recent_avg": float(recent_avg),
-                    "trend": "growing" if trend_slope > 0 else "declining" if trend_slope < 0 else "stable",
-                    "trend_rate": float(trend_slope),
-                    "forecast": [float(x) for x in forecast_values],
-                    "forecast_total": float(sum(forecast_values)),
-                    "confidence": "medium" if len(daily_traffic) > 30 else "low"
-                }
+        predictions = {}
+        for metric in traffic_metrics:
+            trend_slope = trend_slopes[metric]
+            forecast_values = forecast["mean"][metric]
+            
+            predictions[metric] = {
+                "historical_avg": float(overall_avgs[metric]),
+                "recent_avg": float(recent_avgs[metric]),
+                "trend": "growing" if trend_slope > 0 else "declining" if trend_slope < 0 else "stable",
+                "trend_rate": float(trend_slope),
+                "forecast": forecast_values.tolist(),
+                "forecast_lower": forecast["lower"][metric].tolist(),
+                "forecast_upper": forecast["upper"][metric].tolist(),
+                "forecast_total": float(forecast_values.sum()),
+                "confidence": "medium" if len(daily_traffic) > 30 else "low"
+            }
         
         return predictions
         
     except Exception as e:
         return {"error": f"Traffic prediction failed: {str(e)}"}
 
-def _build_conversion_prediction_model(ga4_data: pd.DataFrame, forecast_days: int) -> Dict:
-    """Build conversion prediction model"""
+@offloadable
+def _build_conversion_prediction_model(daily_conversions: pd.DataFrame, forecast_days: int,
+                                       model: Optional[WeeklyTrendModel] = None) -> Dict:
+    """Build conversion prediction model from daily GA4 conversions and sessions"""
     
     try:
-        if 'conversions' not in ga4_data.columns:
+        if 'conversions' not in daily_conversions.columns:
             return {"error": "No conversion data available"}
         
-        # Prepare conversion time series
-        daily_conversions = ga4_data.groupby('date').agg({
-            'conversions': 'sum',
-            'sessions': 'sum'
-        }).sort_index()
-        
+        daily_conversions = daily_conversions.copy()
         daily_conversions['calculated_conversion_rate'] = (daily_conversions['conversions'] / daily_conversions['sessions'] * 100).fillna(0)
         
         if len(daily_conversions) < 14:
@@ -384,34 +534,29 @@ def _build_conversion_prediction_model(ga4_data: pd.DataFrame, forecast_days: in
         # Analyze conversion patterns
         conversion_predictions = {}
         
-        # Conversion volume prediction
-        conversion_values = daily_conversions['conversions'].values
-        conversion_days = np.arange(len(conversion_values))
-        
-        # Fit trend
-        z_conv = np.polyfit(conversion_days, conversion_values, 1)
+        # Fit trend and weekly seasonality on conversion volume
+        if model is None:
+            model = WeeklyTrendModel(daily_conversions[['conversions']])
+        forecast = model.forecast(forecast_days)
+        conversion_trend = float(model.trend_slope['conversions'])
+        forecast_conversions = forecast["mean"]['conversions']
         
         # Recent performance
         recent_conv_avg = daily_conversions['conversions'].tail(7).mean()
         recent_conv_rate = daily_conversions['calculated_conversion_rate'].tail(7).mean()
         overall_conv_rate = daily_conversions['calculated_conversion_rate'].mean()
         
-        # Forecast conversions
-        forecast_conversions = []
-        for i in range(forecast_days):
-            forecast_day = len(conversion_values) + i
-            predicted_conversions = max(0, z_conv[1] + z_conv[0] * forecast_day)
-            forecast_conversions.append(predicted_conversions)
-        
         conversion_predictions = {
             "historical_daily_avg": float(daily_conversions['conversions'].mean()),
             "recent_daily_avg": float(recent_conv_avg),
             "historical_conversion_rate": float(overall_conv_rate),
             "recent_conversion_rate": float(recent_conv_rate),
-            "trend": "improving" if z_conv[0] > 0 else "declining" if z_conv[0] < 0 else "stable",
-            "forecast_daily_conversions": [float(x) for x in forecast_conversions],
-            "forecast_total_conversions": float(sum(forecast_conversions)),
-            "performance_outlook": _assess_conversion_outlook(recent_conv_rate, overall_conv_rate, z_conv[0])
+            "trend": "improving" if conversion_trend > 0 else "declining" if conversion_trend < 0 else "stable",
+            "forecast_daily_conversions": forecast_conversions.tolist(),
+            "forecast_daily_conversions_lower": forecast["lower"]['conversions'].tolist(),
+            "forecast_daily_conversions_upper": forecast["upper"]['conversions'].tolist(),
+            "forecast_total_conversions": float(forecast_conversions.sum()),
+            "performance_outlook": _assess_conversion_outlook(recent_conv_rate, overall_conv_rate, conversion_trend)
         }
         
         return conversion_predictions
@@ -419,26 +564,54 @@ def _build_conversion_prediction_model(ga4_data: pd.DataFrame, forecast_days: in
     except Exception as e:
         return {"error": f"Conversion prediction failed: {str(e)}"}
 
-def _predict_user_segments(ga4_data: pd.DataFrame) -> Dict:
-    """Predict user behavior segments using ML"""
+def _segment_channel_stats(ga4_data: pd.DataFrame) -> pd.DataFrame:
+    """Per-channel sums and row counts; additive, so new days can be merged in"""
+    
+    # GA4Connector renames the channel and duration columns
+    channel_col = 'channel_grouping' if 'channel_grouping' in ga4_data.columns else 'sessionDefaultChannelGrouping'
+    duration_col = next((c for c in ['avgSessionDuration', 'averageSessionDuration', 'avg_session_duration']
+                         if c in ga4_data.columns), None)
+    
+    values = pd.DataFrame({
+        'avgSessionDuration': ga4_data[duration_col] if duration_col else 0,
+        'engagementRate': ga4_data['engagementRate'],
+        'screenPageViews': ga4_data['screenPageViews'],
+        'sessions': ga4_data['sessions'],
+        'conversions': ga4_data['conversions'] if 'conversions' in ga4_data.columns else 0
+    }, index=ga4_data.index).apply(pd.to_numeric, errors='coerce').fillna(0)
+    
+    grouped = values.groupby(ga4_data[channel_col].astype(str))
+    channel_stats = grouped.sum()
+    channel_stats['rows'] = grouped.size()
+    return channel_stats
+
+@offloadable
+def _predict_user_segments(channel_stats: pd.DataFrame,
+                           init_centers: Optional[np.ndarray] = None) -> Tuple[Dict, Optional[np.ndarray]]:
+    """
+    Predict user behavior segments using ML.
+    Returns the segment analysis and the fitted cluster centers; passing stored
+    centers back in warm-starts KMeans so segments stay stable between refreshes.
+    """
     
     try:
         from sklearn.cluster import KMeans
         from sklearn.preprocessing import StandardScaler
         
-        # Prepare features for segmentation
-        feature_data = ga4_data.groupby('sessionDefaultChannelGrouping').agg({
-            'avgSessionDuration': 'mean',
-            'engagementRate': 'mean',
-            'screenPageViews': 'mean',
-            'sessions': 'sum',
-            'conversions': 'sum' if 'conversions' in ga4_data.columns else lambda x: 0
+        # Prepare features for segmentation (means of the per-row metrics, channel totals)
+        rows = channel_stats['rows'].replace(0, np.nan)
+        feature_data = pd.DataFrame({
+            'avgSessionDuration': channel_stats['avgSessionDuration'] / rows,
+            'engagementRate': channel_stats['engagementRate'] / rows,
+            'screenPageViews': channel_stats['screenPageViews'] / rows,
+            'sessions': channel_stats['sessions'],
+            'conversions': channel_stats['conversions']
         }).fillna(0)
         
         feature_data['conversion_rate'] = (feature_data['conversions'] / feature_data['sessions'] * 100).fillna(0)
         
         if len(feature_data) < 3:
-            return {"error": "Need at least 3 traffic sources for user segmentation"}
+            return {"error": "Need at least 3 traffic sources for user segmentation"}, None
         
         # Features for clustering
         features = ['avgSessionDuration', 'engagementRate', 'screenPageViews', 'conversion_rate']
@@ -450,7 +623,10 @@ def _predict_user_segments(ga4_data: pd.DataFrame) -> Dict:
         
         # Perform clustering
         n_clusters = min(4, len(feature_data))
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+        if init_centers is not None and init_centers.shape == (n_clusters, len(features)):
+            kmeans = KMeans(n_clusters=n_clusters, init=init_centers, n_init=1, random_state=42)
+        else:
+            kmeans = KMeans(n_clusters=n_clusters, random_state=42)
         clusters = kmeans.fit_predict(X_scaled)
         
         # Analyze segments
@@ -497,13 +673,14 @@ def _predict_user_segments(ga4_data: pd.DataFrame) -> Dict:
             "total_segments": n_clusters,
             "segment_analysis": segment_analysis,
             "recommendations": _generate_segment_recommendations(segment_analysis)
-        }
+        }, kmeans.cluster_centers_
         
     except ImportError:
-        return {"error": "ML libraries not available for user segmentation"}
+        return {"error": "ML libraries not available for user segmentation"}, None
     except Exception as e:
-        return {"error": f"User segmentation prediction failed: {str(e)}"}
+        return {"error": f"User segmentation prediction failed: {str(e)}"}, None
 
+@offloadable
 def _predict_revenue_impact(ga4_data: pd.DataFrame, revenue_data: pd.DataFrame, scenarios: List[Dict]) -> Dict:
     """Predict revenue impact of optimization scenarios"""
     
@@ -575,16 +752,13 @@ def _predict_revenue_impact(ga4_data: pd.DataFrame, revenue_data: pd.DataFrame,
     except Exception as e:
         return {"error": f"Revenue impact prediction failed: {str(e)}"}
 
-def _predict_seasonal_trends(ga4_data: pd.DataFrame) -> Dict:
-    """Predict seasonal trends and patterns"""
+@offloadable
+def _predict_seasonal_trends(daily_data: pd.DataFrame) -> Dict:
+    """Predict seasonal trends and patterns from daily GA4 totals"""
     
     try:
         # Prepare data for seasonal analysis
-        daily_data = ga4_data.groupby('date').agg({
-            'sessions': 'sum',
-            'conversions': 'sum' if 'conversions' in ga4_data.columns else lambda x: 0,
-            'totalUsers': 'sum'
-        }).sort_index()
+        daily_data = daily_data.reindex(columns=['sessions', 'conversions', 'totalUsers'], fill_value=0).sort_index()
         
         if len(daily_data) < 28:
             return {"error": "Need at least 28 days of data for seasonal analysis"}
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fast_json import FastJSONRoute
 import pandas as pd
 import os
 import json
@@ -7,11 +8,11 @@ from autogluon.tabular import TabularPredictor
 import shap
 from sklearn.cluster import KMeans
 
-from models import PredictWithDataRequest, PredictWithUserDataRequest
+from request_models import PredictWithDataRequest, PredictWithUserDataRequest
 from shared_integrator import data_integrator_instance
 from credential_manager import credential_manager
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 model_dir = "models"
 os.makedirs(model_dir, exist_ok=True)
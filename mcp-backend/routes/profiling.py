@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from fast_json import FastJSONRoute
+from pydantic import BaseModel
+from typing import List, Optional
+
+from mcp_profiling import PROFILING_TOKEN, profiling_controller, token_matches
+
+
+def require_profiling_token(x_profile_token: Optional[str] = Header(None)):
+    """Admin endpoints need X-Profile-Token; without PROFILING_TOKEN they don't exist"""
+    if not PROFILING_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token_matches(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+router = APIRouter(route_class=FastJSONRoute, dependencies=[Depends(require_profiling_token)],
+                   include_in_schema=False)
+
+
+class ProfilingSettings(BaseModel):
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = None
+    paths: Optional[List[str]] = None
+
+
+@router.get("/debug/profiling")
+async def profiling_status():
+    return profiling_controller.status()
+
+@router.post("/debug/profiling")
+async def configure_profiling(settings: ProfilingSettings):
+    """Turn sampled profiling on or off, change the sample rate or the eligible path prefixes"""
+    profiling_controller.configure(enabled=settings.enabled, sample_rate=settings.sample_rate, paths=settings.paths)
+    return profiling_controller.status()
+
+@router.get("/debug/profiles")
+async def list_profiles(limit: int = 50):
+    return {"profiles": profiling_controller.store.list()[:limit]}
+
+@router.get("/debug/profiles/{report_id}")
+async def get_profile(report_id: str):
+    report = profiling_controller.store.get(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Profile {report_id} not found")
+    return report
+
+@router.get("/debug/profiles/{report_id}/{artifact}")
+async def download_profile_artifact(report_id: str, artifact: str):
+    """Download one report file, e.g. profile.html, profile.speedscope.json or allocations.tracemalloc"""
+    path = profiling_controller.store.artifact_path(report_id, artifact)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"{artifact} not found in profile {report_id}")
+    media_type = "text/html" if artifact.endswith(".html") else None
+    return FileResponse(path, media_type=media_type, filename=None if media_type else artifact)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Form
+from fast_json import FastJSONRoute
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -7,8 +8,10 @@ from typing import Dict, List, Optional
 from credential_manager import credential_manager
 from shared_integrator import data_integrator_instance
 import data_integrator
+from compute_executor import compute_executor, offloadable
+from analytics.analysis_cache import memoize
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/user-journey-analysis")
 async def user_journey_analysis(request: str = Form(...)):
@@ -38,7 +41,7 @@ async def user_journey_analysis(request: str = Form(...)):
         )
         
         # Analyze the user journey
-        journey_analysis = _analyze_user_journey(ga4_funnel_data, ad_data)
+        journey_analysis = await compute_executor.run(_analyze_user_journey, ga4_funnel_data, ad_data)
         
         return {
             "user_id": user_id,
@@ -68,7 +71,7 @@ async def drop_off_analysis(request: str = Form(...)):
         behavioral_data = await _fetch_detailed_ga4_data(user_id, start_date, end_date)
         
         # Analyze drop-offs with reasons
-        drop_off_insights = _analyze_drop_offs_with_reasons(behavioral_data, funnel_steps)
+        drop_off_insights = await compute_executor.run(_analyze_drop_offs_with_reasons, behavioral_data, funnel_steps)
         
         return {
             "user_id": user_id,
@@ -103,7 +106,7 @@ async def conversion_funnel_optimization(request: str = Form(...)):
         )
         
         # Generate optimization recommendations
-        optimization_plan = _generate_funnel_optimization_plan(ga4_data, ad_data)
+        optimization_plan = await compute_executor.run(_generate_funnel_optimization_plan, ga4_data, ad_data)
         
         return {
             "user_id": user_id,
@@ -139,7 +142,7 @@ async def traffic_quality_analysis(request: str = Form(...)):
         )
         
         # Analyze traffic quality
-        quality_analysis = _analyze_traffic_quality(ga4_data, ad_data)
+        quality_analysis = await compute_executor.run(_analyze_traffic_quality, ga4_data, ad_data)
         
         return {
             "user_id": user_id,
@@ -277,6 +280,8 @@ async def _fetch_traffic_quality_data(user_id: str, start_date: str, end_date: s
     
     return quality_data
 
+@offloadable
+@memoize
 def _analyze_user_journey(ga4_data: pd.DataFrame, ad_data: pd.DataFrame) -> Dict:
     """Analyze the complete user journey from ads to conversion"""
     
@@ -346,6 +351,8 @@ def _analyze_user_journey(ga4_data: pd.DataFrame, ad_data: pd.DataFrame) -> Dict
         "biggest_drop_off_stage": max(drop_offs.items(), key=lambda x: x[1]['drop_off_rate'])[0] if drop_offs else None
     }
 
+@offloadable
+@memoize
 def _analyze_drop_offs_with_reasons(ga4_data: pd.DataFrame, funnel_steps: List[str]) -> Dict:
     """Analyze drop-offs and provide specific reasons"""
     
@@ -477,6 +484,8 @@ def _analyze_drop_offs_with_reasons(ga4_data: pd.DataFrame, funnel_steps: List[s
     
     return drop_off_insights
 
+@offloadable
+@memoize
 def _generate_funnel_optimization_plan(ga4_data: pd.DataFrame, ad_data: pd.DataFrame) -> Dict:
     """Generate specific optimization recommendations based on funnel analysis"""
     
@@ -646,6 +655,8 @@ def _generate_funnel_optimization_plan(ga4_data: pd.DataFrame, ad_data: pd.DataF
     
     return optimization_plan
 
+@offloadable
+@memoize
 def _analyze_traffic_quality(ga4_data: pd.DataFrame, ad_data: pd.DataFrame) -> Dict:
     """Analyze traffic quality from different sources"""
     
@@ -69,7 +69,7 @@ def check_environment() -> Dict[str, bool]:
 def setup_database():
     """Initialize database if needed"""
     try:
-        from database import credential_storage
+        from credential_db import credential_storage
         credential_storage._init_database()
         logger.info("✅ Database initialized successfully")
     except Exception as e:
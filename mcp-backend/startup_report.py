@@ -0,0 +1,99 @@
+"""
+Startup Report Module
+Times the imports main.py makes while building the app, so cold start cost can
+be read per module on /debug/startup, and warms the platform SDKs that are
+otherwise imported on first use
+"""
+
+import importlib
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() in ("1", "true", "yes")
+# Imported by warm_up(); the connectors and routes otherwise import these on first use
+STARTUP_WARMUP_MODULES = [
+    name.strip() for name in os.getenv(
+        "STARTUP_WARMUP_MODULES",
+        "google.ads.googleads.client,google.analytics.data_v1beta,google.analytics.admin,"
+        "google_auth_oauthlib.flow,googleapiclient.discovery,facebook_business.api"
+    ).split(",") if name.strip()
+]
+# Packages listed per step, largest first
+REPORT_PACKAGES = 8
+
+
+class StartupReport:
+    """Wall time and newly loaded modules for each startup step"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.ready_seconds: Optional[float] = None
+        self.steps: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time a block; steps shouldn't nest, or the inner one is counted twice"""
+        loaded = set(sys.modules)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            new_modules = [module for module in sys.modules if module not in loaded]
+            packages = Counter(module.split(".")[0] for module in new_modules)
+            self.steps.append({
+                "name": name,
+                "seconds": round(seconds, 4),
+                "modules": len(new_modules),
+                "packages": dict(packages.most_common(REPORT_PACKAGES)),
+            })
+
+    def import_module(self, name: str):
+        with self.step(name):
+            return importlib.import_module(name)
+
+    def mark_ready(self):
+        """The app is about to accept traffic; log the slowest steps"""
+        self.ready_seconds = time.perf_counter() - self.started
+        slowest = sorted(self.steps, key=lambda step: step["seconds"], reverse=True)[:5]
+        summary = ", ".join(f"{step['name']} {step['seconds']:.2f}s" for step in slowest)
+        logger.info(f"Startup took {self.ready_seconds:.2f}s since main.py was imported; slowest: {summary}")
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready_seconds is not None,
+            "ready_seconds": round(self.ready_seconds, 4) if self.ready_seconds is not None else None,
+            "imports_seconds": round(sum(step["seconds"] for step in self.steps), 4),
+            "loaded_modules": len(sys.modules),
+            "steps": sorted(self.steps, key=lambda step: step["seconds"], reverse=True),
+        }
+
+
+def warm_up(modules: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Import the deferred platform SDKs now rather than on the first request.
+    Runs at import of main.py when STARTUP_WARMUP is set; with a pre-forking
+    server (gunicorn --preload, or its on_starting hook) the imports then happen
+    once in the master, before any worker accepts traffic. SDKs that aren't
+    installed are skipped.
+    """
+    outcome = {}
+    for name in modules or STARTUP_WARMUP_MODULES:
+        try:
+            startup_report.import_module(name)
+            outcome[name] = "imported"
+        except ImportError as e:
+            logger.info(f"Warm-up skipped {name}: {e}")
+            outcome[name] = "not installed"
+    return outcome
+
+
+# Shared instance used by main.py
+startup_report = StartupReport()
@@ -150,7 +150,7 @@ async def test_analytics_modules():
         ("analytics.recommendation_engine", "Recommendation generation"),
         ("routes.comprehensive_insights", "Comprehensive insights"),
         ("credential_manager", "Credential management"),
-        ("database", "Database operations")
+        ("credential_db", "Database operations")
     ]
     
     failed_imports = []
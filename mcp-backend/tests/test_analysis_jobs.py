@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from analysis_jobs import FINISHED, AnalysisJobManager, JobStore, analysis_jobs, submission_key
+from routes import jobs
+
+
+def app_serving(*paths):
+    router = APIRouter()
+    for path in paths:
+        router.add_api_route(path, lambda: {"success": True}, methods=["POST"])
+    app = FastAPI()
+    app.include_router(router)
+    app.include_router(jobs.router)
+    return app
+
+
+def test_only_mounted_endpoints_accept_jobs(monkeypatch):
+    monkeypatch.setattr(analysis_jobs, "_app", None)
+    monkeypatch.setattr(analysis_jobs, "paths", ())
+    app = app_serving("/file-insights", "/comprehensive-insights")
+    analysis_jobs.bind(app)
+
+    assert analysis_jobs.paths == ("/comprehensive-insights", "/file-insights")
+    response = TestClient(app).post("/jobs/predict-traffic", data={"property_id": "1"})
+    assert response.status_code == 404
+    assert "/file-insights" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_json_bodies_with_the_same_content_share_a_key():
+    first = await submission_key("/file-insights", "application/json", b'{"a": 1, "b": [2, 3]}')
+    same = await submission_key("/file-insights", "application/json", b'{"b":[2,3],"a":1}')
+    other_path = await submission_key("/comprehensive-insights", "application/json", b'{"a": 1, "b": [2, 3]}')
+    assert first == same
+    assert first != other_path
+
+
+@pytest.mark.asyncio
+async def test_job_replays_the_request_and_deduplicates(tmp_path):
+    app = FastAPI()
+
+    @app.post("/file-insights")
+    async def file_insights(payload: dict):
+        return {"success": True, "echo": payload}
+
+    manager = AnalysisJobManager(store=JobStore(str(tmp_path / "jobs.db")), workers=1)
+    manager.bind(app)
+    body = json.dumps({"user_id": "u1"}).encode()
+    key = await submission_key("/file-insights", "application/json", body)
+    try:
+        job, deduplicated = await manager.submit("/file-insights", "application/json", body, key)
+        assert not deduplicated
+        with manager.watch(job["job_id"]) as updates:
+            while (await asyncio.wait_for(updates.get(), 5))["status"] not in FINISHED:
+                pass
+
+        row = manager.result(job["job_id"])
+        assert row["status"] == "succeeded"
+        assert row["status_code"] == 200
+        assert json.loads(row["result"]) == {"success": True, "echo": {"user_id": "u1"}}
+
+        again, deduplicated = await manager.submit("/file-insights", "application/json", body, key)
+        assert deduplicated
+        assert again["job_id"] == job["job_id"]
+    finally:
+        await manager.stop()
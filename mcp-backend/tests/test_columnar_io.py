@@ -0,0 +1,98 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from columnar_io import (ColumnarReadError, SchemaValidationError, detect_upload_format, read_columnar,
+                         to_parquet_bytes)
+from routes import clean_insights
+
+
+def standardized_frame():
+    return pd.DataFrame({
+        "date": pd.to_datetime(["2025-01-01", "2025-01-02"]),
+        "campaign_name": ["a", "b"],
+        "source": ["meta", "meta"],
+        "impressions": [1000, 2000],
+        "clicks": [10, 20],
+        "spend": [5.0, 12.5],
+        "conversions": [1.0, 3.0],
+    })
+
+
+def arrow_bytes(df):
+    buffer = io.BytesIO()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_file(buffer, table.schema) as writer:
+        writer.write_table(table)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(clean_insights.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("fmt, encode", [("parquet", to_parquet_bytes), ("arrow", arrow_bytes)])
+def test_valid_uploads_are_read_and_detected_from_magic_bytes(fmt, encode):
+    stream = io.BytesIO(encode(standardized_frame()))
+    assert detect_upload_format(stream, "upload.bin") == fmt
+
+    df = read_columnar(stream, fmt, "upload.bin")
+    pd.testing.assert_frame_equal(df, standardized_frame(), check_dtype=False)
+
+
+def test_schema_problems_are_reported_together():
+    df = standardized_frame().assign(clicks=["ten", "twenty"], campaign_name=[1, 2])
+    with pytest.raises(SchemaValidationError) as excinfo:
+        read_columnar(io.BytesIO(to_parquet_bytes(df)), "parquet", "bad.parquet")
+    assert len(excinfo.value.problems) == 2
+    assert "column 'clicks'" in str(excinfo.value)
+    assert "column 'campaign_name' is int64, expected string" in str(excinfo.value)
+
+
+def test_uploads_without_metric_columns_are_rejected():
+    df = standardized_frame()[["date", "campaign_name"]]
+    with pytest.raises(SchemaValidationError, match="no standardized metric columns"):
+        read_columnar(io.BytesIO(to_parquet_bytes(df)), "parquet", "bad.parquet")
+
+
+@pytest.mark.parametrize("fmt, content", [
+    ("parquet", b"PAR1 this is not parquet"),
+    ("parquet", to_parquet_bytes(standardized_frame())[:-40]),
+    ("arrow", b"ARROW1 this is not arrow"),
+])
+def test_corrupt_files_raise_a_format_specific_error(fmt, content):
+    with pytest.raises(ColumnarReadError) as excinfo:
+        read_columnar(io.BytesIO(content), fmt, "broken")
+    label = "Parquet" if fmt == "parquet" else "Arrow IPC"
+    assert f"'broken' is not a readable {label} file" in str(excinfo.value)
+
+
+def test_corrupt_upload_is_a_client_error(client):
+    response = client.post("/clean-insights", files={"meta_file": ("meta.parquet", b"PAR1 garbage", "application/octet-stream")})
+    assert response.status_code == 400
+    assert "not a readable Parquet file" in response.json()["detail"]
+
+
+def test_schema_error_is_a_client_error(client):
+    df = standardized_frame().assign(spend=["a", "b"])
+    response = client.post("/clean-insights", files={"meta_file": ("meta.parquet", to_parquet_bytes(df))})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Schema validation failed for meta.parquet")
+
+
+def test_export_round_trips_through_parquet(client):
+    upload = arrow_bytes(standardized_frame())
+    response = client.post("/clean-insights/export", files={"meta_file": ("meta.arrow", upload)})
+    assert response.status_code == 200
+    assert response.headers["x-files-processed"] == "meta"
+
+    exported = read_columnar(io.BytesIO(response.content), "parquet", "clean_insights.parquet")
+    columns = list(standardized_frame().columns)
+    pd.testing.assert_frame_equal(exported[columns], standardized_frame(), check_dtype=False)
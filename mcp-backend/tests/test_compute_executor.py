@@ -0,0 +1,51 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from compute_executor import ComputeExecutor, ComputeTimeoutError, offloadable
+
+
+@offloadable
+def worker_pid(seconds: float = 0.0) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+@pytest.fixture
+def executor():
+    executor = ComputeExecutor(max_workers=2, task_timeout=30)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_replaces_only_the_overrunning_worker(executor):
+    # Start both workers
+    first, second = await asyncio.gather(executor.run(worker_pid, 0.5), executor.run(worker_pid, 0.5))
+    assert first != second
+    assert executor.stats()["worker_pids"] == sorted([first, second])
+
+    slow = asyncio.ensure_future(executor.run(worker_pid, 60, timeout=1))
+    await asyncio.sleep(0.2)
+    survivor = await executor.run(worker_pid)
+    with pytest.raises(ComputeTimeoutError):
+        await slow
+
+    # The other worker kept running tasks; the timed-out one is replaced on next use
+    pids = set()
+    for _ in range(4):
+        pids.update(await asyncio.gather(executor.run(worker_pid, 0.2), executor.run(worker_pid, 0.2)))
+    assert survivor in pids
+    assert len(pids) == 2
+    assert not pids & ({first, second} - {survivor})
+    assert executor.stats()["restarts"] == 1
+    assert executor.stats()["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_exceptions_reach_the_caller(executor):
+    with pytest.raises(TypeError):
+        await executor.run(worker_pid, "not a number")
+    assert executor.stats()["restarts"] == 0
@@ -0,0 +1,56 @@
+import io
+
+import pandas as pd
+import pytest
+
+from csv_ingest import _read_with_pandas, read_csv_stream, sniff_layout
+
+pytest.importorskip("pyarrow")
+
+FIXTURE = (
+    "Campaign report\n"
+    "Day,Campaign,Ad set,Cost,Clicks,Started,Notes\n"
+    "2025-01-01,Brand,,1.5,3,2025-01-01 10:00:00,\n"
+    "2025-01-02,,Retargeting,,4,,N/A\n"
+    "2025-01-03,Generic,Prospecting,2.25,,2025-01-03T08:30:00,null\n"
+    "2025-01-04,Brand,Prospecting,0.75,2,,ok\n"
+).encode()
+
+
+def read_both(data: bytes, **kwargs):
+    via_pyarrow = read_csv_stream(io.BytesIO(data), "fixture.csv", **kwargs)
+    text = data.decode()
+    layout = sniff_layout(text, **kwargs)
+    via_pandas = _read_with_pandas(io.BytesIO(data), "utf-8", layout)
+    return via_pyarrow, via_pandas
+
+
+def test_pyarrow_and_pandas_readers_agree():
+    via_pyarrow, via_pandas = read_both(FIXTURE)
+
+    assert list(via_pyarrow.columns) == list(via_pandas.columns)
+    assert via_pyarrow.isna().sum().to_dict() == via_pandas.isna().sum().to_dict()
+    for column in via_pandas.columns:
+        assert pd.api.types.is_numeric_dtype(via_pyarrow[column]) == pd.api.types.is_numeric_dtype(via_pandas[column])
+        assert pd.api.types.is_datetime64_any_dtype(via_pyarrow[column]) is False
+    pd.testing.assert_frame_equal(via_pyarrow, via_pandas, check_dtype=False)
+
+
+def test_empty_cells_are_null_and_dates_stay_strings():
+    df, _ = read_both(FIXTURE)
+
+    assert df["Campaign"].fillna("Unknown").tolist() == ["Brand", "Unknown", "Generic", "Brand"]
+    assert df["Day"].tolist() == ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"]
+    assert df["Started"].dropna().tolist() == ["2025-01-01 10:00:00", "2025-01-03T08:30:00"]
+
+
+def test_dates_after_the_sniffed_prefix_stay_strings(monkeypatch):
+    import csv_ingest
+
+    rows = "".join(f"{i},\n" for i in range(200))
+    data = f"id,when\n{rows}999,2025-02-01\n".encode()
+    monkeypatch.setattr(csv_ingest, "CSV_SNIFF_BYTES", 256)
+    monkeypatch.setattr(csv_ingest.peek_text, "__defaults__", (256,))
+
+    df = read_csv_stream(io.BytesIO(data), "late-dates.csv")
+    assert df["when"].dropna().tolist() == ["2025-02-01"]
@@ -0,0 +1,37 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from fast_json import dumps
+
+
+def test_numpy_and_pandas_values():
+    payload = {
+        "count": np.int64(3),
+        "share": np.float32(0.5),
+        "values": np.array([1.5, 2.5]),
+        "missing": [float("nan"), np.inf, pd.NaT],
+        "when": pd.Timestamp("2025-01-02 03:04:05"),
+        "frame": pd.DataFrame({"a": [1, 2]}),
+    }
+
+    assert json.loads(dumps(payload)) == {
+        "count": 3,
+        "share": 0.5,
+        "values": [1.5, 2.5],
+        "missing": [None, None, None],
+        "when": "2025-01-02T03:04:05",
+        "frame": [{"a": 1}, {"a": 2}],
+    }
+
+
+def test_keys_orjson_cannot_write_are_normalized():
+    by_day = pd.Series([1, 2], index=pd.to_datetime(["2025-01-01", "2025-01-02"])).to_dict()
+    payload = {"by_day": by_day, "pairs": {("a", "b"): 1}, "ids": {np.int64(7): "x"}}
+
+    assert json.loads(dumps(payload)) == {
+        "by_day": {"2025-01-01T00:00:00": 1, "2025-01-02T00:00:00": 2},
+        "pairs": {"('a', 'b')": 1},
+        "ids": {"7": "x"},
+    }
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from analytics.forecasting import WeeklyTrendModel
+from analytics.model_registry import ModelRegistry
+
+
+def daily_frame(start, days):
+    index = pd.date_range(start, periods=days, freq="D")
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"sessions": 100 + np.arange(days) + rng.normal(0, 5, days),
+                         "conversions": 10 + rng.normal(0, 1, days)}, index=index)
+
+
+def test_updates_from_cached_state_do_not_share_arrays(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path))
+    window = {"start_date": "2025-01-01"}
+    history = daily_frame("2025-01-01", 30)
+    registry.save("prop", "traffic", window, {"trained_through": "2025-01-30",
+                                              "model": WeeklyTrendModel(history).get_state()})
+
+    new_days = daily_frame("2025-01-31", 2)
+    first = WeeklyTrendModel.from_state(registry.load("prop", "traffic", window)["model"]).update(new_days)
+    second = WeeklyTrendModel.from_state(registry.load("prop", "traffic", window)["model"]).update(new_days)
+
+    assert list(first.n_obs) == [32, 32]
+    assert list(second.n_obs) == [32, 32]
+    np.testing.assert_allclose(first.coefficients, second.coefficients)
+    cached = registry.load("prop", "traffic", window)["model"]
+    assert list(cached["n_obs"]) == [30, 30]
+
+    # A model saved after an update isn't changed by updating it again
+    registry.save("prop", "traffic", window, {"trained_through": "2025-02-01", "model": first.get_state()})
+    first.update(daily_frame("2025-02-02", 3))
+    assert list(registry.load("prop", "traffic", window)["model"]["n_obs"]) == [32, 32]
+
+
+def test_update_matches_full_fit():
+    history = daily_frame("2025-01-01", 40)
+    incremental = WeeklyTrendModel(history.iloc[:30]).update(history.iloc[30:])
+    np.testing.assert_allclose(incremental.coefficients, WeeklyTrendModel(history).coefficients)
+
+
+def test_update_lock_is_shared_per_model(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path))
+    window = {"start_date": "2025-01-01"}
+    lock = registry.update_lock("prop", "traffic", window)
+    assert registry.update_lock("prop", "traffic", window) is lock
+    assert registry.update_lock("prop", "conversions", window) is not lock
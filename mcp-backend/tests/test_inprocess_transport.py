@@ -0,0 +1,80 @@
+import os
+import sys
+import threading
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("fastmcp")
+
+import analysis_jobs
+from analysis_jobs import JobStore
+from benchmarks.fake_connectors import DEFAULT_END_DATE, build_fake_integrator
+from credential_manager import credential_manager
+
+BACKEND_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+
+@pytest.fixture
+def transport(monkeypatch, tmp_path):
+    # backend's directory goes last, as mcp_shared puts mcp-backend's for backend
+    monkeypatch.setattr(sys, "path", sys.path + [BACKEND_PATH])
+    monkeypatch.setattr(analysis_jobs.analysis_jobs, "_store", JobStore(str(tmp_path / "jobs.db")))
+    from services.mcp_inprocess import InProcessMCPTransport
+    return InProcessMCPTransport()
+
+
+@pytest.fixture
+def fake_connectors(monkeypatch):
+    threads = []
+    integrator = build_fake_integrator('small', latency=0)
+
+    def build_integrator_for_user(user_id):
+        threads.append(threading.current_thread().name)
+        return integrator
+
+    monkeypatch.setattr(credential_manager, "build_integrator_for_user", build_integrator_for_user)
+    return threads
+
+
+def comprehensive_arguments():
+    end = pd.Timestamp(DEFAULT_END_DATE)
+    date_range = {"start": (end - pd.Timedelta(days=29)).strftime('%Y-%m-%d'), "end": DEFAULT_END_DATE}
+    return {
+        "user_id": "inprocess-user",
+        "start_date": date_range["start"],
+        "end_date": date_range["end"],
+        "data_selections": [{"platform": platform, "date_range": date_range}
+                            for platform in ['facebook', 'google_ads', 'google_analytics']]
+    }
+
+
+@pytest.mark.asyncio
+async def test_tool_runs_on_the_mcp_backend_loop_inside_its_lifespan(transport, fake_connectors):
+    try:
+        result = await transport.call_tool("get_comprehensive_insights", comprehensive_arguments())
+        assert result.get("success") is not False, result.get("error")
+        assert result["configuration"]["platforms_analyzed"] == ['facebook', 'google_ads', 'google_analytics']
+        # Native result, not a JSON round trip
+        assert isinstance(result, dict)
+        assert fake_connectors == ["mcp-inprocess"]
+        assert transport._thread is not threading.current_thread()
+        # mcp-backend's lifespan started the analysis job workers
+        assert analysis_jobs.analysis_jobs._tasks
+        assert transport.status()["loaded"]
+    finally:
+        await transport.close()
+
+    assert analysis_jobs.analysis_jobs._tasks == []
+    assert not transport.status()["loaded"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_and_private_tools_are_errors(transport):
+    try:
+        assert await transport.call_tool("no_such_tool", {}) == {
+            'error': "Unknown tool: no_such_tool", 'success': False
+        }
+        assert (await transport.call_tool("_helper", {}))['success'] is False
+    finally:
+        await transport.close()
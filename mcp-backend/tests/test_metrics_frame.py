@@ -0,0 +1,63 @@
+import pandas as pd
+
+from analytics.metrics_frame import MetricsFrame
+
+
+def ad_data():
+    return pd.DataFrame({
+        "source": ["meta", "meta", "meta", "google", "google", "google"],
+        "campaign_name": ["a", "a", "b", "c", "c", "d"],
+        "ad_name": ["a1", "a2", "b1", "c1", "c2", "d1"],
+        "impressions": [1000, 2000, 500, 4000, 3000, 100],
+        "clicks": [50, 80, 5, 200, 90, 0],
+        "spend": [40.0, 120.0, 0.0, 300.0, 50.0, 75.0],
+        "conversions": [4, 6, 1, 30, 2, 0],
+        "ctr": [0.05, 0.04, 0.01, 0.05, 0.03, 0.0],
+        "cpc": [0.8, 1.5, 0.0, 1.5, 0.55, 0.0],
+        "cpm": [40.0, 60.0, 0.0, 75.0, 16.7, 750.0],
+    })
+
+
+def test_grouped_ratios_match_ratios_of_group_sums():
+    # What AdPerformanceAnalyzer.get_campaign_summary computed before MetricsFrame
+    df = ad_data()
+    old = df.groupby("campaign_name").agg({
+        "impressions": "sum", "clicks": "sum", "spend": "sum", "conversions": "sum",
+        "ctr": "mean", "cpc": "mean", "cpm": "mean"
+    })
+    old["roas"] = old["conversions"] / (old["spend"] + 0.001)
+    old["conversion_rate"] = old["conversions"] / (old["clicks"] + 0.001)
+
+    grouped = MetricsFrame(df).grouped("campaign")
+
+    pd.testing.assert_frame_equal(grouped[old.columns], old)
+
+
+def test_roas_mean_matches_the_mean_of_row_level_roas():
+    # What RecommendationEngine compared platforms on before MetricsFrame
+    df = ad_data()
+    rows = df.copy()
+    rows["roas"] = rows["conversions"] / (rows["spend"] + 0.001)
+    old = rows.groupby("source").agg({"roas": "mean", "ctr": "mean", "spend": "sum"})
+
+    grouped = MetricsFrame(df).grouped("source")
+
+    pd.testing.assert_series_equal(grouped["roas_mean"], old["roas"], check_names=False)
+    pd.testing.assert_frame_equal(grouped[["ctr", "spend"]], old[["ctr", "spend"]])
+    assert grouped["rows"].tolist() == [3, 3]
+
+
+def test_with_min_spend_matches_filtering_before_grouping():
+    # What InsightsGenerator and ActionPlanGenerator grouped before MetricsFrame
+    df = ad_data()
+    metrics = MetricsFrame(df)
+    for min_spend, inclusive, mask in [(50, False, df["spend"] > 50), (50, True, df["spend"] >= 50)]:
+        old = df[mask].groupby(["source", "campaign_name"]).agg({
+            "spend": "sum", "conversions": "sum", "clicks": "sum"
+        })
+        subset = metrics.with_min_spend(min_spend, inclusive=inclusive)
+        pd.testing.assert_frame_equal(subset.grouped("source_campaign")[old.columns], old)
+
+    assert metrics.with_min_spend(50, inclusive=False) is metrics.with_min_spend(50, inclusive=False)
+    # The caller's frame is left without derived columns
+    assert "roas" not in df.columns
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from analytics.model_registry import ModelRegistry
+
+WINDOW = {"start_date": "2025-01-01", "end_date": "2025-03-31"}
+
+
+def sample_state():
+    index = pd.date_range("2025-01-01", periods=3, freq="D", name="date")
+    return {
+        "trained_through": "2025-03-31",
+        "history": pd.DataFrame({"sessions": [1.0, 2.0, 3.0]}, index=index),
+        "weights": np.arange(4.0),
+        "model": {"xtx": np.eye(2), "columns": ["sessions"]},
+    }
+
+
+def test_state_round_trips_through_disk(tmp_path):
+    ModelRegistry(root=str(tmp_path)).save("123", "traffic", WINDOW, sample_state())
+
+    # A new registry has nothing in memory, so this reads the .npz file
+    state = ModelRegistry(root=str(tmp_path)).load("123", "traffic", WINDOW)
+
+    assert state["trained_through"] == "2025-03-31"
+    # The index comes back as datetime64[ns] whatever resolution it was saved with
+    pd.testing.assert_frame_equal(state["history"], sample_state()["history"], check_freq=False, check_index_type=False)
+    np.testing.assert_array_equal(state["weights"], np.arange(4.0))
+    np.testing.assert_array_equal(state["model"]["xtx"], np.eye(2))
+    assert state["model"]["columns"] == ["sessions"]
+
+
+def test_windows_and_model_types_are_stored_separately(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path))
+    registry.save("123", "traffic", WINDOW, sample_state())
+
+    assert registry.load("123", "traffic", {**WINDOW, "end_date": "2025-04-30"}) is None
+    assert registry.load("123", "conversions", WINDOW) is None
+
+
+def test_invalidate_removes_memory_and_disk_entries(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path))
+    registry.save("123", "traffic", WINDOW, sample_state())
+    registry.save("123", "conversions", WINDOW, sample_state())
+
+    assert registry.invalidate("123", "traffic") == 1
+    assert registry.load("123", "traffic", WINDOW) is None
+    assert registry.load("123", "conversions", WINDOW) is not None
+
+
+def test_memory_keeps_the_most_recent_entries(tmp_path):
+    registry = ModelRegistry(root=str(tmp_path), memory_entries=2)
+    for model_type in ("a", "b", "c"):
+        registry.save("123", model_type, WINDOW, sample_state())
+
+    assert len(registry._memory) == 2
+    # Evicted from memory, still loadable from disk
+    assert registry.load("123", "a", WINDOW)["trained_through"] == "2025-03-31"
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import platform_limiter as limiter_module
+from platform_limiter import (BACKGROUND, INTERACTIVE, CircuitOpenError, PlatformLimiter, PlatformTimeout,
+                              TokenBucket, background_priority, degradation_report)
+
+QUOTAS = {"test": {"platform_rate": 1000.0, "platform_burst": 100, "account_rate": 1000.0, "account_burst": 100}}
+
+
+class ServiceUnavailable(Exception):
+    """Retryable by name, like the Google SDK exception"""
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(PlatformLimiter, "_backoff", staticmethod(lambda attempt, hint: 0.0))
+    return PlatformLimiter(quotas=QUOTAS)
+
+
+@pytest.mark.asyncio
+async def test_retryable_errors_are_retried(limiter):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ServiceUnavailable("try again")
+        return "ok"
+
+    assert await limiter.call("test", "123", flaky) == "ok"
+    assert len(attempts) == 3
+    assert limiter.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_other_errors_fail_without_retrying(limiter):
+    def broken():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await limiter.call("test", "123", broken)
+    assert limiter.calls == 1
+    assert limiter.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_consecutive_failures(limiter, monkeypatch):
+    monkeypatch.setattr(limiter_module, "RETRY_ATTEMPTS", 1)
+
+    def down():
+        raise ServiceUnavailable("down")
+
+    for _ in range(limiter_module.BREAKER_FAILURES):
+        with pytest.raises(ServiceUnavailable):
+            await limiter.call("test", "123", down)
+    with pytest.raises(CircuitOpenError):
+        await limiter.call("test", "123", down)
+    assert limiter.rejected == 1
+
+
+def test_background_reservations_leave_the_interactive_reserve():
+    bucket = TokenBucket(rate=0.001, burst=10)
+    taken = 0
+    while bucket.reserve(BACKGROUND) is not None:
+        taken += 1
+    assert taken == 10 - int(10 * limiter_module.INTERACTIVE_RESERVE)
+    assert bucket.reserve(INTERACTIVE) == 0.0
+
+
+def drain_to_reserve(bucket):
+    while bucket.reserve(BACKGROUND) is not None:
+        pass
+
+
+def test_spare_token_refunds_the_platform_token_when_the_account_has_none():
+    limiter = PlatformLimiter(quotas={"test": {"platform_rate": 0.001, "platform_burst": 10,
+                                               "account_rate": 0.001, "account_burst": 10}})
+    drain_to_reserve(limiter.bucket("test", "123"))
+    before = limiter.bucket("test").tokens
+
+    assert not limiter._spare_token("test", "123")
+    assert limiter.bucket("test").tokens == pytest.approx(before, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_background_acquire_does_not_hold_the_platform_token_while_polling(monkeypatch):
+    monkeypatch.setattr(limiter_module, "BACKGROUND_POLL_SECONDS", 0.01)
+    limiter = PlatformLimiter(quotas={"test": {"platform_rate": 0.001, "platform_burst": 10,
+                                               "account_rate": 0.001, "account_burst": 10}})
+    drain_to_reserve(limiter.bucket("test", "123"))
+    before = limiter.bucket("test").tokens
+
+    with background_priority():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.acquire("test", "123"), 0.1)
+    assert limiter.bucket("test").tokens == pytest.approx(before, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_hung_calls_only_tie_up_their_platforms_workers(monkeypatch):
+    monkeypatch.setattr(limiter_module, "CALL_TIMEOUT", 0.2)
+    monkeypatch.setattr(limiter_module, "RETRY_ATTEMPTS", 1)
+    limiter = PlatformLimiter(quotas={"test": {**QUOTAS["test"], "workers": 1}, "other": QUOTAS["test"]})
+    release = threading.Event()
+    try:
+        with pytest.raises(PlatformTimeout):
+            await limiter.call("test", "123", release.wait, 10)
+        # The only worker is still stuck, so the next call queues and times out too
+        with pytest.raises(PlatformTimeout):
+            await limiter.call("test", "123", lambda: "ok")
+        assert await limiter.call("other", "123", lambda: "ok") == "ok"
+        assert limiter.timeouts == 2
+    finally:
+        release.set()
+
+
+def seed_latencies(limiter, platform, seconds):
+    limiter._latency_window(platform).extend([seconds] * limiter_module.HEDGE_MIN_SAMPLES)
+
+
+def first_call_hangs(release):
+    calls = []
+    lock = threading.Lock()
+
+    def fetch():
+        with lock:
+            calls.append(1)
+            number = len(calls)
+        if number == 1:
+            release.wait(10)
+            return "first"
+        return "hedge"
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_slow_attempt_is_hedged_and_the_hedge_wins(limiter, monkeypatch):
+    monkeypatch.setattr(limiter_module, "HEDGING_ENABLED", True)
+    seed_latencies(limiter, "test", 0.01)
+    release = threading.Event()
+    try:
+        assert await limiter.call_hedged("test", "123", first_call_hangs(release)) == "hedge"
+    finally:
+        release.set()
+    assert limiter.hedges == 1
+    assert limiter.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_a_spare_token(monkeypatch):
+    monkeypatch.setattr(limiter_module, "HEDGING_ENABLED", True)
+    limiter = PlatformLimiter(quotas={"test": {"platform_rate": 0.001, "platform_burst": 10,
+                                               "account_rate": 0.001, "account_burst": 10}})
+    drain_to_reserve(limiter.bucket("test", "123"))
+    seed_latencies(limiter, "test", 0.01)
+
+    def slow():
+        time.sleep(0.1)
+        return "first"
+
+    assert await limiter.call_hedged("test", "123", slow) == "first"
+    assert limiter.hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_degradation_report_collects_failures_from_tasks(limiter, monkeypatch):
+    monkeypatch.setattr(limiter_module, "RETRY_ATTEMPTS", 1)
+
+    def down():
+        raise ServiceUnavailable("down")
+
+    def bad_request():
+        raise ValueError("bad request")
+
+    with degradation_report() as report:
+        results = await asyncio.gather(
+            asyncio.ensure_future(limiter.call("test", "123", down)),
+            asyncio.ensure_future(limiter.call("other", "123", bad_request)),
+            return_exceptions=True
+        )
+    assert [type(result) for result in results] == [ServiceUnavailable, ValueError]
+    # Client errors say nothing about the platform's health
+    assert report == {"test": "ServiceUnavailable: down"}
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_reported_as_degradation(limiter):
+    breaker = limiter.breaker("test")
+    for _ in range(limiter_module.BREAKER_FAILURES):
+        breaker.record_failure()
+
+    with degradation_report() as report:
+        with pytest.raises(CircuitOpenError):
+            await limiter.call("test", "123", lambda: "ok")
+    assert report["test"].startswith("circuit open for all accounts")
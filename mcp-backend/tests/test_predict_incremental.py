@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.forecasting import WeeklyTrendModel
+from analytics.model_registry import ModelRegistry
+
+predict = pytest.importorskip("routes.predict")
+
+TODAY = pd.Timestamp.now().normalize()
+START = (TODAY - pd.Timedelta(days=30)).strftime('%Y-%m-%d')
+END = TODAY.strftime('%Y-%m-%d')
+
+
+def day(offset):
+    return (TODAY - pd.Timedelta(days=offset)).strftime('%Y-%m-%d')
+
+
+class FakeGA4Connector:
+    """Serves GA4-shaped rows; sessions for a day can be revised, as GA4 does for the last 48h"""
+
+    property_id = "123"
+
+    def __init__(self):
+        self.sessions = {day(offset): 100.0 + offset for offset in range(31)}
+        self.requests = []
+
+    async def fetch_data(self, start_date, end_date, dimensions=None, metrics=None):
+        self.requests.append((start_date, end_date))
+        days = [d for d in sorted(self.sessions) if start_date <= d <= end_date]
+        return pd.DataFrame({
+            "date": [d.replace("-", "") for d in days],
+            "sessionDefaultChannelGrouping": "Organic Search",
+            "sessions": [self.sessions[d] for d in days],
+            "totalUsers": [self.sessions[d] / 2 for d in days],
+            "screenPageViews": [self.sessions[d] * 3 for d in days],
+        })
+
+
+@pytest.fixture
+def ga4(monkeypatch, tmp_path):
+    connector = FakeGA4Connector()
+    monkeypatch.setattr(predict, "_get_ga4_connector", lambda: connector)
+    monkeypatch.setattr(predict, "model_registry", ModelRegistry(root=str(tmp_path)))
+    return connector
+
+
+async def load_traffic():
+    return await predict._load_daily_ga4_model(
+        "u1", "traffic", START, END, trend_metrics=predict.PREDICTION_METRICS["traffic"]
+    )
+
+
+def stored_traffic():
+    window = {"start_date": START, "metrics": predict.PREDICTION_METRICS["traffic"]}
+    return predict.model_registry.load("123", "traffic", window)
+
+
+@pytest.mark.asyncio
+async def test_unsettled_days_are_refetched_and_settled_days_appended(ga4, monkeypatch):
+    daily, _ = await load_traffic()
+    assert len(daily) == 31
+    assert stored_traffic()["trained_through"] == day(predict.GA4_SETTLE_DAYS)
+    assert len(stored_traffic()["daily"]) == 31 - predict.GA4_SETTLE_DAYS
+
+    # GA4 revises yesterday; only the unsettled tail is fetched again
+    ga4.sessions[day(1)] = 500.0
+    daily, model = await load_traffic()
+    assert ga4.requests[-1] == (day(predict.GA4_SETTLE_DAYS - 1), END)
+    assert daily.loc[day(1), "sessions"] == 500.0
+    assert len(stored_traffic()["daily"]) == 31 - predict.GA4_SETTLE_DAYS
+
+    # A day later yesterday has settled: it is appended to the stored model
+    monkeypatch.setattr(predict, "GA4_SETTLE_DAYS", 1)
+    daily, model = await load_traffic()
+    assert ga4.requests[-1] == (day(1), END)
+    assert stored_traffic()["trained_through"] == day(1)
+    assert stored_traffic()["daily"].loc[day(1), "sessions"] == 500.0
+
+    # Stored settled days plus the refetched tail give the same fit as the full history
+    full = WeeklyTrendModel(daily[predict.PREDICTION_METRICS["traffic"]])
+    np.testing.assert_allclose(model.coefficients, full.coefficients)
+    assert len(ga4.requests) == 3
@@ -0,0 +1,95 @@
+import pytest
+
+import query_cache
+from query_cache import CursorError, QueryResultCache, page_from_cursor, paginate_new_result, paginate_result
+
+ROWS = [
+    {"campaign": "a", "spend": 10.0, "clicks": 5},
+    {"campaign": "b", "spend": 30.0, "clicks": 1},
+    {"campaign": "c", "clicks": 7},
+    {"campaign": "d", "spend": 20.0, "clicks": 2},
+]
+
+
+def result():
+    return {"success": True, "total_rows": len(ROWS), "data": [dict(row) for row in ROWS]}
+
+
+@pytest.fixture
+def cache():
+    return QueryResultCache(ttl_seconds=60, max_entries=8)
+
+
+def test_plain_calls_return_everything_and_are_not_cached(cache):
+    response = paginate_new_result(cache, "k", "u1", result())
+
+    assert response["data"] == ROWS
+    assert "pagination" not in response
+    assert cache.get("k") is None
+
+
+def test_limit_pages_through_the_cached_result(cache):
+    first = paginate_new_result(cache, "k", "u1", result(), limit=3)
+    assert [row["campaign"] for row in first["data"]] == ["a", "b", "c"]
+    assert first["total_rows"] == 4
+    assert first["pagination"]["has_more"]
+
+    second = page_from_cursor(cache, first["pagination"]["next_cursor"], "u1")
+    assert [row["campaign"] for row in second["data"]] == ["d"]
+    assert second["pagination"] == {"offset": 3, "returned_rows": 1, "has_more": False, "next_cursor": None}
+
+
+def test_a_page_without_a_cursor_is_not_cached(cache):
+    response = paginate_new_result(cache, "k", "u1", result(), limit=10)
+
+    assert response["pagination"]["next_cursor"] is None
+    assert cache.get("k") is None
+
+
+def test_fields_project_every_page(cache):
+    first = paginate_new_result(cache, "k", "u1", result(), fields=["campaign", "missing"], limit=2)
+    assert first["data"] == [{"campaign": "a"}, {"campaign": "b"}]
+
+    # The projection is carried by the cursor unless overridden
+    second = page_from_cursor(cache, first["pagination"]["next_cursor"], "u1")
+    assert second["data"] == [{"campaign": "c"}, {"campaign": "d"}]
+    overridden = page_from_cursor(cache, first["pagination"]["next_cursor"], "u1", fields=["clicks"])
+    assert overridden["data"] == [{"clicks": 7}, {"clicks": 2}]
+
+
+@pytest.mark.parametrize("order_by", ["-spend", "spend DESC"])
+def test_order_by_sorts_descending_with_missing_values_last(cache, order_by):
+    first = paginate_new_result(cache, "k", "u1", result(), order_by=order_by, limit=2)
+    second = page_from_cursor(cache, first["pagination"]["next_cursor"], "u1")
+
+    campaigns = [row["campaign"] for row in first["data"] + second["data"]]
+    assert campaigns == ["b", "d", "a", "c"]
+
+
+def test_order_by_ascending(cache):
+    entry = cache.set("k", "u1", result())
+    response = paginate_result(entry, "k", order_by="clicks")
+    assert [row["clicks"] for row in response["data"]] == [1, 2, 5, 7]
+    # The cached rows keep their original order
+    assert entry["result"]["data"] == ROWS
+
+
+def test_cursor_belongs_to_the_user_who_ran_the_query(cache):
+    first = paginate_new_result(cache, "k", "u1", result(), limit=1)
+
+    with pytest.raises(CursorError, match="Invalid cursor"):
+        page_from_cursor(cache, first["pagination"]["next_cursor"], "u2")
+
+
+def test_cursor_expires_with_the_cached_result(cache, monkeypatch):
+    first = paginate_new_result(cache, "k", "u1", result(), limit=1)
+    now = query_cache.time.monotonic()
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: now + cache.ttl_seconds + 1)
+
+    with pytest.raises(CursorError, match="expired"):
+        page_from_cursor(cache, first["pagination"]["next_cursor"], "u1")
+
+
+def test_malformed_cursor_is_rejected(cache):
+    with pytest.raises(CursorError):
+        page_from_cursor(cache, "not-a-cursor", "u1")